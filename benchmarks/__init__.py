@@ -0,0 +1,6 @@
+"""Benchmarks for guitarprotool.
+
+Standalone scripts (python benchmarks/bench_*.py) compare implementation
+choices; the suite (python -m benchmarks.suite) times the pipeline stages
+on a synthetic corpus and stores the results as JSON.
+"""
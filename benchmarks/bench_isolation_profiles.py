@@ -0,0 +1,167 @@
+"""Benchmark: Demucs inference profiles - separation time and bass-onset accuracy.
+
+Runs BassIsolator once per profile (fast, balanced, quality) and reports
+wall time, real-time factor and how well bass onsets detected on the
+isolated stem match a reference:
+
+- Synthetic mode (default): a generated mix of bass notes at known onset
+  times, kick/hi-hat noise and a sustained pad. The reference is the
+  known note onsets.
+- --audio FILE: a real song. The reference is the onsets found on the
+  "quality" profile's stem, so scores show agreement with the slowest
+  profile.
+
+Usage:
+    python benchmarks/bench_isolation_profiles.py [--seconds 30] [--threads N]
+    python benchmarks/bench_isolation_profiles.py --audio song.mp3
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import scipy.io.wavfile as wavfile
+
+from guitarprotool.core.bass_isolator import INFERENCE_PROFILES, BassIsolator
+
+SAMPLE_RATE = 44100
+
+# Onsets within this distance of a reference onset count as hits
+TOLERANCE_S = 0.05
+
+
+def build_mix(path: Path, seconds: float, seed: int = 0) -> np.ndarray:
+    """Write a synthetic stereo mix and return its bass note onset times."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    mix = np.zeros(n, dtype=np.float32)
+    t = np.arange(n) / SAMPLE_RATE
+
+    # Pad: two detuned saws, always on
+    pad = ((t * 220.0) % 1.0 - 0.5) + ((t * 221.5) % 1.0 - 0.5)
+    mix += 0.05 * pad.astype(np.float32)
+
+    # Drums: kick on quarter notes, hi-hat on eighths (120 BPM)
+    for beat in np.arange(0.0, seconds, 0.25):
+        start = int(beat * SAMPLE_RATE)
+        length = min(int(0.05 * SAMPLE_RATE), n - start)
+        decay = np.exp(-np.arange(length) / (0.01 * SAMPLE_RATE)).astype(np.float32)
+        if beat % 0.5 == 0:
+            kick = np.sin(2 * np.pi * 60 * np.arange(length) / SAMPLE_RATE)
+            mix[start:start + length] += 0.4 * kick.astype(np.float32) * decay
+        else:
+            noise = rng.standard_normal(length).astype(np.float32)
+            mix[start:start + length] += 0.1 * noise * decay
+
+    # Bass: notes of random length (eighth to half note) and pitch (E1-E2)
+    onsets = []
+    position = 0.3
+    while position < seconds - 0.5:
+        duration = rng.choice([0.25, 0.5, 0.75, 1.0])
+        frequency = 41.2 * 2 ** (rng.integers(0, 12) / 12)
+        start = int(position * SAMPLE_RATE)
+        length = min(int(duration * SAMPLE_RATE), n - start)
+        note_t = np.arange(length) / SAMPLE_RATE
+        envelope = np.exp(-note_t * 3.0) * np.minimum(1.0, note_t / 0.005)
+        phase = 2 * np.pi * frequency * note_t
+        tone = np.sin(phase) + 0.3 * np.sin(2 * phase)
+        mix[start:start + length] += (0.5 * tone * envelope).astype(np.float32)
+        onsets.append(position)
+        position += duration
+
+    stereo = np.stack([mix, mix], axis=1)
+    wavfile.write(path, SAMPLE_RATE, np.clip(stereo, -1, 1))
+    return np.array(onsets)
+
+
+def detect_onsets(y: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Detect onset times (seconds) in a mono stem."""
+    import librosa
+
+    return librosa.onset.onset_detect(y=y, sr=sample_rate, units="time", backtrack=True)
+
+
+def score_onsets(detected: np.ndarray, reference: np.ndarray) -> tuple[float, float]:
+    """Match onsets one-to-one within TOLERANCE_S.
+
+    Returns:
+        Tuple of (F-measure, mean absolute error in ms of matched onsets)
+    """
+    errors = []
+    used = np.zeros(len(detected), dtype=bool)
+    for onset in reference:
+        if len(detected) == 0:
+            break
+        distance = np.abs(detected - onset)
+        distance[used] = np.inf
+        index = int(np.argmin(distance))
+        if distance[index] <= TOLERANCE_S:
+            used[index] = True
+            errors.append(distance[index])
+
+    hits = len(errors)
+    if hits == 0:
+        return 0.0, float("nan")
+    precision = hits / len(detected)
+    recall = hits / len(reference)
+    f_measure = 2 * precision * recall / (precision + recall)
+    return f_measure, float(np.mean(errors) * 1000)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--audio", type=Path, help="Real audio file instead of a synthetic mix")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Synthetic mix length")
+    parser.add_argument("--threads", type=int, help="torch threads (default: all available)")
+    parser.add_argument("--model", default=BassIsolator.DEFAULT_MODEL, help="Demucs model")
+    args = parser.parse_args()
+
+    if not BassIsolator.is_available():
+        print("Bass isolation dependencies (torch, demucs) are not installed", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        reference = None
+        if args.audio:
+            audio_path = args.audio
+        else:
+            audio_path = tmp_dir / "mix.wav"
+            reference = build_mix(audio_path, args.seconds)
+
+        isolator = BassIsolator(
+            output_dir=tmp_dir, model=args.model, device="cpu", num_threads=args.threads
+        )
+        isolator._load_model()  # Keep model loading out of the timings
+
+        # Run "quality" first so it can serve as the reference for real audio
+        names = ["quality"] + [name for name in INFERENCE_PROFILES if name != "quality"]
+        rows = {}
+        for name in names:
+            start = time.perf_counter()
+            result = isolator.isolate(audio_path, write_file=False, profile=name)
+            elapsed = time.perf_counter() - start
+            if not result.success:
+                print(f"{name}: isolation failed: {result.error_message}", file=sys.stderr)
+                return 1
+
+            onsets = detect_onsets(result.bass_audio, result.sample_rate)
+            if reference is None:
+                reference = onsets
+            duration = len(result.bass_audio) / result.sample_rate
+            rows[name] = (elapsed, elapsed / duration, *score_onsets(onsets, reference))
+
+    source = args.audio.name if args.audio else f"synthetic {args.seconds:.0f}s mix"
+    print(f"{source}, reference onsets: {len(reference)}")
+    print(f"{'profile':<10} {'time (s)':>9} {'RTF':>6} {'F-measure':>10} {'MAE (ms)':>9}")
+    for name in INFERENCE_PROFILES:
+        elapsed, rtf, f_measure, mae = rows[name]
+        print(f"{name:<10} {elapsed:>9.1f} {rtf:>6.2f} {f_measure:>10.3f} {mae:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Micro-benchmark: string ElementPath lookups vs precompiled XPath queries.
+
+Builds a synthetic score.gpif with many bars and sync points, then times the
+lookups used by XMLModifier and SyncComparator both ways.
+
+Usage:
+    python benchmarks/bench_xml_queries.py [--bars 2000] [--number 2000]
+"""
+
+import argparse
+import timeit
+
+from lxml import etree
+
+from guitarprotool.core import xml_queries as queries
+
+
+def build_score(bars: int) -> etree._Element:
+    """Build a synthetic GPIF tree with one sync point per bar."""
+    root = etree.Element("GPIF")
+    automations = etree.SubElement(etree.SubElement(root, "MasterTrack"), "Automations")
+    tempo = etree.SubElement(automations, "Automation")
+    etree.SubElement(tempo, "Type").text = "Tempo"
+    etree.SubElement(tempo, "Value").text = "120 2"
+    for bar in range(bars):
+        automation = etree.SubElement(automations, "Automation")
+        etree.SubElement(automation, "Type").text = "SyncPoint"
+        value = etree.SubElement(automation, "Value")
+        etree.SubElement(value, "BarIndex").text = str(bar)
+        etree.SubElement(value, "BarOccurrence").text = "0"
+    master_bars = etree.SubElement(root, "MasterBars")
+    for _ in range(bars):
+        etree.SubElement(master_bars, "MasterBar")
+    assets = etree.SubElement(root, "Assets")
+    for asset_id in range(50):
+        etree.SubElement(assets, "Asset", id=str(asset_id))
+    return root
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=2000, help="Bars in synthetic score")
+    parser.add_argument("--number", type=int, default=2000, help="Iterations per query")
+    args = parser.parse_args()
+
+    root = build_score(args.bars)
+    automations = root.find("MasterTrack/Automations")
+    assets = root.find("Assets")
+    tempo_xpath = etree.XPath("MasterTrack/Automations/Automation[Type='Tempo'][1]")
+
+    cases = [
+        (
+            "tempo automation",
+            lambda: root.find(queries.TEMPO_AUTOMATION_PATH),
+            lambda: queries.first(tempo_xpath, root),
+        ),
+        (
+            "asset by id",
+            lambda: assets.find(f"Asset[@id='{42}']"),
+            lambda: queries.first(queries.ASSET_BY_ID, assets, id=str(42)),
+        ),
+        (
+            "sync point automations",
+            lambda: automations.findall("Automation[Type='SyncPoint']"),
+            lambda: queries.AUTOMATIONS_OF_TYPE(automations, type="SyncPoint"),
+        ),
+        (
+            "master bar count",
+            lambda: len(root.find("MasterBars").findall("MasterBar")),
+            lambda: int(queries.MASTER_BAR_COUNT(root)),
+        ),
+    ]
+
+    print(f"{'query':<24} {'string (us)':>12} {'compiled (us)':>14} {'speedup':>8}")
+    for name, string_query, compiled_query in cases:
+        string_us = timeit.timeit(string_query, number=args.number) / args.number * 1e6
+        compiled_us = timeit.timeit(compiled_query, number=args.number) / args.number * 1e6
+        print(f"{name:<24} {string_us:>12.2f} {compiled_us:>14.2f} {string_us / compiled_us:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
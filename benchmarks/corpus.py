@@ -0,0 +1,249 @@
+"""Synthetic benchmark corpus: drum tracks and Guitar Pro files of any size.
+
+Audio: drum tracks (kick, snare, hi-hat) whose tempo drifts linearly from
+a start to an end tempo, with optional intro silence. The true beat times
+are returned alongside, so beat tracking can be scored as well as timed.
+
+Scores: score.gpif with N bars and T tracks (one quarter note per beat,
+optional empty intro bars), packaged as GP8 (.gp ZIP) or GPX (BCFS
+container, optionally BCFZ compressed).
+
+Usage:
+    python -m benchmarks.corpus OUTPUT_DIR [--bars 200] [--tracks 2] [--seconds 60]
+"""
+
+import argparse
+import zipfile
+from pathlib import Path
+
+import numpy as np
+from lxml import etree
+
+from guitarprotool.core.bcfz import build_bcfs_container, compress_bcfz
+
+SAMPLE_RATE = 44100
+
+
+def drifting_beat_times(
+    seconds: float,
+    bpm: float,
+    drift: float = 0.0,
+    intro_silence: float = 0.0,
+) -> np.ndarray:
+    """Beat times of a performance whose tempo drifts linearly.
+
+    Args:
+        seconds: Total length including the intro silence
+        bpm: Tempo at the first beat
+        drift: Relative tempo change by the end (0.02 = 2% faster)
+        intro_silence: Time before the first beat, in seconds
+
+    Returns:
+        Beat times in seconds
+    """
+    playing = seconds - intro_silence
+    beats = []
+    position = 0.0
+    while position < playing:
+        beats.append(intro_silence + position)
+        tempo = bpm * (1 + drift * position / playing)
+        position += 60.0 / tempo
+    return np.array(beats)
+
+
+def _hit(length: int, decay_s: float, tone_hz: float = 0.0, rng=None) -> np.ndarray:
+    """One drum hit: a decaying sine (tone_hz > 0) or noise burst."""
+    t = np.arange(length) / SAMPLE_RATE
+    envelope = np.exp(-t / decay_s)
+    if tone_hz > 0:
+        # Pitch drops over the hit, like a kick drum
+        wave = np.sin(2 * np.pi * tone_hz * t * (1 - 0.5 * t / t[-1]))
+    else:
+        wave = rng.standard_normal(length)
+    return (wave * envelope).astype(np.float32)
+
+
+def write_drum_track(
+    path: Path,
+    seconds: float,
+    bpm: float = 120.0,
+    drift: float = 0.0,
+    intro_silence: float = 0.0,
+    beats_per_bar: int = 4,
+    seed: int = 0,
+) -> np.ndarray:
+    """Write a mono drum track (WAV) and return its beat times.
+
+    Kick on beats 1 and 3, snare on 2 and 4, hi-hat on every eighth note.
+
+    Args:
+        path: Output .wav path
+        seconds: Total length including the intro silence
+        bpm: Tempo at the first beat
+        drift: Relative tempo change by the end (see drifting_beat_times)
+        intro_silence: Silence before the first beat, in seconds
+        beats_per_bar: Beats per bar
+        seed: Random seed for the noise-based drums
+
+    Returns:
+        Beat times in seconds
+    """
+    import scipy.io.wavfile as wavfile
+
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    mix = np.zeros(n, dtype=np.float32)
+    beats = drifting_beat_times(seconds, bpm, drift, intro_silence)
+
+    def add(time: float, sound: np.ndarray, gain: float) -> None:
+        start = int(time * SAMPLE_RATE)
+        length = min(len(sound), n - start)
+        if length > 0:
+            mix[start:start + length] += gain * sound[:length]
+
+    kick = _hit(int(0.15 * SAMPLE_RATE), 0.04, tone_hz=70.0)
+    snare = _hit(int(0.12 * SAMPLE_RATE), 0.03, rng=rng)
+    hihat = np.diff(_hit(int(0.04 * SAMPLE_RATE), 0.008, rng=rng), prepend=0.0)
+
+    for index, beat in enumerate(beats):
+        in_bar = index % beats_per_bar
+        add(beat, kick if in_bar % 2 == 0 else snare, 0.8 if in_bar == 0 else 0.6)
+        add(beat, hihat, 0.2)
+        if index + 1 < len(beats):
+            add((beat + beats[index + 1]) / 2, hihat, 0.15)
+
+    wavfile.write(path, SAMPLE_RATE, np.clip(mix, -1, 1))
+    return beats
+
+
+def build_gpif(bars: int, tracks: int = 1, tempo: float = 120.0, intro_bars: int = 0) -> bytes:
+    """Build a score.gpif document.
+
+    Every track plays one quarter note per beat in 4/4, except during the
+    intro bars, which hold rests.
+
+    Args:
+        bars: Number of bars
+        tracks: Number of tracks
+        tempo: Tempo automation value in BPM
+        intro_bars: Leading bars without notes
+
+    Returns:
+        UTF-8 encoded XML
+    """
+    root = etree.Element("GPIF")
+    etree.SubElement(root, "GPVersion").text = "8.0"
+    score = etree.SubElement(root, "Score")
+    etree.SubElement(score, "Title").text = etree.CDATA(f"Synthetic {bars} bars")
+    etree.SubElement(score, "Artist").text = etree.CDATA("guitarprotool benchmarks")
+
+    master_track = etree.SubElement(root, "MasterTrack")
+    etree.SubElement(master_track, "Tracks").text = " ".join(str(t) for t in range(tracks))
+    automation = etree.SubElement(etree.SubElement(master_track, "Automations"), "Automation")
+    for tag, text in (
+        ("Type", "Tempo"), ("Linear", "false"), ("Bar", "0"), ("Position", "0"),
+        ("Visible", "true"), ("Value", f"{tempo:g} 2"),
+    ):
+        etree.SubElement(automation, tag).text = text
+
+    tracks_elem = etree.SubElement(root, "Tracks")
+    for track in range(tracks):
+        track_elem = etree.SubElement(tracks_elem, "Track", id=str(track))
+        etree.SubElement(track_elem, "Name").text = etree.CDATA(f"Track {track + 1}")
+        etree.SubElement(track_elem, "ShortName").text = etree.CDATA(f"t{track + 1}")
+        instrument = etree.SubElement(track_elem, "InstrumentSet")
+        etree.SubElement(instrument, "Type").text = "electricBass" if track == 0 else "electricGuitar"
+
+    master_bars = etree.SubElement(root, "MasterBars")
+    bars_elem = etree.SubElement(root, "Bars")
+    voices_elem = etree.SubElement(root, "Voices")
+    beats_elem = etree.SubElement(root, "Beats")
+    notes_elem = etree.SubElement(root, "Notes")
+    rhythms_elem = etree.SubElement(root, "Rhythms")
+    rhythm = etree.SubElement(rhythms_elem, "Rhythm", id="0")
+    etree.SubElement(rhythm, "NoteValue").text = "Quarter"
+
+    for bar in range(bars):
+        master_bar = etree.SubElement(master_bars, "MasterBar")
+        etree.SubElement(master_bar, "Time").text = "4/4"
+        bar_ids = []
+        for track in range(tracks):
+            bar_id = bar * tracks + track
+            bar_ids.append(str(bar_id))
+            bar_elem = etree.SubElement(bars_elem, "Bar", id=str(bar_id))
+            etree.SubElement(bar_elem, "Clef").text = "F4" if track == 0 else "G2"
+            etree.SubElement(bar_elem, "Voices").text = f"{bar_id} -1 -1 -1"
+
+            beat_ids = []
+            for beat in range(4):
+                beat_id = bar_id * 4 + beat
+                beat_ids.append(str(beat_id))
+                beat_elem = etree.SubElement(beats_elem, "Beat", id=str(beat_id))
+                etree.SubElement(beat_elem, "Rhythm", ref="0")
+                if bar >= intro_bars:
+                    etree.SubElement(beat_elem, "Notes").text = str(beat_id)
+                    note = etree.SubElement(notes_elem, "Note", id=str(beat_id))
+                    properties = etree.SubElement(note, "Properties")
+                    for name, value in (("String", track % 4), ("Fret", (bar + beat) % 12)):
+                        prop = etree.SubElement(properties, "Property", name=name)
+                        etree.SubElement(prop, name).text = str(value)
+
+            voice = etree.SubElement(voices_elem, "Voice", id=str(bar_id))
+            etree.SubElement(voice, "Beats").text = " ".join(beat_ids)
+        etree.SubElement(master_bar, "Bars").text = " ".join(bar_ids)
+
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", pretty_print=True)
+
+
+def write_gp8(path: Path, gpif: bytes) -> Path:
+    """Write a GP8 (.gp) archive containing the given score.gpif."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("VERSION", "8.0")
+        zf.writestr("Content/score.gpif", gpif)
+        zf.writestr("Content/BinaryStylesheet", b"")
+    return path
+
+
+def build_gpx(gpif: bytes, compress: bool = True) -> bytes:
+    """Build GPX file contents holding the given score.gpif.
+
+    Args:
+        gpif: score.gpif contents
+        compress: BCFZ-compress the container (as Guitar Pro 6 does);
+            otherwise return the bare BCFS container
+
+    Returns:
+        GPX file contents
+    """
+    container = build_bcfs_container({
+        "score.gpif": gpif,
+        "misc.xml": b'<?xml version="1.0" encoding="UTF-8"?>\n<Misc/>\n',
+    })
+    return compress_bcfz(container) if compress else container
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output_dir", type=Path, help="Directory to write the corpus to")
+    parser.add_argument("--bars", type=int, default=200, help="Bars per score")
+    parser.add_argument("--tracks", type=int, default=2, help="Tracks per score")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Drum track length")
+    parser.add_argument("--bpm", type=float, default=120.0, help="Starting tempo")
+    parser.add_argument("--drift", type=float, default=0.02, help="Relative tempo drift")
+    parser.add_argument("--intro", type=float, default=1.0, help="Intro silence in seconds")
+    args = parser.parse_args()
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    gpif = build_gpif(args.bars, args.tracks, tempo=args.bpm)
+    (args.output_dir / "score.gpif").write_bytes(gpif)
+    write_gp8(args.output_dir / "score.gp", gpif)
+    (args.output_dir / "score.gpx").write_bytes(build_gpx(gpif))
+    beats = write_drum_track(
+        args.output_dir / "drums.wav", args.seconds, args.bpm, args.drift, args.intro
+    )
+    np.savetxt(args.output_dir / "beats.txt", beats, fmt="%.6f")
+    print(f"Wrote {args.bars}-bar score and {args.seconds:.0f}s drum track to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
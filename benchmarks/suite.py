@@ -0,0 +1,274 @@
+"""Benchmark suite: pipeline stages on a synthetic corpus, stored as JSON.
+
+Times, at each corpus size:
+- decompress_bcfz and extract_gpx_files on a BCFZ-compressed GPX
+- BeatDetector.analyze on a drum track with tempo drift and intro silence
+  (also recording the tempo and beat-time error against the known beats)
+- DriftAnalyzer analysis and adaptive sync-point generation
+- XMLModifier load, asset/backing-track/sync-point injection and save
+- GPFile.repackage of an extracted GP8
+
+Results go to benchmarks/results/<UTC time>-<commit>.json with the machine
+and commit they were measured on. Pass --compare with an earlier results
+file to print the change per benchmark; the exit status is 1 if any
+benchmark slowed down by more than --threshold.
+
+Usage:
+    python -m benchmarks.suite [--sizes small medium] [--repeat 5]
+    python -m benchmarks.suite --compare benchmarks/results/<earlier>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.corpus import build_gpif, build_gpx, drifting_beat_times, write_drum_track, write_gp8
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Corpus sizes: score bars and tracks, drum track length. A BCFS file
+# entry addresses at most ~4 MB, which bounds the largest score.
+SIZES = {
+    "small": {"bars": 50, "tracks": 1, "seconds": 30.0},
+    "medium": {"bars": 250, "tracks": 2, "seconds": 120.0},
+    "large": {"bars": 600, "tracks": 4, "seconds": 300.0},
+}
+
+# Drum track parameters shared by all sizes
+BPM = 120.0
+DRIFT = 0.02
+INTRO_SILENCE = 1.5
+
+
+def measure(func: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> dict:
+    """Time func `repeat` times; setup (untimed) runs before each call.
+
+    Returns:
+        Dict with min, median and mean time in seconds and the repeat count
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+        "repeat": repeat,
+    }
+
+
+def bench_gpx(work_dir: Path, size: dict, repeat: int) -> List[dict]:
+    """Time BCFZ decompression and BCFS extraction."""
+    from guitarprotool.core.bcfz import decompress_bcfz, extract_gpx_files
+
+    gpx = build_gpx(build_gpif(size["bars"], size["tracks"]))
+    container = decompress_bcfz(gpx)
+    extra = {"compressed_bytes": len(gpx), "container_bytes": len(container)}
+    return [
+        {"benchmark": "decompress_bcfz", **measure(lambda: decompress_bcfz(gpx), repeat), **extra},
+        {
+            "benchmark": "extract_gpx_files",
+            **measure(lambda: extract_gpx_files(container), repeat),
+            **extra,
+        },
+    ]
+
+
+def bench_beat_detection(work_dir: Path, size: dict, repeat: int) -> List[dict]:
+    """Time beat tracking on a drum track and score it against the known beats."""
+    from guitarprotool.core.beat_detector import BeatDetector
+
+    audio_path = work_dir / "drums.wav"
+    truth = write_drum_track(audio_path, size["seconds"], BPM, DRIFT, INTRO_SILENCE)
+    detector = BeatDetector()
+    detector.analyze(audio_path)  # Untimed: librosa's first call compiles its numba kernels
+    results = []
+    timing = measure(lambda: results.append(detector.analyze(audio_path)), repeat)
+
+    detected = results[-1].beat_times
+    errors = [np.min(np.abs(detected - t)) for t in truth] if len(detected) else [np.nan]
+    return [
+        {
+            "benchmark": "beat_detector_analyze",
+            **timing,
+            "audio_seconds": size["seconds"],
+            "detected_bpm": results[-1].bpm,
+            "true_mean_bpm": 60.0 / float(np.mean(np.diff(truth))),
+            "beat_error_median_ms": float(np.median(errors) * 1000),
+        }
+    ]
+
+
+def bench_drift(work_dir: Path, size: dict, repeat: int) -> List[dict]:
+    """Time drift analysis and adaptive sync-point generation."""
+    from guitarprotool.core.drift_analyzer import DriftAnalyzer
+
+    beats = drifting_beat_times(size["seconds"], BPM, DRIFT, INTRO_SILENCE)
+    max_bars = len(beats) // 4
+
+    def run() -> None:
+        analyzer = DriftAnalyzer(beats, original_tempo=BPM)
+        analyzer.analyze()
+        analyzer.generate_adaptive_sync_points(max_bars=max_bars)
+
+    return [{"benchmark": "drift_analyzer", **measure(run, repeat), "beats": len(beats)}]
+
+
+def bench_xml(work_dir: Path, size: dict, repeat: int) -> List[dict]:
+    """Time loading, injecting into and saving a score.gpif."""
+    from guitarprotool.core.xml_modifier import (
+        AssetInfo,
+        BackingTrackConfig,
+        SyncPoint,
+        XMLModifier,
+    )
+
+    gpif = build_gpif(size["bars"], size["tracks"])
+    gpif_path = work_dir / "score.gpif"
+    sync_points = [
+        SyncPoint(bar=bar, frame_offset=bar * 88200, modified_tempo=BPM, original_tempo=BPM)
+        for bar in range(0, size["bars"], 2)
+    ]
+
+    def run() -> None:
+        modifier = XMLModifier(gpif_path)
+        modifier.load()
+        modifier.inject_asset(AssetInfo(0, "0" * 40, "/tmp/song.mp3"))
+        modifier.inject_backing_track(BackingTrackConfig())
+        modifier.inject_sync_points(sync_points)
+        modifier.save(work_dir / "score_out.gpif")
+
+    return [
+        {
+            "benchmark": "xml_modifier_inject_save",
+            **measure(run, repeat, setup=lambda: gpif_path.write_bytes(gpif)),
+            "gpif_bytes": len(gpif),
+            "sync_points": len(sync_points),
+        }
+    ]
+
+
+def bench_repackage(work_dir: Path, size: dict, repeat: int) -> List[dict]:
+    """Time repackaging an extracted GP8 file."""
+    from guitarprotool.core.gp_file import GPFile
+
+    gp_path = write_gp8(work_dir / "score.gp", build_gpif(size["bars"], size["tracks"]))
+    gp_file = GPFile(gp_path)
+    gp_file.extract(work_dir / "extracted")
+    output = work_dir / "repackaged.gp"
+    try:
+        timing = measure(lambda: gp_file.repackage(output), repeat)
+    finally:
+        gp_file.cleanup()
+    return [{"benchmark": "gp_file_repackage", **timing, "gp_bytes": gp_path.stat().st_size}]
+
+
+BENCHMARKS = [bench_gpx, bench_beat_detection, bench_drift, bench_xml, bench_repackage]
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and checkout the results were measured on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(current: List[dict], baseline_path: Path, threshold: float) -> bool:
+    """Print median-time ratios against an earlier results file.
+
+    Returns:
+        True if no benchmark got slower by more than the threshold
+    """
+    baseline = {
+        (r["size"], r["benchmark"]): r for r in json.loads(baseline_path.read_text())["results"]
+    }
+    ok = True
+    print(f"\nCompared with {baseline_path.name}:")
+    for result in current:
+        before = baseline.get((result["size"], result["benchmark"]))
+        if before is None:
+            continue
+        ratio = result["median_s"] / before["median_s"]
+        flag = ""
+        if ratio > threshold:
+            flag, ok = "  REGRESSION", False
+        print(f"{result['size']:<8} {result['benchmark']:<26} {ratio:>6.2f}x{flag}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"],
+        help="Corpus sizes to run (default: small medium)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25,
+        help="Slowdown ratio reported as a regression (default: 1.25)",
+    )
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()  # Keep per-call logging out of the timings
+
+    results = []
+    print(f"{'size':<8} {'benchmark':<26} {'median (s)':>11} {'min (s)':>9}")
+    for size_name in args.sizes:
+        for bench in BENCHMARKS:
+            with tempfile.TemporaryDirectory() as tmp:
+                for result in bench(Path(tmp), SIZES[size_name], args.repeat):
+                    result = {"size": size_name, **SIZES[size_name], **result}
+                    results.append(result)
+                    print(
+                        f"{size_name:<8} {result['benchmark']:<26} "
+                        f"{result['median_s']:>11.4f} {result['min_s']:>9.4f}"
+                    )
+
+    report = {"environment": environment(), "results": results}
+    output = args.output
+    if output is None:
+        stamp = report["environment"]["timestamp"].replace(":", "").replace("+0000", "Z")
+        output = RESULTS_DIR / f"{stamp}-{report['environment']['commit'] or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare and not compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,17 +7,21 @@ Provides an interactive command-line interface for:
 - Injecting audio with sync points into GP files
 
 Also supports non-interactive mode via command-line arguments.
+
+Heavy dependencies (numpy, librosa, yt_dlp, questionary, torch) are
+imported by the functions that use them, so `--help` and argument errors
+return without loading them.
 """
 
 import argparse
 import shutil
 import sys
 from datetime import datetime
+from fractions import Fraction
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import questionary
-from questionary import Style
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
@@ -32,11 +36,8 @@ from guitarprotool.core.format_handler import (
     get_supported_extensions,
     is_supported_format,
 )
-from guitarprotool.core.beat_detector import BeatDetector, BeatInfo, SyncResult
-from guitarprotool.core.drift_analyzer import DriftAnalyzer, DriftReport, DriftSeverity
 from guitarprotool.core.xml_modifier import (
     XMLModifier,
-    SyncPoint,
     AssetInfo,
     BackingTrackConfig,
 )
@@ -45,45 +46,66 @@ from guitarprotool.utils.exceptions import (
     AudioProcessingError,
     BeatDetectionError,
     FormatConversionError,
+    WorkerUnavailableError,
 )
 from guitarprotool.core.sync_comparator import SyncComparator
-
-# Try to import AudioProcessor - may fail on Python 3.14 due to pydub/audioop issue
-try:
-    from guitarprotool.core.audio_processor import AudioProcessor, AudioInfo
-
-    AUDIO_PROCESSOR_AVAILABLE = True
-except ImportError as e:
-    AudioProcessor = None  # type: ignore
-    AudioInfo = None  # type: ignore
-    AUDIO_PROCESSOR_AVAILABLE = False
-    logger.warning(f"AudioProcessor not available: {e}")
-
-# Try to import BassIsolator - requires optional torch/demucs dependencies
-try:
-    from guitarprotool.core.bass_isolator import BassIsolator, IsolationResult
-
-    BASS_ISOLATION_AVAILABLE = BassIsolator.is_available()
-except ImportError:
-    BassIsolator = None  # type: ignore
-    IsolationResult = None  # type: ignore
-    BASS_ISOLATION_AVAILABLE = False
-    logger.debug("BassIsolator not available (optional dependency)")
+from guitarprotool.core.bass_isolator import (
+    DEFAULT_BACKEND,
+    DEFAULT_PROFILE,
+    INFERENCE_PROFILES,
+    SEPARATION_BACKENDS,
+    create_isolator,
+    isolation_available,
+)
+from guitarprotool.utils.imports import is_installed, lazy_import
+from guitarprotool.utils.instrumentation import SpanRecorder, get_recorder, set_recorder, span
+
+if TYPE_CHECKING:
+    from guitarprotool.core.audio_processor import AudioInfo
+    from guitarprotool.core.bass_isolator import IsolationResult
+    from guitarprotool.core.beat_detector import BeatInfo
+    from guitarprotool.core.drift_analyzer import DriftReport
+    from guitarprotool.core.prefetcher import YouTubePrefetcher
+    from guitarprotool.core.score_aligner import ScoreAlignment, StartEstimate
+    from guitarprotool.core.tempo_map import TempoMap
+    from guitarprotool.core.worker import WorkerClient
+    from guitarprotool.utils.profiling import StageProfiler
+
+# Imported on first use (prompt_toolkit makes it one of the slowest imports)
+questionary = lazy_import("questionary")
+
+# Audio download/conversion needs yt_dlp; checked without importing it
+AUDIO_PROCESSOR_AVAILABLE = is_installed("yt_dlp")
+if not AUDIO_PROCESSOR_AVAILABLE:
+    logger.warning("AudioProcessor not available: yt_dlp is not installed")
+
+# Concurrent background downloads in test mode
+PREFETCH_WORKERS = 2
+
+# Beats per bar when the tab has no tempo map to take the meter from
+BEATS_PER_BAR = 4
+
+# How bars are located in the audio: beats = bar N at detected beat
+# N * beats_per_bar, score = tab note onsets aligned to audio onsets (DTW)
+SYNC_METHODS = ("beats", "score")
 
 # Rich console for styled output (record=True enables session capture)
 console = Console(record=True)
 
-# Custom questionary style
-custom_style = Style(
-    [
-        ("qmark", "fg:cyan bold"),
-        ("question", "bold"),
-        ("answer", "fg:cyan"),
-        ("pointer", "fg:cyan bold"),
-        ("highlighted", "fg:cyan"),
-        ("selected", "fg:green"),
-    ]
-)
+
+@lru_cache(maxsize=None)
+def get_style():
+    """Get the custom questionary style (built on first prompt)."""
+    return questionary.Style(
+        [
+            ("qmark", "fg:cyan bold"),
+            ("question", "bold"),
+            ("answer", "fg:cyan"),
+            ("pointer", "fg:cyan bold"),
+            ("highlighted", "fg:cyan"),
+            ("selected", "fg:green"),
+        ]
+    )
 
 
 def print_banner():
@@ -124,6 +146,12 @@ Examples:
 
   # Compare output to reference file
   guitarprotool -i song.gp -y "URL" -o output.gp --compare reference.gp
+
+  # Keep models loaded for later runs (other invocations use it automatically)
+  guitarprotool --worker
+
+  # Sync tabs dropped into a folder next to song.mp3 / song.url, 4 at a time
+  guitarprotool --watch ~/tabs --watch-workers 4
         """,
     )
     parser.add_argument(
@@ -159,15 +187,105 @@ Examples:
     parser.add_argument(
         "--quiet", action="store_true", help="Suppress non-essential output"
     )
+    parser.add_argument(
+        "--isolation-profile",
+        choices=list(INFERENCE_PROFILES),
+        default=DEFAULT_PROFILE,
+        help=f"Bass isolation speed/quality profile (default: {DEFAULT_PROFILE})",
+    )
+    parser.add_argument(
+        "--separation-backend",
+        choices=list(SEPARATION_BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f"Bass isolation runtime: PyTorch or ONNX Runtime (default: {DEFAULT_BACKEND})",
+    )
+    parser.add_argument(
+        "--sync-method",
+        choices=list(SYNC_METHODS),
+        default="beats",
+        help="Place bars by beat tracking, or by aligning the tab's notes to the audio "
+        "(default: beats)",
+    )
+    parser.add_argument(
+        "--sync-error-ms",
+        type=float,
+        metavar="MS",
+        help="Place the fewest sync points that keep every bar within MS milliseconds "
+        "of the audio",
+    )
+    parser.add_argument(
+        "--max-sync-points",
+        type=int,
+        metavar="N",
+        help="Place at most N sync points, minimising the largest bar timing error",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Record peak Python/numpy allocations per stage (slower)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each pipeline stage with cProfile (.prof and flame-graph stacks)",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Run the analysis worker, keeping models loaded for other invocations",
+    )
+    parser.add_argument(
+        "--watch",
+        type=Path,
+        nargs="+",
+        metavar="DIR",
+        help="Watch folders and sync each tab with the audio file or link of the same name",
+    )
+    parser.add_argument(
+        "--watch-output",
+        type=Path,
+        metavar="DIR",
+        help="Folder for files synced by --watch (default: a 'synced' folder in each)",
+    )
+    parser.add_argument(
+        "--watch-workers",
+        type=int,
+        default=2,
+        metavar="N",
+        help="Files synced at once by --watch (default: 2)",
+    )
+    parser.add_argument(
+        "--watch-polling",
+        action="store_true",
+        help="Poll watched folders instead of using inotify (e.g. for network shares)",
+    )
 
     args = parser.parse_args()
+    configure_instrumentation(args)
+
+    if args.sync_error_ms is not None and args.sync_error_ms <= 0:
+        parser.error("--sync-error-ms must be positive")
+    if args.max_sync_points is not None and args.max_sync_points < 1:
+        parser.error("--max-sync-points must be at least 1")
 
-    # Test mode takes priority
-    if args.test_mode:
+    # Test mode, worker mode and watch mode take priority
+    if args.test_mode or args.worker:
+        return args
+    if args.watch:
+        missing = [directory for directory in args.watch if not directory.is_dir()]
+        if missing:
+            parser.error(f"Watch folder not found: {missing[0]}")
+        if args.watch_workers < 1:
+            parser.error("--watch-workers must be at least 1")
         return args
 
     # If no input provided, return None for interactive mode
     if args.input is None:
+        if args.sync_method != "beats":
+            parser.error(
+                f"--sync-method {args.sync_method} requires --input "
+                "(the interactive menu syncs by beat tracking)"
+            )
         return None
 
     # Validate required arguments for non-interactive mode
@@ -203,6 +321,25 @@ Examples:
     return args
 
 
+def configure_instrumentation(args: argparse.Namespace) -> None:
+    """Set up memory tracing and stage profiling from CLI flags.
+
+    Called while parsing, so the flags also apply to interactive mode.
+
+    Args:
+        args: Parsed command-line arguments
+    """
+    global _stage_profiler
+
+    if args.trace_memory:
+        set_recorder(SpanRecorder(trace_memory=True))
+    if args.profile:
+        from guitarprotool.utils.profiling import StageProfiler
+
+        _stage_profiler = StageProfiler()
+        get_recorder().hooks.append(_stage_profiler)
+
+
 def get_test_fixtures_dir() -> Path:
     """Get the path to the test fixtures directory."""
     # Try relative to this file first (installed package)
@@ -316,6 +453,15 @@ def run_test_mode() -> int:
         console.print(f"  - {tc['name']} {ref_status}")
     console.print()
 
+    # Start downloads for all test cases so later downloads overlap with the
+    # analysis of earlier cases
+    prefetcher = None
+    if AUDIO_PROCESSOR_AVAILABLE:
+        from guitarprotool.core.prefetcher import YouTubePrefetcher
+
+        prefetcher = YouTubePrefetcher(max_workers=PREFETCH_WORKERS)
+        prefetcher.prefetch_all(tc["youtube_url"] for tc in test_cases)
+
     # Run each test case
     results = []
     for tc in test_cases:
@@ -336,6 +482,7 @@ def run_test_mode() -> int:
             compare=tc["reference"],
             quiet=False,
             test_mode=True,
+            prefetcher=prefetcher,
         )
 
         # Run pipeline
@@ -349,6 +496,9 @@ def run_test_mode() -> int:
 
         console.print()
 
+    if prefetcher is not None:
+        prefetcher.shutdown()
+
     # Summary
     console.print(f"[bold]{'='*60}[/bold]")
     console.print("[bold]TEST SUMMARY[/bold]")
@@ -388,7 +538,7 @@ def get_gp_file_path() -> Optional[Path]:
     result = questionary.path(
         f"Select Guitar Pro file ({supported}):",
         only_directories=False,
-        style=custom_style,
+        style=get_style(),
     ).ask()
 
     if not result:
@@ -422,20 +572,20 @@ def get_audio_source() -> tuple[str, str]:
             questionary.Choice("YouTube URL", value="youtube"),
             questionary.Choice("Local audio file", value="local"),
         ],
-        style=custom_style,
+        style=get_style(),
     ).ask()
 
     if source_type == "youtube":
         url = questionary.text(
             "Enter YouTube URL:",
-            style=custom_style,
+            style=get_style(),
         ).ask()
         return ("youtube", url or "")
     else:
         path = questionary.path(
             "Select audio file:",
             only_directories=False,
-            style=custom_style,
+            style=get_style(),
         ).ask()
         return ("local", path or "")
 
@@ -453,7 +603,7 @@ def get_track_name(default: str = "Audio Track") -> str:
         questionary.text(
             "Track name (shown in Guitar Pro):",
             default=default,
-            style=custom_style,
+            style=get_style(),
         ).ask()
         or default
     )
@@ -473,7 +623,7 @@ def get_output_path(input_path: Path) -> Path:
     result = questionary.path(
         "Save modified file as:",
         default=str(default_output),
-        style=custom_style,
+        style=get_style(),
     ).ask()
 
     if not result:
@@ -504,7 +654,7 @@ def confirm_overwrite(path: Path) -> bool:
         questionary.confirm(
             f"File {path.name} already exists. Overwrite?",
             default=False,
-            style=custom_style,
+            style=get_style(),
         ).ask()
         or False
     )
@@ -520,10 +670,18 @@ def get_troubleshooting_dir() -> Path:
     """
     # Use current working directory's 'files' folder
     base_dir = Path.cwd() / "files"
+    base_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Runs started in the same second (e.g. by --watch) get numbered folders
     troubleshoot_dir = base_dir / f"run_{timestamp}"
-    troubleshoot_dir.mkdir(parents=True, exist_ok=True)
-    return troubleshoot_dir
+    number = 1
+    while True:
+        try:
+            troubleshoot_dir.mkdir()
+            return troubleshoot_dir
+        except FileExistsError:
+            number += 1
+            troubleshoot_dir = base_dir / f"run_{timestamp}_{number}"
 
 
 def save_troubleshooting_copies(
@@ -573,11 +731,62 @@ def save_session_log(troubleshoot_dir: Path) -> tuple[Path, Path]:
     return txt_path, html_path
 
 
+def reset_stage_metrics() -> None:
+    """Drop spans and profiles from a previous pipeline run."""
+    get_recorder().clear()
+    if _stage_profiler is not None:
+        _stage_profiler.clear()
+
+
+def save_stage_metrics(troubleshoot_dir: Path) -> None:
+    """Save the run's stage timings as JSON, Chrome trace and Prometheus text.
+
+    With --profile, per-stage .prof and .collapsed files are written to a
+    profile/ subdirectory and the top functions of each stage are printed.
+
+    Args:
+        troubleshoot_dir: Directory to save spans.json, trace.json and
+            metrics.prom to
+    """
+    recorder = get_recorder()
+    recorder.write(troubleshoot_dir)
+    for record in recorder.to_json():
+        logger.debug(
+            f"Stage {record['name']}: {record['wall_time']:.2f}s wall, "
+            f"{record['cpu_time']:.2f}s CPU"
+        )
+
+    if _stage_profiler is not None and _stage_profiler.stages:
+        profile_dir = troubleshoot_dir / "profile"
+        _stage_profiler.write(profile_dir)
+        display_stage_profiles(_stage_profiler)
+        console.print(f"[dim]Stage profiles saved to: {profile_dir}[/dim]")
+
+
+def display_stage_profiles(profiler: "StageProfiler", limit: int = 5) -> None:
+    """Display the functions with the most self time in each profiled stage."""
+    for stage in profiler.stages:
+        table = Table(title=f"Profile: {stage}", border_style="cyan")
+        table.add_column("Function", style="cyan")
+        table.add_column("Calls", justify="right")
+        table.add_column("Self (s)", justify="right", style="green")
+        table.add_column("Total (s)", justify="right")
+        for function in profiler.top_functions(stage, limit):
+            table.add_row(
+                function.name,
+                str(function.calls),
+                f"{function.self_time:.3f}",
+                f"{function.cumulative_time:.3f}",
+            )
+        console.print(table)
+
+
 def process_audio(
     source_type: str,
     source_value: str,
     output_dir: Path,
     progress: Progress,
+    prefetcher: Optional["YouTubePrefetcher"] = None,
 ):
     """Download/convert audio with progress display.
 
@@ -586,18 +795,21 @@ def process_audio(
         source_value: URL or file path
         output_dir: Directory to save processed audio
         progress: Rich progress instance
+        prefetcher: Optional YouTubePrefetcher that may already be downloading
+            the URL in the background
 
     Returns:
         AudioInfo or None on failure
     """
     if not AUDIO_PROCESSOR_AVAILABLE:
         console.print(
-            "[red]Error:[/red] Audio processing not available. "
-            "This is likely due to Python 3.14 compatibility issues with pydub.\n"
-            "Please use Python 3.10-3.13 for full functionality."
+            "[red]Error:[/red] Audio processing not available: yt-dlp is not installed.\n"
+            "Install it with: pip install yt-dlp"
         )
         return None
 
+    from guitarprotool.core.audio_processor import AudioProcessor
+
     task_id = progress.add_task("[cyan]Processing audio...", total=100)
 
     def update_progress(percent: float, status: str):
@@ -609,10 +821,13 @@ def process_audio(
             progress_callback=update_progress,
         )
 
-        if source_type == "youtube":
+        if source_type == "youtube" and prefetcher is not None:
+            progress.update(task_id, description="[cyan]Waiting for download...")
+            audio_info = processor.process_download(prefetcher.get(source_value))
+        elif source_type == "youtube":
             audio_info = processor.process_youtube(source_value)
         else:
-            audio_info = processor.process_local(Path(source_value))
+            audio_info = processor.process_local_file(Path(source_value))
 
         progress.update(task_id, completed=100, description="[green]Audio processed")
         return audio_info
@@ -623,22 +838,159 @@ def process_audio(
         return None
 
 
+# Stage profiler installed by --profile
+_stage_profiler: Optional["StageProfiler"] = None
+
+_worker_client: Optional["WorkerClient"] = None
+_worker_checked = False
+
+
+def get_worker_client() -> Optional["WorkerClient"]:
+    """Get a client for the analysis worker, if one is running.
+
+    The socket is checked once per process; later calls reuse the answer.
+
+    Returns:
+        WorkerClient, or None to run analysis in-process
+    """
+    global _worker_client, _worker_checked
+
+    if not _worker_checked:
+        from guitarprotool.core.worker import WorkerClient
+
+        _worker_checked = True
+        client = WorkerClient()
+        try:
+            status = client.ping()
+            _worker_client = client
+            logger.info(f"Using analysis worker (pid {status['pid']})")
+        except WorkerUnavailableError:
+            logger.debug("No analysis worker running, analyzing in-process")
+
+    return _worker_client
+
+
+def _drop_worker(error: Exception) -> None:
+    """Stop using a worker that failed mid-job and fall back to in-process."""
+    global _worker_client
+
+    logger.warning(f"Analysis worker unavailable, continuing in-process: {error}")
+    _worker_client = None
+
+
+def bass_isolation_available(backend: str = DEFAULT_BACKEND) -> bool:
+    """Check whether bass isolation can run, in-process or in the worker."""
+    if isolation_available(backend):
+        return True
+    worker = get_worker_client()
+    if worker is None:
+        return False
+    try:
+        return worker.ping()["isolation"]
+    except WorkerUnavailableError as e:
+        _drop_worker(e)
+        return False
+
+
+def run_worker(backend: str = DEFAULT_BACKEND) -> int:
+    """Run the analysis worker until interrupted.
+
+    Args:
+        backend: Separation backend the worker loads ("torch" or "onnx")
+
+    Returns:
+        Exit code
+    """
+    from guitarprotool.core.worker import serve
+
+    console.print("[cyan]Loading models for the analysis worker...[/cyan]")
+    try:
+        serve(backend=backend)
+    except WorkerUnavailableError as e:
+        console.print(f"[red]{e}[/red]")
+        return 1
+    except KeyboardInterrupt:
+        console.print("\n[dim]Worker stopped.[/dim]")
+    return 0
+
+
+def watch_pipeline_args(args: argparse.Namespace) -> list[str]:
+    """Pipeline options to pass on to each job started by --watch."""
+    pipeline_args = [
+        "--track-name",
+        args.track_name,
+        "--isolation-profile",
+        args.isolation_profile,
+        "--separation-backend",
+        args.separation_backend,
+        "--sync-method",
+        args.sync_method,
+    ]
+    if args.sync_error_ms is not None:
+        pipeline_args += ["--sync-error-ms", str(args.sync_error_ms)]
+    if args.max_sync_points is not None:
+        pipeline_args += ["--max-sync-points", str(args.max_sync_points)]
+    return pipeline_args
+
+
+def run_watch(args: argparse.Namespace) -> int:
+    """Sync tabs dropped into the --watch folders until interrupted.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Exit code
+    """
+    from guitarprotool.core.watcher import FolderWatcher
+
+    watcher = FolderWatcher(
+        args.watch,
+        output_dir=args.watch_output,
+        workers=args.watch_workers,
+        pipeline_args=watch_pipeline_args(args),
+        use_inotify=not args.watch_polling,
+    )
+    watcher.start()
+    console.print(
+        f"[cyan]Watching {', '.join(str(d) for d in watcher.directories)} "
+        f"({watcher.backend}, {watcher.workers} workers). Press Ctrl+C to stop.[/cyan]"
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        console.print("\n[dim]Watch stopped.[/dim]")
+    stats = watcher.stats
+    console.print(
+        f"[dim]Synced {stats.synced}, unchanged {stats.skipped}, failed {stats.failed}[/dim]"
+    )
+    return 0
+
+
 def isolate_bass(
     audio_path: Path,
     output_dir: Path,
     progress: Progress,
-) -> Optional[Path]:
+    profile: str = DEFAULT_PROFILE,
+    backend: str = DEFAULT_BACKEND,
+) -> Optional["IsolationResult"]:
     """Isolate bass from audio for improved beat detection.
 
+    The stem is kept in memory (IsolationResult.bass_audio) rather than
+    written to a WAV file, since it is only used for beat detection.
+
     Args:
         audio_path: Path to audio file
-        output_dir: Directory to save isolated audio
+        output_dir: Working directory for the isolator
         progress: Rich progress instance
+        profile: Inference profile name (see INFERENCE_PROFILES)
+        backend: Separation backend for in-process isolation ("torch" or
+            "onnx"); a running worker uses the backend it was started with
 
     Returns:
-        Path to isolated bass audio or None if isolation fails/unavailable
+        Successful IsolationResult, or None if isolation fails/unavailable
     """
-    if not BASS_ISOLATION_AVAILABLE:
+    if not bass_isolation_available(backend):
         return None
 
     task_id = progress.add_task("[cyan]Isolating bass (AI)...", total=100)
@@ -647,12 +999,30 @@ def isolate_bass(
         progress.update(task_id, completed=percent * 100, description=f"[cyan]{status}")
 
     try:
-        isolator = BassIsolator(
-            output_dir=output_dir,
-            progress_callback=update_progress,
-        )
-
-        result = isolator.isolate(audio_path)
+        result = None
+        worker = get_worker_client()
+        if worker is not None:
+            try:
+                result = worker.isolate(
+                    audio_path,
+                    output_dir=output_dir,
+                    write_file=False,
+                    profile=profile,
+                    progress_callback=update_progress,
+                )
+            except WorkerUnavailableError as e:
+                _drop_worker(e)
+                if not isolation_available(backend):
+                    raise
+
+        if result is None:
+            isolator = create_isolator(
+                backend,
+                output_dir=output_dir,
+                progress_callback=update_progress,
+                profile=profile,
+            )
+            result = isolator.isolate(audio_path, write_file=False)
 
         if result.success:
             progress.update(
@@ -660,7 +1030,7 @@ def isolate_bass(
                 completed=100,
                 description=f"[green]Bass isolated ({result.processing_time:.1f}s)",
             )
-            return result.bass_path
+            return result
         else:
             progress.update(
                 task_id,
@@ -678,24 +1048,54 @@ def isolate_bass(
 def detect_beats(
     audio_path: Path,
     progress: Progress,
-) -> Optional[BeatInfo]:
+    isolation: Optional["IsolationResult"] = None,
+    tempo_map: Optional["TempoMap"] = None,
+    beats_per_bar: Optional[int] = None,
+) -> Optional["BeatInfo"]:
     """Detect BPM and beats with progress display.
 
     Args:
         audio_path: Path to audio file
         progress: Rich progress instance
+        isolation: In-memory isolation result; when given, its bass buffer
+            is analyzed instead of reading audio_path
+        tempo_map: Tab tempo map to guide tempo estimation
+        beats_per_bar: Meter for downbeat detection (None skips it)
 
     Returns:
         BeatInfo or None on failure
     """
+    from guitarprotool.core.beat_detector import BeatDetector
+
     task_id = progress.add_task("[cyan]Detecting beats...", total=100)
 
     def update_progress(percent: float, status: str):
         progress.update(task_id, completed=percent * 100, description=f"[cyan]{status}")
 
     try:
-        detector = BeatDetector()
-        beat_info = detector.analyze(audio_path, progress_callback=update_progress)
+        beat_info = None
+        worker = get_worker_client()
+        analyzer = worker or BeatDetector()
+        while beat_info is None:
+            try:
+                if isolation is not None and isolation.bass_audio is not None:
+                    beat_info = analyzer.analyze_audio(
+                        isolation.bass_audio,
+                        isolation.sample_rate,
+                        progress_callback=update_progress,
+                        tempo_map=tempo_map,
+                        beats_per_bar=beats_per_bar,
+                    )
+                else:
+                    beat_info = analyzer.analyze(
+                        audio_path,
+                        progress_callback=update_progress,
+                        tempo_map=tempo_map,
+                        beats_per_bar=beats_per_bar,
+                    )
+            except WorkerUnavailableError as e:
+                _drop_worker(e)
+                analyzer = BeatDetector()
 
         progress.update(task_id, completed=100, description="[green]Beat detection complete")
         return beat_info
@@ -706,7 +1106,99 @@ def detect_beats(
         return None
 
 
-def display_beat_info(beat_info: BeatInfo):
+def align_to_score(
+    audio_path: Path,
+    gpif_path: Path,
+    progress: Progress,
+) -> Optional["ScoreAlignment"]:
+    """Align the tab's note onsets to the audio with progress display.
+
+    Args:
+        audio_path: Path to audio file
+        gpif_path: Path to the extracted score.gpif
+        progress: Rich progress instance
+
+    Returns:
+        ScoreAlignment or None on failure
+    """
+    from guitarprotool.core.score_aligner import ScoreAligner, ScoreOnsets
+
+    task_id = progress.add_task("[cyan]Aligning tab to audio...", total=None)
+    try:
+        alignment = ScoreAligner().align_file(ScoreOnsets.from_gpif(gpif_path), audio_path)
+    except BeatDetectionError as e:
+        progress.update(task_id, total=100, description=f"[red]Alignment failed: {e}")
+        logger.error(f"Score alignment failed: {e}")
+        return None
+
+    progress.update(
+        task_id,
+        completed=100,
+        total=100,
+        description=f"[green]Aligned {alignment.bar_count} bars "
+        f"(confidence {alignment.confidence:.2f})",
+    )
+    return alignment
+
+
+def estimate_music_start(
+    audio_path: Path,
+    gpif_path: Path,
+    progress: Progress,
+) -> Optional["StartEstimate"]:
+    """Find where the tab's first notes start in the audio with progress display.
+
+    Args:
+        audio_path: Path to audio file
+        gpif_path: Path to the extracted score.gpif
+        progress: Rich progress instance
+
+    Returns:
+        StartEstimate or None on failure
+    """
+    from guitarprotool.core.score_aligner import ScoreAligner, ScoreOnsets
+
+    task_id = progress.add_task("[cyan]Finding where the music starts...", total=None)
+    try:
+        estimate = ScoreAligner().estimate_start_file(ScoreOnsets.from_gpif(gpif_path), audio_path)
+    except BeatDetectionError as e:
+        progress.update(task_id, total=100, description=f"[red]Start estimate failed: {e}")
+        logger.warning(f"Start estimate failed: {e}")
+        return None
+
+    progress.update(
+        task_id,
+        completed=100,
+        total=100,
+        description=f"[green]Music starts at {estimate.time:.2f}s "
+        f"(confidence {estimate.confidence:.2f})",
+    )
+    return estimate
+
+
+def align_beats_to_start(beat_info: "BeatInfo", start_time: float) -> "BeatInfo":
+    """Make the detected beat nearest start_time the first beat, moved to start_time.
+
+    Bar positions are kept if that beat was detected as a downbeat, so that
+    later bars still map to detected downbeats.
+
+    Args:
+        beat_info: Detected beats
+        start_time: Audio time where the tab's first note bar starts
+
+    Returns:
+        BeatInfo starting at start_time
+    """
+    beat_times = beat_info.beat_times
+    index = int(abs(beat_times - start_time).argmin())
+    aligned = beat_info.from_beat(index, start_time)
+    positions = beat_info.beat_positions
+    if positions is not None and len(positions) == len(beat_times) and positions[index] == 0:
+        aligned.beat_positions = positions[index:]
+    return aligned
+
+
+def display_beat_info(beat_info: "BeatInfo"):
     """Display detected beat information."""
     table = Table(title="Beat Detection Results", border_style="cyan")
     table.add_column("Property", style="dim")
@@ -716,15 +1208,17 @@ def display_beat_info(beat_info: BeatInfo):
     table.add_row("Total Beats", str(len(beat_info.beat_times)))
     table.add_row("Confidence", f"{beat_info.confidence:.0%}")
 
-    if beat_info.beat_times:
+    if len(beat_info.beat_times):
         duration = beat_info.beat_times[-1]
         table.add_row("Duration", f"{duration:.1f} seconds")
 
     console.print(table)
 
 
-def display_drift_report(drift_report: DriftReport):
+def display_drift_report(drift_report: "DriftReport"):
     """Display tempo drift analysis results."""
+    from guitarprotool.core.drift_analyzer import DriftSeverity
+
     # Summary panel
     summary_lines = drift_report.get_summary_lines()
     summary_text = "\n".join(summary_lines)
@@ -769,6 +1263,10 @@ def display_drift_report(drift_report: DriftReport):
 
 def run_pipeline():
     """Execute the full audio injection pipeline."""
+    from guitarprotool.core.beat_detector import BeatDetector
+    from guitarprotool.core.drift_analyzer import DriftAnalyzer
+
+    reset_stage_metrics()
     console.print()
 
     # Step 1: Get GP file
@@ -835,7 +1333,8 @@ def run_pipeline():
             else:
                 extract_task = progress.add_task("[cyan]Extracting GP file...", total=None)
 
-            temp_dir = handler.prepare_for_audio_injection()
+            with span("extract", format=original_format.name):
+                temp_dir = handler.prepare_for_audio_injection()
 
             if original_format != GPFormat.GP8:
                 progress.update(
@@ -855,24 +1354,42 @@ def run_pipeline():
             if not audio_info:
                 raise AudioProcessingError("Failed to process audio")
 
-            # Bass isolation for finding bass start time (used for intro alignment)
+            # Get original tempo and tempo map from GP file
+            gpif_path = handler.get_gpif_path()
+            modifier = XMLModifier(gpif_path)
+            modifier.load()
+            original_tempo = modifier.get_original_tempo()
+            tempo_map = modifier.get_tempo_map()
+            beats_per_bar = tempo_map.beats_per_bar if tempo_map else BEATS_PER_BAR
+
+            # Find where the tab's first notes start (used for intro alignment):
+            # cross-correlating the tab's first bars with the audio takes well
+            # under a second; bass isolation is the fallback when that is unsure.
             # Beat detection uses ORIGINAL audio for accurate sync point timing
             bass_isolated = False
-            bass_first_beat_time = None
+            music_start = None  # (first note bar, audio time of its start)
 
-            if BASS_ISOLATION_AVAILABLE:
-                isolated_bass_path = isolate_bass(
+            start_estimate = estimate_music_start(audio_info.file_path, gpif_path, progress)
+            if start_estimate is not None and start_estimate.reliable:
+                music_start = (start_estimate.bar, start_estimate.time)
+            elif bass_isolation_available():
+                isolation = isolate_bass(
                     audio_info.file_path,
                     audio_dir,
                     progress,
                 )
-                if isolated_bass_path:
+                if isolation:
                     bass_isolated = True
                     # Detect beats on isolated bass to find where bass starts
-                    bass_beat_info = detect_beats(isolated_bass_path, progress)
-                    if bass_beat_info and bass_beat_info.beat_times:
+                    bass_beat_info = detect_beats(
+                        audio_info.file_path, progress, isolation=isolation
+                    )
+                    if bass_beat_info and len(bass_beat_info.beat_times):
                         bass_first_beat_time = bass_beat_info.beat_times[0]
                         logger.info(f"Bass start detected at: {bass_first_beat_time:.3f}s")
+                        first_note_bar = modifier.get_first_note_bar()
+                        if first_note_bar > 0:
+                            music_start = (first_note_bar, bass_first_beat_time)
             else:
                 # Show one-time info about bass isolation availability
                 progress.console.print(
@@ -882,16 +1399,12 @@ def run_pipeline():
 
             # Detect beats on ORIGINAL audio for accurate sync point timing
             # (Bass isolation is only used to find where bass starts, not for sync)
-            beat_info = detect_beats(audio_info.file_path, progress)
+            beat_info = detect_beats(
+                audio_info.file_path, progress, tempo_map=tempo_map, beats_per_bar=beats_per_bar
+            )
             if not beat_info:
                 raise BeatDetectionError("Failed to detect beats")
 
-            # Get original tempo from GP file
-            gpif_path = handler.get_gpif_path()
-            modifier = XMLModifier(gpif_path)
-            modifier.load()
-            original_tempo = modifier.get_original_tempo()
-
             # Fall back to detected BPM if original tempo not found in GP file
             if original_tempo is None:
                 original_tempo = beat_info.bpm
@@ -899,45 +1412,28 @@ def run_pipeline():
                     f"No tempo found in GP file, using detected BPM: {original_tempo:.1f}"
                 )
 
-            # Find where notes start in the tab (for bass isolation alignment)
+            # Align the first note bar of the tab with where the music starts
             tab_start_bar = 0
-            if bass_isolated and bass_first_beat_time is not None:
-                tab_start_bar = modifier.get_first_note_bar()
-                if tab_start_bar > 0:
-                    # Find the beat in original audio closest to bass start time
-                    # This aligns original audio beats with where bass actually starts
-                    min_diff = float('inf')
-                    bass_beat_index = 0
-                    for i, bt in enumerate(beat_info.beat_times):
-                        diff = abs(bt - bass_first_beat_time)
-                        if diff < min_diff:
-                            min_diff = diff
-                            bass_beat_index = i
-
-                    # Shift beat times so that bass_beat_index becomes beat 0
-                    # This makes the first beat align with where bass starts
-                    original_first_beat = beat_info.beat_times[0]
-                    aligned_beat_times = [
-                        bt - beat_info.beat_times[bass_beat_index] + bass_first_beat_time
-                        for bt in beat_info.beat_times[bass_beat_index:]
-                    ]
-                    beat_info = BeatInfo(
-                        bpm=beat_info.bpm,
-                        beat_times=aligned_beat_times,
-                        confidence=beat_info.confidence,
-                    )
+            if music_start is not None:
+                tab_start_bar, start_time = music_start
+                # The detected beat nearest the start becomes beat 0, so
+                # noise and count-ins before it are dropped
+                beat_info = align_beats_to_start(beat_info, start_time)
 
-                    logger.info(
-                        f"Tab has {tab_start_bar} intro bars before notes start "
-                        f"(first note at bar {tab_start_bar + 1}). "
-                        f"Aligned to bass start at {bass_first_beat_time:.3f}s "
-                        f"(shifted from beat {bass_beat_index})"
-                    )
+                logger.info(
+                    f"First note bar ({tab_start_bar + 1}) aligned to music start "
+                    f"at {start_time:.3f}s"
+                )
 
-            # Correct for double/half-time detection
+            # Correct double/half-time and 3:2 / 4:3 grids against the tab's
+            # tempo map; without one the reference is the detected tempo itself
             original_detected_bpm = beat_info.bpm
-            beat_info = BeatDetector.correct_tempo_multiple(beat_info, original_tempo)
-            tempo_corrected = beat_info.bpm != original_detected_bpm
+            tempo_ratio = Fraction(1)
+            if tempo_map is not None:
+                beat_info, tempo_ratio = BeatDetector.correct_tempo_ratio(
+                    beat_info, original_tempo, tempo_map=tempo_map
+                )
+            tempo_corrected = tempo_ratio != 1
 
             # Display beat info
             progress.stop()
@@ -947,7 +1443,8 @@ def run_pipeline():
             if tempo_corrected:
                 console.print(
                     f"[yellow]Note:[/yellow] Tempo corrected from {original_detected_bpm:.1f} "
-                    f"to {beat_info.bpm:.1f} BPM (reference tempo: {original_tempo:.1f})"
+                    f"to {beat_info.bpm:.1f} BPM ({tempo_ratio.numerator}:"
+                    f"{tempo_ratio.denominator} grid, reference tempo: {original_tempo:.1f})"
                 )
 
             if tab_start_bar > 0:
@@ -977,14 +1474,18 @@ def run_pipeline():
                     analyzer = DriftAnalyzer(
                         beat_times=beat_info.beat_times,
                         original_tempo=original_tempo,
-                        beats_per_bar=4,
+                        beats_per_bar=beats_per_bar,
                         tab_start_bar=tab_start_bar,
+                        beat_positions=beat_info.beat_positions,
+                        reliable_beats=beat_info.reliable,
                     )
-                    drift_report = analyzer.analyze(max_bars=max_bars)
+                    with span("drift_analysis"):
+                        drift_report = analyzer.analyze(max_bars=max_bars)
                     # Add tempo correction info to report
                     drift_report.tempo_corrected = tempo_corrected
                     drift_report.original_detected_bpm = original_detected_bpm
                     drift_report.corrected_bpm = beat_info.bpm
+                    drift_report.tempo_ratio = f"{tempo_ratio.numerator}:{tempo_ratio.denominator}"
                     has_drift_report = True
                 except Exception as e:
                     logger.warning(f"Drift analysis failed: {e}")
@@ -1001,25 +1502,19 @@ def run_pipeline():
                 # Generate adaptive sync points
                 sync_task = progress2.add_task("[cyan]Generating sync points...", total=None)
                 detector = BeatDetector()
-                sync_result = detector.generate_sync_points(
-                    beat_info,
-                    original_tempo=original_tempo,
-                    sync_interval=16,
-                    max_bars=max_bars,
-                    adaptive=True,  # Use adaptive tempo sync
-                    tab_start_bar=tab_start_bar,  # Align with first note bar
-                )
+                with span("sync_points"):
+                    sync_result = detector.generate_sync_points(
+                        beat_info,
+                        original_tempo=original_tempo,
+                        beats_per_bar=beats_per_bar,
+                        sync_interval=16,
+                        max_bars=max_bars,
+                        adaptive=True,  # Use adaptive tempo sync
+                        tab_start_bar=tab_start_bar,  # Align with first note bar
+                    )
 
                 # Convert to XML modifier format
-                sync_points = [
-                    SyncPoint(
-                        bar=sp.bar,
-                        frame_offset=sp.frame_offset,
-                        modified_tempo=sp.modified_tempo,
-                        original_tempo=sp.original_tempo,
-                    )
-                    for sp in sync_result.sync_points
-                ]
+                sync_points = sync_result.points.to_sync_points()
                 progress2.update(
                     sync_task,
                     completed=100,
@@ -1035,7 +1530,7 @@ def run_pipeline():
             debug_beats_path = None
             if has_drift_report and drift_report:
                 # Add sync point bar numbers to the report
-                drift_report.bars_with_sync_points = [sp.bar for sp in sync_result.sync_points]
+                drift_report.bars_with_sync_points = sync_result.points.bars.tolist()
 
                 console.print()
                 display_drift_report(drift_report)
@@ -1043,11 +1538,13 @@ def run_pipeline():
                 # Write drift report to run folder
                 drift_report_path = troubleshoot_dir / "drift_report.txt"
                 drift_report.write_to_file(str(drift_report_path))
+                drift_report.export(troubleshoot_dir / "drift_bars.csv")
                 console.print(f"[dim]Drift report saved to: {drift_report_path}[/dim]")
 
                 # Write debug beat data to run folder
                 debug_beats_path = troubleshoot_dir / "debug_beats.txt"
                 analyzer.write_debug_beats(str(debug_beats_path))
+                analyzer.export_beats(troubleshoot_dir / "debug_beats.csv")
                 console.print(f"[dim]Debug beat data saved to: {debug_beats_path}[/dim]")
                 console.print()
 
@@ -1080,10 +1577,12 @@ def run_pipeline():
                 )
 
                 # Inject elements
-                modifier.inject_asset(asset_info)
-                modifier.inject_backing_track(track_config)
-                modifier.inject_sync_points(sync_points)
-                modifier.save()
+                with span("xml_injection", sync_points=len(sync_points)):
+                    modifier.inject_asset(asset_info)
+                    modifier.inject_backing_track(track_config)
+                    sync_delta = modifier.inject_sync_points(sync_points, incremental=True)
+                    logger.info(f"Sync point changes: {sync_delta.summary()}")
+                    modifier.save()
 
                 # Copy audio file to proper location
                 target_audio_path = temp_dir / asset_info.embedded_file_path
@@ -1111,6 +1610,7 @@ def run_pipeline():
 
         # Save session log (both .txt and .html formats)
         txt_log, html_log = save_session_log(troubleshoot_dir)
+        save_stage_metrics(troubleshoot_dir)
 
         # Success!
         console.print()
@@ -1158,7 +1658,7 @@ def main_menu():
                 questionary.Choice("Detect BPM from audio file", value="bpm"),
                 questionary.Choice("Exit", value="exit"),
             ],
-            style=custom_style,
+            style=get_style(),
         ).ask()
 
         if choice == "inject":
@@ -1178,7 +1678,7 @@ def detect_bpm_only():
     path = questionary.path(
         "Select audio file:",
         only_directories=False,
-        style=custom_style,
+        style=get_style(),
     ).ask()
 
     if not path:
@@ -1215,6 +1715,10 @@ def run_pipeline_noninteractive(args: argparse.Namespace) -> int:
     Returns:
         Exit code (0 = success, 1 = error)
     """
+    from guitarprotool.core.beat_detector import BeatDetector
+    from guitarprotool.core.drift_analyzer import DriftAnalyzer
+
+    reset_stage_metrics()
     gp_path = args.input.expanduser().resolve()
     output_path = args.output.expanduser().resolve()
     track_name = args.track_name
@@ -1255,7 +1759,8 @@ def run_pipeline_noninteractive(args: argparse.Namespace) -> int:
             else:
                 extract_task = progress.add_task("[cyan]Extracting GP file...", total=None)
 
-            temp_dir = handler.prepare_for_audio_injection()
+            with span("extract", format=original_format.name):
+                temp_dir = handler.prepare_for_audio_injection()
 
             if original_format != GPFormat.GP8:
                 progress.update(
@@ -1271,69 +1776,95 @@ def run_pipeline_noninteractive(args: argparse.Namespace) -> int:
 
             # Process audio
             audio_dir = handler.get_audio_dir()
-            audio_info = process_audio(source_type, source_value, audio_dir, progress)
+            audio_info = process_audio(
+                source_type,
+                source_value,
+                audio_dir,
+                progress,
+                prefetcher=getattr(args, "prefetcher", None),
+            )
             if not audio_info:
                 raise AudioProcessingError("Failed to process audio")
 
-            # Bass isolation for finding bass start time
-            bass_isolated = False
-            bass_first_beat_time = None
-
-            if BASS_ISOLATION_AVAILABLE:
-                isolated_bass_path = isolate_bass(
-                    audio_info.file_path,
-                    audio_dir,
-                    progress,
-                )
-                if isolated_bass_path:
-                    bass_isolated = True
-                    bass_beat_info = detect_beats(isolated_bass_path, progress)
-                    if bass_beat_info and bass_beat_info.beat_times:
-                        bass_first_beat_time = bass_beat_info.beat_times[0]
-                        logger.info(f"Bass start detected at: {bass_first_beat_time:.3f}s")
-
-            # Detect beats on original audio
-            beat_info = detect_beats(audio_info.file_path, progress)
-            if not beat_info:
-                raise BeatDetectionError("Failed to detect beats")
-
-            # Get original tempo from GP file
+            # Get original tempo and tempo map from GP file
             gpif_path = handler.get_gpif_path()
             modifier = XMLModifier(gpif_path)
             modifier.load()
             original_tempo = modifier.get_original_tempo()
+            tempo_map = modifier.get_tempo_map()
+            beats_per_bar = tempo_map.beats_per_bar if tempo_map else BEATS_PER_BAR
 
-            if original_tempo is None:
-                original_tempo = beat_info.bpm
-                logger.info(f"No tempo found in GP file, using detected BPM: {original_tempo:.1f}")
+            # Score alignment places every bar itself (intro bars included), so
+            # the start estimate, bass isolation, beat tracking and tempo
+            # correction only run when it is not requested or fails
+            alignment = None
+            if getattr(args, "sync_method", "beats") == "score":
+                alignment = align_to_score(audio_info.file_path, gpif_path, progress)
 
-            # Find where notes start in the tab
             tab_start_bar = 0
-            if bass_isolated and bass_first_beat_time is not None:
-                tab_start_bar = modifier.get_first_note_bar()
-                if tab_start_bar > 0:
-                    min_diff = float('inf')
-                    bass_beat_index = 0
-                    for i, bt in enumerate(beat_info.beat_times):
-                        diff = abs(bt - bass_first_beat_time)
-                        if diff < min_diff:
-                            min_diff = diff
-                            bass_beat_index = i
-
-                    aligned_beat_times = [
-                        bt - beat_info.beat_times[bass_beat_index] + bass_first_beat_time
-                        for bt in beat_info.beat_times[bass_beat_index:]
-                    ]
-                    beat_info = BeatInfo(
-                        bpm=beat_info.bpm,
-                        beat_times=aligned_beat_times,
-                        confidence=beat_info.confidence,
+            tempo_ratio = Fraction(1)
+            if alignment is not None:
+                beat_info = alignment.beat_info(beats_per_bar)
+                original_detected_bpm = beat_info.bpm
+                if original_tempo is None:
+                    original_tempo = beat_info.bpm
+            else:
+                # Find where the tab's first notes start; bass isolation is the
+                # fallback when the cross-correlation estimate is unsure
+                music_start = None  # (first note bar, audio time of its start)
+
+                start_estimate = estimate_music_start(audio_info.file_path, gpif_path, progress)
+                backend = getattr(args, "separation_backend", DEFAULT_BACKEND)
+                if start_estimate is not None and start_estimate.reliable:
+                    music_start = (start_estimate.bar, start_estimate.time)
+                elif bass_isolation_available(backend):
+                    isolation = isolate_bass(
+                        audio_info.file_path,
+                        audio_dir,
+                        progress,
+                        profile=getattr(args, "isolation_profile", DEFAULT_PROFILE),
+                        backend=backend,
                     )
+                    if isolation:
+                        bass_beat_info = detect_beats(
+                            audio_info.file_path, progress, isolation=isolation
+                        )
+                        if bass_beat_info and len(bass_beat_info.beat_times):
+                            bass_first_beat_time = bass_beat_info.beat_times[0]
+                            logger.info(f"Bass start detected at: {bass_first_beat_time:.3f}s")
+                            first_note_bar = modifier.get_first_note_bar()
+                            if first_note_bar > 0:
+                                music_start = (first_note_bar, bass_first_beat_time)
+
+                # Detect beats on original audio
+                beat_info = detect_beats(
+                    audio_info.file_path,
+                    progress,
+                    tempo_map=tempo_map,
+                    beats_per_bar=beats_per_bar,
+                )
+                if not beat_info:
+                    raise BeatDetectionError("Failed to detect beats")
 
-            # Correct for double/half-time detection
-            original_detected_bpm = beat_info.bpm
-            beat_info = BeatDetector.correct_tempo_multiple(beat_info, original_tempo)
-            tempo_corrected = beat_info.bpm != original_detected_bpm
+                if original_tempo is None:
+                    original_tempo = beat_info.bpm
+                    logger.info(
+                        f"No tempo found in GP file, using detected BPM: {original_tempo:.1f}"
+                    )
+
+                # Align the first note bar of the tab with where the music starts
+                if music_start is not None:
+                    tab_start_bar, start_time = music_start
+                    beat_info = align_beats_to_start(beat_info, start_time)
+
+                # Correct double/half-time and 3:2 / 4:3 grids against the tab's
+                # tempo map; without one the reference is the detected tempo itself
+                original_detected_bpm = beat_info.bpm
+                if tempo_map is not None:
+                    beat_info, tempo_ratio = BeatDetector.correct_tempo_ratio(
+                        beat_info, original_tempo, tempo_map=tempo_map
+                    )
+            tempo_corrected = tempo_ratio != 1
 
             # Display beat info (unless quiet)
             progress.stop()
@@ -1343,7 +1874,8 @@ def run_pipeline_noninteractive(args: argparse.Namespace) -> int:
                 if tempo_corrected:
                     console.print(
                         f"[yellow]Note:[/yellow] Tempo corrected from {original_detected_bpm:.1f} "
-                        f"to {beat_info.bpm:.1f} BPM (reference tempo: {original_tempo:.1f})"
+                        f"to {beat_info.bpm:.1f} BPM ({tempo_ratio.numerator}:"
+                        f"{tempo_ratio.denominator} grid, reference tempo: {original_tempo:.1f})"
                     )
                 console.print()
 
@@ -1365,13 +1897,17 @@ def run_pipeline_noninteractive(args: argparse.Namespace) -> int:
                 analyzer = DriftAnalyzer(
                     beat_times=beat_info.beat_times,
                     original_tempo=original_tempo,
-                    beats_per_bar=4,
+                    beats_per_bar=beats_per_bar,
                     tab_start_bar=tab_start_bar,
+                    beat_positions=beat_info.beat_positions,
+                    reliable_beats=beat_info.reliable,
                 )
-                drift_report = analyzer.analyze(max_bars=max_bars)
+                with span("drift_analysis"):
+                    drift_report = analyzer.analyze(max_bars=max_bars)
                 drift_report.tempo_corrected = tempo_corrected
                 drift_report.original_detected_bpm = original_detected_bpm
                 drift_report.corrected_bpm = beat_info.bpm
+                drift_report.tempo_ratio = f"{tempo_ratio.numerator}:{tempo_ratio.denominator}"
                 has_drift_report = True
             except Exception as e:
                 logger.warning(f"Drift analysis failed: {e}")
@@ -1388,24 +1924,20 @@ def run_pipeline_noninteractive(args: argparse.Namespace) -> int:
             # Generate adaptive sync points
             sync_task = progress2.add_task("[cyan]Generating sync points...", total=None)
             detector = BeatDetector()
-            sync_result = detector.generate_sync_points(
-                beat_info,
-                original_tempo=original_tempo,
-                sync_interval=16,
-                max_bars=max_bars,
-                adaptive=True,
-                tab_start_bar=tab_start_bar,
-            )
-
-            sync_points = [
-                SyncPoint(
-                    bar=sp.bar,
-                    frame_offset=sp.frame_offset,
-                    modified_tempo=sp.modified_tempo,
-                    original_tempo=sp.original_tempo,
+            with span("sync_points"):
+                sync_result = detector.generate_sync_points(
+                    beat_info,
+                    original_tempo=original_tempo,
+                    beats_per_bar=beats_per_bar,
+                    sync_interval=16,
+                    max_bars=max_bars,
+                    adaptive=True,
+                    tab_start_bar=tab_start_bar,
+                    max_error_ms=getattr(args, "sync_error_ms", None),
+                    max_sync_points=getattr(args, "max_sync_points", None),
                 )
-                for sp in sync_result.sync_points
-            ]
+
+            sync_points = sync_result.points.to_sync_points()
             progress2.update(
                 sync_task,
                 completed=100,
@@ -1418,7 +1950,7 @@ def run_pipeline_noninteractive(args: argparse.Namespace) -> int:
 
         # Write drift report
         if has_drift_report and drift_report:
-            drift_report.bars_with_sync_points = [sp.bar for sp in sync_result.sync_points]
+            drift_report.bars_with_sync_points = sync_result.points.bars.tolist()
 
             if not args.quiet:
                 console.print()
@@ -1426,9 +1958,11 @@ def run_pipeline_noninteractive(args: argparse.Namespace) -> int:
 
             drift_report_path = troubleshoot_dir / "drift_report.txt"
             drift_report.write_to_file(str(drift_report_path))
+            drift_report.export(troubleshoot_dir / "drift_bars.csv")
 
             debug_beats_path = troubleshoot_dir / "debug_beats.txt"
             analyzer.write_debug_beats(str(debug_beats_path))
+            analyzer.export_beats(troubleshoot_dir / "debug_beats.csv")
 
             if not args.quiet:
                 console.print(f"[dim]Drift report saved to: {drift_report_path}[/dim]")
@@ -1458,10 +1992,12 @@ def run_pipeline_noninteractive(args: argparse.Namespace) -> int:
                 frame_padding=sync_result.frame_padding,
             )
 
-            modifier.inject_asset(asset_info)
-            modifier.inject_backing_track(track_config)
-            modifier.inject_sync_points(sync_points)
-            modifier.save()
+            with span("xml_injection", sync_points=len(sync_points)):
+                modifier.inject_asset(asset_info)
+                modifier.inject_backing_track(track_config)
+                sync_delta = modifier.inject_sync_points(sync_points, incremental=True)
+                logger.info(f"Sync point changes: {sync_delta.summary()}")
+                modifier.save()
 
             target_audio_path = temp_dir / asset_info.embedded_file_path
             target_audio_path.parent.mkdir(parents=True, exist_ok=True)
@@ -1485,6 +2021,7 @@ def run_pipeline_noninteractive(args: argparse.Namespace) -> int:
             troubleshoot_dir,
         )
         save_session_log(troubleshoot_dir)
+        save_stage_metrics(troubleshoot_dir)
 
         # Success message
         if not args.quiet:
@@ -1552,7 +2089,13 @@ def main():
         if args is not None:
             print_banner()
 
-            if args.test_mode:
+            if args.worker:
+                # Analysis worker - serve jobs until interrupted
+                sys.exit(run_worker(args.separation_backend))
+            elif args.watch:
+                # Watch folders - sync dropped files until interrupted
+                sys.exit(run_watch(args))
+            elif args.test_mode:
                 # Test mode - run all configured test cases
                 sys.exit(run_test_mode())
             else:
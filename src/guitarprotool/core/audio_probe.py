@@ -0,0 +1,218 @@
+"""Header-only probing of MP3 files.
+
+Reads the ID3v2 tag size, the first MPEG audio frame header and the optional
+Xing/Info/VBRI header to report codec parameters and duration without
+decoding any audio. Used by AudioProcessor to decide whether an input can be
+embedded as-is.
+"""
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+from loguru import logger
+
+# Bytes read from the start of the file (after the ID3v2 tag) to find the
+# first frame and check the frames following it
+_SCAN_BYTES = 64 * 1024
+
+# Consecutive frames checked to confirm sync and constant bitrate
+_CHECK_FRAMES = 8
+
+# MPEG version bits -> name
+_VERSIONS = {0: "2.5", 2: "2", 3: "1"}
+
+# Layer III bitrates (kbps) by bitrate index
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+_SAMPLE_RATES = {
+    "1": (44100, 48000, 32000),
+    "2": (22050, 24000, 16000),
+    "2.5": (11025, 12000, 8000),
+}
+
+
+@dataclass
+class Mp3Info:
+    """Codec parameters read from MP3 headers.
+
+    Attributes:
+        mpeg_version: "1", "2" or "2.5"
+        sample_rate: Sample rate in Hz
+        channels: Number of channels (1 or 2)
+        bitrate: Bitrate of the audio frames in kbps
+        is_cbr: True if there is no VBR header and the sampled frames share
+            one bitrate
+        duration_ms: Duration in milliseconds
+        audio_offset: Byte offset of the first audio frame
+    """
+
+    mpeg_version: str
+    sample_rate: int
+    channels: int
+    bitrate: int
+    is_cbr: bool
+    duration_ms: int
+    audio_offset: int
+
+
+def probe_mp3(file_path: Path) -> Optional[Mp3Info]:
+    """Read MP3 codec parameters from the file headers.
+
+    Args:
+        file_path: Path to the audio file
+
+    Returns:
+        Mp3Info, or None if the file is not an MPEG-1/2 Layer III stream
+    """
+    file_path = Path(file_path)
+
+    try:
+        file_size = file_path.stat().st_size
+        with open(file_path, "rb") as f:
+            offset = _id3v2_size(f.read(10))
+            f.seek(offset)
+            data = f.read(_SCAN_BYTES)
+            f.seek(max(0, file_size - 128))
+            has_id3v1 = f.read(3) == b"TAG"
+    except OSError as e:
+        logger.debug(f"Cannot probe {file_path}: {e}")
+        return None
+
+    first = _find_first_frame(data)
+    if first is None:
+        return None
+
+    position, header = first
+    version, bitrate, sample_rate, channels, _ = header
+    samples_per_frame = 1152 if version == "1" else 576
+
+    vbr_tag, frame_count = _read_vbr_header(data, position, version, channels)
+    audio_start = position
+    if vbr_tag is not None:
+        # The tag frame carries no audio
+        audio_start += header[4]
+    audio_bitrate = _constant_bitrate(data, audio_start)
+    is_cbr = vbr_tag != b"Xing" and vbr_tag != b"VBRI" and audio_bitrate is not None
+    if audio_bitrate:
+        bitrate = audio_bitrate
+
+    audio_end = file_size - (128 if has_id3v1 else 0)
+    if frame_count:
+        duration_ms = frame_count * samples_per_frame * 1000 // sample_rate
+    else:
+        audio_bytes = audio_end - (offset + audio_start)
+        duration_ms = audio_bytes * 8 // bitrate
+
+    return Mp3Info(
+        mpeg_version=version,
+        sample_rate=sample_rate,
+        channels=channels,
+        bitrate=bitrate,
+        is_cbr=is_cbr,
+        duration_ms=duration_ms,
+        audio_offset=offset + position,
+    )
+
+
+def _id3v2_size(header: bytes) -> int:
+    """Get the total size of a leading ID3v2 tag (0 if there is none)."""
+    if len(header) < 10 or header[:3] != b"ID3":
+        return 0
+    size = 0
+    for byte in header[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _parse_header(data: bytes, pos: int) -> Optional[Tuple[str, int, int, int, int]]:
+    """Parse a Layer III frame header.
+
+    Returns:
+        Tuple of (mpeg_version, bitrate_kbps, sample_rate, channels,
+        frame_length), or None if there is no valid header at pos
+    """
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version = _VERSIONS.get((b1 >> 3) & 0x03)
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version is None or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    bitrates = _BITRATES_V1 if version == "1" else _BITRATES_V2
+    bitrate = bitrates[bitrate_index]
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    channels = 1 if (b3 >> 6) == 3 else 2
+
+    coefficient = 144 if version == "1" else 72
+    frame_length = coefficient * bitrate * 1000 // sample_rate + padding
+    return version, bitrate, sample_rate, channels, frame_length
+
+
+def _find_first_frame(data: bytes) -> Optional[Tuple[int, Tuple[str, int, int, int, int]]]:
+    """Find the first frame header that is followed by another valid frame."""
+    pos = data.find(b"\xff")
+    while 0 <= pos < len(data) - 4:
+        header = _parse_header(data, pos)
+        if header is not None:
+            following = _parse_header(data, pos + header[4])
+            # Bitrate may change between frames (VBR); version and rate may not
+            if following is not None and (following[0], following[2]) == (header[0], header[2]):
+                return pos, header
+        pos = data.find(b"\xff", pos + 1)
+    return None
+
+
+def _read_vbr_header(
+    data: bytes, position: int, version: str, channels: int
+) -> Tuple[Optional[bytes], int]:
+    """Read the Xing/Info or VBRI header from the first frame.
+
+    Returns:
+        Tuple of (tag name or None, frame count or 0)
+    """
+    if version == "1":
+        side_info = 32 if channels == 2 else 17
+    else:
+        side_info = 17 if channels == 2 else 9
+
+    xing = position + 4 + side_info
+    tag = data[xing:xing + 4]
+    if tag in (b"Xing", b"Info") and len(data) >= xing + 12:
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        frames = struct.unpack(">I", data[xing + 8:xing + 12])[0] if flags & 0x01 else 0
+        return tag, frames
+
+    vbri = position + 36
+    if data[vbri:vbri + 4] == b"VBRI" and len(data) >= vbri + 18:
+        return b"VBRI", struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+
+    return None, 0
+
+
+def _constant_bitrate(data: bytes, position: int) -> Optional[int]:
+    """Get the bitrate shared by the first frames starting at position.
+
+    Returns:
+        Bitrate in kbps, or None if the frames use different bitrates
+    """
+    bitrate = None
+    pos = position
+    for _ in range(_CHECK_FRAMES):
+        header = _parse_header(data, pos)
+        if header is None:
+            break
+        if bitrate is None:
+            bitrate = header[1]
+        elif header[1] != bitrate:
+            return None
+        pos += header[4]
+    return bitrate
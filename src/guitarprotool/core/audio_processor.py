@@ -2,26 +2,33 @@
 
 This module handles:
 - Downloading audio from YouTube using yt-dlp
-- Converting local audio files to MP3 format
+- Converting local audio files to MP3 format (streamed through ffmpeg)
+- Embedding MP3 inputs that already meet the target specifications as-is
 - Normalizing audio to target specifications (192kbps, 44.1kHz)
 - Generating UUID filenames for .gp archive embedding
 """
 
 import hashlib
+import os
+import shutil
+import subprocess
 import tempfile
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 
 import yt_dlp
-from pydub import AudioSegment
 from loguru import logger
 
+from guitarprotool.core.audio_probe import Mp3Info, probe_mp3
+from guitarprotool.core.prefetcher import DownloadedAudio
 from guitarprotool.utils.exceptions import (
     DownloadError,
     ConversionError,
     AudioValidationError,
 )
+from guitarprotool.utils.instrumentation import span
 
 
 @dataclass
@@ -70,6 +77,9 @@ class AudioProcessor:
     TARGET_CHANNELS = 2  # Stereo
     TARGET_FORMAT = "mp3"
 
+    # Chunk size for streaming ffmpeg output to disk
+    STREAM_CHUNK_SIZE = 1024 * 1024
+
     def __init__(
         self,
         output_dir: Optional[Path] = None,
@@ -135,7 +145,7 @@ class AudioProcessor:
             }
 
             # Download and extract info
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with span("download", source="youtube"), yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 logger.debug("Extracting video info...")
                 info_dict = ydl.extract_info(url, download=True)
 
@@ -174,6 +184,37 @@ class AudioProcessor:
             logger.error(f"Unexpected error processing YouTube URL: {e}")
             raise DownloadError(f"Failed to process YouTube URL: {e}")
 
+    def process_download(
+        self,
+        download: DownloadedAudio,
+        output_filename: Optional[str] = None,
+    ) -> AudioInfo:
+        """Process audio fetched by a YouTubePrefetcher.
+
+        The downloaded file stays in the prefetch cache; only the converted
+        MP3 is written to output_dir.
+
+        Args:
+            download: Completed download from YouTubePrefetcher.get()
+            output_filename: Optional custom filename (without extension).
+                           If None, uses video title.
+
+        Returns:
+            AudioInfo object with processed audio details
+
+        Raises:
+            ConversionError: If audio conversion fails
+        """
+        logger.info(f"Processing prefetched download: {download.video_id}")
+
+        final_filename = output_filename or self._sanitize_filename(download.title)
+        return self._process_audio_file(
+            download.file_path,
+            final_filename,
+            title=download.title,
+            original_url=download.url,
+        )
+
     def process_local_file(
         self,
         file_path: Path,
@@ -224,6 +265,11 @@ class AudioProcessor:
     ) -> AudioInfo:
         """Process audio file to target specifications.
 
+        The input is probed first from its headers. An MP3 that already matches
+        the target specifications is copied unchanged; anything else is
+        transcoded by streaming it through ffmpeg. The input's SHA1 (and so
+        the UUID) is computed during that single read of the input.
+
         Args:
             input_path: Path to input audio file
             output_filename: Output filename (without extension)
@@ -238,46 +284,39 @@ class AudioProcessor:
         """
         logger.debug(f"Processing audio file: {input_path}")
 
-        try:
-            # Load audio file
-            if self.progress_callback:
-                self.progress_callback(10, "Loading audio file...")
-
-            audio = AudioSegment.from_file(str(input_path))
-            logger.debug(f"Loaded audio: {len(audio)}ms, {audio.frame_rate}Hz, {audio.channels}ch")
+        # Written under a temporary name until the UUID is known
+        fd, temp_name = tempfile.mkstemp(dir=self.output_dir, suffix=".tmp")
+        os.close(fd)
+        temp_path = Path(temp_name)
 
-            # Convert to target specifications
+        try:
+            # Probe codec parameters without decoding
             if self.progress_callback:
-                self.progress_callback(30, "Converting audio format...")
-
-            # Resample to target sample rate
-            if audio.frame_rate != self.TARGET_SAMPLE_RATE:
-                logger.debug(f"Resampling from {audio.frame_rate}Hz to {self.TARGET_SAMPLE_RATE}Hz")
-                audio = audio.set_frame_rate(self.TARGET_SAMPLE_RATE)
-
-            # Convert to target channels
-            if audio.channels != self.TARGET_CHANNELS:
-                logger.debug(f"Converting from {audio.channels}ch to {self.TARGET_CHANNELS}ch")
-                audio = audio.set_channels(self.TARGET_CHANNELS)
+                self.progress_callback(10, "Probing audio file...")
+
+            probe = probe_mp3(input_path)
+
+            if probe is not None and self._is_compliant(probe):
+                logger.debug("Input already matches target format, copying without re-encode")
+                if self.progress_callback:
+                    self.progress_callback(30, "Copying MP3...")
+                with span("transcode", mode="copy"):
+                    sha1 = self._copy_hashing(input_path, temp_path)
+            else:
+                if self.progress_callback:
+                    self.progress_callback(30, "Converting audio format...")
+                with span("transcode", mode="encode"):
+                    sha1 = self._transcode(input_path, temp_path)
+                probe = probe_mp3(temp_path)
+                if probe is None:
+                    raise ConversionError(f"ffmpeg produced an invalid MP3: {input_path}")
 
-            # Generate UUID from file content
             if self.progress_callback:
-                self.progress_callback(60, "Generating UUID...")
-
-            uuid = self._generate_uuid(input_path)
-
-            # Export to MP3 with target bitrate
-            if self.progress_callback:
-                self.progress_callback(70, "Exporting MP3...")
+                self.progress_callback(90, "Generating UUID...")
 
+            uuid = self._format_uuid(sha1.hexdigest())
             output_path = self.output_dir / f"{uuid}.{self.TARGET_FORMAT}"
-
-            audio.export(
-                str(output_path),
-                format=self.TARGET_FORMAT,
-                bitrate=f"{self.TARGET_BITRATE}k",
-                parameters=["-ar", str(self.TARGET_SAMPLE_RATE)],
-            )
+            os.replace(temp_path, output_path)
 
             logger.info(f"Audio exported to: {output_path}")
 
@@ -288,7 +327,7 @@ class AudioProcessor:
             return AudioInfo(
                 file_path=output_path,
                 uuid=uuid,
-                duration_ms=len(audio),
+                duration_ms=probe.duration_ms,
                 sample_rate=self.TARGET_SAMPLE_RATE,
                 channels=self.TARGET_CHANNELS,
                 bitrate=self.TARGET_BITRATE,
@@ -297,12 +336,142 @@ class AudioProcessor:
             )
 
         except Exception as e:
+            temp_path.unlink(missing_ok=True)
             logger.error(f"Audio conversion error: {e}")
             raise ConversionError(f"Failed to convert audio: {e}")
 
+    def _is_compliant(self, probe: Mp3Info) -> bool:
+        """Check if a probed MP3 can be embedded without re-encoding.
+
+        Args:
+            probe: Header information of the input file
+
+        Returns:
+            True if the file is a constant-bitrate MPEG-1 Layer III stream at
+            the target sample rate, channel count and bitrate
+        """
+        return (
+            probe.mpeg_version == "1"
+            and probe.is_cbr
+            and probe.sample_rate == self.TARGET_SAMPLE_RATE
+            and probe.channels == self.TARGET_CHANNELS
+            and probe.bitrate == self.TARGET_BITRATE
+        )
+
+    def _copy_hashing(self, input_path: Path, output_path: Path) -> "hashlib._Hash":
+        """Copy a file while computing its SHA1.
+
+        Args:
+            input_path: File to copy
+            output_path: Destination path
+
+        Returns:
+            SHA1 hash object of the copied content
+        """
+        sha1 = hashlib.sha1()
+        buffer = bytearray(self.STREAM_CHUNK_SIZE)
+        view = memoryview(buffer)
+
+        with open(input_path, "rb") as src, open(output_path, "wb") as dst:
+            while size := src.readinto(buffer):
+                sha1.update(view[:size])
+                dst.write(view[:size])
+
+        return sha1
+
+    def _transcode(self, input_path: Path, output_path: Path) -> "hashlib._Hash":
+        """Transcode audio to the target MP3 format with ffmpeg.
+
+        ffmpeg streams the encode straight into output_path, so memory use
+        does not grow with track length. It is given the file rather than a
+        pipe so it can seek back and fill in the Xing/LAME Info header, which
+        players use for exact duration and gapless playback. The input is
+        hashed on a worker thread while ffmpeg reads it, so both reads are
+        served by the same page-cache pages and the hash overlaps the encode.
+        (ffmpeg is likewise given the input path rather than piped input
+        because demuxers such as MP3 and MP4 need to seek to apply gapless
+        trimming and locate their index.)
+
+        Args:
+            input_path: Path to input audio file
+            output_path: Path for the MP3 output
+
+        Returns:
+            SHA1 hash object of the input file
+
+        Raises:
+            ConversionError: If ffmpeg is missing or fails
+        """
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise ConversionError("ffmpeg not found on PATH")
+
+        command = [
+            ffmpeg,
+            "-hide_banner",
+            "-loglevel", "error",
+            "-nostdin",
+            "-i", str(input_path),
+            "-vn",
+            "-ar", str(self.TARGET_SAMPLE_RATE),
+            "-ac", str(self.TARGET_CHANNELS),
+            "-b:a", f"{self.TARGET_BITRATE}k",
+            "-f", self.TARGET_FORMAT,
+            "-y",
+            str(output_path),
+        ]
+        logger.debug(f"Running: {' '.join(command)}")
+
+        sha1 = hashlib.sha1()
+        hash_errors = []
+
+        def hash_input() -> None:
+            try:
+                self._hash_into(input_path, sha1)
+            except OSError as e:
+                hash_errors.append(e)
+
+        hasher = threading.Thread(target=hash_input, daemon=True)
+
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=stderr)
+            hasher.start()
+            try:
+                returncode = process.wait()
+            finally:
+                hasher.join()
+
+            if returncode != 0:
+                stderr.seek(0)
+                message = stderr.read().decode("utf-8", errors="replace").strip()
+                output_path.unlink(missing_ok=True)
+                raise ConversionError(f"ffmpeg exited with code {returncode}: {message}")
+
+        if hash_errors:
+            raise ConversionError(f"Failed to hash {input_path}: {hash_errors[0]}")
+
+        return sha1
+
+    def _hash_into(self, file_path: Path, sha1: "hashlib._Hash") -> None:
+        """Feed a file's content into a hash object using a large reusable buffer.
+
+        Args:
+            file_path: File to hash
+            sha1: Hash object to update
+        """
+        buffer = bytearray(self.STREAM_CHUNK_SIZE)
+        view = memoryview(buffer)
+
+        with open(file_path, "rb") as f:
+            while size := f.readinto(buffer):
+                sha1.update(view[:size])
+
     def _generate_uuid(self, file_path: Path) -> str:
         """Generate SHA1 UUID from file content.
 
+        Only needed when the content was not already hashed while being
+        copied or transcoded; reads with a large reusable buffer.
+
         Args:
             file_path: Path to file
 
@@ -310,13 +479,19 @@ class AudioProcessor:
             SHA1 hash as UUID string (format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx)
         """
         sha1 = hashlib.sha1()
+        self._hash_into(file_path, sha1)
+        return self._format_uuid(sha1.hexdigest())
 
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                sha1.update(chunk)
+    @staticmethod
+    def _format_uuid(hash_hex: str) -> str:
+        """Format a SHA1 hex digest as a UUID string.
 
-        # Format as UUID: 8-4-4-4-12 hex digits
-        hash_hex = sha1.hexdigest()
+        Args:
+            hash_hex: SHA1 hex digest
+
+        Returns:
+            UUID string (8-4-4-4-12 hex digits)
+        """
         uuid = f"{hash_hex[0:8]}-{hash_hex[8:12]}-{hash_hex[12:16]}-{hash_hex[16:20]}-{hash_hex[20:32]}"
 
         logger.debug(f"Generated UUID: {uuid}")
@@ -10,16 +10,17 @@ audio is still embedded in the GP file.
 Dependencies:
     - torch>=2.0.0
     - demucs>=4.0.0
-    - scipy (for WAV file output, typically installed with librosa)
 
 Install with: pip install guitarprotool[bass-isolation]
 """
 
+import os
 import tempfile
 import time
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Optional
 
 from loguru import logger
 
@@ -28,9 +29,59 @@ from guitarprotool.utils.exceptions import (
     IsolationDependencyError,
     ModelNotAvailableError,
 )
+from guitarprotool.utils.imports import is_installed
+from guitarprotool.utils.instrumentation import span
 
+if TYPE_CHECKING:
+    import numpy as np
 
-# Lazy import flags - set when dependencies are actually imported
+
+# Sample formats accepted for written stems (see stem_writer.STEM_FORMATS)
+STEM_FORMAT_NAMES = ("int16", "float32")
+
+
+@dataclass(frozen=True)
+class InferenceProfile:
+    """Speed/quality settings for one separation run.
+
+    Attributes:
+        name: Profile name
+        shifts: Random time shifts averaged by Demucs (0 disables; each
+            shift adds a full pass)
+        overlap: Overlap between split segments (0-1)
+        segment: Segment length in seconds, or None for the model default
+        quantize: Apply dynamic int8 quantization to Linear layers (CPU only)
+        bfloat16: Run under bfloat16 autocast (CPU only)
+        num_threads: torch intra-op threads, or None for all CPUs available
+            to this process
+    """
+
+    name: str
+    shifts: int = 1
+    overlap: float = 0.25
+    segment: Optional[float] = None
+    quantize: bool = False
+    bfloat16: bool = False
+    num_threads: Optional[int] = None
+
+
+# CPU inference profiles; "balanced" matches Demucs' own defaults
+INFERENCE_PROFILES: Dict[str, InferenceProfile] = {
+    "fast": InferenceProfile("fast", shifts=0, overlap=0.1, quantize=True),
+    "balanced": InferenceProfile("balanced", shifts=1, overlap=0.25),
+    "quality": InferenceProfile("quality", shifts=2, overlap=0.5),
+}
+DEFAULT_PROFILE = "balanced"
+
+
+def _available_cpus() -> int:
+    """Count CPUs this process may run on (respects affinity/cpusets)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# Lazy dependency flags - set on the first availability check
 _DEMUCS_AVAILABLE: Optional[bool] = None
 _TORCH_AVAILABLE: Optional[bool] = None
 
@@ -38,6 +89,9 @@ _TORCH_AVAILABLE: Optional[bool] = None
 def _check_dependencies() -> bool:
     """Check if bass isolation dependencies are available.
 
+    The packages are located with importlib.util.find_spec rather than
+    imported, so the check does not pay torch's import time.
+
     Returns:
         True if all dependencies are available
     """
@@ -46,21 +100,11 @@ def _check_dependencies() -> bool:
     if _DEMUCS_AVAILABLE is not None:
         return _DEMUCS_AVAILABLE and _TORCH_AVAILABLE
 
-    try:
-        import torch
-        _TORCH_AVAILABLE = True
-        logger.debug(f"PyTorch available: {torch.__version__}")
-    except ImportError:
-        _TORCH_AVAILABLE = False
-        logger.debug("PyTorch not available")
-
-    try:
-        import demucs  # noqa: F401
-        _DEMUCS_AVAILABLE = True
-        logger.debug("Demucs available")
-    except ImportError:
-        _DEMUCS_AVAILABLE = False
-        logger.debug("Demucs not available")
+    _TORCH_AVAILABLE = is_installed("torch")
+    logger.debug(f"PyTorch available: {_TORCH_AVAILABLE}")
+
+    _DEMUCS_AVAILABLE = is_installed("demucs")
+    logger.debug(f"Demucs available: {_DEMUCS_AVAILABLE}")
 
     return _DEMUCS_AVAILABLE and _TORCH_AVAILABLE
 
@@ -70,12 +114,16 @@ class IsolationResult:
     """Result of bass isolation.
 
     Attributes:
-        bass_path: Path to isolated bass audio file (WAV format)
+        bass_path: Path to isolated bass audio file (WAV format), or None if
+            the stem was not written to disk
         original_path: Path to original audio file
         model_used: Name of the separation model used
         processing_time: Time taken in seconds
         success: Whether isolation completed successfully
         error_message: Error message if isolation failed
+        bass_audio: Mono float32 bass samples, set when isolate() is called
+            with write_file=False
+        sample_rate: Sample rate of bass_audio in Hz
     """
 
     bass_path: Optional[Path]
@@ -84,6 +132,8 @@ class IsolationResult:
     processing_time: float
     success: bool
     error_message: Optional[str] = None
+    bass_audio: Optional["np.ndarray"] = None
+    sample_rate: Optional[int] = None
 
 
 # Type alias for progress callback
@@ -113,6 +163,9 @@ class BassIsolator:
         model: str = DEFAULT_MODEL,
         device: Optional[str] = None,
         progress_callback: Optional[ProgressCallback] = None,
+        stem_format: str = "int16",
+        profile: str = DEFAULT_PROFILE,
+        num_threads: Optional[int] = None,
     ):
         """Initialize BassIsolator.
 
@@ -127,10 +180,17 @@ class BassIsolator:
             device: Processing device ("cuda", "cpu", or None for auto-detect)
             progress_callback: Optional callback for progress updates.
                              Called with (percent: float, message: str)
+            stem_format: Sample format of written stems, "int16" (16-bit PCM)
+                         or "float32" (no clipping loss for beat detection)
+            profile: Default inference profile (see INFERENCE_PROFILES):
+                     "fast", "balanced" or "quality"
+            num_threads: torch intra-op threads on CPU, overriding the
+                         profile. Set it when several isolations share a node.
 
         Raises:
             IsolationDependencyError: If torch/demucs not installed
             ModelNotAvailableError: If specified model is not available
+            ValueError: If stem_format or profile is not supported
         """
         if not self.is_available():
             raise IsolationDependencyError(
@@ -143,10 +203,19 @@ class BassIsolator:
                 f"Model '{model}' not supported. Available: {self.SUPPORTED_MODELS}"
             )
 
+        if stem_format not in STEM_FORMAT_NAMES:
+            raise ValueError(
+                f"Stem format '{stem_format}' not supported. Available: {list(STEM_FORMAT_NAMES)}"
+            )
+
+        self.profile = self._get_profile(profile)
+        self.num_threads = num_threads
+
         self.output_dir = output_dir or Path(tempfile.gettempdir()) / "guitarprotool_isolation"
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.model_name = model
         self.progress_callback = progress_callback
+        self.stem_format = stem_format
 
         # Auto-detect device if not specified
         if device is None:
@@ -162,9 +231,68 @@ class BassIsolator:
             f"output_dir={self.output_dir}"
         )
 
-        # Model is loaded lazily on first isolation
+        # Model is loaded lazily on first isolation; the int8 copy on first
+        # use of a quantized profile
         self._model = None
         self._model_loaded = False
+        self._quantized_model = None
+
+    @staticmethod
+    def _get_profile(profile: str | InferenceProfile) -> InferenceProfile:
+        """Look up an inference profile by name.
+
+        Raises:
+            ValueError: If the profile name is unknown
+        """
+        if isinstance(profile, InferenceProfile):
+            return profile
+        if profile not in INFERENCE_PROFILES:
+            raise ValueError(
+                f"Profile '{profile}' not supported. Available: {list(INFERENCE_PROFILES)}"
+            )
+        return INFERENCE_PROFILES[profile]
+
+    def _model_for(self, profile: InferenceProfile):
+        """Get the model to run for a profile (int8 copy for quantized CPU runs)."""
+        if not (profile.quantize and self.device == "cpu"):
+            return self._model
+
+        if self._quantized_model is None:
+            import torch
+
+            logger.info("Quantizing Demucs Linear layers to int8")
+            self._quantized_model = torch.ao.quantization.quantize_dynamic(
+                self._model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        return self._quantized_model
+
+    @contextmanager
+    def _cpu_settings(self, profile: InferenceProfile) -> Iterator[None]:
+        """Apply a profile's thread count and precision for one run.
+
+        The previous torch thread count is restored afterwards, since it is
+        process-wide state.
+        """
+        if self.device != "cpu":
+            yield
+            return
+
+        import torch
+
+        threads = self.num_threads or profile.num_threads or _available_cpus()
+        previous = torch.get_num_threads()
+        torch.set_num_threads(threads)
+        autocast = (
+            torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+            if profile.bfloat16
+            else nullcontext()
+        )
+        logger.debug(f"Inference profile {profile.name}: {threads} threads")
+        try:
+            with autocast:
+                yield
+        finally:
+            torch.set_num_threads(previous)
 
     def _load_model(self) -> None:
         """Load the Demucs model (lazy loading).
@@ -183,7 +311,8 @@ class BassIsolator:
                 self.progress_callback(0.05, "Loading Demucs model...")
 
             logger.info(f"Loading Demucs model: {self.model_name}")
-            self._model = get_model(self.model_name)
+            with span("model_load", backend="torch", model=self.model_name):
+                self._model = get_model(self.model_name)
             self._model.to(self.device)
             self._model.eval()
             self._model_loaded = True
@@ -199,6 +328,8 @@ class BassIsolator:
         self,
         audio_path: Path | str,
         output_filename: Optional[str] = None,
+        write_file: bool = True,
+        profile: Optional[str | InferenceProfile] = None,
     ) -> IsolationResult:
         """Isolate bass from audio file.
 
@@ -206,13 +337,19 @@ class BassIsolator:
             audio_path: Path to input audio file (MP3, WAV, etc.)
             output_filename: Optional output filename (without extension).
                            If None, uses "{input_stem}_bass".
+            write_file: If False, no WAV is written; the result carries the
+                        mono bass buffer in bass_audio instead, ready for
+                        BeatDetector.analyze_audio().
+            profile: Inference profile for this job (name or InferenceProfile).
+                     If None, uses the profile given at construction.
 
         Returns:
-            IsolationResult with path to isolated bass audio
+            IsolationResult with path to isolated bass audio (or the bass
+            samples when write_file is False)
 
         Note:
-            The isolated bass is saved as WAV format at the model's
-            native sample rate (44.1 kHz for htdemucs models).
+            The isolated bass is saved as WAV format (see stem_format) at
+            the model's native sample rate (44.1 kHz for htdemucs models).
         """
         start_time = time.time()
         audio_path = Path(audio_path)
@@ -230,6 +367,8 @@ class BassIsolator:
             )
 
         try:
+            profile = self._get_profile(profile) if profile is not None else self.profile
+
             # Load model (lazy)
             self._load_model()
 
@@ -239,16 +378,19 @@ class BassIsolator:
             from demucs.audio import AudioFile
             from demucs.apply import apply_model
 
+            from guitarprotool.core.stem_writer import to_mono, write_stem
+
             # Load audio
             if self.progress_callback:
                 self.progress_callback(0.15, "Loading audio file...")
 
             logger.debug("Loading audio with Demucs AudioFile...")
-            wav = AudioFile(audio_path).read(
-                streams=0,
-                samplerate=self._model.samplerate,
-                channels=self._model.audio_channels,
-            )
+            with span("decode"):
+                wav = AudioFile(audio_path).read(
+                    streams=0,
+                    samplerate=self._model.samplerate,
+                    channels=self._model.audio_channels,
+                )
             wav = wav.to(self.device)
 
             logger.debug(
@@ -259,15 +401,24 @@ class BassIsolator:
             if self.progress_callback:
                 self.progress_callback(0.25, "Separating sources (this may take a while)...")
 
-            logger.info("Running source separation...")
-            with torch.no_grad():
+            logger.info(f"Running source separation ({profile.name} profile)...")
+            model = self._model_for(profile)
+            with (
+                span("isolation", backend="torch", model=self.model_name, profile=profile.name),
+                torch.no_grad(),
+                self._cpu_settings(profile),
+            ):
                 sources = apply_model(
-                    self._model,
+                    model,
                     wav[None],  # Add batch dimension
                     device=self.device,
+                    shifts=profile.shifts,
+                    overlap=profile.overlap,
+                    segment=profile.segment,
                     progress=True,
                     num_workers=0,  # Avoid multiprocessing issues
                 )
+            sources = sources.float()  # bfloat16 autocast output
 
             # Extract bass stem
             sources = sources[0]  # Remove batch dimension
@@ -276,36 +427,29 @@ class BassIsolator:
 
             logger.debug(f"Bass extracted: shape={bass.shape}")
 
-            # Save isolated bass
-            if self.progress_callback:
-                self.progress_callback(0.9, "Saving isolated bass...")
-
-            output_name = output_filename or f"{audio_path.stem}_bass"
-            output_path = self.output_dir / f"{output_name}.wav"
-
-            # Ensure bass is on CPU and convert to numpy
-            bass_cpu = bass.cpu()
-
-            # Use scipy to save WAV file (avoids torchaudio torchcodec dependency)
-            # scipy expects shape (samples, channels), torchaudio gives (channels, samples)
-            import scipy.io.wavfile as wavfile
-            import numpy as np
-
-            # Convert to numpy and transpose to (samples, channels)
-            bass_numpy = bass_cpu.numpy().T
-
-            # Convert to int16 for WAV file (scale from float [-1, 1] to int16 range)
-            bass_int16 = (bass_numpy * 32767).astype(np.int16)
-
-            wavfile.write(
-                str(output_path),
-                self._model.samplerate,
-                bass_int16,
-            )
+            # Tensor -> numpy is a view of the CPU tensor's memory (no copy)
+            bass_numpy = bass.cpu().numpy()
+            sample_rate = self._model.samplerate
+            output_path = None
+            bass_audio = None
+
+            if write_file:
+                if self.progress_callback:
+                    self.progress_callback(0.9, "Saving isolated bass...")
+
+                output_name = output_filename or f"{audio_path.stem}_bass"
+                output_path = write_stem(
+                    self.output_dir / f"{output_name}.wav",
+                    bass_numpy,
+                    sample_rate,
+                    sample_format=self.stem_format,
+                )
+            else:
+                bass_audio = to_mono(bass_numpy)
 
             processing_time = time.time() - start_time
             logger.success(
-                f"Bass isolated in {processing_time:.1f}s: {output_path}"
+                f"Bass isolated in {processing_time:.1f}s: {output_path or 'in memory'}"
             )
 
             if self.progress_callback:
@@ -317,6 +461,8 @@ class BassIsolator:
                 model_used=self.model_name,
                 processing_time=processing_time,
                 success=True,
+                bass_audio=bass_audio,
+                sample_rate=sample_rate,
             )
 
         except Exception as e:
@@ -405,3 +551,52 @@ class BassIsolator:
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         """Context manager exit - cleanup temporary files."""
         self.cleanup()
+
+
+# Separation backends: PyTorch Demucs, or an ONNX export run by onnxruntime
+SEPARATION_BACKENDS = ("torch", "onnx")
+DEFAULT_BACKEND = "torch"
+
+
+def isolation_available(backend: str = DEFAULT_BACKEND) -> bool:
+    """Check if a separation backend's dependencies are installed.
+
+    Args:
+        backend: "torch" or "onnx"
+
+    Returns:
+        True if isolate() can run with the backend
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == "torch":
+        return BassIsolator.is_available()
+    if backend == "onnx":
+        from guitarprotool.core.onnx_separator import OnnxBassIsolator
+
+        return OnnxBassIsolator.is_available()
+    raise ValueError(f"Backend '{backend}' not supported. Available: {list(SEPARATION_BACKENDS)}")
+
+
+def create_isolator(backend: str = DEFAULT_BACKEND, **kwargs):
+    """Create a bass isolator for the chosen separation backend.
+
+    Args:
+        backend: "torch" (BassIsolator) or "onnx" (OnnxBassIsolator)
+        **kwargs: Passed to the isolator's constructor
+
+    Returns:
+        BassIsolator or OnnxBassIsolator; both return IsolationResult
+
+    Raises:
+        ValueError: If the backend is unknown
+        IsolationDependencyError: If the backend's dependencies are missing
+    """
+    if backend == "torch":
+        return BassIsolator(**kwargs)
+    if backend == "onnx":
+        from guitarprotool.core.onnx_separator import OnnxBassIsolator
+
+        return OnnxBassIsolator(**kwargs)
+    raise ValueError(f"Backend '{backend}' not supported. Available: {list(SEPARATION_BACKENDS)}")
@@ -2,7 +2,8 @@
 
 The BCFZ format is a proprietary compression format used by Guitar Pro 6/7
 (.gpx files). This module implements decompression to extract the inner
-file system container.
+file system container, and the reverse (building a BCFS container and
+compressing it) for generating test and benchmark files.
 
 Algorithm based on TuxGuitar GPXFileSystem.java:
 - https://github.com/phiresky/tuxguitar/blob/master/TuxGuitar-gpx/src/org/herac/tuxguitar/io/gpx/v6/GPXFileSystem.java
@@ -22,6 +23,8 @@ Chunk types (determined by single bit flag):
   - word_size bits (reversed/LE): length to copy
 """
 
+from typing import Dict
+
 from loguru import logger
 
 from guitarprotool.utils.exceptions import BCFZDecompressionError
@@ -110,6 +113,42 @@ class BitStream:
         return result
 
 
+class BitWriter:
+    """Bit-by-bit writer, the counterpart of BitStream.
+
+    Bits are packed MSB first within each byte; the last byte is padded
+    with zero bits.
+    """
+
+    def __init__(self):
+        """Initialize BitWriter."""
+        self._buffer = bytearray()
+        self._pending = 0  # Bits not yet flushed to _buffer
+        self._pending_count = 0
+
+    def write_bits(self, value: int, count: int) -> None:
+        """Write the low `count` bits of value, MSB first."""
+        self._pending = (self._pending << count) | (value & ((1 << count) - 1))
+        self._pending_count += count
+        while self._pending_count >= 8:
+            self._pending_count -= 8
+            self._buffer.append((self._pending >> self._pending_count) & 0xFF)
+        self._pending &= (1 << self._pending_count) - 1
+
+    def write_bits_reversed(self, value: int, count: int) -> None:
+        """Write the low `count` bits of value, LSB first."""
+        reversed_value = 0
+        for i in range(count):
+            reversed_value = (reversed_value << 1) | ((value >> i) & 1)
+        self.write_bits(reversed_value, count)
+
+    def getvalue(self) -> bytes:
+        """Get the written bytes, zero-padding the final byte."""
+        if self._pending_count == 0:
+            return bytes(self._buffer)
+        return bytes(self._buffer) + bytes([(self._pending << (8 - self._pending_count)) & 0xFF])
+
+
 def decompress_bcfz(data: bytes) -> bytes:
     """Decompress BCFZ-compressed data.
 
@@ -197,6 +236,74 @@ def decompress_bcfz(data: bytes) -> bytes:
     return bytes(output)
 
 
+# Back-reference fields are at most 15 bits wide (4-bit word size)
+_MAX_REFERENCE = (1 << 15) - 1
+
+# Shortest back-reference worth emitting; shorter matches cost more bits
+# than the literal chunks they replace
+_MIN_MATCH = 4
+
+
+def compress_bcfz(data: bytes) -> bytes:
+    """Compress data into a BCFZ stream readable by decompress_bcfz.
+
+    Greedy LZ77: each position is looked up by its first four bytes in a
+    table of earlier positions, and matches are emitted as back-references,
+    everything else as literal chunks of up to three bytes.
+
+    Args:
+        data: Data to compress (normally a BCFS container)
+
+    Returns:
+        BCFZ data, including header
+    """
+    writer = BitWriter()
+    last_seen: Dict[bytes, int] = {}
+    literals = bytearray()
+
+    def flush_literals() -> None:
+        for start in range(0, len(literals), 3):
+            chunk = literals[start : start + 3]
+            writer.write_bits(0, 1)
+            writer.write_bits_reversed(len(chunk), 2)
+            for byte in chunk:
+                writer.write_bits(byte, 8)
+        literals.clear()
+
+    pos = 0
+    size = len(data)
+    while pos < size:
+        key = data[pos : pos + _MIN_MATCH]
+        candidate = last_seen.get(key)
+        last_seen[key] = pos
+
+        length = 0
+        if candidate is not None and len(key) == _MIN_MATCH and pos - candidate <= _MAX_REFERENCE:
+            limit = min(_MAX_REFERENCE, size - pos)
+            length = _MIN_MATCH
+            while length < limit and data[candidate + length] == data[pos + length]:
+                length += 1
+
+        if length < _MIN_MATCH:
+            literals.append(data[pos])
+            pos += 1
+            continue
+
+        flush_literals()
+        offset = pos - candidate
+        word_size = max(offset.bit_length(), length.bit_length())
+        writer.write_bits(1, 1)
+        writer.write_bits(word_size, 4)
+        writer.write_bits_reversed(offset, word_size)
+        writer.write_bits_reversed(length, word_size)
+        pos += length
+
+    flush_literals()
+    compressed = writer.getvalue()
+    logger.debug(f"BCFZ compressed {size} bytes to {len(compressed) + 8}")
+    return b"BCFZ" + size.to_bytes(4, "little") + compressed
+
+
 def extract_gpx_files(decompressed_data: bytes) -> dict[str, bytes]:
     """Extract individual files from decompressed GPX container.
 
@@ -316,3 +423,52 @@ def extract_gpx_files(decompressed_data: bytes) -> dict[str, bytes]:
         raise BCFZDecompressionError("No files found in BCFS container")
 
     return files
+
+
+def build_bcfs_container(files: Dict[str, bytes]) -> bytes:
+    """Build a BCFS container holding the given files.
+
+    The inverse of extract_gpx_files: sector 0 holds the "BCFS" header,
+    followed by one file table sector per file and then the data sectors.
+    Each data sector starts with a 4-byte marker and carries 4092 bytes of
+    file data.
+
+    Args:
+        files: Mapping of filename to contents
+
+    Returns:
+        Uncompressed BCFS container
+
+    Raises:
+        ValueError: If a filename or file is too large for a table entry
+    """
+    SECTOR_SIZE = 4096
+    SECTOR_PAYLOAD = SECTOR_SIZE - 4
+    MAX_SECTORS = (SECTOR_SIZE - 152) // 4 - 1  # Leave room for the 0 terminator
+
+    entries = bytearray()
+    data_sectors = bytearray()
+    next_sector = 1 + len(files)
+    for index, (filename, content) in enumerate(files.items()):
+        name = filename.encode("utf-8")
+        if len(name) > 127:
+            raise ValueError(f"Filename too long for BCFS entry: {filename}")
+        sector_count = (len(content) + SECTOR_PAYLOAD - 1) // SECTOR_PAYLOAD
+        if sector_count > MAX_SECTORS:
+            raise ValueError(f"File too large for BCFS entry: {filename} ({len(content)} bytes)")
+
+        entry = bytearray(SECTOR_SIZE)
+        marker = 0xFFFFFFFF if index == 0 else 0
+        entry[0:4] = marker.to_bytes(4, "little")
+        entry[4:8] = (2).to_bytes(4, "little")
+        entry[8 : 8 + len(name)] = name
+        entry[144:148] = len(content).to_bytes(4, "little")
+        for i in range(sector_count):
+            entry[152 + i * 4 : 156 + i * 4] = (next_sector + i).to_bytes(4, "little")
+            chunk = content[i * SECTOR_PAYLOAD : (i + 1) * SECTOR_PAYLOAD]
+            data_sectors += bytes(4) + chunk + bytes(SECTOR_PAYLOAD - len(chunk))
+        next_sector += sector_count
+        entries += entry
+
+    header = b"BCFS" + bytes(SECTOR_SIZE - 4)
+    return header + bytes(entries) + bytes(data_sectors)
@@ -3,33 +3,88 @@
 This module handles:
 - Loading and analyzing audio files using librosa
 - Detecting BPM (tempo) from audio
-- Finding beat positions throughout the track
+- Finding beat positions throughout the track, optionally guided by the
+  tab's tempo map
+- Labelling each beat with its position in the bar (downbeat detection)
 - Generating sync points for GP8 XML injection
 """
 
 from dataclasses import dataclass
+from fractions import Fraction
+from functools import cached_property
 from pathlib import Path
 from statistics import median
-from typing import Callable, List, Optional
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from loguru import logger
 
+from guitarprotool.core.xml_modifier import SyncPoint
 from guitarprotool.utils.exceptions import BeatDetectionError, BPMDetectionError
+from guitarprotool.utils.imports import is_installed, lazy_import
+from guitarprotool.utils.instrumentation import span
 
-# Try to import librosa, but allow running without it for testing
-try:
-    import librosa
+if TYPE_CHECKING:
+    from guitarprotool.core.tempo_map import TempoMap
 
-    LIBROSA_AVAILABLE = True
-except ImportError:
+# librosa is bound lazily (imported on first use), but allow running without it for testing
+LIBROSA_AVAILABLE = is_installed("librosa")
+if LIBROSA_AVAILABLE:
+    librosa = lazy_import("librosa")
+else:
     librosa = None  # type: ignore
-    LIBROSA_AVAILABLE = False
     logger.warning(
         "librosa not available. Beat detection will not work. "
         "Install librosa with: pip install librosa"
     )
 
+# Tempo-map guided tracking: the audio tempo is searched within this
+# fraction of the tab tempo of the section being played
+TEMPO_SEARCH_RANGE = 0.1
+
+# Window over which the local tempo is estimated, in seconds
+TEMPO_WINDOW_SECONDS = 8.0
+
+# How far (in seconds, on top of TEMPO_SEARCH_RANGE of the elapsed time) a
+# section may sit from where the tab tempo puts it in the audio
+SECTION_SLACK_SECONDS = 4.0
+
+# Downbeat detection: probability that the beat tracker inserted or missed
+# a beat between two detected beats, which shifts the bar position
+BEAT_ERROR_PROBABILITY = 0.01
+
+# Mel bands (of 64) holding the kick drum and bass, for the low-frequency accent
+LOW_MEL_BANDS = 8
+
+# Outlier filtering: beats over which the local beat interval is the median
+OUTLIER_WINDOW_BEATS = 9
+
+# Intervals within this fraction of the local median interval are regular
+INTERVAL_TOLERANCE = 0.2
+
+# Longest run of missed beats that is filled in
+MAX_MISSING_BEATS = 7
+
+# Tempo correction: detected:true beat ratios the tracker locks onto. Besides
+# double and half time, shuffle, 6/8 and triplet feel give 3:2 and 4:3 grids.
+TEMPO_RATIOS = tuple(
+    Fraction(numerator, denominator)
+    for numerator, denominator in ((2, 1), (1, 2), (3, 2), (2, 3), (4, 3), (3, 4))
+)
+
+# Score penalty per step of ratio complexity (numerator + denominator - 2), so
+# that of two ratios fitting the reference tempo about as well the simpler wins
+RATIO_COMPLEXITY_PENALTY = 0.25
+
+# Score weight of the onset evidence: how much stronger the beats kept on the
+# corrected grid are than the beats falling between its beats
+RATIO_ONSET_WEIGHT = 4.0
+
+# Onset contrast a ratio other than 1 needs over the uncorrected grid (whose
+# contrast is 0) before the grid is resampled, when beat strengths are known.
+# A steady grid has no contrast at any ratio and is left alone
+RATIO_MIN_CONTRAST = 0.1
+
 
 @dataclass
 class BeatInfo:
@@ -37,16 +92,74 @@ class BeatInfo:
 
     Attributes:
         bpm: Detected tempo in beats per minute (median of all detected values)
-        beat_times: List of beat positions in seconds
+        beat_times: Beat positions in seconds (float64 array)
         confidence: Overall confidence score (0.0-1.0)
+        beat_positions: Position of each beat within its bar (0 = downbeat),
+            or None if downbeats were not detected
+        beat_strengths: Onset strength at each beat (0.0-1.0, relative to the
+            track's loudest onsets), or None if not measured
+        beat_regularity: How well the intervals either side of each beat match
+            the local beat interval (0.0-1.0; 0.0 for beats filled in where the
+            tracker missed them), or None if not measured
     """
 
     bpm: float
-    beat_times: List[float]
+    beat_times: np.ndarray
     confidence: float
+    beat_positions: Optional[List[int]] = None
+    beat_strengths: Optional[np.ndarray] = None
+    beat_regularity: Optional[np.ndarray] = None
 
+    def __post_init__(self):
+        # No copy when the beats already are a float64 array
+        self.beat_times = np.asarray(self.beat_times, dtype=np.float64)
 
-@dataclass
+    @property
+    def first_downbeat(self) -> int:
+        """Index of the beat starting bar 0: the first labelled downbeat.
+
+        Beats before it are a pickup. 0 when downbeats were not detected.
+        """
+        if self.beat_positions is not None:
+            for index, position in enumerate(self.beat_positions):
+                if position == 0:
+                    return index
+        return 0
+
+    @property
+    def reliable(self) -> Optional[np.ndarray]:
+        """Mask of beats whose timing can be trusted, or None if not measured.
+
+        A beat is reliable when the intervals either side of it are within
+        INTERVAL_TOLERANCE of the local beat interval.
+        """
+        if self.beat_regularity is None:
+            return None
+        return self.beat_regularity >= 1.0 - INTERVAL_TOLERANCE
+
+    def from_beat(self, start: int, start_time: float) -> "BeatInfo":
+        """The beats from index start on, shifted so beat start is at start_time.
+
+        Bar positions are dropped, as the new first beat starts a bar.
+
+        Args:
+            start: Index of the new first beat
+            start_time: Time in seconds to move the new first beat to
+
+        Returns:
+            New BeatInfo with the same BPM and confidence
+        """
+        shift = start_time - self.beat_times[start]
+        return BeatInfo(
+            bpm=self.bpm,
+            beat_times=self.beat_times[start:] + shift,
+            confidence=self.confidence,
+            beat_strengths=None if self.beat_strengths is None else self.beat_strengths[start:],
+            beat_regularity=None if self.beat_regularity is None else self.beat_regularity[start:],
+        )
+
+
+@dataclass(slots=True)
 class SyncPointData:
     """Data for a single sync point, ready for XML injection.
 
@@ -65,21 +178,113 @@ class SyncPointData:
     original_tempo: float
 
 
+@dataclass
+class SyncPointArray:
+    """Sync points stored column-wise, one array per field.
+
+    Long recordings produce many sync points; four arrays take a fraction of
+    the memory of one object per point, and convert to XML SyncPoints with
+    one tolist() per column. An int index gives a SyncPointData record; a
+    slice gives a SyncPointArray of views into the same arrays.
+
+    Attributes:
+        bars: Bar of each sync point (int64)
+        frame_offsets: Audio frame of each sync point (int64)
+        modified_tempos: Tempo in the audio at each sync point, BPM (float32)
+        original_tempos: Tab tempo at each sync point, BPM (float32)
+    """
+
+    bars: np.ndarray
+    frame_offsets: np.ndarray
+    modified_tempos: np.ndarray
+    original_tempos: np.ndarray
+
+    def __post_init__(self):
+        # No copy when a column already has its dtype
+        self.bars = np.asarray(self.bars, dtype=np.int64)
+        self.frame_offsets = np.asarray(self.frame_offsets, dtype=np.int64)
+        self.modified_tempos = np.asarray(self.modified_tempos, dtype=np.float32)
+        self.original_tempos = np.asarray(self.original_tempos, dtype=np.float32)
+        if not (
+            len(self.bars)
+            == len(self.frame_offsets)
+            == len(self.modified_tempos)
+            == len(self.original_tempos)
+        ):
+            raise ValueError("Sync point columns differ in length")
+
+    @classmethod
+    def from_records(cls, records: Sequence[SyncPointData]) -> "SyncPointArray":
+        """Build the columns from SyncPointData records."""
+        return cls(
+            bars=[record.bar for record in records],
+            frame_offsets=[record.frame_offset for record in records],
+            modified_tempos=[record.modified_tempo for record in records],
+            original_tempos=[record.original_tempo for record in records],
+        )
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[SyncPointData, "SyncPointArray"]:
+        if isinstance(index, (int, np.integer)):
+            return SyncPointData(
+                bar=int(self.bars[index]),
+                frame_offset=int(self.frame_offsets[index]),
+                modified_tempo=float(self.modified_tempos[index]),
+                original_tempo=float(self.original_tempos[index]),
+            )
+        return SyncPointArray(
+            bars=self.bars[index],
+            frame_offsets=self.frame_offsets[index],
+            modified_tempos=self.modified_tempos[index],
+            original_tempos=self.original_tempos[index],
+        )
+
+    def __iter__(self) -> Iterator[SyncPointData]:
+        return iter(self.records())
+
+    def _rows(self) -> Iterator[Tuple[int, int, float, float]]:
+        """(bar, frame offset, modified tempo, original tempo) as Python scalars."""
+        return zip(
+            self.bars.tolist(),
+            self.frame_offsets.tolist(),
+            self.modified_tempos.tolist(),
+            self.original_tempos.tolist(),
+        )
+
+    def records(self) -> List[SyncPointData]:
+        """The sync points as SyncPointData records."""
+        return [SyncPointData(*row) for row in self._rows()]
+
+    def to_sync_points(self) -> List[SyncPoint]:
+        """The sync points as XMLModifier SyncPoints, ready for injection."""
+        return [
+            SyncPoint(bar=bar, frame_offset=frame, modified_tempo=tempo, original_tempo=original)
+            for bar, frame, tempo, original in self._rows()
+        ]
+
+
 @dataclass
 class SyncResult:
     """Result of sync point generation, including frame padding for alignment.
 
     Attributes:
-        sync_points: List of sync points with relative frame offsets
+        points: Sync points with relative frame offsets, column-wise
         frame_padding: Negative frame offset to align audio start with bar 0.
                       This should be set on BackingTrackConfig.frame_padding.
         first_beat_time: Time in seconds where music starts in the audio.
     """
 
-    sync_points: List[SyncPointData]
+    points: SyncPointArray
     frame_padding: int
     first_beat_time: float
 
+    @cached_property
+    def sync_points(self) -> List[SyncPointData]:
+        """The sync points as a list of records (built on first access)."""
+        return self.points.records()
+
 
 # Type alias for progress callbacks
 ProgressCallback = Callable[[float, str], None]
@@ -125,6 +330,8 @@ class BeatDetector:
         self,
         audio_path: Path | str,
         progress_callback: Optional[ProgressCallback] = None,
+        tempo_map: Optional["TempoMap"] = None,
+        beats_per_bar: Optional[int] = None,
     ) -> BeatInfo:
         """Analyze audio file to detect BPM and beat positions.
 
@@ -132,6 +339,8 @@ class BeatDetector:
             audio_path: Path to the audio file (MP3, WAV, etc.)
             progress_callback: Optional callback for progress updates.
                               Receives (progress: float 0-1, message: str)
+            tempo_map: Optional tab tempo map; see analyze_audio
+            beats_per_bar: Optional meter; see analyze_audio
 
         Returns:
             BeatInfo containing BPM, beat times, and confidence
@@ -160,18 +369,118 @@ class BeatDetector:
             # Load audio file
             if progress_callback:
                 progress_callback(0.1, "Loading audio...")
-            y, sr = librosa.load(str(audio_path), sr=self.sample_rate, mono=True)
+            with span("decode"):
+                y, sr = librosa.load(str(audio_path), sr=self.sample_rate, mono=True)
+        except Exception as e:
+            raise BeatDetectionError(f"Failed to analyze audio: {e}") from e
+
+        return self.analyze_audio(
+            y,
+            sr,
+            progress_callback=progress_callback,
+            tempo_map=tempo_map,
+            beats_per_bar=beats_per_bar,
+        )
+
+    def analyze_audio(
+        self,
+        y: np.ndarray,
+        sample_rate: int,
+        progress_callback: Optional[ProgressCallback] = None,
+        tempo_map: Optional["TempoMap"] = None,
+        beats_per_bar: Optional[int] = None,
+    ) -> BeatInfo:
+        """Analyze an in-memory mono signal to detect BPM and beat positions.
+
+        Lets callers that already hold decoded audio (such as an isolated
+        bass stem from BassIsolator) skip writing and re-reading a file.
+
+        Args:
+            y: Mono float samples
+            sample_rate: Sample rate of y in Hz. Resampled to self.sample_rate
+                if different.
+            progress_callback: Optional callback for progress updates.
+                              Receives (progress: float 0-1, message: str)
+            tempo_map: Optional tab tempo map. When given, the tempo is
+                searched only near the tab tempo of each section (see
+                guided_tempo), which rules out double- and half-time
+                detection, and beats are tracked at that local tempo.
+            beats_per_bar: Optional meter. When given, each beat is labelled
+                with its position in the bar (BeatInfo.beat_positions); beats
+                before the first downbeat are a pickup.
+
+        Returns:
+            BeatInfo containing BPM, beat times, and confidence
+
+        Raises:
+            BeatDetectionError: If analysis fails
+            BPMDetectionError: If no BPM can be detected
+        """
+        if not LIBROSA_AVAILABLE:
+            raise BeatDetectionError(
+                "librosa library not available. Install with: pip install librosa"
+            )
+
+        with span("beat_tracking", samples=len(y)):
+            return self._analyze_audio(
+                y, sample_rate, progress_callback, tempo_map, beats_per_bar
+            )
+
+    def _analyze_audio(
+        self,
+        y: np.ndarray,
+        sample_rate: int,
+        progress_callback: Optional[ProgressCallback],
+        tempo_map: Optional["TempoMap"],
+        beats_per_bar: Optional[int],
+    ) -> BeatInfo:
+        """Beat tracking for analyze_audio()."""
+        try:
+            y = np.asarray(y, dtype=np.float32)
+            if y.ndim != 1:
+                raise BeatDetectionError(f"Expected mono audio, got shape {y.shape}")
+
+            sr = self.sample_rate
+            if sample_rate != sr:
+                y = librosa.resample(y, orig_sr=sample_rate, target_sr=sr)
 
             duration = len(y) / sr
             logger.debug(f"Audio duration: {duration:.2f}s")
 
-            # Detect BPM and beats
+            # Detect onsets to find the first note more accurately
             if progress_callback:
-                progress_callback(0.3, "Detecting tempo and beats...")
+                progress_callback(0.3, "Detecting first onset...")
 
-            tempo, beat_frames = librosa.beat.beat_track(
+            onset_frames = librosa.onset.onset_detect(
                 y=y, sr=sr, hop_length=self.hop_length
             )
+            onset_times = librosa.frames_to_time(
+                onset_frames, sr=sr, hop_length=self.hop_length
+            ).tolist()
+
+            # Detect BPM and beats
+            if progress_callback:
+                progress_callback(0.5, "Detecting tempo and beats...")
+
+            # Same envelope beat_track computes for itself; also gives beat strengths
+            onset_envelope = librosa.onset.onset_strength(
+                y=y, sr=sr, hop_length=self.hop_length, aggregate=np.median
+            )
+            if tempo_map is None:
+                tempo, beat_frames = librosa.beat.beat_track(
+                    y=y, onset_envelope=onset_envelope, sr=sr, hop_length=self.hop_length
+                )
+            else:
+                bpm_curve = self.guided_tempo(
+                    onset_envelope, tempo_map, onset_times[0] if onset_times else 0.0
+                )
+                _, beat_frames = librosa.beat.beat_track(
+                    onset_envelope=onset_envelope,
+                    sr=sr,
+                    hop_length=self.hop_length,
+                    bpm=bpm_curve,
+                )
+                tempo = float(np.median(bpm_curve))
 
             # Convert tempo to float (librosa may return array)
             if isinstance(tempo, np.ndarray):
@@ -182,35 +491,22 @@ class BeatDetector:
             if bpm <= 0:
                 raise BPMDetectionError("No BPM detected. Audio may not have a clear beat.")
 
-            # Detect onsets to find the first note more accurately
-            if progress_callback:
-                progress_callback(0.5, "Detecting first onset...")
-
-            onset_frames = librosa.onset.onset_detect(
-                y=y, sr=sr, hop_length=self.hop_length
-            )
-            onset_times = librosa.frames_to_time(
-                onset_frames, sr=sr, hop_length=self.hop_length
-            ).tolist()
-
             # Convert beat frames to times
-            beat_times = librosa.frames_to_time(
-                beat_frames, sr=sr, hop_length=self.hop_length
-            ).tolist()
+            beat_times = librosa.frames_to_time(beat_frames, sr=sr, hop_length=self.hop_length)
 
             # Use the first onset as the starting point
             # This is more accurate than beat detection for finding when music starts
             if onset_times:
                 first_onset = onset_times[0]
-                if beat_times:
+                if len(beat_times):
                     first_beat = beat_times[0]
                     logger.debug(
                         f"First onset: {first_onset:.3f}s, first beat: {first_beat:.3f}s"
                     )
                 # Always use the first onset as the starting point for bar 0
                 # Insert it at the beginning of beat_times so generate_sync_points uses it
-                if not beat_times or first_onset != beat_times[0]:
-                    beat_times.insert(0, first_onset)
+                if not len(beat_times) or first_onset != beat_times[0]:
+                    beat_times = np.insert(beat_times, 0, first_onset)
                     logger.debug(f"Using first onset ({first_onset:.3f}s) as start point")
 
             # Validate first beat - check if first interval is reasonable
@@ -230,13 +526,39 @@ class BeatDetector:
             if progress_callback:
                 progress_callback(0.7, "Calculating confidence...")
 
+            # Drop beats splitting an interval, fill in missed beats
+            filtered, filled = filter_beat_outliers(beat_times)
+            if len(filtered) != len(beat_times):
+                logger.info(
+                    f"Beat outliers: {len(beat_times) + filled.sum() - len(filtered)} "
+                    f"spurious beats dropped, {filled.sum()} missed beats filled in"
+                )
+            beat_times = filtered
+            beat_strengths = self.beat_strengths(onset_envelope, beat_times)
+            regularity = beat_regularity(beat_times)
+            regularity[filled] = 0.0
+
             # Calculate confidence based on beat regularity
             confidence = self._calculate_beat_consistency(beat_times, bpm)
 
+            beat_positions = None
+            if beats_per_bar and len(beat_times) >= 2:
+                if progress_callback:
+                    progress_callback(0.8, "Detecting downbeats...")
+                accents = self.beat_accents(y, beat_times)
+                beat_positions = bar_positions(accents, beats_per_bar).tolist()
+
             if progress_callback:
                 progress_callback(1.0, "Analysis complete")
 
-            beat_info = BeatInfo(bpm=bpm, beat_times=beat_times, confidence=confidence)
+            beat_info = BeatInfo(
+                bpm=bpm,
+                beat_times=beat_times,
+                confidence=confidence,
+                beat_positions=beat_positions,
+                beat_strengths=beat_strengths,
+                beat_regularity=regularity,
+            )
 
             logger.success(
                 f"Analysis complete: BPM={bpm:.1f}, beats={len(beat_times)}, "
@@ -250,6 +572,172 @@ class BeatDetector:
         except Exception as e:
             raise BeatDetectionError(f"Failed to analyze audio: {e}") from e
 
+    def guided_tempo(
+        self,
+        onset_envelope: np.ndarray,
+        tempo_map: "TempoMap",
+        start_time: float = 0.0,
+    ) -> np.ndarray:
+        """Estimate the local tempo of each frame near the tab tempo map.
+
+        Each tempo section of the tab is expected in the audio where the
+        tab tempo puts it after start_time, give or take
+        TEMPO_SEARCH_RANGE of the elapsed time plus SECTION_SLACK_SECONDS.
+        Within that span, the local tempo is the beat period (between
+        TEMPO_SEARCH_RANGE below and above the section tempo) with the
+        strongest onset autocorrelation over TEMPO_WINDOW_SECONDS. Only
+        those few periods are evaluated, rather than the full tempogram.
+
+        Args:
+            onset_envelope: Onset strength envelope at self.hop_length
+            tempo_map: Tab tempo map
+            start_time: Audio time of the tab's first bar, in seconds
+
+        Returns:
+            Tempo in BPM for every envelope frame
+        """
+        from scipy.ndimage import median_filter, uniform_filter1d
+
+        frame_rate = self.sample_rate / self.hop_length
+        n = len(onset_envelope)
+        envelope = np.asarray(onset_envelope, dtype=np.float64)
+        envelope = envelope - envelope.mean()
+
+        sections = tempo_map.sections() or [(0.0, n / frame_rate, tempo_map.tempos[0])]
+        if n < 2 * frame_rate * 60.0 / max(bpm for _, _, bpm in sections):
+            # Too short for even two beats: nothing to estimate from
+            return np.full(n, float(np.median([bpm for _, _, bpm in sections])))
+        lag_ranges = [
+            (
+                frame_rate * 60.0 / (bpm * (1 + TEMPO_SEARCH_RANGE)),
+                frame_rate * 60.0 / (bpm * (1 - TEMPO_SEARCH_RANGE)),
+            )
+            for _, _, bpm in sections
+        ]
+        # One extra lag either side for interpolating the peak
+        min_lag = max(1, int(np.floor(min(lo for lo, _ in lag_ranges))) - 1)
+        max_lag = max(min_lag, min(n - 1, int(np.ceil(max(hi for _, hi in lag_ranges))) + 1))
+        lags = np.arange(min_lag, max_lag + 1)
+
+        # Local autocorrelation at each candidate lag
+        window = max(1, int(TEMPO_WINDOW_SECONDS * frame_rate))
+        strength = np.zeros((len(lags), n))
+        for row, lag in enumerate(lags):
+            strength[row, : n - lag] = envelope[: n - lag] * envelope[lag:]
+        strength = uniform_filter1d(strength, window, axis=1, mode="constant")
+
+        # Decide every eighth of a window and interpolate between decisions
+        step = max(1, window // 8)
+        frames = np.arange(0, n, step)
+        times = frames / frame_rate
+        best = np.full(len(frames), -np.inf)
+        best_row = np.full(len(frames), -1)
+        # Tab tempo of the section, used where the audio gives no evidence
+        section_bpm = np.full(len(frames), np.nan)
+        for (start, end, bpm), (lo, hi) in zip(sections, lag_ranges):
+            slack = TEMPO_SEARCH_RANGE * end + SECTION_SLACK_SECONDS
+            in_section = (times >= start_time + start - slack) & (times <= start_time + end + slack)
+            rows = np.flatnonzero((lags >= lo) & (lags <= hi))
+            if not in_section.any() or len(rows) == 0:
+                continue
+            # Prefer periods near the section tempo when peaks are similar
+            deviation = np.log(lags[rows] * bpm / (60.0 * frame_rate)) / TEMPO_SEARCH_RANGE
+            weights = np.exp(-0.5 * deviation**2)[:, None]
+            scores = np.maximum(strength[rows][:, frames[in_section]], 0.0) * weights
+            choice = scores.argmax(axis=0)
+            value = scores[choice, np.arange(len(choice))]
+            better = value > best[in_section]
+            updated = np.flatnonzero(in_section)[better]
+            best[updated] = value[better]
+            best_row[updated] = rows[choice[better]]
+            section_bpm[updated] = bpm
+
+        # Frames outside every section (e.g. a long outro) take the nearest decision
+        decided = np.flatnonzero(best_row >= 0)
+        if len(decided) == 0:
+            return np.full(n, float(np.median([bpm for _, _, bpm in sections])))
+        nearest = decided[np.abs(np.arange(len(frames))[:, None] - decided).argmin(axis=1)]
+        rows = best_row[nearest]
+        columns = frames[nearest]
+
+        # Parabolic interpolation of the autocorrelation peak for sub-frame periods
+        inner = (rows > 0) & (rows < len(lags) - 1)
+        left = strength[np.maximum(rows - 1, 0), columns]
+        center = strength[rows, columns]
+        right = strength[np.minimum(rows + 1, len(lags) - 1), columns]
+        curvature = left - 2 * center + right
+        offset = np.zeros(len(rows))
+        peaked = inner & (curvature < 0)
+        offset[peaked] = 0.5 * (left[peaked] - right[peaked]) / curvature[peaked]
+        periods = lags[rows] + np.clip(offset, -0.5, 0.5)
+
+        decisions = np.where(
+            best[nearest] > 0, frame_rate * 60.0 / periods, section_bpm[nearest]
+        )
+        decisions = median_filter(decisions, size=9, mode="nearest")
+        return np.interp(np.arange(n), frames, decisions)
+
+    def beat_strengths(self, onset_envelope: np.ndarray, beat_times: np.ndarray) -> np.ndarray:
+        """Onset strength at each beat.
+
+        Args:
+            onset_envelope: Onset strength envelope at self.hop_length
+            beat_times: Beat times in seconds
+
+        Returns:
+            Strongest onset within a frame or two of each beat, relative to
+            the 99th percentile of the envelope and clipped to 0.0-1.0
+        """
+        envelope = np.asarray(onset_envelope, dtype=np.float64)
+        if len(envelope) == 0 or len(beat_times) == 0:
+            return np.zeros(len(beat_times))
+        frames = np.rint(np.asarray(beat_times) * self.sample_rate / self.hop_length).astype(int)
+        # Onset peaks can land a frame or two after the tracked beat
+        windows = np.clip(frames[:, None] + np.arange(-1, 3), 0, len(envelope) - 1)
+        scale = max(float(np.percentile(envelope, 99)), 1e-9)
+        return np.clip(envelope[windows].max(axis=1) / scale, 0.0, 1.0)
+
+    def beat_accents(self, y: np.ndarray, beat_times: np.ndarray) -> np.ndarray:
+        """How strongly each beat sounds like the start of a bar.
+
+        Bars tend to start with a kick or bass note and a chord change, so
+        the accent of a beat combines the low-frequency onset strength at
+        the beat with how much the harmony (beat-synchronous chroma)
+        differs from the previous beat. Both are standardized over the
+        track.
+
+        Args:
+            y: Mono samples at self.sample_rate
+            beat_times: Beat times in seconds
+
+        Returns:
+            Accent per beat (mean 0); higher is more downbeat-like
+        """
+        power = np.abs(librosa.stft(y, hop_length=self.hop_length)) ** 2
+        mel = librosa.power_to_db(
+            librosa.feature.melspectrogram(S=power, sr=self.sample_rate, n_mels=64)
+        )
+        low_onsets = librosa.onset.onset_strength(S=mel[:LOW_MEL_BANDS], sr=self.sample_rate)
+        chroma = librosa.feature.chroma_stft(S=power, sr=self.sample_rate)
+
+        frames = np.clip(
+            librosa.time_to_frames(beat_times, sr=self.sample_rate, hop_length=self.hop_length),
+            0,
+            power.shape[1] - 1,
+        )
+        # Onset peaks can land a frame or two after the tracked beat
+        windows = np.clip(frames[:, None] + np.arange(-1, 3), 0, len(low_onsets) - 1)
+        low = low_onsets[windows].max(axis=1)
+
+        # Chroma of the span starting at each beat, compared with the previous span
+        lengths = np.maximum(np.diff(np.append(frames, chroma.shape[1])), 1)
+        segments = np.add.reduceat(chroma, frames, axis=1) / lengths
+        segments = segments / np.maximum(np.linalg.norm(segments, axis=0), 1e-9)
+        change = np.zeros(len(frames))
+        change[1:] = 1.0 - np.sum(segments[:, 1:] * segments[:, :-1], axis=0)
+
+        return _standardize(low) + _standardize(change)
+
     def detect_bpm(self, audio_path: Path | str) -> float:
         """Detect BPM only (without full beat analysis).
 
@@ -303,6 +791,8 @@ class BeatDetector:
         max_bars: Optional[int] = None,
         adaptive: bool = True,
         tab_start_bar: int = 0,
+        max_error_ms: Optional[float] = None,
+        max_sync_points: Optional[int] = None,
     ) -> SyncResult:
         """Generate sync points for audio alignment with the tab.
 
@@ -311,7 +801,8 @@ class BeatDetector:
         at each sync point and place sync points more frequently where tempo
         drifts significantly.
 
-        The first detected beat/onset in the audio is used as the starting point.
+        The first detected downbeat (or the first beat, when downbeats are
+        unknown) is used as the starting point.
         The frame_padding value returned should be set on BackingTrackConfig to
         align the audio with bar 0 of the tab.
 
@@ -329,6 +820,10 @@ class BeatDetector:
             tab_start_bar: Bar number where notes begin in the tab (0-indexed).
                           When set, aligns first detected beat with this bar instead
                           of bar 0. Used when tabs have intro bars before music starts.
+            max_error_ms: Adaptive mode: place the fewest sync points keeping every
+                         bar within this many milliseconds of its detected time
+            max_sync_points: Adaptive mode: place at most this many sync points,
+                            minimising the largest bar timing error
 
         Returns:
             SyncResult containing sync points and frame_padding for alignment
@@ -336,14 +831,15 @@ class BeatDetector:
         Raises:
             BeatDetectionError: If not enough beats to generate sync points
         """
-        if not beat_info.beat_times:
+        if not len(beat_info.beat_times):
             raise BeatDetectionError("No beats detected, cannot generate sync points")
 
         if len(beat_info.beat_times) < 2:
             raise BeatDetectionError("Need at least 2 beats to generate sync points")
 
-        # Use the first detected beat/onset as the starting point
-        first_beat_time = beat_info.beat_times[0] + start_offset
+        # Bar 0 starts at the first downbeat (the first beat when downbeats
+        # are unknown); earlier pickup beats fall before it
+        first_beat_time = beat_info.beat_times[beat_info.first_downbeat] + start_offset
 
         # FramePadding adjustment depends on whether we have tab_start_bar offset
         if tab_start_bar > 0:
@@ -379,23 +875,25 @@ class BeatDetector:
             max_bars = int(audio_duration / seconds_per_bar) + 1
 
         if adaptive:
-            sync_points = self._generate_adaptive_sync_points(
+            points = self._generate_adaptive_sync_points(
                 beat_info, original_tempo, beats_per_bar, bar_interval, max_bars,
-                tab_start_bar=tab_start_bar
+                tab_start_bar=tab_start_bar,
+                max_error_ms=max_error_ms,
+                max_sync_points=max_sync_points,
             )
         else:
-            sync_points = self._generate_static_sync_points(
+            points = self._generate_static_sync_points(
                 original_tempo, beats_per_bar, bar_interval, max_bars
             )
 
         logger.success(
-            f"Generated {len(sync_points)} sync points "
+            f"Generated {len(points)} sync points "
             f"({'adaptive' if adaptive else 'static'}), "
             f"frame_padding={frame_padding} ({first_beat_time:.3f}s offset)"
         )
 
         return SyncResult(
-            sync_points=sync_points,
+            points=points,
             frame_padding=frame_padding,
             first_beat_time=first_beat_time,
         )
@@ -408,7 +906,9 @@ class BeatDetector:
         bar_interval: int,
         max_bars: int,
         tab_start_bar: int = 0,
-    ) -> List[SyncPointData]:
+        max_error_ms: Optional[float] = None,
+        max_sync_points: Optional[int] = None,
+    ) -> SyncPointArray:
         """Generate sync points with adaptive tempo detection.
 
         Uses DriftAnalyzer to calculate local tempo at each sync point
@@ -421,6 +921,8 @@ class BeatDetector:
             bar_interval: Base interval between sync points
             max_bars: Maximum bar number from GP file
             tab_start_bar: Bar where notes start in tab (for intro alignment)
+            max_error_ms: Per-bar timing error bound for optimal placement
+            max_sync_points: Sync point budget for optimal placement
         """
         from guitarprotool.core.drift_analyzer import DriftAnalyzer
         from guitarprotool.utils.exceptions import InsufficientBeatsError
@@ -432,13 +934,17 @@ class BeatDetector:
                 beats_per_bar=beats_per_bar,
                 sample_rate=self.sample_rate,
                 tab_start_bar=tab_start_bar,
+                beat_positions=beat_info.beat_positions,
+                reliable_beats=beat_info.reliable,
             )
             sync_points = analyzer.generate_adaptive_sync_points(
                 max_bars=max_bars,
                 base_interval=bar_interval,
+                max_error_ms=max_error_ms,
+                max_sync_points=max_sync_points,
             )
             logger.info(f"Adaptive sync: {len(sync_points)} sync points generated")
-            return sync_points
+            return SyncPointArray.from_records(sync_points)
 
         except InsufficientBeatsError:
             # Fall back to static generation if not enough beats
@@ -453,41 +959,34 @@ class BeatDetector:
         beats_per_bar: int,
         bar_interval: int,
         max_bars: int,
-    ) -> List[SyncPointData]:
+    ) -> SyncPointArray:
         """Generate sync points with static interval (legacy behavior).
 
         Creates sync points at regular bar intervals, all with the same
         modified_tempo equal to original_tempo.
         """
-        sync_points: List[SyncPointData] = []
-
         seconds_per_beat = 60.0 / original_tempo
         seconds_per_bar = seconds_per_beat * beats_per_bar
 
-        for bar in range(0, max_bars, bar_interval):
-            relative_time = bar * seconds_per_bar
-            frame_offset = int(relative_time * self.sample_rate)
-
-            sync_point = SyncPointData(
-                bar=bar,
-                frame_offset=frame_offset,
-                modified_tempo=original_tempo,
-                original_tempo=original_tempo,
-            )
-            sync_points.append(sync_point)
-
-            logger.debug(
-                f"Static sync point: bar={bar}, frame={frame_offset}, "
-                f"tempo={original_tempo:.3f}"
-            )
+        bars = np.arange(0, max_bars, bar_interval, dtype=np.int64)
+        frame_offsets = (bars * seconds_per_bar * self.sample_rate).astype(np.int64)
+        logger.debug(
+            f"Static sync points: {len(bars)} every {bar_interval} bars, "
+            f"tempo={original_tempo:.3f}"
+        )
 
-        return sync_points
+        return SyncPointArray(
+            bars=bars,
+            frame_offsets=frame_offsets,
+            modified_tempos=np.full(len(bars), original_tempo),
+            original_tempos=np.full(len(bars), original_tempo),
+        )
 
-    def _calculate_bpm_from_beats(self, beat_times: List[float]) -> float:
+    def _calculate_bpm_from_beats(self, beat_times: np.ndarray) -> float:
         """Calculate BPM from beat intervals.
 
         Args:
-            beat_times: List of beat times in seconds
+            beat_times: Beat times in seconds
 
         Returns:
             Calculated BPM
@@ -505,11 +1004,11 @@ class BeatDetector:
 
         return 60.0 / median_interval
 
-    def _calculate_beat_consistency(self, beat_times: List[float], expected_bpm: float) -> float:
+    def _calculate_beat_consistency(self, beat_times: np.ndarray, expected_bpm: float) -> float:
         """Calculate how consistent beat intervals are with expected BPM.
 
         Args:
-            beat_times: List of beat times in seconds
+            beat_times: Beat times in seconds
             expected_bpm: Expected BPM to compare against
 
         Returns:
@@ -531,14 +1030,14 @@ class BeatDetector:
 
     def _calculate_local_tempo(
         self,
-        beat_times: List[float],
+        beat_times: np.ndarray,
         center_idx: int,
         window_beats: int = 8,
     ) -> float:
         """Calculate local tempo around a specific beat.
 
         Args:
-            beat_times: List of all beat times
+            beat_times: All beat times in seconds
             center_idx: Index of the center beat
             window_beats: Number of beats to consider (on each side)
 
@@ -576,9 +1075,9 @@ class BeatDetector:
     ) -> "BeatInfo":
         """Correct detected tempo if it's a multiple of the reference tempo.
 
-        Beat detection algorithms often detect double-time (2x) or half-time (0.5x).
-        This method checks if the detected BPM is close to a multiple of the
-        reference tempo and corrects the beat times accordingly.
+        Beat detection algorithms often detect double-time (2x) or half-time
+        (0.5x), or lock onto 3:2 or 4:3 grids. See correct_tempo_ratio, which
+        also reports the ratio it chose.
 
         Args:
             beat_info: Original beat detection results
@@ -588,47 +1087,282 @@ class BeatDetector:
         Returns:
             Corrected BeatInfo with adjusted BPM and beat_times
         """
-        detected_bpm = beat_info.bpm
-        ratio = detected_bpm / reference_tempo
-
-        # Check for double-time (detected ~2x reference)
-        if abs(ratio - 2.0) < tolerance * 2:
-            corrected_bpm = detected_bpm / 2.0
-            # Use every other beat (skip the interpolated eighth notes)
-            corrected_beats = beat_info.beat_times[::2]
-            logger.info(
-                f"Correcting double-time: {detected_bpm:.1f} -> {corrected_bpm:.1f} BPM "
-                f"(reference: {reference_tempo:.1f})"
-            )
-            return BeatInfo(
-                bpm=corrected_bpm,
-                beat_times=corrected_beats,
-                confidence=beat_info.confidence,
-            )
+        return BeatDetector.correct_tempo_ratio(beat_info, reference_tempo, tolerance)[0]
 
-        # Check for half-time (detected ~0.5x reference)
-        if abs(ratio - 0.5) < tolerance * 0.5:
-            corrected_bpm = detected_bpm * 2.0
-            # Interpolate beat times (add a beat between each pair)
-            corrected_beats = []
-            for i, t in enumerate(beat_info.beat_times):
-                corrected_beats.append(t)
-                if i < len(beat_info.beat_times) - 1:
-                    next_t = beat_info.beat_times[i + 1]
-                    corrected_beats.append((t + next_t) / 2.0)
-            logger.info(
-                f"Correcting half-time: {detected_bpm:.1f} -> {corrected_bpm:.1f} BPM "
-                f"(reference: {reference_tempo:.1f})"
+    @staticmethod
+    def correct_tempo_ratio(
+        beat_info: "BeatInfo",
+        reference_tempo: float,
+        tolerance: float = 0.15,
+        tempo_map: Optional["TempoMap"] = None,
+    ) -> Tuple["BeatInfo", Fraction]:
+        """Undo a beat grid locked onto a multiple of the true tempo.
+
+        Each ratio in TEMPO_RATIOS is scored by how close the corrected
+        tempo is to the reference tempo, or to the nearest tempo of the
+        tab's tempo map, in log-tempo within tolerance; by its complexity;
+        and, when the beats have onset strengths, by how much stronger the
+        detected beats that stay on the corrected grid are than those that
+        fall between its beats. Ratio 1 (no correction) is always eligible,
+        scoring no worse than the edge of the tolerance, and with onset
+        strengths a ratio needs RATIO_MIN_CONTRAST of contrast to replace
+        it. The beat grid is then resampled at the chosen ratio, keeping
+        the first beat, and detected bar positions are carried over (see
+        _regrid_positions).
+
+        Args:
+            beat_info: Original beat detection results
+            reference_tempo: Expected tempo (from GP file) to compare against
+            tolerance: Largest relative tempo difference a ratio may correct
+            tempo_map: Optional tab tempo map; its tempos replace reference_tempo
+
+        Returns:
+            (corrected BeatInfo, detected:true ratio chosen; 1 if unchanged)
+        """
+        references = tempo_map.tempos if tempo_map is not None else [reference_tempo]
+        strengths = beat_info.beat_strengths
+        scores = {
+            ratio: _ratio_score(beat_info.bpm, strengths, ratio, references, tolerance)
+            for ratio in (Fraction(1),) + TEMPO_RATIOS
+        }
+        ratio = max(scores, key=lambda candidate: scores[candidate])
+        if ratio == 1:
+            logger.debug(
+                f"No tempo correction needed: detected={beat_info.bpm:.1f}, "
+                f"reference={reference_tempo:.1f}, ratio={beat_info.bpm / reference_tempo:.2f}"
             )
-            return BeatInfo(
+            return beat_info, Fraction(1)
+
+        times, on_grid, sources = _resample_beats(beat_info.beat_times, ratio)
+        if strengths is not None:
+            # Beats between detected beats have no measured onset
+            strengths = np.where(on_grid, strengths[sources], 0.0)
+        corrected_bpm = beat_info.bpm / float(ratio)
+        logger.info(
+            f"Correcting {ratio.numerator}:{ratio.denominator} tempo lock: "
+            f"{beat_info.bpm:.1f} -> {corrected_bpm:.1f} BPM "
+            f"(reference: {', '.join(f'{tempo:.1f}' for tempo in references)})"
+        )
+        return (
+            BeatInfo(
                 bpm=corrected_bpm,
-                beat_times=corrected_beats,
+                beat_times=times,
                 confidence=beat_info.confidence,
-            )
-
-        # No correction needed
-        logger.debug(
-            f"No tempo correction needed: detected={detected_bpm:.1f}, "
-            f"reference={reference_tempo:.1f}, ratio={ratio:.2f}"
+                beat_positions=_regrid_positions(beat_info, times),
+                beat_strengths=strengths,
+                beat_regularity=(
+                    None if beat_info.beat_regularity is None else beat_regularity(times)
+                ),
+            ),
+            ratio,
         )
-        return beat_info
+
+
+def bar_positions(accents: np.ndarray, beats_per_bar: int) -> np.ndarray:
+    """Label each beat with its position in the bar.
+
+    Viterbi decoding over bar positions: each beat normally advances the
+    position by one, but with BEAT_ERROR_PROBABILITY the tracker inserted
+    a beat (position repeats) or missed one (position skips). Beats are
+    scored as downbeats by their accent. A tracking error therefore only
+    shifts the bar phase once the accents after it consistently agree,
+    and the phase recovers there rather than staying shifted for the rest
+    of the track. The first beat may fall anywhere in the bar (a pickup),
+    so decoding starts from a uniform prior over positions.
+
+    Args:
+        accents: Downbeat accent per beat (see BeatDetector.beat_accents)
+        beats_per_bar: Beats per bar
+
+    Returns:
+        Position in the bar (0 = downbeat) for each beat
+    """
+    count = len(accents)
+    if count == 0 or beats_per_bar < 2:
+        return np.zeros(count, dtype=int)
+
+    states = np.arange(beats_per_bar)
+    log_error = np.log(BEAT_ERROR_PROBABILITY)
+    transition = np.full((beats_per_bar, beats_per_bar), -np.inf)
+    transition[states, (states + 1) % beats_per_bar] = np.log(1 - 2 * BEAT_ERROR_PROBABILITY)
+    transition[states, states] = log_error
+    transition[states, (states + 2) % beats_per_bar] = np.logaddexp(
+        transition[states, (states + 2) % beats_per_bar], log_error
+    )
+
+    emission = np.zeros((count, beats_per_bar))
+    emission[:, 0] = accents
+
+    score = emission[0].copy()
+    backpointers = np.zeros((count, beats_per_bar), dtype=int)
+    for beat in range(1, count):
+        candidates = score[:, None] + transition
+        backpointers[beat] = candidates.argmax(axis=0)
+        score = candidates[backpointers[beat], states] + emission[beat]
+
+    positions = np.zeros(count, dtype=int)
+    positions[-1] = int(score.argmax())
+    for beat in range(count - 1, 0, -1):
+        positions[beat - 1] = backpointers[beat, positions[beat]]
+    return positions
+
+
+def _ratio_score(
+    bpm: float,
+    strengths: Optional[np.ndarray],
+    ratio: Fraction,
+    references: List[float],
+    tolerance: float,
+) -> float:
+    """Score of correcting a detected tempo by a detected:true ratio (higher is better)."""
+    limit = np.log1p(tolerance)
+    error = min(abs(np.log(bpm / float(ratio) / reference)) for reference in references)
+    if ratio == 1:
+        # The detected grid stands unless another ratio clearly explains it better
+        return -min((error / limit) ** 2, 1.0)
+    if error > limit:
+        return -np.inf
+    score = -((error / limit) ** 2)
+    score -= RATIO_COMPLEXITY_PENALTY * (ratio.numerator + ratio.denominator - 2)
+    if strengths is not None and len(strengths):
+        # Detected beat i is on the corrected grid when i / ratio is whole
+        on_grid = np.arange(len(strengths)) * ratio.denominator % ratio.numerator == 0
+        if on_grid.all():
+            return score
+        contrast = float(strengths[on_grid].mean() - strengths[~on_grid].mean())
+        if contrast < RATIO_MIN_CONTRAST:
+            return -np.inf
+        score += RATIO_ONSET_WEIGHT * contrast
+    return score
+
+
+def _regrid_positions(beat_info: "BeatInfo", times: np.ndarray) -> Optional[List[int]]:
+    """Bar positions of a resampled beat grid, from the detected downbeats.
+
+    The new beat nearest the first detected downbeat starts bar 0 and the
+    meter (the largest detected position plus one) is counted on from it,
+    so beats before it are a pickup.
+
+    Returns:
+        Position of each new beat, or None if the detected beats have none
+    """
+    positions = beat_info.beat_positions
+    if positions is None or len(positions) != len(beat_info.beat_times) or 0 not in positions:
+        return None
+    beats_per_bar = max(positions) + 1
+    downbeat_time = beat_info.beat_times[beat_info.first_downbeat]
+    first = int(np.abs(times - downbeat_time).argmin())
+    return ((np.arange(len(times)) - first) % beats_per_bar).tolist()
+
+
+def _resample_beats(
+    beat_times: np.ndarray, ratio: Fraction
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Beat grid at 1/ratio times the density, interpolated from the detected beats.
+
+    Returns:
+        (new beat times, mask of new beats on a detected beat, index of the
+        detected beat at or before each new beat)
+    """
+    p, q = ratio.numerator, ratio.denominator
+    count = len(beat_times)
+    # New beat k lies at detected-beat index k * p / q
+    steps = np.arange((count - 1) * q // p + 1) * p
+    positions = steps / q
+    times = np.interp(positions, np.arange(count), beat_times)
+    return times, steps % q == 0, steps // q
+
+
+def filter_beat_outliers(
+    beat_times: np.ndarray,
+    window: int = OUTLIER_WINDOW_BEATS,
+    tolerance: float = INTERVAL_TOLERANCE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Drop spurious beats and fill in missed ones.
+
+    Each interval is compared with the median of the surrounding `window`
+    intervals. A beat that splits a regular interval into two short ones
+    (summing to the local interval within `tolerance`) is dropped; an
+    interval close to a whole number of local intervals (up to
+    MAX_MISSING_BEATS + 1) gets the missing beats spread evenly over it.
+    The first beat is always kept. Other irregular beats are left for
+    beat_regularity to flag.
+
+    Args:
+        beat_times: Beat times in seconds, increasing
+        window: Intervals in the local median (odd)
+        tolerance: Allowed deviation from the local interval, as a fraction
+
+    Returns:
+        (filtered beat times, mask of the beats that were filled in)
+    """
+    times = np.asarray(beat_times, dtype=np.float64)
+    if len(times) < 3:
+        return times, np.zeros(len(times), dtype=bool)
+
+    ratios = _interval_ratios(times, window)
+    splits = (ratios[:-1] < 1.0 - tolerance) & (np.abs(ratios[:-1] + ratios[1:] - 1.0) < tolerance)
+    # Of two overlapping candidates, only the first beat is spurious
+    splits[1:] &= ~splits[:-1]
+    times = np.delete(times, np.flatnonzero(splits) + 1)
+
+    ratios = _interval_ratios(times, window)
+    beats = np.rint(ratios).astype(int)
+    gaps = (
+        (beats >= 2)
+        & (beats <= MAX_MISSING_BEATS + 1)
+        & (np.abs(ratios / np.maximum(beats, 1) - 1.0) < tolerance)
+    )
+    missing = np.where(gaps, beats - 1, 0)
+    if not missing.any():
+        return times, np.zeros(len(times), dtype=bool)
+
+    # Interval each new beat falls in, and its step (1..missing) within it
+    intervals = np.repeat(np.arange(len(missing)), missing)
+    steps = np.arange(len(intervals)) - np.repeat(np.cumsum(missing) - missing, missing) + 1
+    new_times = times[intervals] + (
+        (times[intervals + 1] - times[intervals]) * steps / (missing[intervals] + 1)
+    )
+    filled = np.insert(np.zeros(len(times), dtype=bool), intervals + 1, True)
+    return np.insert(times, intervals + 1, new_times), filled
+
+
+def beat_regularity(
+    beat_times: np.ndarray,
+    window: int = OUTLIER_WINDOW_BEATS,
+) -> np.ndarray:
+    """How well the intervals either side of each beat fit the local interval.
+
+    Args:
+        beat_times: Beat times in seconds, increasing
+        window: Intervals in the local median (odd)
+
+    Returns:
+        1.0 minus the larger relative deviation of the beat's two intervals
+        from the local median interval, clipped to 0.0-1.0 (1.0 for fewer
+        than 3 beats)
+    """
+    times = np.asarray(beat_times, dtype=np.float64)
+    if len(times) < 3:
+        return np.ones(len(times))
+    deviations = np.abs(_interval_ratios(times, window) - 1.0)
+    # Beat i lies between intervals i-1 and i
+    worst = np.maximum(np.append(deviations, 0.0), np.insert(deviations, 0, 0.0))
+    return np.clip(1.0 - worst, 0.0, 1.0)
+
+
+def _interval_ratios(times: np.ndarray, window: int) -> np.ndarray:
+    """Each beat interval divided by the median interval around it."""
+    from scipy.ndimage import median_filter
+
+    intervals = np.diff(times)
+    local = median_filter(intervals, size=min(window, len(intervals)), mode="nearest")
+    return intervals / np.maximum(local, 1e-9)
+
+
+def _standardize(values: np.ndarray) -> np.ndarray:
+    """Scale to zero mean and unit variance (zeros if constant)."""
+    deviation = values.std()
+    if deviation < 1e-9:
+        return np.zeros_like(values, dtype=float)
+    return (values - values.mean()) / deviation
@@ -5,16 +5,19 @@ enabling adaptive sync point placement for better alignment throughout songs
 with tempo variation.
 """
 
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 from statistics import median
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 from loguru import logger
 
 from guitarprotool.core.beat_detector import SyncPointData
 from guitarprotool.utils.exceptions import DriftAnalysisError, InsufficientBeatsError
+from guitarprotool.utils.tables import Table, format_rows, table_chunks, write_table
 
 
 class DriftSeverity(Enum):
@@ -27,7 +30,36 @@ class DriftSeverity(Enum):
     SEVERE = "severe"  # > 10% drift
 
 
-@dataclass
+# Absolute drift percentages at which each severity above STABLE begins
+SEVERITY_LIMITS = (1.0, 3.0, 5.0, 10.0)
+
+# Bars in the first chunk scanned after a candidate sync bar; later chunks double
+SCAN_CHUNK_BARS = 32
+
+# Bar-by-bar section of the text report: column -> format
+BAR_TEXT_FORMATS = {
+    "bar": "%6d",
+    "expected_time": "%10.3f",
+    "actual_time": "%10.3f",
+    "local_tempo": "%10.2f",
+    "drift_percent": "%+10.2f",
+    "severity": "%12s",
+    "sync_marker": "%s",
+}
+
+# Beat-by-beat section of the debug file: column -> format ("-" for missing)
+BEAT_TEXT_FORMATS = {
+    "beat": "%6d",
+    "time": "%12.4f",
+    "relative_time": "%12.4f",
+    "interval": "%10.4f",
+    "instant_bpm": "%10.2f",
+    "bar": "%6d",
+    "beat_in_bar": "%12d",
+}
+
+
+@dataclass(slots=True)
 class BarDriftInfo:
     """Drift information for a specific bar.
 
@@ -60,17 +92,7 @@ class BarDriftInfo:
     @property
     def severity(self) -> DriftSeverity:
         """Classification of drift severity."""
-        abs_drift = abs(self.drift_percent)
-        if abs_drift < 1.0:
-            return DriftSeverity.STABLE
-        elif abs_drift < 3.0:
-            return DriftSeverity.MINOR
-        elif abs_drift < 5.0:
-            return DriftSeverity.MODERATE
-        elif abs_drift < 10.0:
-            return DriftSeverity.SIGNIFICANT
-        else:
-            return DriftSeverity.SEVERE
+        return list(DriftSeverity)[bisect_right(SEVERITY_LIMITS, abs(self.drift_percent))]
 
 
 @dataclass
@@ -89,6 +111,7 @@ class DriftReport:
         tempo_corrected: Whether tempo correction was applied
         original_detected_bpm: Originally detected BPM before correction
         corrected_bpm: BPM after correction (same as original if no correction)
+        tempo_ratio: Detected:true beat ratio corrected for (e.g. "3:2")
     """
 
     bar_drifts: List[BarDriftInfo]
@@ -103,6 +126,7 @@ class DriftReport:
     tempo_corrected: bool = False
     original_detected_bpm: Optional[float] = None
     corrected_bpm: Optional[float] = None
+    tempo_ratio: Optional[str] = None
     # Sync point placement info
     bars_with_sync_points: List[int] = None  # type: ignore
 
@@ -121,21 +145,89 @@ class DriftReport:
             f"Recommended sync interval: every {self.recommended_sync_interval} bar(s)",
         ]
         if self.tempo_corrected and self.original_detected_bpm and self.corrected_bpm:
+            ratio = f" ({self.tempo_ratio} grid)" if self.tempo_ratio else ""
             lines.append(
-                f"Tempo correction: {self.original_detected_bpm:.1f} -> {self.corrected_bpm:.1f} BPM"
+                f"Tempo correction: {self.original_detected_bpm:.1f} -> "
+                f"{self.corrected_bpm:.1f} BPM{ratio}"
             )
         if self.bars_with_significant_drift:
             lines.append(f"Bars needing attention: {len(self.bars_with_significant_drift)}")
         return lines
 
+    def _correction_type(self) -> str:
+        """Describe the tempo correction for the report."""
+        if self.tempo_ratio == "2:1":
+            return "Double-time (halved)"
+        if self.tempo_ratio == "1:2":
+            return "Half-time (doubled)"
+        if self.tempo_ratio:
+            return f"{self.tempo_ratio} grid (detected:true beats)"
+        if self.corrected_bpm and self.original_detected_bpm:
+            if self.corrected_bpm > self.original_detected_bpm:
+                return "Half-time (doubled)"
+            return "Double-time (halved)"
+        return "Unknown"
+
+    def bar_table(self) -> Table:
+        """Per-bar drift data as columns.
+
+        Returns:
+            Table with columns bar, expected_time, actual_time, local_tempo,
+            original_tempo, drift_percent, severity and sync_point (whether a
+            sync point was placed at the bar)
+        """
+        drifts = self.bar_drifts
+        bars = np.fromiter((d.bar for d in drifts), dtype=np.int64, count=len(drifts))
+        local_tempo = np.fromiter((d.local_tempo for d in drifts), dtype=float, count=len(drifts))
+        original_tempo = np.fromiter(
+            (d.original_tempo for d in drifts), dtype=float, count=len(drifts)
+        )
+        valid = original_tempo > 0
+        drift_percent = np.zeros(len(drifts))
+        drift_percent[valid] = (local_tempo[valid] / original_tempo[valid] - 1.0) * 100
+        severity_names = np.array([severity.value for severity in DriftSeverity])
+        return {
+            "bar": bars,
+            "expected_time": np.fromiter(
+                (d.expected_time for d in drifts), dtype=float, count=len(drifts)
+            ),
+            "actual_time": np.fromiter(
+                (d.actual_time for d in drifts), dtype=float, count=len(drifts)
+            ),
+            "local_tempo": local_tempo,
+            "original_tempo": original_tempo,
+            "drift_percent": drift_percent,
+            "severity": severity_names[
+                np.digitize(np.abs(drift_percent), SEVERITY_LIMITS, right=False)
+            ],
+            "sync_point": np.isin(bars, self.bars_with_sync_points or []),
+        }
+
+    def export(self, file_path: Path | str, table_format: Optional[str] = None) -> Path:
+        """Export the per-bar drift data (see bar_table) as CSV, TSV, JSON Lines,
+        Parquet or Arrow.
+
+        Args:
+            file_path: Output file
+            table_format: Export format; None picks it from the file suffix
+
+        Returns:
+            Path written
+
+        Raises:
+            ConfigurationError: If the format is unknown or needs pyarrow
+        """
+        return write_table(self.bar_table(), file_path, table_format)
+
     def write_to_file(self, file_path: str) -> None:
         """Write detailed drift report to a file.
 
+        The bar-by-bar section is formatted from bar_table in chunks and
+        streamed to the file.
+
         Args:
             file_path: Path to write the report file
         """
-        from pathlib import Path
-
         output_path = Path(file_path)
 
         lines = [
@@ -152,7 +244,7 @@ class DriftReport:
                 "-" * 40,
                 f"Original detected BPM: {self.original_detected_bpm:.1f}",
                 f"Corrected BPM:         {self.corrected_bpm:.1f}",
-                f"Correction type:       {'Half-time (doubled)' if self.corrected_bpm > self.original_detected_bpm else 'Double-time (halved)'}",
+                f"Correction type:       {self._correction_type()}",
                 "",
             ])
         else:
@@ -181,16 +273,7 @@ class DriftReport:
             "-" * 80,
         ])
 
-        sync_point_set = set(self.bars_with_sync_points) if self.bars_with_sync_points else set()
-        for drift in self.bar_drifts:
-            has_sync = "<<SYNC" if drift.bar in sync_point_set else ""
-            lines.append(
-                f"{drift.bar:>6} | {drift.expected_time:>10.3f} | {drift.actual_time:>10.3f} | "
-                f"{drift.local_tempo:>10.2f} | {drift.drift_percent:>+10.2f} | "
-                f"{drift.severity.value:>12} | {has_sync}"
-            )
-
-        lines.extend([
+        legend = [
             "",
             "=" * 70,
             "LEGEND",
@@ -209,12 +292,197 @@ class DriftReport:
             "  SEVERE:      > 10% drift",
             "",
             "=" * 70,
-        ])
+        ]
 
-        output_path.write_text("\n".join(lines))
+        table = self.bar_table()
+        table["sync_marker"] = np.where(table["sync_point"], "<<SYNC", "")
+        with open(output_path, "w", encoding="utf-8") as out:
+            out.write("\n".join(lines))
+            for chunk in table_chunks(table):
+                out.write("\n" + "\n".join(format_rows(chunk, BAR_TEXT_FORMATS, " | ")))
+            out.write("\n" + "\n".join(legend))
         logger.info(f"Drift report written to: {output_path}")
 
 
+def min_sync_anchors(
+    bar_times: np.ndarray, max_error: float, bars: Optional[np.ndarray] = None
+) -> List[int]:
+    """Fewest sync points keeping every bar within max_error of its detected time.
+
+    Between consecutive sync points playback runs at one tempo, so bar
+    times are interpolated linearly between the two sync bars' detected
+    times; after the last sync point the tempo is free and runs to the
+    last bar. Sync bars are indices into bar_times, starting with 0.
+
+    For each candidate sync bar a, scanning forward keeps the range of
+    tempos that fit every bar so far (the intersection of one slope
+    interval per bar). A segment a..b is feasible when the slope through
+    bar b lies in that range, and the scan stops in the chunk where the
+    range becomes empty (see _scan_segment). The shortest-path pass costs
+    O(n·L) when every sync bar's segment reaches at most L bars, counting
+    segments that run to the last bar; with a bound so loose that most bars
+    can reach the end, that is O(n²).
+
+    Args:
+        bar_times: Detected time of each bar in seconds, increasing
+        max_error: Largest allowed error per bar in seconds
+        bars: Bar number of each time, increasing (default: consecutive bars)
+
+    Returns:
+        Indices into bar_times of the sync bars, ascending
+    """
+    n = len(bar_times)
+    bars = np.arange(n) if bars is None else np.asarray(bars)
+    # count[a]: sync points needed from bar a on, given a sync point at a
+    count = np.zeros(n, dtype=int)
+    next_anchor: List[Optional[int]] = [None] * n
+    # Neighbouring sync bars reach similarly far, so size the first chunk
+    # from the last reach to usually finish in one
+    chunk = SCAN_CHUNK_BARS
+    for anchor in range(n - 1, -1, -1):
+        ends, tail = _scan_segment(bar_times, bars, anchor, max_error, chunk)
+        if len(ends):
+            chunk = max(SCAN_CHUNK_BARS, 2 * int(ends[-1] - anchor))
+        if tail is not None:
+            count[anchor] = 1
+            continue
+        # A segment to the very next bar always fits, so ends is never empty.
+        # Of the ends needing fewest sync points, take the farthest.
+        fewest = np.flatnonzero(count[ends] == count[ends].min())
+        best = int(ends[fewest[-1]])
+        count[anchor] = count[best] + 1
+        next_anchor[anchor] = best
+
+    anchors = [0]
+    while next_anchor[anchors[-1]] is not None:
+        anchors.append(next_anchor[anchors[-1]])  # type: ignore[arg-type]
+    return anchors
+
+
+def budget_sync_anchors(
+    bar_times: np.ndarray,
+    max_points: int,
+    bars: Optional[np.ndarray] = None,
+    tolerance: float = 5e-4,
+) -> Tuple[List[int], float]:
+    """Place at most max_points sync points to minimise the largest bar error.
+
+    Binary-searches the error bound with min_sync_anchors, which is
+    monotone in the bound. The search starts from the error of max_points
+    evenly spaced sync points, which is already close to the optimum, so
+    the loose bounds that let most segments run to the last bar (the
+    expensive case for min_sync_anchors) are never tried.
+
+    Args:
+        bar_times: Detected time of each bar in seconds, increasing
+        max_points: Number of sync points available (at least 1)
+        bars: Bar number of each time, increasing (default: consecutive bars)
+        tolerance: Precision of the error bound in seconds
+
+    Returns:
+        (sync bar indices, error bound in seconds they achieve)
+    """
+    # One sync point at the overall mean tempo bounds the error from above
+    bars = np.arange(len(bar_times)) if bars is None else np.asarray(bars)
+    mean_slope = (bar_times[-1] - bar_times[0]) / max(bars[-1] - bars[0], 1)
+    drift = bar_times - (bar_times[0] + mean_slope * (bars - bars[0]))
+    error = float(np.max(np.abs(drift)))
+    if max_points > 1:
+        # So do evenly spaced sync points ending on the last bar
+        spaced = np.unique(np.linspace(0, len(bar_times) - 1, max_points).round().astype(int))
+        interpolated = np.interp(bars, bars[spaced], bar_times[spaced])
+        error = min(error, float(np.max(np.abs(bar_times - interpolated))))
+    low, high = 0.0, max(tolerance, error)
+    anchors = min_sync_anchors(bar_times, high, bars)
+    while high - low > tolerance:
+        middle = (low + high) / 2
+        candidate = min_sync_anchors(bar_times, middle, bars)
+        if len(candidate) <= max_points:
+            high, anchors = middle, candidate
+        else:
+            low = middle
+    return anchors, high
+
+
+def segment_slopes(
+    bar_times: np.ndarray,
+    anchors: List[int],
+    max_error: float,
+    bars: Optional[np.ndarray] = None,
+) -> List[float]:
+    """Seconds per bar of the segment starting at each sync bar.
+
+    Segments between sync bars join their detected times; the last segment
+    takes the middle of the slopes that keep its bars within max_error.
+
+    Args:
+        bar_times: Detected time of each bar in seconds
+        anchors: Sync bar indices placed with max_error
+        max_error: Error bound the anchors were placed with, in seconds
+        bars: Bar number of each time, increasing (default: consecutive bars)
+
+    Returns:
+        One slope per sync bar
+    """
+    bars = np.arange(len(bar_times)) if bars is None else np.asarray(bars)
+    slopes = [
+        float(bar_times[end] - bar_times[start]) / float(bars[end] - bars[start])
+        for start, end in zip(anchors, anchors[1:])
+    ]
+    _, tail = _scan_segment(bar_times, bars, anchors[-1], max_error)
+    if tail is None or anchors[-1] == len(bar_times) - 1:
+        # Nothing to fit after the last sync bar: keep the previous tempo
+        slopes.append(slopes[-1] if slopes else 0.0)
+    else:
+        slopes.append(float(tail[0] + tail[1]) / 2)
+    return slopes
+
+
+def _scan_segment(
+    bar_times: np.ndarray,
+    bars: np.ndarray,
+    anchor: int,
+    max_error: float,
+    chunk: int = SCAN_CHUNK_BARS,
+) -> Tuple[np.ndarray, Optional[Tuple[float, float]]]:
+    """Feasible segments starting at a sync bar.
+
+    The bars after the anchor are scanned in chunks, starting with chunk
+    bars and doubling, carrying the slope range across chunks; the scan
+    stops in the chunk where the range becomes empty. A segment reaching at
+    most L bars therefore costs O(L + chunk) rather than the length of the
+    whole suffix.
+
+    Returns:
+        (indices that can hold the next sync point, slope range fitting every
+        bar to the end, or None if the segment cannot reach the last bar)
+    """
+    count = len(bar_times)
+    ends = []
+    # Slope range fitting every bar scanned so far
+    low, high = -np.inf, np.inf
+    start, size = anchor + 1, chunk
+    while start < count:
+        stop = min(count, start + size)
+        spans = (bars[start:stop] - bars[anchor]).astype(np.float64)
+        slopes = (bar_times[start:stop] - bar_times[anchor]) / spans
+        # Slope range fitting every bar up to and including each end
+        lows = np.maximum.accumulate(np.maximum(slopes - max_error / spans, low))
+        highs = np.minimum.accumulate(np.minimum(slopes + max_error / spans, high))
+        empty = np.flatnonzero(lows > highs)
+        reach = int(empty[0]) if len(empty) else len(spans)
+        # An end fits when its own slope lies in the range of the bars before it
+        before_low = np.concatenate(([low], lows[:-1]))[:reach]
+        before_high = np.concatenate(([high], highs[:-1]))[:reach]
+        fits = (before_low <= slopes[:reach]) & (slopes[:reach] <= before_high)
+        ends.append(start + np.flatnonzero(fits))
+        if len(empty):
+            return np.concatenate(ends), None
+        low, high = float(lows[-1]), float(highs[-1])
+        start, size = stop, size * 2
+    return np.concatenate(ends) if ends else np.array([], dtype=int), (low, high)
+
+
 class DriftAnalyzer:
     """Analyzes tempo drift between audio and tab notation.
 
@@ -228,7 +496,7 @@ class DriftAnalyzer:
         >>> sync_points = analyzer.generate_adaptive_sync_points(max_bars=100)
 
     Attributes:
-        beat_times: List of detected beat times in seconds from audio
+        beat_times: Detected beat times in seconds from audio (float64 array)
         original_tempo: Tab tempo in BPM
         beats_per_bar: Beats per bar (4 for 4/4 time)
         sample_rate: Audio sample rate (default 44100)
@@ -243,22 +511,32 @@ class DriftAnalyzer:
 
     def __init__(
         self,
-        beat_times: List[float],
+        beat_times: Sequence[float],
         original_tempo: float,
         beats_per_bar: int = 4,
         sample_rate: int = DEFAULT_SAMPLE_RATE,
         tab_start_bar: int = 0,
+        beat_positions: Optional[List[int]] = None,
+        reliable_beats: Optional[Sequence[bool]] = None,
     ):
         """Initialize DriftAnalyzer.
 
         Args:
-            beat_times: List of detected beat times in seconds from audio
+            beat_times: Detected beat times in seconds from audio
             original_tempo: Tab tempo in BPM
             beats_per_bar: Beats per bar (4 for 4/4 time)
             sample_rate: Audio sample rate (default 44100)
             tab_start_bar: Bar number where notes begin in the tab (0-indexed).
                           This aligns the first detected beat with this bar instead of bar 0.
                           Used when tabs have intro bars before the actual music starts.
+            beat_positions: Position of each beat in its bar (0 = downbeat), from
+                          downbeat detection. When given, bar N maps to the Nth
+                          downbeat instead of beat N*beats_per_bar, so an extra or
+                          missed beat only affects the bar it occurs in.
+            reliable_beats: Whether each beat's timing can be trusted (see
+                          BeatInfo.reliable). Bars starting on unreliable beats
+                          are left out of drift statistics and sync point
+                          placement, and unreliable intervals out of local tempos.
 
         Raises:
             InsufficientBeatsError: If not enough beats for analysis
@@ -268,7 +546,7 @@ class DriftAnalyzer:
                 f"Need at least 4 beats for drift analysis, got {len(beat_times)}"
             )
 
-        self.beat_times = beat_times
+        self.beat_times = np.asarray(beat_times, dtype=np.float64)
         self.original_tempo = original_tempo
         self.beats_per_bar = beats_per_bar
         self.sample_rate = sample_rate
@@ -278,8 +556,32 @@ class DriftAnalyzer:
         self.expected_beat_interval = 60.0 / original_tempo
         self.expected_bar_duration = self.expected_beat_interval * beats_per_bar
 
-        # First beat time is our reference point (aligns with tab_start_bar)
-        self.first_beat_time = beat_times[0]
+        # Beat index of each bar's downbeat; beats before the first one are a
+        # pickup and belong to no bar
+        self.downbeat_indices: Optional[List[int]] = None
+        if beat_positions is not None:
+            if len(beat_positions) == len(beat_times):
+                downbeats = [i for i, position in enumerate(beat_positions) if position == 0]
+                self.downbeat_indices = downbeats or None
+            else:
+                logger.warning(
+                    f"Ignoring beat positions: {len(beat_positions)} positions "
+                    f"for {len(beat_times)} beats"
+                )
+
+        # The first bar's start is our reference point (aligns with tab_start_bar)
+        first_bar_beat = self.downbeat_indices[0] if self.downbeat_indices else 0
+        self.first_beat_time = beat_times[first_bar_beat]
+
+        self.reliable_beats: Optional[List[bool]] = None
+        if reliable_beats is not None:
+            if len(reliable_beats) == len(beat_times):
+                self.reliable_beats = [bool(reliable) for reliable in reliable_beats]
+            else:
+                logger.warning(
+                    f"Ignoring beat reliability: {len(reliable_beats)} flags "
+                    f"for {len(beat_times)} beats"
+                )
 
         logger.debug(
             f"DriftAnalyzer initialized: tempo={original_tempo}, "
@@ -304,11 +606,18 @@ class DriftAnalyzer:
         bar_drifts: List[BarDriftInfo] = []
         abs_drift_values: List[float] = []
 
+        unreliable_bars = 0
         for bar in range(max_bars):
             drift_info = self.get_drift_at_bar(bar)
-            if drift_info is not None:
-                bar_drifts.append(drift_info)
-                abs_drift_values.append(abs(drift_info.drift_percent))
+            if drift_info is None:
+                continue
+            if not self._is_reliable_bar(bar):
+                unreliable_bars += 1
+                continue
+            bar_drifts.append(drift_info)
+            abs_drift_values.append(abs(drift_info.drift_percent))
+        if unreliable_bars:
+            logger.info(f"Skipped {unreliable_bars} bars starting on unreliable beats")
 
         if not bar_drifts:
             # No bars could be analyzed
@@ -379,6 +688,9 @@ class DriftAnalyzer:
         maps bar N to beat N*beats_per_bar, regardless of tempo differences between
         the audio and tab.
 
+        When downbeats are known (beat_positions), bar N maps to the Nth downbeat
+        in either case.
+
         Args:
             bar: Bar number (0-indexed)
 
@@ -393,18 +705,9 @@ class DriftAnalyzer:
         bars_from_start = bar - self.tab_start_bar
         expected_time = bars_from_start * self.expected_bar_duration
 
-        if self.tab_start_bar > 0:
-            # For tabs with intro bars, use nearest-beat matching
-            # This handles alignment when first detected beat is at tab_start_bar
-            beat_idx = self._find_nearest_beat_to_expected(bars_from_start)
-            if beat_idx is None:
-                return None
-        else:
-            # Default: use direct indexing (bar N -> beat N*beats_per_bar)
-            # This correctly maps bars to beats even when audio tempo differs from tab
-            beat_idx = bars_from_start * self.beats_per_bar
-            if beat_idx >= len(self.beat_times):
-                return None
+        beat_idx = self._bar_beat_index(bar)
+        if beat_idx is None:
+            return None
 
         # Actual time relative to first beat
         actual_time = self.beat_times[beat_idx] - self.first_beat_time
@@ -441,10 +744,9 @@ class DriftAnalyzer:
             return self.original_tempo
 
         # Find beat index for this bar (adjusted for tab_start_bar)
-        bars_from_start = bar - self.tab_start_bar
-        beat_index = bars_from_start * self.beats_per_bar
+        beat_index = self._beat_index_for_bar(bar - self.tab_start_bar)
 
-        if beat_index >= len(self.beat_times):
+        if beat_index is None:
             # Beyond detected beats, return original tempo
             return self.original_tempo
 
@@ -461,6 +763,13 @@ class DriftAnalyzer:
         if len(intervals) == 0:
             return self.original_tempo
 
+        if self.reliable_beats is not None:
+            # Keep intervals between two reliable beats, if there are any
+            reliable = np.array(self.reliable_beats[start_idx:end_idx])
+            trusted = reliable[:-1] & reliable[1:]
+            if trusted.any():
+                intervals = intervals[trusted]
+
         median_interval = median(intervals.tolist())
         if median_interval <= 0:
             return self.original_tempo
@@ -471,6 +780,8 @@ class DriftAnalyzer:
         self,
         max_bars: int,
         base_interval: int = 4,
+        max_error_ms: Optional[float] = None,
+        max_sync_points: Optional[int] = None,
     ) -> List[SyncPointData]:
         """Generate sync points with adaptive frequency based on drift.
 
@@ -478,6 +789,14 @@ class DriftAnalyzer:
         where tempo is stable. Each sync point includes the calculated
         modified_tempo for that position.
 
+        By default sync points follow fixed rules (base interval, drift
+        threshold, maximum spacing). Given max_error_ms and/or
+        max_sync_points, they are instead placed by fitting a piecewise-
+        constant tempo to the detected bar times: the fewest sync points
+        keeping every bar within max_error_ms, or the placement with the
+        smallest worst-case error using at most max_sync_points. With both,
+        the budget wins when the bound would need more sync points.
+
         When tab_start_bar > 0, an intro sync point is added at bar 0 with a
         stretched tempo that makes bars 0 through (tab_start_bar-1) cover the
         audio intro duration (first_beat_time seconds).
@@ -485,12 +804,19 @@ class DriftAnalyzer:
         Args:
             max_bars: Maximum bar number from GP file
             base_interval: Base interval between sync points (bars)
+            max_error_ms: Largest timing error allowed at any bar, in milliseconds
+            max_sync_points: Most sync points to place after the intro
 
         Returns:
             List of SyncPointData with adaptive placement and tempo values
         """
-        # Find optimal sync point positions
-        positions = self._find_sync_point_positions(max_bars, base_interval)
+        tempos: Dict[int, float] = {}
+        if max_error_ms is None and max_sync_points is None:
+            positions = self._find_sync_point_positions(max_bars, base_interval)
+        else:
+            positions, tempos = self._find_optimal_sync_points(
+                max_bars, max_error_ms, max_sync_points
+            )
 
         sync_points: List[SyncPointData] = []
 
@@ -517,7 +843,7 @@ class DriftAnalyzer:
             )
 
         for bar in positions:
-            local_tempo = self.calculate_local_tempo_at_bar(bar)
+            local_tempo = tempos.get(bar) or self.calculate_local_tempo_at_bar(bar)
             frame_offset = self._calculate_frame_offset_for_bar(bar)
 
             sync_point = SyncPointData(
@@ -536,17 +862,72 @@ class DriftAnalyzer:
         logger.success(f"Generated {len(sync_points)} adaptive sync points")
         return sync_points
 
+    def beat_table(self) -> Table:
+        """Per-beat detection data as columns.
+
+        Returns:
+            Table with columns beat, time, relative_time (from the start of
+            bar 0), interval and instant_bpm (NaN for the first beat), bar
+            (-1 for pickup beats) and beat_in_bar, plus reliable when beat
+            reliability is known
+        """
+        times = self.beat_times
+        beats = np.arange(len(times))
+        intervals = np.concatenate(([np.nan], np.diff(times)))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            instant_bpm = np.where(intervals > 0, 60.0 / intervals, 0.0)
+        instant_bpm[0] = np.nan
+        if self.downbeat_indices is not None:
+            downbeats = np.asarray(self.downbeat_indices)
+            bars = np.searchsorted(downbeats, beats, side="right") - 1
+            # Pickup beats get bar -1, counted back from the first downbeat
+            beat_in_bar = np.where(
+                bars >= 0,
+                beats - downbeats[np.maximum(bars, 0)],
+                beats - downbeats[0] + self.beats_per_bar,
+            )
+        else:
+            bars, beat_in_bar = np.divmod(beats, self.beats_per_bar)
+        table = {
+            "beat": beats,
+            "time": times,
+            "relative_time": times - self.first_beat_time,
+            "interval": intervals,
+            "instant_bpm": instant_bpm,
+            "bar": bars,
+            "beat_in_bar": beat_in_bar,
+        }
+        if self.reliable_beats is not None:
+            table["reliable"] = np.asarray(self.reliable_beats, dtype=bool)
+        return table
+
+    def export_beats(self, file_path: Path | str, table_format: Optional[str] = None) -> Path:
+        """Export the per-beat data (see beat_table) as CSV, TSV, JSON Lines,
+        Parquet or Arrow.
+
+        Args:
+            file_path: Output file
+            table_format: Export format; None picks it from the file suffix
+
+        Returns:
+            Path written
+
+        Raises:
+            ConfigurationError: If the format is unknown or needs pyarrow
+        """
+        return write_table(self.beat_table(), file_path, table_format)
+
     def write_debug_beats(self, file_path: str) -> None:
         """Write detailed beat detection data for debugging.
 
         Outputs raw beat times, intervals, and calculated BPMs for each beat.
-        This is useful for diagnosing beat detection accuracy issues.
+        This is useful for diagnosing beat detection accuracy issues. The
+        beat-by-beat section is formatted from beat_table in chunks and
+        streamed to the file.
 
         Args:
             file_path: Path to write the debug file
         """
-        from pathlib import Path
-
         output_path = Path(file_path)
         lines = [
             "=" * 80,
@@ -567,37 +948,17 @@ class DriftAnalyzer:
             "-" * 90,
         ]
 
-        prev_time = None
-        for i, beat_time in enumerate(self.beat_times):
-            rel_time = beat_time - self.first_beat_time
-            bar = i // self.beats_per_bar
-            beat_in_bar = i % self.beats_per_bar
-
-            if prev_time is not None:
-                interval = beat_time - prev_time
-                inst_bpm = 60.0 / interval if interval > 0 else 0
-                interval_str = f"{interval:.4f}"
-                bpm_str = f"{inst_bpm:.2f}"
-            else:
-                interval_str = "-"
-                bpm_str = "-"
-
-            lines.append(
-                f"{i:>6} | {beat_time:>12.4f} | {rel_time:>12.4f} | {interval_str:>10} | "
-                f"{bpm_str:>10} | {bar:>6} | {beat_in_bar:>12}"
-            )
-            prev_time = beat_time
-
-        # Add summary statistics
+        table = self.beat_table()
+        statistics = []
         if len(self.beat_times) >= 2:
-            intervals = np.diff(self.beat_times)
+            intervals = table["interval"][1:]
             avg_interval = np.mean(intervals)
             std_interval = np.std(intervals)
             min_interval = np.min(intervals)
             max_interval = np.max(intervals)
             avg_bpm = 60.0 / avg_interval if avg_interval > 0 else 0
 
-            lines.extend([
+            statistics = [
                 "",
                 "=" * 80,
                 "INTERVAL STATISTICS",
@@ -613,11 +974,60 @@ class DriftAnalyzer:
                 f"Deviation from expected: {(avg_interval - self.expected_beat_interval):.4f}s "
                 f"({((avg_interval - self.expected_beat_interval) / self.expected_beat_interval * 100):.2f}%)",
                 "",
-            ])
-
-        output_path.write_text("\n".join(lines))
+            ]
+
+        with open(output_path, "w", encoding="utf-8") as out:
+            out.write("\n".join(lines))
+            for chunk in table_chunks(table):
+                rows = format_rows(chunk, BEAT_TEXT_FORMATS, " | ", missing="-")
+                out.write("\n" + "\n".join(rows))
+            if statistics:
+                out.write("\n" + "\n".join(statistics))
         logger.info(f"Debug beat data written to: {output_path}")
 
+    def _bar_beat_index(self, bar: int) -> Optional[int]:
+        """Find the beat a bar is measured at.
+
+        Args:
+            bar: Bar number (0-indexed, at or after tab_start_bar)
+
+        Returns:
+            Index into beat_times, or None if beyond audio
+        """
+        bars_from_start = bar - self.tab_start_bar
+        if self.tab_start_bar > 0 and self.downbeat_indices is None:
+            # For tabs with intro bars, use nearest-beat matching
+            # This handles alignment when first detected beat is at tab_start_bar
+            return self._find_nearest_beat_to_expected(bars_from_start)
+        # Default: the bar's downbeat (bar N -> beat N*beats_per_bar without
+        # downbeat labels). This correctly maps bars to beats even when audio
+        # tempo differs from tab
+        return self._beat_index_for_bar(bars_from_start)
+
+    def _is_reliable_bar(self, bar: int) -> bool:
+        """Whether a bar's beat can be trusted (True when reliability is unknown)."""
+        if self.reliable_beats is None:
+            return True
+        beat_idx = self._bar_beat_index(bar)
+        return beat_idx is not None and self.reliable_beats[beat_idx]
+
+    def _beat_index_for_bar(self, bars_from_start: int) -> Optional[int]:
+        """Find the beat that starts a bar.
+
+        Args:
+            bars_from_start: Number of bars from tab_start_bar (0 = first bar with notes)
+
+        Returns:
+            Index into beat_times of the bar's downbeat, or None if beyond audio
+        """
+        if self.downbeat_indices is not None:
+            if bars_from_start < len(self.downbeat_indices):
+                return self.downbeat_indices[bars_from_start]
+            return None
+
+        beat_idx = bars_from_start * self.beats_per_bar
+        return beat_idx if beat_idx < len(self.beat_times) else None
+
     def _find_nearest_beat_to_expected(self, bars_from_start: int) -> Optional[int]:
         """Find the beat index nearest to the expected bar position.
 
@@ -632,7 +1042,7 @@ class DriftAnalyzer:
         Returns:
             Index into beat_times of the nearest beat, or None if beyond audio
         """
-        if not self.beat_times:
+        if not len(self.beat_times):
             return None
 
         # Calculate expected absolute time for this bar
@@ -709,7 +1119,11 @@ class DriftAnalyzer:
             # Check if drift threshold exceeded (and min interval passed)
             if bars_since_last >= self.MIN_SYNC_INTERVAL:
                 drift_info = self.get_drift_at_bar(bar)
-                if drift_info and abs(drift_info.drift_percent) >= self.DRIFT_THRESHOLD_PERCENT:
+                if (
+                    drift_info
+                    and abs(drift_info.drift_percent) >= self.DRIFT_THRESHOLD_PERCENT
+                    and self._is_reliable_bar(bar)
+                ):
                     positions.append(bar)
                     last_sync_bar = bar
                     continue
@@ -721,6 +1135,71 @@ class DriftAnalyzer:
 
         return positions
 
+    def _find_optimal_sync_points(
+        self,
+        max_bars: int,
+        max_error_ms: Optional[float],
+        max_sync_points: Optional[int],
+    ) -> Tuple[List[int], Dict[int, float]]:
+        """Place sync points by fitting a piecewise-constant tempo to the bars.
+
+        Bars from tab_start_bar with a detected beat are fitted, skipping
+        those on unreliable beats (the first bar always starts a sync point);
+        later bars play on at the last sync point's tempo.
+
+        Args:
+            max_bars: Maximum bar number
+            max_error_ms: Largest timing error allowed at any bar (None = no bound)
+            max_sync_points: Most sync points to place (None = no budget)
+
+        Returns:
+            (bar numbers of the sync points, modified tempo for each of them)
+        """
+        bars: List[int] = []
+        times: List[float] = []
+        for bar in range(self.tab_start_bar, max_bars):
+            beat_idx = self._bar_beat_index(bar)
+            if beat_idx is None:
+                break
+            if times and (
+                not self._is_reliable_bar(bar) or self.beat_times[beat_idx] <= times[-1]
+            ):
+                continue
+            bars.append(bar)
+            times.append(self.beat_times[beat_idx])
+        if len(bars) < 2:
+            return [self.tab_start_bar], {}
+
+        bar_times = np.asarray(times)
+        bar_numbers = np.asarray(bars)
+        anchors: List[int] = []
+        max_error = 0.0
+        if max_error_ms is not None:
+            max_error = max_error_ms / 1000.0
+            anchors = min_sync_anchors(bar_times, max_error, bar_numbers)
+        if max_sync_points is not None and (not anchors or len(anchors) > max_sync_points):
+            if anchors:
+                logger.warning(
+                    f"{len(anchors)} sync points needed for {max_error_ms:g} ms, "
+                    f"limited to {max_sync_points}"
+                )
+            anchors, max_error = budget_sync_anchors(
+                bar_times, max(1, max_sync_points), bar_numbers
+            )
+
+        tempos = {
+            bars[anchor]: self.original_tempo * self.expected_bar_duration / slope
+            for anchor, slope in zip(
+                anchors, segment_slopes(bar_times, anchors, max_error, bar_numbers)
+            )
+            if slope > 0
+        }
+        logger.info(
+            f"Optimal sync placement: {len(anchors)} sync points for {len(bars)} bars, "
+            f"max error {max_error * 1000:.1f} ms"
+        )
+        return [bars[anchor] for anchor in anchors], tempos
+
     def _calculate_frame_offset_for_bar(self, bar: int) -> int:
         """Calculate audio frame offset for a given bar.
 
@@ -753,9 +1232,13 @@ class DriftAnalyzer:
                 absolute_time = self.first_beat_time - (bars_before_music * self.expected_bar_duration)
                 return int(max(0, absolute_time) * self.sample_rate)
 
-            # Use nearest-beat matching for robustness against false beats
+            # Use the bar's downbeat when known, otherwise nearest-beat matching
+            # for robustness against false beats
             adjusted_bar = bar - self.tab_start_bar
-            nearest_beat_idx = self._find_nearest_beat_to_expected(adjusted_bar)
+            if self.downbeat_indices is not None:
+                nearest_beat_idx = self._beat_index_for_bar(adjusted_bar)
+            else:
+                nearest_beat_idx = self._find_nearest_beat_to_expected(adjusted_bar)
 
             if nearest_beat_idx is not None:
                 # Use ABSOLUTE audio position (not relative to first beat)
@@ -769,11 +1252,11 @@ class DriftAnalyzer:
             # Default behavior: frame offsets are RELATIVE to first beat (bar 0 = 0)
             # Combined with negative FramePadding, this aligns bar 0 with first beat
 
-            # Use direct indexing (bar N -> beat N*beats_per_bar)
+            # Use the bar's downbeat (bar N -> beat N*beats_per_bar without labels)
             # This correctly maps bars to beats even when audio tempo differs from tab
-            beat_idx = bar * self.beats_per_bar
+            beat_idx = self._beat_index_for_bar(bar)
 
-            if beat_idx < len(self.beat_times):
+            if beat_idx is not None:
                 # Calculate time RELATIVE to first beat (bar 0 = 0)
                 relative_time = self.beat_times[beat_idx] - self.first_beat_time
                 return int(relative_time * self.sample_rate)
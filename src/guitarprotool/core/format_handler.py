@@ -9,8 +9,13 @@ For audio injection, files are converted to GP8 format since that's the only
 format supporting embedded audio tracks.
 """
 
+import re
 import shutil
+import struct
 import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Optional
@@ -25,6 +30,7 @@ from guitarprotool.utils.exceptions import (
     InvalidGPFileError,
     UnsupportedFormatError,
 )
+from guitarprotool.utils.instrumentation import span
 
 
 class GPFormat(Enum):
@@ -60,9 +66,81 @@ class GPFormat(Enum):
         raise UnsupportedFormatError(f"Unsupported file format: {ext}")
 
 
+# Leading bytes identifying each container format
+ZIP_MAGIC = (b"PK\x03\x04", b"PK\x05\x06")  # Local file header, empty archive
+GPX_MAGIC = (b"BCFZ", b"BCFS")  # Compressed, uncompressed container
+
+# Legacy binary files start with a length-prefixed "FICHIER GUITAR PRO vX.YY"
+_LEGACY_VERSION_RE = re.compile(rb"GUITAR PRO v(\d)\.\d\d")
+_LEGACY_FORMATS = {b"3": GPFormat.GP3, b"4": GPFormat.GP4, b"5": GPFormat.GP5}
+
+# Bytes read when sniffing; covers the legacy version string
+SNIFF_BYTES = 32
+
+# Locations of score.gpif inside a GP8 archive
+GPIF_MEMBERS = ("Content/score.gpif", "score.gpif")
+
+
+@dataclass
+class FileInspection:
+    """Result of a header-only inspection of a Guitar Pro file.
+
+    Attributes:
+        path: Inspected file
+        format: Format identified from the file content (None if unknown)
+        suffix_format: Format implied by the file extension (None if unsupported)
+        valid: True if the header checks passed
+        error: Reason the file is invalid, if any
+        gpif_member: Archive member holding score.gpif (GP8 only)
+    """
+
+    path: Path
+    format: Optional[GPFormat] = None
+    suffix_format: Optional[GPFormat] = None
+    valid: bool = False
+    error: Optional[str] = None
+    gpif_member: Optional[str] = None
+
+    @property
+    def mislabeled(self) -> bool:
+        """True if the content format differs from the extension."""
+        return self.format is not None and self.format != self.suffix_format
+
+
+def sniff_format(filepath: Path | str) -> Optional[GPFormat]:
+    """Identify a Guitar Pro file format from its leading bytes.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        GPFormat identified from the content, or None if unrecognized
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    with open(filepath, "rb") as f:
+        header = f.read(SNIFF_BYTES)
+
+    if header.startswith(ZIP_MAGIC):
+        return GPFormat.GP8
+    if header.startswith(GPX_MAGIC):
+        return GPFormat.GPX
+
+    match = _LEGACY_VERSION_RE.search(header)
+    if match and b"FICHIER" in header[: match.start()]:
+        return _LEGACY_FORMATS.get(match.group(1))
+
+    return None
+
+
 def detect_format(filepath: Path | str) -> GPFormat:
     """Detect the format of a Guitar Pro file.
 
+    The format is identified from the file's leading bytes, so mislabeled
+    files are handled correctly. The extension is only used when the content
+    is not recognized.
+
     Args:
         filepath: Path to the file
 
@@ -78,7 +156,109 @@ def detect_format(filepath: Path | str) -> GPFormat:
     if not filepath.exists():
         raise InvalidGPFileError(f"File not found: {filepath}")
 
-    return GPFormat.from_extension(filepath.suffix)
+    try:
+        sniffed = sniff_format(filepath)
+    except OSError as e:
+        raise InvalidGPFileError(f"Cannot read file: {filepath}: {e}") from e
+
+    if sniffed is None:
+        return GPFormat.from_extension(filepath.suffix)
+
+    if filepath.suffix.lower() != sniffed.value:
+        logger.warning(
+            f"{filepath.name} has extension {filepath.suffix!r} but contains "
+            f"{sniffed.name} data; treating it as {sniffed.name}"
+        )
+    return sniffed
+
+
+def inspect_file(filepath: Path | str) -> FileInspection:
+    """Validate a Guitar Pro file by reading only its headers.
+
+    GP8 archives are checked by reading the ZIP central directory for a
+    score.gpif member; no member is decompressed. GPX and legacy files are
+    checked by their magic bytes (and, for BCFZ, the declared size).
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        FileInspection describing the file; errors are reported in the result
+        rather than raised
+    """
+    filepath = Path(filepath)
+    result = FileInspection(path=filepath)
+
+    try:
+        result.suffix_format = GPFormat.from_extension(filepath.suffix)
+    except UnsupportedFormatError:
+        pass
+
+    try:
+        result.format = sniff_format(filepath)
+        if result.format is None:
+            result.error = "Unrecognized file header"
+        elif result.format == GPFormat.GP8:
+            with zipfile.ZipFile(filepath) as zf:
+                names = set(zf.namelist())
+            result.gpif_member = next((m for m in GPIF_MEMBERS if m in names), None)
+            if result.gpif_member is None:
+                result.error = "Archive has no score.gpif"
+        elif result.format == GPFormat.GPX:
+            with open(filepath, "rb") as f:
+                header = f.read(8)
+            if header.startswith(b"BCFZ") and (
+                len(header) < 8 or struct.unpack("<i", header[4:8])[0] <= 0
+            ):
+                result.error = "Invalid BCFZ header"
+    except zipfile.BadZipFile as e:
+        result.error = f"Corrupted ZIP archive: {e}"
+    except OSError as e:
+        result.error = f"Cannot read file: {e}"
+
+    result.valid = result.error is None
+    return result
+
+
+def scan_library(
+    directory: Path | str,
+    max_workers: int = 8,
+    recursive: bool = True,
+) -> list[FileInspection]:
+    """Inspect every Guitar Pro file in a directory on a thread pool.
+
+    Files are selected by supported extension and validated with
+    inspect_file(), which only reads headers, so large libraries can be
+    checked without extracting or decompressing anything.
+
+    Args:
+        directory: Library root directory
+        max_workers: Number of worker threads
+        recursive: Include subdirectories
+
+    Returns:
+        One FileInspection per file, sorted by path
+
+    Raises:
+        InvalidGPFileError: If directory doesn't exist
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        raise InvalidGPFileError(f"Directory not found: {directory}")
+
+    pattern = "**/*" if recursive else "*"
+    paths = sorted(
+        p for p in directory.glob(pattern) if p.is_file() and is_supported_format(p)
+    )
+    logger.info(f"Scanning {len(paths)} Guitar Pro files in {directory}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(inspect_file, paths))
+
+    invalid = sum(1 for r in results if not r.valid)
+    mislabeled = sum(1 for r in results if r.mislabeled)
+    logger.info(f"Scan complete: {len(results)} files, {invalid} invalid, {mislabeled} mislabeled")
+    return results
 
 
 class GPFileHandler:
@@ -182,9 +362,9 @@ class GPFileHandler:
         """Prepare a GPX file (decompress BCFZ, extract files, create GP8 structure)."""
         logger.info(f"Preparing GPX file: {self.filepath}")
 
-        # Read and decompress BCFZ data
-        compressed_data = self.filepath.read_bytes()
-        decompressed = decompress_bcfz(compressed_data)
+        # Read and decompress BCFZ data (BCFS containers are stored uncompressed)
+        data = self.filepath.read_bytes()
+        decompressed = data if data.startswith(b"BCFS") else decompress_bcfz(data)
 
         # Extract files from BCFS container
         files = extract_gpx_files(decompressed)
@@ -209,8 +389,6 @@ class GPFileHandler:
         Returns:
             Fixed XML content as bytes
         """
-        import re
-
         # Strip trailing null bytes (padding from BCFS container)
         content = content.rstrip(b'\x00')
 
@@ -351,8 +529,6 @@ class GPFileHandler:
         self._converted_path = self.temp_dir / "converted.gp"
 
         # Create dummy .gp file for GPFile to work with
-        import zipfile
-
         with zipfile.ZipFile(self._converted_path, "w", zipfile.ZIP_DEFLATED) as zf:
             zf.writestr("Content/score.gpif", gpif_content)
             zf.writestr("VERSION", "7.0")
@@ -465,7 +641,8 @@ class GPFileHandler:
         if output_path.suffix.lower() != ".gp":
             output_path = output_path.with_suffix(".gp")
 
-        return self._gp8_file.repackage(output_path)
+        with span("repackage"):
+            return self._gp8_file.repackage(output_path)
 
     def cleanup(self) -> None:
         """Clean up temporary files and directories."""
@@ -87,9 +87,11 @@ class GPFile:
             return self.temp_dir
 
         try:
-            # Verify it's a valid ZIP file
-            if not zipfile.is_zipfile(self.filepath):
-                raise InvalidGPFileError(f"Not a valid ZIP archive: {self.filepath}")
+            # Open once: reading the central directory also verifies it's a ZIP file
+            try:
+                zip_ref = zipfile.ZipFile(self.filepath, "r")
+            except zipfile.BadZipFile as e:
+                raise InvalidGPFileError(f"Not a valid ZIP archive: {self.filepath}") from e
 
             # Create temp directory
             if output_dir:
@@ -101,7 +103,7 @@ class GPFile:
             logger.info(f"Extracting {self.filepath} to {self.temp_dir}")
 
             # Extract and store compression info
-            with zipfile.ZipFile(self.filepath, "r") as zip_ref:
+            with zip_ref:
                 # Store compression info for each file (to replicate on repackaging)
                 for info in zip_ref.filelist:
                     self._compression_info[info.filename] = {
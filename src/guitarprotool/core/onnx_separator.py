@@ -0,0 +1,680 @@
+"""ONNX Runtime backend for bass isolation.
+
+Runs a Demucs model exported to ONNX through onnxruntime instead of
+PyTorch. On CPU this avoids importing torch at all (once the graph has
+been exported) and gives better per-core throughput with an explicitly
+sized thread pool.
+
+The exporter cannot express the complex STFT and iSTFT the hybrid Demucs
+models compute in forward(), so they are done here in numpy and the graph
+holds only the network between them. It takes one fixed-length,
+normalized segment and its spectrogram (complex channels stored as pairs
+of real ones, as the models do internally), and returns the spectrogram
+and waveform of every source; the waveform of a source is the sum of its
+waveform output and the iSTFT of its spectrogram output:
+
+    spec:         float32 [1, 2 * audio_channels, nfft / 2, frames]
+    mix:          float32 [1, audio_channels, segment_samples]
+    spec_sources: float32 [1, len(sources), 2 * audio_channels, nfft / 2, frames]
+    wave_sources: float32 [1, len(sources), audio_channels, segment_samples]
+
+where frames = ceil(segment_samples / hop_length). Its sample rate,
+channels, source names, segment length and STFT size are stored in a
+JSON sidecar next to the .onnx file. Segmenting, overlap-add and
+normalization are done here in numpy, mirroring demucs.apply.apply_model.
+
+Dependencies:
+    - onnxruntime (inference)
+    - torch and demucs (only to export a graph that is not cached yet)
+"""
+
+import json
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from loguru import logger
+
+from guitarprotool.core.bass_isolator import (
+    DEFAULT_PROFILE,
+    STEM_FORMAT_NAMES,
+    BassIsolator,
+    InferenceProfile,
+    IsolationResult,
+    ProgressCallback,
+    _available_cpus,
+)
+from guitarprotool.utils.exceptions import (
+    IsolationDependencyError,
+    IsolationError,
+    ModelNotAvailableError,
+)
+from guitarprotool.utils.imports import is_installed
+from guitarprotool.utils.instrumentation import span
+
+# Exported graphs (and their JSON sidecars) are cached here by model name
+DEFAULT_ONNX_DIR = Path(tempfile.gettempdir()) / "guitarprotool" / "onnx"
+
+# Random time shift range used when a profile asks for shifts (as Demucs)
+MAX_SHIFT_SECONDS = 0.5
+
+ONNX_OPSET = 17
+
+# Graph layout version, stored in the sidecar; graphs of another version
+# are exported again
+ONNX_GRAPH_VERSION = 2
+
+
+def export_onnx(model_name: str, onnx_path: Path, opset: int = ONNX_OPSET) -> Dict[str, Any]:
+    """Export a Demucs model to ONNX with its metadata sidecar.
+
+    For bags of models (e.g. htdemucs_ft) the member weighted highest for
+    the bass source is exported.
+
+    Args:
+        model_name: Demucs model name
+        onnx_path: Where to write the graph; metadata goes to the same path
+            with a .json suffix
+        opset: ONNX opset version
+
+    Returns:
+        The graph metadata
+
+    Raises:
+        IsolationDependencyError: If torch/demucs are not installed
+        IsolationError: If the export fails
+    """
+    if not is_installed("torch", "demucs"):
+        raise IsolationDependencyError(
+            f"No ONNX graph for '{model_name}' at {onnx_path}, and exporting one "
+            "requires torch and demucs. Install with: pip install guitarprotool[bass-isolation]"
+        )
+
+    from demucs.pretrained import get_model
+
+    logger.info(f"Exporting Demucs model to ONNX: {model_name}")
+    model = get_model(model_name)
+    if hasattr(model, "models"):  # BagOfModels
+        bass_idx = model.sources.index("bass")
+        weights = [w[bass_idx] for w in model.weights]
+        model = model.models[weights.index(max(weights))]
+    return export_model(model, onnx_path, opset, name=model_name)
+
+
+def export_model(
+    model: Any, onnx_path: Path, opset: int = ONNX_OPSET, name: Optional[str] = None
+) -> Dict[str, Any]:
+    """Export a hybrid Demucs model (HTDemucs or HDemucs) without its STFT.
+
+    The model's spectrogram, magnitude, mask and inverse spectrogram steps
+    are swapped for pass-throughs while it is traced, so the graph takes
+    the spectrogram as an input and returns the sources' spectrograms
+    instead of their iSTFT (see the module docstring).
+
+    Args:
+        model: Demucs model (torch.nn.Module)
+        onnx_path: Where to write the graph; metadata goes to the same path
+            with a .json suffix
+        opset: ONNX opset version
+        name: Model name stored in the metadata
+
+    Returns:
+        The graph metadata
+
+    Raises:
+        IsolationError: If the model is not supported or the export fails
+    """
+    import torch
+
+    hybrid = getattr(model, "hybrid", True) and not getattr(model, "hybrid_old", False)
+    if not hybrid or not getattr(model, "cac", False):
+        raise IsolationError(
+            f"Cannot export '{name}' to ONNX: only hybrid Demucs models with "
+            "complex-as-channels spectrograms are supported"
+        )
+    model.eval()
+
+    metadata = {
+        "model": name,
+        "version": ONNX_GRAPH_VERSION,
+        "samplerate": int(model.samplerate),
+        "audio_channels": int(model.audio_channels),
+        "sources": list(model.sources),
+        "segment_samples": int(model.segment * model.samplerate),
+        "nfft": int(model.nfft),
+        "hop_length": int(model.hop_length),
+    }
+
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    mix = np.zeros(
+        (1, metadata["audio_channels"], metadata["segment_samples"]), dtype=np.float32
+    )
+    spec = spectrogram(mix, metadata["nfft"], metadata["hop_length"])
+    try:
+        with torch.no_grad():
+            torch.onnx.export(
+                _spectral_graph(model),
+                (torch.from_numpy(spec), torch.from_numpy(mix)),
+                str(onnx_path),
+                input_names=["spec", "mix"],
+                output_names=["spec_sources", "wave_sources"],
+                opset_version=opset,
+            )
+    except Exception as e:
+        onnx_path.unlink(missing_ok=True)
+        raise IsolationError(f"Failed to export '{name}' to ONNX: {e}") from e
+
+    onnx_path.with_suffix(".json").write_text(json.dumps(metadata, indent=2))
+    logger.debug(f"ONNX graph written: {onnx_path}")
+    return metadata
+
+
+def _spectral_graph(model: Any) -> Any:
+    """Wrap a hybrid Demucs model as a module mapping (spec, mix) to
+    (spec_sources, wave_sources), bypassing its STFT and iSTFT."""
+    import torch
+
+    class SpectralGraph(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, spec, mix):
+            captured = []
+
+            def ispec(z, length=None, scale=0):
+                # Keep the spectrogram output; its waveform is added outside
+                captured.append(z)
+                return mix.new_zeros(z.shape[0], z.shape[1], mix.shape[1], length)
+
+            bypass = {
+                "_spec": lambda x: spec,
+                "_magnitude": lambda z: z,
+                "_mask": lambda z, m: m,
+                "_ispec": ispec,
+            }
+            for attribute, function in bypass.items():
+                setattr(self.model, attribute, function)
+            try:
+                wave = self.model(mix)
+            finally:
+                for attribute in bypass:
+                    delattr(self.model, attribute)
+            return captured[0], wave
+
+    return SpectralGraph()
+
+
+def _hann_window(length: int) -> np.ndarray:
+    """Periodic Hann window, as torch.hann_window."""
+    return 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(length) / length)
+
+
+def spectrogram(mix: np.ndarray, nfft: int, hop_length: int) -> np.ndarray:
+    """Hybrid Demucs spectrogram of a segment (HTDemucs._spec, _magnitude).
+
+    The segment is reflect-padded so that frame i is centred on sample
+    i * hop_length, the STFT (Hann window, normalized) drops its Nyquist
+    bin, and each complex channel becomes a real and an imaginary channel.
+
+    Args:
+        mix: Audio, shape (batch, channels, samples)
+        nfft: FFT size (4 * hop_length)
+        hop_length: Frame hop in samples
+
+    Returns:
+        float32 array of shape (batch, 2 * channels, nfft // 2, frames),
+        frames = ceil(samples / hop_length)
+    """
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    batch, channels, length = mix.shape
+    frames = -(-length // hop_length)
+    pad = hop_length // 2 * 3
+    x = np.pad(mix, ((0, 0), (0, 0), (pad, pad + frames * hop_length - length)), mode="reflect")
+    # The STFT's own centring; of its frames only 2 .. frames + 1 are kept
+    x = np.pad(x, ((0, 0), (0, 0), (nfft // 2, nfft // 2)), mode="reflect")
+    windows = sliding_window_view(x, nfft, axis=-1)[
+        ..., 2 * hop_length : (frames + 2) * hop_length : hop_length, :
+    ]
+    z = np.fft.rfft(windows * _hann_window(nfft), axis=-1)[..., :-1] / np.sqrt(nfft)
+    z = np.stack([z.real, z.imag], axis=2).transpose(0, 1, 2, 4, 3)
+    return z.reshape(batch, 2 * channels, nfft // 2, frames).astype(np.float32)
+
+
+def ispectrogram(spec: np.ndarray, hop_length: int, length: int) -> np.ndarray:
+    """Waveforms of source spectrograms (HTDemucs._mask, _ispec).
+
+    Inverts spectrogram(): real and imaginary channels are recombined,
+    the Nyquist bin and the two frames either side are restored as zeros,
+    and the frames are overlap-added (normalized, Hann window).
+
+    Args:
+        spec: Spectrograms, shape (batch, sources, 2 * channels, nfft // 2, frames)
+        hop_length: Frame hop in samples
+        length: Samples to return
+
+    Returns:
+        float32 array of shape (batch, sources, channels, length)
+    """
+    batch, sources, channels, bins, frames = spec.shape
+    nfft = 2 * bins
+    overlap = nfft // hop_length
+    z = spec.reshape(batch, sources, channels // 2, 2, bins, frames)
+    z = z[:, :, :, 0] + 1j * z[:, :, :, 1]
+    z = np.pad(z, ((0, 0), (0, 0), (0, 0), (0, 1), (2, 2)))
+
+    window = _hann_window(nfft)
+    chunks = np.fft.irfft(z * np.sqrt(nfft), n=nfft, axis=-2) * window[:, None]
+    # Overlap-add in hop-sized blocks: block j of frame t lands at block t + j
+    chunks = chunks.reshape(*chunks.shape[:-2], overlap, hop_length, frames + 4)
+    out = np.zeros((*chunks.shape[:-3], frames + 4 + overlap - 1, hop_length))
+    envelope = np.zeros((frames + 4 + overlap - 1, hop_length))
+    blocks = (window**2).reshape(overlap, hop_length)
+    for j in range(overlap):
+        out[..., j : j + frames + 4, :] += np.swapaxes(chunks[..., j, :, :], -1, -2)
+        envelope[j : j + frames + 4] += blocks[j]
+
+    start = nfft // 2 + hop_length // 2 * 3
+    out = out.reshape(*out.shape[:-2], -1)[..., start : start + length]
+    return (out / envelope.reshape(-1)[start : start + length]).astype(np.float32)
+
+
+def decode_audio(audio_path: Path, sample_rate: int, channels: int) -> np.ndarray:
+    """Decode an audio file with ffmpeg.
+
+    Args:
+        audio_path: Input audio file
+        sample_rate: Output sample rate in Hz
+        channels: Output channel count
+
+    Returns:
+        float32 array of shape (channels, samples)
+
+    Raises:
+        IsolationError: If ffmpeg is missing or fails
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise IsolationError("ffmpeg not found on PATH")
+
+    with span("decode"):
+        process = subprocess.run(
+            [
+                ffmpeg, "-nostdin", "-loglevel", "error", "-i", str(audio_path),
+                "-f", "f32le", "-ac", str(channels), "-ar", str(sample_rate), "-",
+            ],
+            capture_output=True,
+        )
+    if process.returncode != 0:
+        message = process.stderr.decode(errors="replace").strip()
+        raise IsolationError(f"ffmpeg exited with code {process.returncode}: {message}")
+
+    return np.frombuffer(process.stdout, dtype="<f4").reshape(-1, channels).T
+
+
+def _segment_weight(length: int) -> np.ndarray:
+    """Triangular overlap-add window (demucs' transition_power=1)."""
+    weight = np.concatenate(
+        [np.arange(1, length // 2 + 1), np.arange(length - length // 2, 0, -1)]
+    ).astype(np.float32)
+    return weight / weight.max()
+
+
+def separate_segments(
+    run_segment: Callable[[np.ndarray], np.ndarray],
+    mix: np.ndarray,
+    segment_samples: int,
+    num_sources: int,
+    overlap: float,
+) -> np.ndarray:
+    """Separate overlapping fixed-length segments and overlap-add the results.
+
+    The last segment is zero-padded to full length.
+
+    Args:
+        run_segment: Maps a (1, channels, segment_samples) chunk to its
+            (1, num_sources, channels, segment_samples) sources
+        mix: Audio, shape (channels, samples)
+        segment_samples: Segment length the model expects
+        num_sources: Number of sources the model returns
+        overlap: Overlap between segments (0-1)
+
+    Returns:
+        Sources, shape (num_sources, channels, samples)
+    """
+    channels, length = mix.shape
+    stride = max(1, int((1 - overlap) * segment_samples))
+    weight = _segment_weight(segment_samples)
+
+    out = np.zeros((num_sources, channels, length), dtype=np.float32)
+    total_weight = np.zeros(length, dtype=np.float32)
+    chunk = np.zeros((1, channels, segment_samples), dtype=np.float32)
+
+    for offset in range(0, length, stride):
+        valid = min(segment_samples, length - offset)
+        chunk[0, :, :valid] = mix[:, offset:offset + valid]
+        chunk[0, :, valid:] = 0.0
+        sources = run_segment(chunk)
+        out[..., offset:offset + valid] += sources[0, ..., :valid] * weight[:valid]
+        total_weight[offset:offset + valid] += weight[:valid]
+
+    return out / total_weight
+
+
+class OnnxBassIsolator:
+    """Isolates bass with an ONNX export of a Demucs model.
+
+    Drop-in alternative to BassIsolator (same isolate() arguments and
+    IsolationResult), CPU only. Profiles apply their shifts, overlap and
+    thread count; quantize and bfloat16 are PyTorch-specific and ignored.
+
+    Example:
+        >>> if OnnxBassIsolator.is_available():
+        ...     isolator = OnnxBassIsolator(num_threads=4)
+        ...     result = isolator.isolate("/path/to/audio.mp3", write_file=False)
+    """
+
+    DEFAULT_MODEL = BassIsolator.DEFAULT_MODEL
+    SUPPORTED_MODELS = BassIsolator.SUPPORTED_MODELS
+
+    def __init__(
+        self,
+        output_dir: Optional[Path] = None,
+        model: str = DEFAULT_MODEL,
+        device: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        stem_format: str = "int16",
+        profile: str = DEFAULT_PROFILE,
+        num_threads: Optional[int] = None,
+        onnx_path: Optional[Path] = None,
+    ):
+        """Initialize OnnxBassIsolator.
+
+        Args:
+            output_dir: Directory to save isolated audio files.
+                       If None, uses system temp directory.
+            model: Demucs model name (see BassIsolator.SUPPORTED_MODELS)
+            device: Accepted for BassIsolator compatibility; only "cpu" (or
+                    None) is supported
+            progress_callback: Optional callback for progress updates.
+                             Called with (percent: float, message: str)
+            stem_format: Sample format of written stems, "int16" or "float32"
+            profile: Default inference profile (see INFERENCE_PROFILES)
+            num_threads: onnxruntime intra-op threads, overriding the profile.
+                         Defaults to all CPUs available to this process.
+            onnx_path: Graph to load. If None, {DEFAULT_ONNX_DIR}/{model}.onnx,
+                       exported from Demucs on first use if missing.
+
+        Raises:
+            IsolationDependencyError: If onnxruntime is not installed
+            ModelNotAvailableError: If specified model is not available
+            ValueError: If device, stem_format or profile is not supported
+        """
+        if not self.is_available():
+            raise IsolationDependencyError(
+                "The ONNX separation backend requires onnxruntime. "
+                "Install with: pip install onnxruntime"
+            )
+
+        if model not in self.SUPPORTED_MODELS:
+            raise ModelNotAvailableError(
+                f"Model '{model}' not supported. Available: {self.SUPPORTED_MODELS}"
+            )
+
+        if device not in (None, "cpu"):
+            raise ValueError(f"The ONNX backend runs on CPU only, not '{device}'")
+
+        if stem_format not in STEM_FORMAT_NAMES:
+            raise ValueError(
+                f"Stem format '{stem_format}' not supported. Available: {list(STEM_FORMAT_NAMES)}"
+            )
+
+        self.profile = BassIsolator._get_profile(profile)
+        self.num_threads = num_threads
+        self.output_dir = output_dir or Path(tempfile.gettempdir()) / "guitarprotool_isolation"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.model_name = model
+        self.device = "cpu"
+        self.progress_callback = progress_callback
+        self.stem_format = stem_format
+        self.onnx_path = Path(onnx_path) if onnx_path else DEFAULT_ONNX_DIR / f"{model}.onnx"
+
+        # Sessions are created lazily, one per thread count
+        self._sessions: Dict[int, Any] = {}
+        self._metadata: Optional[Dict[str, Any]] = None
+
+        logger.debug(
+            f"OnnxBassIsolator initialized: model={model}, onnx_path={self.onnx_path}, "
+            f"output_dir={self.output_dir}"
+        )
+
+    def _load_metadata(self) -> Dict[str, Any]:
+        """Read the graph's sidecar metadata, exporting the graph if needed."""
+        if self._metadata is None:
+            metadata_path = self.onnx_path.with_suffix(".json")
+            if self.onnx_path.exists() and metadata_path.exists():
+                self._metadata = json.loads(metadata_path.read_text())
+            if self._metadata is None or self._metadata.get("version") != ONNX_GRAPH_VERSION:
+                if self.progress_callback:
+                    self.progress_callback(0.02, "Exporting Demucs model to ONNX...")
+                self._metadata = export_onnx(self.model_name, self.onnx_path)
+        return self._metadata
+
+    def _session(self, threads: int) -> Any:
+        """Get an inference session using the given intra-op thread count."""
+        if threads not in self._sessions:
+            import onnxruntime as ort
+
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+            options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+            logger.info(f"Loading ONNX graph: {self.onnx_path} ({threads} threads)")
+            with span("model_load", backend="onnx", model=self.model_name):
+                self._sessions[threads] = ort.InferenceSession(
+                    str(self.onnx_path), sess_options=options, providers=["CPUExecutionProvider"]
+                )
+        return self._sessions[threads]
+
+    def _load_model(self) -> None:
+        """Export (if needed) and load the ONNX graph.
+
+        Raises:
+            IsolationError: If the graph cannot be exported or loaded
+        """
+        if self.progress_callback:
+            self.progress_callback(0.05, "Loading ONNX model...")
+        try:
+            self._load_metadata()
+            self._session(self._threads(self.profile))
+        except IsolationError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to load ONNX model: {e}")
+            raise IsolationError(f"Failed to load ONNX graph '{self.onnx_path}': {e}") from e
+
+    def _threads(self, profile: InferenceProfile) -> int:
+        """Intra-op thread count for a profile."""
+        return self.num_threads or profile.num_threads or _available_cpus()
+
+    def _run_segment(self, session: Any, chunk: np.ndarray) -> np.ndarray:
+        """Separate one segment: STFT, the graph, then the sources' iSTFT."""
+        nfft, hop_length = self._metadata["nfft"], self._metadata["hop_length"]
+        spec_sources, wave_sources = session.run(
+            ["spec_sources", "wave_sources"],
+            {"spec": spectrogram(chunk, nfft, hop_length), "mix": chunk},
+        )
+        return wave_sources + ispectrogram(spec_sources, hop_length, chunk.shape[-1])
+
+    def _separate(self, session: Any, mix: np.ndarray, overlap: float) -> np.ndarray:
+        """Run the graph over a normalized mix (see separate_segments)."""
+        return separate_segments(
+            lambda chunk: self._run_segment(session, chunk),
+            mix,
+            self._metadata["segment_samples"],
+            len(self._metadata["sources"]),
+            overlap,
+        )
+
+    def _separate_shifted(
+        self, session: Any, mix: np.ndarray, profile: InferenceProfile
+    ) -> np.ndarray:
+        """Average separations of randomly time-shifted copies (Demucs shifts)."""
+        if profile.shifts == 0:
+            return self._separate(session, mix, profile.overlap)
+
+        length = mix.shape[1]
+        max_shift = int(MAX_SHIFT_SECONDS * self._metadata["samplerate"])
+        padded = np.pad(mix, ((0, 0), (max_shift, max_shift)))
+        rng = np.random.default_rng()
+
+        out = None
+        for _ in range(profile.shifts):
+            offset = int(rng.integers(0, max_shift))
+            window = padded[:, offset:offset + length + max_shift]
+            shifted = self._separate(session, window, profile.overlap)
+            shifted = shifted[..., max_shift - offset:max_shift - offset + length]
+            out = shifted if out is None else out + shifted
+        return out / profile.shifts
+
+    def isolate(
+        self,
+        audio_path: Path | str,
+        output_filename: Optional[str] = None,
+        write_file: bool = True,
+        profile: Optional[str | InferenceProfile] = None,
+    ) -> IsolationResult:
+        """Isolate bass from audio file (see BassIsolator.isolate).
+
+        Args:
+            audio_path: Path to input audio file (MP3, WAV, etc.)
+            output_filename: Optional output filename (without extension).
+                           If None, uses "{input_stem}_bass".
+            write_file: If False, no WAV is written; the result carries the
+                        mono bass buffer in bass_audio instead.
+            profile: Inference profile for this job (name or InferenceProfile).
+                     If None, uses the profile given at construction.
+
+        Returns:
+            IsolationResult with path to isolated bass audio (or the bass
+            samples when write_file is False)
+        """
+        start_time = time.time()
+        audio_path = Path(audio_path)
+
+        logger.info(f"Isolating bass (ONNX) from: {audio_path}")
+
+        if not audio_path.exists():
+            return IsolationResult(
+                bass_path=None,
+                original_path=audio_path,
+                model_used=self.model_name,
+                processing_time=time.time() - start_time,
+                success=False,
+                error_message=f"Audio file not found: {audio_path}",
+            )
+
+        try:
+            from guitarprotool.core.stem_writer import to_mono, write_stem
+
+            profile = BassIsolator._get_profile(profile) if profile is not None else self.profile
+            metadata = self._load_metadata()
+            session = self._session(self._threads(profile))
+            sample_rate = metadata["samplerate"]
+
+            if self.progress_callback:
+                self.progress_callback(0.15, "Loading audio file...")
+            wav = decode_audio(audio_path, sample_rate, metadata["audio_channels"])
+
+            # Normalize like demucs.separate, undo on the separated sources
+            ref = wav.mean(axis=0)
+            mean, std = float(ref.mean()), float(ref.std()) or 1.0
+            mix = (wav - mean) / std
+
+            if self.progress_callback:
+                self.progress_callback(0.25, "Separating sources (this may take a while)...")
+            logger.info(f"Running ONNX source separation ({profile.name} profile)...")
+            with span("isolation", backend="onnx", model=self.model_name, profile=profile.name):
+                sources = self._separate_shifted(session, mix, profile)
+
+            bass = sources[metadata["sources"].index("bass")] * std + mean
+            output_path = None
+            bass_audio = None
+
+            if write_file:
+                if self.progress_callback:
+                    self.progress_callback(0.9, "Saving isolated bass...")
+
+                output_name = output_filename or f"{audio_path.stem}_bass"
+                output_path = write_stem(
+                    self.output_dir / f"{output_name}.wav",
+                    bass,
+                    sample_rate,
+                    sample_format=self.stem_format,
+                )
+            else:
+                bass_audio = to_mono(bass)
+
+            processing_time = time.time() - start_time
+            logger.success(
+                f"Bass isolated in {processing_time:.1f}s: {output_path or 'in memory'}"
+            )
+
+            if self.progress_callback:
+                self.progress_callback(1.0, "Bass isolation complete")
+
+            return IsolationResult(
+                bass_path=output_path,
+                original_path=audio_path,
+                model_used=self.model_name,
+                processing_time=processing_time,
+                success=True,
+                bass_audio=bass_audio,
+                sample_rate=sample_rate,
+            )
+
+        except Exception as e:
+            processing_time = time.time() - start_time
+            logger.error(f"Bass isolation failed after {processing_time:.1f}s: {e}")
+            return IsolationResult(
+                bass_path=None,
+                original_path=audio_path,
+                model_used=self.model_name,
+                processing_time=processing_time,
+                success=False,
+                error_message=str(e),
+            )
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check if onnxruntime is installed.
+
+        Returns:
+            True if the ONNX backend can run (exporting a missing graph
+            additionally needs torch and demucs)
+        """
+        return is_installed("onnxruntime")
+
+    def cleanup(self) -> None:
+        """Remove temporary isolated audio files (see BassIsolator.cleanup)."""
+        logger.debug(f"Cleaning up isolation files in: {self.output_dir}")
+
+        for file in self.output_dir.glob("*_bass.wav"):
+            if file.is_file():
+                logger.debug(f"Removing: {file}")
+                file.unlink()
+
+    def __enter__(self) -> "OnnxBassIsolator":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Context manager exit - cleanup temporary files."""
+        self.cleanup()
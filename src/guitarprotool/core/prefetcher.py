@@ -0,0 +1,297 @@
+"""Background download stage for YouTube audio sources.
+
+This module handles:
+- Starting YouTube downloads for upcoming jobs on a bounded thread pool, so
+  network latency overlaps with beat detection of earlier jobs
+- A download cache keyed by video id, so repeated runs skip the network
+- Resuming interrupted downloads from their partial (.part) files
+
+Downloads are stored in the source format chosen by yt-dlp; conversion to the
+embedding format is left to AudioProcessor.process_download().
+"""
+
+import hashlib
+import json
+import re
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import yt_dlp
+from loguru import logger
+
+from guitarprotool.utils.exceptions import DownloadError
+from guitarprotool.utils.instrumentation import span
+
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "guitarprotool" / "download_cache"
+
+# watch?v=<id>, youtu.be/<id>, /shorts/<id>, /embed/<id>, /live/<id>
+_VIDEO_ID_RE = re.compile(
+    r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/|/live/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+)
+
+# Downloader signature: (url, cache_dir, video_id) -> (downloaded file, title)
+Downloader = Callable[[str, Path, str], Tuple[Path, str]]
+
+
+@dataclass
+class DownloadedAudio:
+    """A downloaded (not yet converted) audio source.
+
+    Attributes:
+        url: Original URL
+        video_id: Cache key (YouTube video id, or URL hash for other sites)
+        file_path: Path to the downloaded file in the cache
+        title: Video title
+        from_cache: True if the file was already in the cache
+    """
+
+    url: str
+    video_id: str
+    file_path: Path
+    title: str
+    from_cache: bool = False
+
+
+def extract_video_id(url: str) -> str:
+    """Get the cache key for a URL.
+
+    Args:
+        url: YouTube (or other yt-dlp supported) URL
+
+    Returns:
+        The 11-character YouTube video id, or a SHA1 prefix of the URL for
+        URLs that do not contain one
+    """
+    match = _VIDEO_ID_RE.search(url)
+    if match:
+        return match.group(1)
+    return "url-" + hashlib.sha1(url.strip().encode("utf-8")).hexdigest()[:16]
+
+
+def yt_dlp_download(url: str, cache_dir: Path, video_id: str) -> Tuple[Path, str]:
+    """Download the best audio stream for a URL into the cache.
+
+    The output name depends only on the video id, so a download interrupted
+    part-way leaves a .part file that yt-dlp continues from on the next call.
+
+    Args:
+        url: Video URL
+        cache_dir: Cache directory
+        video_id: Cache key used as the file stem
+
+    Returns:
+        Tuple of (downloaded file path, video title)
+
+    Raises:
+        DownloadError: If yt-dlp fails or produces no file
+    """
+    ydl_opts = {
+        "format": "bestaudio/best",
+        "outtmpl": str(cache_dir / f"{video_id}.%(ext)s"),
+        "continuedl": True,
+        "nopart": False,
+        "overwrites": False,
+        "retries": 10,
+        "fragment_retries": 10,
+        "quiet": True,
+        "no_warnings": True,
+        "noprogress": True,
+    }
+
+    try:
+        with span("download", source="prefetch"), yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info_dict = ydl.extract_info(url, download=True)
+            if not info_dict:
+                raise DownloadError(f"Failed to extract info from URL: {url}")
+            file_path = Path(ydl.prepare_filename(info_dict))
+    except yt_dlp.utils.DownloadError as e:
+        raise DownloadError(f"Failed to download from YouTube: {e}") from e
+
+    if not file_path.exists():
+        raise DownloadError(f"Downloaded file not found: {file_path}")
+
+    return file_path, info_dict.get("title", "Unknown")
+
+
+class YouTubePrefetcher:
+    """Downloads YouTube audio in the background with a shared cache.
+
+    Downloads run on a thread pool of max_workers threads; at most that many
+    run at once and further requests queue. Requests for a video id that is
+    cached or already in flight share the existing result.
+
+    Example:
+        >>> with YouTubePrefetcher(max_workers=2) as prefetcher:
+        ...     prefetcher.prefetch_all(urls)
+        ...     for url in urls:
+        ...         download = prefetcher.get(url)
+        ...         audio_info = processor.process_download(download)
+    """
+
+    METADATA_SUFFIX = ".json"
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_workers: int = 2,
+        downloader: Optional[Downloader] = None,
+    ):
+        """Initialize YouTubePrefetcher.
+
+        Args:
+            cache_dir: Download cache directory. If None, uses DEFAULT_CACHE_DIR.
+            max_workers: Maximum number of concurrent downloads
+            downloader: Function performing a single download. Defaults to
+                yt_dlp_download; tests can pass a local stand-in.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self._downloader = downloader or yt_dlp_download
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="yt-prefetch"
+        )
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        logger.debug(
+            f"YouTubePrefetcher initialized: cache_dir={self.cache_dir}, max_workers={max_workers}"
+        )
+
+    def __enter__(self) -> "YouTubePrefetcher":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.shutdown(wait=exc_type is None)
+
+    def prefetch(self, url: str) -> Future:
+        """Start downloading a URL in the background.
+
+        Args:
+            url: Video URL
+
+        Returns:
+            Future resolving to a DownloadedAudio
+        """
+        video_id = extract_video_id(url)
+
+        with self._lock:
+            future = self._futures.get(video_id)
+            if future is not None:
+                return future
+
+            cached = self.lookup(url)
+            if cached is not None:
+                future = Future()
+                future.set_result(cached)
+            else:
+                logger.debug(f"Prefetching {video_id}")
+                future = self._executor.submit(self._download, url, video_id)
+            self._futures[video_id] = future
+            return future
+
+    def prefetch_all(self, urls: Iterable[str]) -> None:
+        """Queue downloads for several URLs, in order.
+
+        Args:
+            urls: Video URLs
+        """
+        for url in urls:
+            self.prefetch(url)
+
+    def get(self, url: str, timeout: Optional[float] = None) -> DownloadedAudio:
+        """Get a download, waiting for it if it is still in progress.
+
+        Starts the download if the URL was not prefetched.
+
+        Args:
+            url: Video URL
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            DownloadedAudio for the URL
+
+        Raises:
+            DownloadError: If the download failed or timed out
+        """
+        future = self.prefetch(url)
+        try:
+            return future.result(timeout=timeout)
+        except DownloadError:
+            self._forget(extract_video_id(url), future)
+            raise
+        except FutureTimeoutError as e:
+            # Not the builtin TimeoutError before Python 3.11
+            raise DownloadError(f"Timed out waiting for download: {url}") from e
+        except Exception as e:
+            self._forget(extract_video_id(url), future)
+            raise DownloadError(f"Failed to download {url}: {e}") from e
+
+    def lookup(self, url: str) -> Optional[DownloadedAudio]:
+        """Get a completed download from the cache without downloading.
+
+        Args:
+            url: Video URL
+
+        Returns:
+            DownloadedAudio, or None if the URL is not cached
+        """
+        video_id = extract_video_id(url)
+        metadata_path = self.cache_dir / f"{video_id}{self.METADATA_SUFFIX}"
+        if not metadata_path.exists():
+            return None
+
+        try:
+            metadata = json.loads(metadata_path.read_text())
+            file_path = self.cache_dir / metadata["file_name"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring corrupt cache entry {metadata_path}: {e}")
+            return None
+
+        if not file_path.exists():
+            return None
+
+        return DownloadedAudio(
+            url=url,
+            video_id=video_id,
+            file_path=file_path,
+            title=metadata.get("title", "Unknown"),
+            from_cache=True,
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads.
+
+        Args:
+            wait: Wait for running downloads to finish. Queued downloads that
+                have not started are cancelled either way.
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _download(self, url: str, video_id: str) -> DownloadedAudio:
+        """Download a URL and record it in the cache (runs on a worker thread)."""
+        logger.info(f"Downloading {url}")
+        file_path, title = self._downloader(url, self.cache_dir, video_id)
+
+        # Metadata is written last, so only complete downloads are cache hits
+        metadata_path = self.cache_dir / f"{video_id}{self.METADATA_SUFFIX}"
+        temp_path = metadata_path.with_suffix(".json.tmp")
+        temp_path.write_text(json.dumps({"url": url, "title": title, "file_name": file_path.name}))
+        temp_path.replace(metadata_path)
+
+        logger.success(f"Downloaded {video_id}: {title}")
+        return DownloadedAudio(url=url, video_id=video_id, file_path=file_path, title=title)
+
+    def _forget(self, video_id: str, future: Future) -> None:
+        """Drop a failed future so a later request retries the download."""
+        with self._lock:
+            if self._futures.get(video_id) is future:
+                del self._futures[video_id]
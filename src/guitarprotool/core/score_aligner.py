@@ -0,0 +1,842 @@
+"""Score-informed alignment of audio to the tab.
+
+Beat tracking maps bar N to detected beat N * beats_per_bar, so a single
+false or missed beat shifts every later bar. This module aligns the tab's
+own rhythm to the audio instead:
+
+1. The note onsets in score.gpif (MasterBars -> Bars -> Voices -> Beats,
+   with durations from Rhythms) are rendered at the tab tempo into an
+   expected onset envelope.
+2. The audio's onset strength envelope is computed with librosa.
+3. The envelopes are aligned with dynamic time warping on local onset
+   patterns. DTW runs coarse to fine: the coarsest level is solved in
+   full, each finer level only within a fixed-width band around the path
+   projected from the level above, so time and memory grow linearly with
+   song length.
+
+The result gives the audio time of every bar, and a beat grid built from
+it feeds BeatDetector.generate_sync_points in place of detected beats.
+
+For finding only where the music starts, ScoreAligner.estimate_start
+cross-correlates the first bars with notes, rendered as an onset impulse
+train at the tab tempo, with the onset envelope of the start of the audio
+(via FFT). It needs neither the whole song nor a separated stem.
+
+Repeats and alternate endings are not expanded; bars are aligned in
+written order.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+from lxml import etree
+
+from guitarprotool.core.beat_detector import BeatInfo
+from guitarprotool.core.tempo_map import TempoMap
+from guitarprotool.utils.exceptions import AlignmentError
+from guitarprotool.utils.imports import is_installed, lazy_import
+from guitarprotool.utils.instrumentation import span
+
+LIBROSA_AVAILABLE = is_installed("librosa")
+librosa = lazy_import("librosa") if LIBROSA_AVAILABLE else None
+
+# Rhythm NoteValue to duration in quarter notes
+NOTE_VALUES = {
+    "Whole": 4.0,
+    "Half": 2.0,
+    "Quarter": 1.0,
+    "Eighth": 0.5,
+    "16th": 0.25,
+    "32nd": 0.125,
+    "64th": 0.0625,
+    "128th": 0.03125,
+}
+
+# Frames on each side of a frame in its local onset pattern (the DTW feature)
+PATTERN_CONTEXT = 8
+
+# Extra frames on each side of the projected path searched at finer levels
+BAND_RADIUS = 16
+
+# Levels are halved until the score envelope is at most this long
+MAX_COARSE_FRAMES = 256
+
+# Cost added to steps that skip a score or audio frame, so the path only
+# leaves the diagonal where the onsets call for it
+STEP_PENALTY = 0.1
+
+# Length in samples of the clicks the score onsets are rendered as
+CLICK_SAMPLES = 256
+
+# Onsets used to estimate the tempo for bars before the first and after the
+# last note
+ANCHOR_SPAN = 16
+
+# Start estimation: bars from the first note rendered into the template
+START_BARS = 4
+
+# Seconds from the start of the audio searched for the first note bar
+START_SEARCH_SECONDS = 60.0
+
+# Template time scales tried, for audio played off the tab tempo
+START_STRETCHES = tuple(1.0 + 0.01 * step for step in range(-6, 7))
+
+# Frames of timing slack on each side of a template onset
+START_SLACK_FRAMES = 2
+
+# The earliest correlation peak within this fraction of the best is taken,
+# since a riff repeated later in the song matches about as well
+START_PEAK_RATIO = 0.9
+
+# Estimates with at least this correlation are trusted
+START_MIN_CONFIDENCE = 0.3
+
+
+@dataclass
+class ScoreOnsets:
+    """Note onsets of a tab, in seconds at the tab tempo.
+
+    Attributes:
+        bar_starts: Start time of each bar, followed by the end of the last bar
+        onset_times: Times of beats that start at least one note
+        onset_weights: Number of notes starting at each onset
+    """
+
+    bar_starts: np.ndarray
+    onset_times: np.ndarray
+    onset_weights: np.ndarray
+
+    @property
+    def bar_count(self) -> int:
+        """Number of bars."""
+        return len(self.bar_starts) - 1
+
+    @property
+    def duration(self) -> float:
+        """Length of the score in seconds at the tab tempo."""
+        return float(self.bar_starts[-1])
+
+    @classmethod
+    def from_gpif(
+        cls, gpif_path: Path | str, tracks: Optional[Sequence[int]] = None
+    ) -> "ScoreOnsets":
+        """Read note onsets from a score.gpif file.
+
+        Args:
+            gpif_path: Path to score.gpif
+            tracks: Positions of the tracks to read (order in MasterBar/Bars);
+                None reads all tracks
+
+        Returns:
+            ScoreOnsets for the score
+
+        Raises:
+            AlignmentError: If the file cannot be parsed or has no bars
+        """
+        try:
+            root = etree.parse(str(gpif_path)).getroot()
+        except (OSError, etree.XMLSyntaxError) as e:
+            raise AlignmentError(f"Failed to read score {gpif_path}: {e}") from e
+        return cls.from_root(root, tracks)
+
+    @classmethod
+    def from_root(
+        cls, root: etree._Element, tracks: Optional[Sequence[int]] = None
+    ) -> "ScoreOnsets":
+        """Read note onsets from a parsed GPIF document.
+
+        See from_gpif.
+        """
+        rhythms = {r.get("id"): _rhythm_quarters(r) for r in _children(root, "Rhythms", "Rhythm")}
+
+        # Notes continuing a tie do not start a new sound
+        tied = {
+            note.get("id")
+            for note in _children(root, "Notes", "Note")
+            if note.find("Tie") is not None and note.find("Tie").get("destination") == "true"
+        }
+
+        # Beat id -> (duration in quarters, notes started; None for grace notes)
+        beats = {}
+        for beat in _children(root, "Beats", "Beat"):
+            rhythm = beat.find("Rhythm")
+            duration = rhythms.get(rhythm.get("ref") if rhythm is not None else None, 1.0)
+            note_ids = (beat.findtext("Notes") or "").split()
+            started = sum(1 for note_id in note_ids if note_id not in tied)
+            grace = beat.find("GraceNotes") is not None
+            beats[beat.get("id")] = (duration, None if grace else started)
+
+        voices = {
+            voice.get("id"): (voice.findtext("Beats") or "").split()
+            for voice in _children(root, "Voices", "Voice")
+        }
+        bars = {
+            bar.get("id"): [v for v in (bar.findtext("Voices") or "").split() if v != "-1"]
+            for bar in _children(root, "Bars", "Bar")
+        }
+
+        tempo_map = TempoMap.from_root(root)
+        master_bars = _children(root, "MasterBars", "MasterBar")
+        if not master_bars:
+            raise AlignmentError("Score has no bars")
+
+        bar_starts = []
+        onset_times = []
+        onset_weights = []
+        time = 0.0
+        for index, master_bar in enumerate(master_bars):
+            bar_quarters = tempo_map.bar_quarters[index]
+            seconds_per_quarter = 60.0 / tempo_map.tempo_at_bar(index)
+            bar_starts.append(time)
+
+            for position, bar_id in enumerate((master_bar.findtext("Bars") or "").split()):
+                if tracks is not None and position not in tracks:
+                    continue
+                for voice_id in bars.get(bar_id, []):
+                    offset = 0.0
+                    for beat_id in voices.get(voice_id, []):
+                        duration, started = beats.get(beat_id, (1.0, 0))
+                        if started is None:  # Grace notes take no time of their own
+                            continue
+                        if started and offset < bar_quarters:
+                            onset_times.append(time + offset * seconds_per_quarter)
+                            onset_weights.append(started)
+                        offset += duration
+
+            time += bar_quarters * seconds_per_quarter
+        bar_starts.append(time)
+
+        order = np.argsort(onset_times, kind="stable")
+        return cls(
+            bar_starts=np.array(bar_starts),
+            onset_times=np.array(onset_times, dtype=float)[order],
+            onset_weights=np.array(onset_weights, dtype=float)[order],
+        )
+
+    def click_track(self, sample_rate: int) -> np.ndarray:
+        """Render the onsets as noise-burst clicks.
+
+        Running the clicks through the same onset detector as the audio
+        gives the score envelope the detector's own peak shape and lag.
+
+        Args:
+            sample_rate: Sample rate in Hz
+
+        Returns:
+            Mono float32 samples covering the whole score
+        """
+        length = int(np.ceil(self.duration * sample_rate)) + CLICK_SAMPLES
+        samples = np.zeros(length, dtype=np.float32)
+        click = _click()
+        starts = np.round(self.onset_times * sample_rate).astype(int)
+        for start, gain in zip(starts, np.log1p(self.onset_weights)):
+            samples[start : start + CLICK_SAMPLES] += gain * click
+        return samples
+
+    @property
+    def first_note_bar(self) -> int:
+        """Index of the first bar with a note onset (0 if there are none)."""
+        if len(self.onset_times) == 0:
+            return 0
+        return int(np.searchsorted(self.bar_starts, self.onset_times[0], side="right")) - 1
+
+    def impulse_train(
+        self, frame_rate: float, start: float, end: float, stretch: float = 1.0
+    ) -> np.ndarray:
+        """Render the onsets between two score times as weighted impulses.
+
+        Args:
+            frame_rate: Frames per second
+            start: Score time of frame 0 in seconds
+            end: Score time the train ends at (exclusive)
+            stretch: Factor applied to times after start, for audio slower
+                (> 1) or faster (< 1) than the tab tempo
+
+        Returns:
+            Frames covering start to end, log1p(notes) at each onset frame
+            (the click_track gains) and 0 elsewhere
+        """
+        train = np.zeros(int(round((end - start) * stretch * frame_rate)) + 1)
+        inside = (self.onset_times >= start) & (self.onset_times < end)
+        frames = np.round((self.onset_times[inside] - start) * stretch * frame_rate).astype(int)
+        np.add.at(train, frames, np.log1p(self.onset_weights[inside]))
+        return train
+
+
+@dataclass
+class ScoreAlignment:
+    """Result of aligning a score to audio.
+
+    Attributes:
+        bar_times: Audio time in seconds of each bar start, followed by the
+            end of the last bar (float64 array)
+        cost: Mean DTW cost along the path (0 = identical onset patterns,
+            1 = uncorrelated, 2 = opposite)
+    """
+
+    bar_times: np.ndarray
+    cost: float
+
+    def __post_init__(self):
+        self.bar_times = np.asarray(self.bar_times, dtype=np.float64)
+
+    @property
+    def bar_count(self) -> int:
+        """Number of bars."""
+        return len(self.bar_times) - 1
+
+    @property
+    def confidence(self) -> float:
+        """Alignment confidence from 0.0 (no better than chance) to 1.0."""
+        return max(0.0, min(1.0, 1.0 - self.cost))
+
+    def beat_times(self, beats_per_bar: int = 4) -> np.ndarray:
+        """Beat grid with beats_per_bar evenly spaced beats per aligned bar.
+
+        Beat N * beats_per_bar is the start of bar N, which is how
+        DriftAnalyzer maps bars to beats.
+
+        Args:
+            beats_per_bar: Beats per bar
+
+        Returns:
+            Beat times in seconds, ending with the end of the last bar
+        """
+        starts = self.bar_times[:-1]
+        lengths = np.diff(self.bar_times)
+        grid = starts[:, None] + lengths[:, None] * np.arange(beats_per_bar) / beats_per_bar
+        return np.append(grid.ravel(), self.bar_times[-1])
+
+    def beat_info(self, beats_per_bar: int = 4) -> BeatInfo:
+        """The beat grid as BeatInfo, ready for generate_sync_points.
+
+        Args:
+            beats_per_bar: Beats per bar
+
+        Returns:
+            BeatInfo with the median grid tempo and the alignment confidence
+        """
+        beat_times = self.beat_times(beats_per_bar)
+        interval = float(np.median(np.diff(beat_times)))
+        bpm = 60.0 / interval if interval > 0 else 0.0
+        # Every bar start is known, and the final time starts the bar after the last
+        positions = [beat % beats_per_bar for beat in range(len(beat_times) - 1)] + [0]
+        return BeatInfo(
+            bpm=bpm,
+            beat_times=beat_times,
+            confidence=self.confidence,
+            beat_positions=positions,
+        )
+
+
+@dataclass
+class StartEstimate:
+    """Where the tab's first notes start in the audio.
+
+    Attributes:
+        bar: First bar of the score with notes
+        time: Audio time in seconds of the start of that bar
+        confidence: Correlation of the expected and the audio onsets at that
+            time, from 0.0 (unrelated) to 1.0 (identical patterns)
+    """
+
+    bar: int
+    time: float
+    confidence: float
+
+    @property
+    def reliable(self) -> bool:
+        """Whether the estimate is confident enough to align to."""
+        return self.confidence >= START_MIN_CONFIDENCE
+
+
+def _children(root: etree._Element, section: str, tag: str) -> List[etree._Element]:
+    """Elements <tag> inside the <section> child of root."""
+    parent = root.find(section)
+    return parent.findall(tag) if parent is not None else []
+
+
+def _rhythm_quarters(rhythm: etree._Element) -> float:
+    """Duration of a Rhythm element in quarter notes."""
+    quarters = NOTE_VALUES.get(rhythm.findtext("NoteValue"), 1.0)
+    dot = rhythm.find("AugmentationDot")
+    if dot is not None:
+        quarters *= 2.0 - 0.5 ** int(dot.get("count", "1"))
+    tuplet = rhythm.find("PrimaryTuplet")
+    if tuplet is not None:
+        quarters *= int(tuplet.get("den", "1")) / max(1, int(tuplet.get("num", "1")))
+    return quarters
+
+
+def _click() -> np.ndarray:
+    """Noise burst the score onsets are rendered as (same one every call)."""
+    click = np.random.default_rng(0).standard_normal(CLICK_SAMPLES).astype(np.float32)
+    click *= np.exp(-np.arange(CLICK_SAMPLES) / (CLICK_SAMPLES / 5)).astype(np.float32)
+    return click
+
+
+def onset_patterns(envelope: np.ndarray, context: int = PATTERN_CONTEXT) -> np.ndarray:
+    """Local onset pattern around each frame, as unit vectors.
+
+    Each row is the envelope within `context` frames of the frame, with its
+    mean removed and scaled to unit length, so the dot product of two rows
+    is their correlation. Flat windows (silence, rests) become zero rows.
+
+    Args:
+        envelope: Onset strength envelope
+        context: Frames on each side
+
+    Returns:
+        Array of shape (frames, 2 * context + 1)
+    """
+    padded = np.pad(envelope.astype(np.float32), context)
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * context + 1)
+    patterns = windows - windows.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(patterns, axis=1, keepdims=True)
+    return np.divide(patterns, norms, out=np.zeros_like(patterns), where=norms > 1e-6)
+
+
+def _band_costs(
+    score_patterns: np.ndarray,
+    audio_patterns: np.ndarray,
+    band_start: np.ndarray,
+    band_width: int,
+    chunk_rows: int = 2048,
+) -> np.ndarray:
+    """Cost (1 - correlation) of every cell in the band; inf outside the audio."""
+    n, m = len(score_patterns), len(audio_patterns)
+    costs = np.empty((n, band_width), dtype=np.float32)
+    offsets = np.arange(band_width)
+    for start in range(0, n, chunk_rows):
+        rows = slice(start, min(n, start + chunk_rows))
+        columns = band_start[rows, None] + offsets
+        inside = columns < m
+        patterns = audio_patterns[np.minimum(columns, m - 1)]
+        correlation = np.einsum("nwk,nk->nw", patterns, score_patterns[rows])
+        costs[rows] = np.where(inside, 1.0 - correlation, np.inf)
+    return costs
+
+
+def banded_dtw(
+    score_patterns: np.ndarray,
+    audio_patterns: np.ndarray,
+    band_start: np.ndarray,
+    band_width: int,
+) -> Tuple[np.ndarray, float]:
+    """Subsequence DTW of a score against audio, within a band.
+
+    Row i (score frame) may only visit audio frames band_start[i] to
+    band_start[i] + band_width - 1. The path may start and end anywhere in
+    the audio but covers the whole score. Steps are (1, 1), (1, 2) and
+    (2, 1) score/audio frames, which limits the local tempo ratio to
+    between 0.5 and 2 and lets each row be computed from the two rows
+    before it in one vectorized operation. Costs are weighted per score
+    frame, so the total weight of any path is the score length.
+
+    Args:
+        score_patterns: Score features, one row per frame (see onset_patterns)
+        audio_patterns: Audio features, one row per frame
+        band_start: First audio frame of the band for each score frame
+        band_width: Band width in audio frames
+
+    Returns:
+        Tuple of (path as (score frame, audio frame) rows, mean path cost)
+
+    Raises:
+        AlignmentError: If no path fits in the band
+    """
+    n = len(score_patterns)
+    costs = _band_costs(score_patterns, audio_patterns, band_start, band_width)
+
+    # Accumulated costs, padded with inf on both sides so every predecessor
+    # row is a slice: column k of row i is audio frame band_start[i] + k
+    pad = int(np.max(np.abs(np.diff(band_start)), initial=0)) + 2
+    totals = np.full((n, band_width + 2 * pad), np.inf, dtype=np.float32)
+    totals[0, pad : pad + band_width] = costs[0]  # Free start anywhere in the audio
+
+    # Column of row i - 1 (shift_1) and row i - 2 (shift_2) holding the
+    # audio frame before column 0 of row i
+    shift_1 = (pad - 1 + band_start[1:] - band_start[:-1]).tolist()
+    shift_2 = (pad - 1 + band_start[2:] - band_start[:-2]).tolist()
+
+    best = np.empty(band_width, dtype=np.float32)
+    for i in range(1, n):
+        previous = totals[i - 1]
+        s = shift_1[i - 1]
+        np.minimum(
+            previous[s : s + band_width],
+            previous[s - 1 : s - 1 + band_width] + STEP_PENALTY,
+            out=best,
+        )
+        if i >= 2:
+            s = shift_2[i - 2]
+            skip_score = totals[i - 2, s : s + band_width] + STEP_PENALTY + costs[i]
+            np.minimum(best, skip_score, out=best)
+        totals[i, pad : pad + band_width] = costs[i] + best
+
+    end = int(np.argmin(totals[n - 1]))
+    total = float(totals[n - 1, end])
+    if not np.isfinite(total):
+        raise AlignmentError("No alignment path within the search band")
+
+    # Backtrack through the stored totals (padded column = audio frame - offset)
+    i, column = n - 1, end
+    path = [(i, int(band_start[i]) + column - pad)]
+    while i > 0:
+        s = shift_1[i - 1] + column - pad
+        diagonal = totals[i - 1, s]
+        skip_audio = totals[i - 1, s - 1] + STEP_PENALTY
+        skip_score = np.inf
+        if i >= 2:
+            skip_score = (
+                totals[i - 2, shift_2[i - 2] + column - pad] + STEP_PENALTY + costs[i, column - pad]
+            )
+        if diagonal <= skip_audio and diagonal <= skip_score:
+            i, column = i - 1, s
+        elif skip_audio <= skip_score:
+            i, column = i - 1, s - 1
+        else:
+            i, column = i - 2, shift_2[i - 2] + column - pad
+        path.append((i, int(band_start[i]) + column - pad))
+
+    return np.array(path[::-1]), total / n
+
+
+def _downsample(envelope: np.ndarray) -> np.ndarray:
+    """Halve an envelope's frame rate, summing pairs of frames."""
+    if len(envelope) % 2:
+        envelope = np.append(envelope, 0.0)
+    return envelope.reshape(-1, 2).sum(axis=1)
+
+
+def multiscale_dtw(
+    score_envelope: np.ndarray, audio_envelope: np.ndarray
+) -> Tuple[np.ndarray, float]:
+    """Align two onset envelopes coarse to fine.
+
+    Args:
+        score_envelope: Rendered score onsets
+        audio_envelope: Audio onset strength, same frame rate
+
+    Returns:
+        Tuple of (path as (score frame, audio frame) rows, mean path cost)
+
+    Raises:
+        AlignmentError: If the audio is too short for the score
+    """
+    levels = [(score_envelope, audio_envelope)]
+    while len(levels[-1][0]) > MAX_COARSE_FRAMES and len(levels[-1][1]) > 1:
+        levels.append(tuple(_downsample(e) for e in levels[-1]))
+
+    score, audio = levels[-1]
+    band_start = np.zeros(len(score), dtype=int)
+    path, cost = banded_dtw(onset_patterns(score), onset_patterns(audio), band_start, len(audio))
+
+    for score, audio in reversed(levels[:-1]):
+        # Audio frame of the coarse path at each fine row, then a band around it
+        coarse_rows = np.arange(len(score)) // 2
+        centers = 2 * np.interp(coarse_rows, path[:, 0], path[:, 1])
+        band_start = np.clip(np.floor(centers).astype(int) - BAND_RADIUS, 0, None)
+        path, cost = banded_dtw(
+            onset_patterns(score), onset_patterns(audio), band_start, 2 * BAND_RADIUS + 2
+        )
+    return path, cost
+
+
+def _warp(score_frames: np.ndarray, onset_frames: np.ndarray, path: np.ndarray) -> np.ndarray:
+    """Map score frames to audio frames through the note onsets on the path.
+
+    Where the score rests the path is free to bend, so positions are
+    interpolated linearly between the audio frames of the surrounding
+    onsets instead of read off the path. Before the first and after the
+    last onset they are extrapolated at the tempo of the nearest
+    ANCHOR_SPAN onsets.
+    """
+    anchors = np.unique(onset_frames)
+    aligned = np.interp(anchors, path[:, 0], path[:, 1])
+    if len(anchors) < 2:
+        return np.interp(score_frames, path[:, 0], path[:, 1])
+
+    span_ = min(ANCHOR_SPAN, len(anchors) - 1)
+    start_slope = (aligned[span_] - aligned[0]) / (anchors[span_] - anchors[0])
+    end_slope = (aligned[-1] - aligned[-1 - span_]) / (anchors[-1] - anchors[-1 - span_])
+
+    warped = np.interp(score_frames, anchors, aligned)
+    before = score_frames < anchors[0]
+    warped[before] = aligned[0] - (anchors[0] - score_frames[before]) * start_slope
+    after = score_frames > anchors[-1]
+    warped[after] = aligned[-1] + (score_frames[after] - anchors[-1]) * end_slope
+    return warped
+
+
+def normalized_cross_correlation(template: np.ndarray, signal: np.ndarray) -> np.ndarray:
+    """Correlation coefficient of a template with every window of a signal.
+
+    The sliding dot products come from one FFT product, and the window
+    means and spreads from cumulative sums, so the cost is
+    O((n + m) log(n + m)) rather than O(n * m).
+
+    Args:
+        template: Pattern of m samples
+        signal: Samples searched; zero-padded to m if shorter
+
+    Returns:
+        Coefficient from -1.0 to 1.0 for each lag 0..n-m; 0.0 where the
+        template or the window is (near) constant
+    """
+    m = len(template)
+    if len(signal) < m:
+        signal = np.pad(signal, (0, m - len(signal)))
+    n = len(signal)
+    template = template - template.mean()
+    norm = np.linalg.norm(template)
+    if norm == 0:
+        return np.zeros(n - m + 1)
+
+    size = 1 << (n + m - 2).bit_length()
+    products = np.fft.irfft(
+        np.fft.rfft(signal, size) * np.conj(np.fft.rfft(template / norm, size)), size
+    )[: n - m + 1]
+
+    sums = np.concatenate([[0.0], np.cumsum(signal)])
+    squares = np.concatenate([[0.0], np.cumsum(np.square(signal))])
+    window_sums = sums[m:] - sums[:-m]
+    spreads = np.sqrt(np.maximum(squares[m:] - squares[:-m] - window_sums**2 / m, 0.0))
+    # Windows of (near) silence: the ratio would be rounding noise
+    flat = spreads <= 1e-3 * spreads.max()
+    return np.divide(products, spreads, out=np.zeros_like(products), where=~flat)
+
+
+def _earliest_peak(values: np.ndarray, ratio: float) -> int:
+    """Index of the maximum of the first run of values within ratio of the best."""
+    above = values >= ratio * values.max()
+    start = int(np.argmax(above))
+    end = start + int(np.argmin(above[start:])) if not above[start:].all() else len(values)
+    return start + int(np.argmax(values[start:end]))
+
+
+class ScoreAligner:
+    """Aligns a tab's note onsets to audio.
+
+    Example:
+        >>> score = ScoreOnsets.from_gpif("extracted/Content/score.gpif")
+        >>> alignment = ScoreAligner().align_file(score, "song.mp3")
+        >>> beat_info = alignment.beat_info()
+        >>> sync = BeatDetector().generate_sync_points(beat_info, original_tempo=120)
+
+    Attributes:
+        sample_rate: Rate audio is analyzed at, in Hz
+        hop_length: Hop between onset envelope frames, in samples
+    """
+
+    DEFAULT_SAMPLE_RATE = 22050
+    DEFAULT_HOP_LENGTH = 256
+
+    def __init__(
+        self, sample_rate: int = DEFAULT_SAMPLE_RATE, hop_length: int = DEFAULT_HOP_LENGTH
+    ):
+        """Initialize ScoreAligner.
+
+        Args:
+            sample_rate: Rate audio is analyzed at, in Hz
+            hop_length: Hop between onset envelope frames, in samples
+        """
+        self.sample_rate = sample_rate
+        self.hop_length = hop_length
+
+    @property
+    def frame_rate(self) -> float:
+        """Onset envelope frames per second."""
+        return self.sample_rate / self.hop_length
+
+    def align_file(self, score: ScoreOnsets, audio_path: Path | str) -> ScoreAlignment:
+        """Align a score to an audio file.
+
+        Args:
+            score: Score onsets
+            audio_path: Audio file (any format librosa/ffmpeg can decode)
+
+        Returns:
+            ScoreAlignment with the audio time of every bar
+
+        Raises:
+            AlignmentError: If the audio cannot be read or aligned
+        """
+        if not LIBROSA_AVAILABLE:
+            raise AlignmentError("librosa library not available. Install with: pip install librosa")
+        try:
+            with span("decode"):
+                y, sr = librosa.load(str(audio_path), sr=self.sample_rate, mono=True)
+        except Exception as e:
+            raise AlignmentError(f"Failed to load audio {audio_path}: {e}") from e
+        return self.align(score, y, sr)
+
+    def align(self, score: ScoreOnsets, y: np.ndarray, sample_rate: int) -> ScoreAlignment:
+        """Align a score to a mono signal.
+
+        Args:
+            score: Score onsets
+            y: Mono float samples
+            sample_rate: Sample rate of y in Hz
+
+        Returns:
+            ScoreAlignment with the audio time of every bar
+
+        Raises:
+            AlignmentError: If the score has no notes or cannot be aligned
+        """
+        if not LIBROSA_AVAILABLE:
+            raise AlignmentError("librosa library not available. Install with: pip install librosa")
+        if len(score.onset_times) == 0:
+            raise AlignmentError("Score has no notes to align")
+
+        with span("score_alignment", bars=score.bar_count):
+            if sample_rate != self.sample_rate:
+                y = librosa.resample(
+                    np.asarray(y, dtype=np.float32), orig_sr=sample_rate, target_sr=self.sample_rate
+                )
+            audio_envelope = librosa.onset.onset_strength(
+                y=np.asarray(y, dtype=np.float32), sr=self.sample_rate, hop_length=self.hop_length
+            )
+            # The detector cannot see onsets in its first frames, so a note at
+            # time 0 needs silence before it; the lead-in frames are dropped
+            lead_in = np.zeros(PATTERN_CONTEXT * self.hop_length, dtype=np.float32)
+            score_envelope = librosa.onset.onset_strength(
+                y=np.concatenate([lead_in, score.click_track(self.sample_rate)]),
+                sr=self.sample_rate,
+                hop_length=self.hop_length,
+            )[PATTERN_CONTEXT:]
+            if len(audio_envelope) * 2 < len(score_envelope):
+                raise AlignmentError(
+                    f"Audio ({len(y) / self.sample_rate:.1f}s) is too short for the score "
+                    f"({score.duration:.1f}s at the tab tempo)"
+                )
+
+            path, cost = multiscale_dtw(score_envelope, audio_envelope)
+
+        bar_frames = _warp(
+            score.bar_starts * self.frame_rate, score.onset_times * self.frame_rate, path
+        )
+        alignment = ScoreAlignment(bar_times=bar_frames / self.frame_rate, cost=cost)
+        logger.info(
+            f"Aligned {score.bar_count} bars: bar 0 at {alignment.bar_times[0]:.3f}s, "
+            f"confidence {alignment.confidence:.2f}"
+        )
+        return alignment
+
+    def estimate_start_file(self, score: ScoreOnsets, audio_path: Path | str) -> StartEstimate:
+        """Find where the tab's first notes start in an audio file.
+
+        Only the start of the file is decoded (see estimate_start).
+
+        Args:
+            score: Score onsets
+            audio_path: Audio file (any format librosa/ffmpeg can decode)
+
+        Returns:
+            StartEstimate for the first bar with notes
+
+        Raises:
+            AlignmentError: If the audio cannot be read or the score has no notes
+        """
+        if not LIBROSA_AVAILABLE:
+            raise AlignmentError("librosa library not available. Install with: pip install librosa")
+        bar = score.first_note_bar
+        end = min(bar + START_BARS, score.bar_count)
+        template_seconds = (score.bar_starts[end] - score.bar_starts[bar]) * max(START_STRETCHES)
+        try:
+            with span("decode"):
+                y, sr = librosa.load(
+                    str(audio_path),
+                    sr=self.sample_rate,
+                    mono=True,
+                    duration=START_SEARCH_SECONDS + template_seconds,
+                )
+        except Exception as e:
+            raise AlignmentError(f"Failed to load audio {audio_path}: {e}") from e
+        return self.estimate_start(score, y, sr)
+
+    def estimate_start(self, score: ScoreOnsets, y: np.ndarray, sample_rate: int) -> StartEstimate:
+        """Find where the tab's first notes start in a mono signal.
+
+        The first START_BARS bars with notes are rendered as an impulse
+        train, shaped by the onset detector's response to a click, and
+        cross-correlated with the audio onset envelope at each of
+        START_STRETCHES. The earliest strong peak within the first
+        START_SEARCH_SECONDS gives the start of the first note bar, so
+        silence, noise and count-ins before it are skipped.
+
+        Args:
+            score: Score onsets
+            y: Mono float samples (only the first START_SEARCH_SECONDS plus
+                the template length are used)
+            sample_rate: Sample rate of y in Hz
+
+        Returns:
+            StartEstimate for the first bar with notes
+
+        Raises:
+            AlignmentError: If the score has no notes
+        """
+        if not LIBROSA_AVAILABLE:
+            raise AlignmentError("librosa library not available. Install with: pip install librosa")
+        if len(score.onset_times) == 0:
+            raise AlignmentError("Score has no notes to align")
+
+        bar = score.first_note_bar
+        end = min(bar + START_BARS, score.bar_count)
+        start_time, end_time = score.bar_starts[bar], score.bar_starts[end]
+
+        with span("start_estimate", bar=bar):
+            y = np.asarray(y, dtype=np.float32)
+            if sample_rate != self.sample_rate:
+                y = librosa.resample(y, orig_sr=sample_rate, target_sr=self.sample_rate)
+            search_frames = int(START_SEARCH_SECONDS * self.frame_rate)
+            template_frames = int((end_time - start_time) * max(START_STRETCHES) * self.frame_rate)
+            y = y[: (search_frames + template_frames + 1) * self.hop_length]
+            envelope = librosa.onset.onset_strength(
+                y=y, sr=self.sample_rate, hop_length=self.hop_length
+            )
+
+            kernel = self._onset_kernel()
+            slack = START_SLACK_FRAMES
+            correlations = []
+            for stretch in START_STRETCHES:
+                train = score.impulse_train(self.frame_rate, start_time, end_time, stretch)
+                template = np.convolve(train, kernel)[slack : slack + len(train)]
+                correlations.append(normalized_cross_correlation(template, envelope))
+            lags = min(search_frames + 1, *(len(c) for c in correlations))
+            correlation = np.max([c[:lags] for c in correlations], axis=0)
+            lag = _earliest_peak(correlation, START_PEAK_RATIO)
+
+        estimate = StartEstimate(
+            bar=bar,
+            time=lag / self.frame_rate,
+            confidence=float(np.clip(correlation[lag], 0.0, 1.0)),
+        )
+        logger.info(
+            f"First notes (bar {bar}) start at {estimate.time:.3f}s, "
+            f"confidence {estimate.confidence:.2f}"
+        )
+        return estimate
+
+    def _onset_kernel(self) -> np.ndarray:
+        """Expected onset envelope around a note, as the template kernel.
+
+        The detector's response to a click (its lag and decay), spread over
+        START_SLACK_FRAMES on each side for timing slack. Index
+        START_SLACK_FRAMES is the note's own frame.
+        """
+        samples = np.zeros((2 * PATTERN_CONTEXT + 1) * self.hop_length, dtype=np.float32)
+        click_at = PATTERN_CONTEXT * self.hop_length
+        samples[click_at : click_at + CLICK_SAMPLES] = _click()
+        response = librosa.onset.onset_strength(
+            y=samples, sr=self.sample_rate, hop_length=self.hop_length
+        )[PATTERN_CONTEXT:]
+        slack = START_SLACK_FRAMES
+        triangle = 1.0 - np.abs(np.arange(-slack, slack + 1)) / (slack + 1)
+        kernel = np.convolve(triangle, response)
+        return kernel / kernel.max()
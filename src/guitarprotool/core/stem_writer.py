@@ -0,0 +1,153 @@
+"""Output of separated stems without full-length intermediate copies.
+
+This module handles:
+- Writing a (channels, frames) float stem to a 16-bit PCM or 32-bit float
+  WAV file through a memory-mapped data chunk, clipping and scaling one
+  block at a time
+- Mixing a stem down to the mono float32 buffer BeatDetector analyzes,
+  so isolation results can be passed on without a WAV round trip
+
+Stems come from Demucs as float tensors in [-1, 1] (with occasional
+overshoot); `tensor.cpu().numpy()` is a view of the tensor's memory, so
+the only full-length allocation is the output itself.
+"""
+
+import struct
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+# Supported WAV sample formats -> (numpy dtype, WAVE format tag)
+STEM_FORMATS = {
+    "int16": (np.dtype("<i2"), 1),  # WAVE_FORMAT_PCM
+    "float32": (np.dtype("<f4"), 3),  # WAVE_FORMAT_IEEE_FLOAT
+}
+
+# Frames converted per block; bounds the scratch buffer to ~1.5 MB of float32
+BLOCK_FRAMES = 1 << 18
+
+# Full scale for float -> int16 conversion
+_INT16_SCALE = 32767.0
+
+
+def write_stem(
+    path: Path | str,
+    audio: np.ndarray,
+    sample_rate: int,
+    sample_format: str = "int16",
+    block_frames: int = BLOCK_FRAMES,
+) -> Path:
+    """Write a float stem to a WAV file.
+
+    The header is written first and the data chunk is then filled through
+    an np.memmap in blocks of block_frames. Each block is clipped to
+    [-1, 1] (and scaled for int16) in a reusable scratch buffer, so no
+    full-length temporary array is created.
+
+    Args:
+        path: Output WAV path
+        audio: Float samples shaped (channels, frames), or (frames,) for mono
+        sample_rate: Sample rate in Hz
+        sample_format: "int16" or "float32"
+        block_frames: Frames converted per block
+
+    Returns:
+        Path of the written file
+
+    Raises:
+        ValueError: If sample_format is unknown or audio has more than 2 dims
+    """
+    if sample_format not in STEM_FORMATS:
+        raise ValueError(
+            f"Unknown stem format '{sample_format}'. Available: {list(STEM_FORMATS)}"
+        )
+    if audio.ndim == 1:
+        audio = audio[None, :]
+    elif audio.ndim != 2:
+        raise ValueError(f"Expected (channels, frames) audio, got shape {audio.shape}")
+
+    path = Path(path)
+    dtype, format_tag = STEM_FORMATS[sample_format]
+    channels, frames = audio.shape
+    header = _wav_header(channels, frames, sample_rate, dtype.itemsize, format_tag)
+
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(len(header) + frames * channels * dtype.itemsize)
+
+    if frames == 0:
+        return path
+
+    data = np.memmap(path, dtype=dtype, mode="r+", offset=len(header), shape=(frames, channels))
+    scratch = np.empty((min(block_frames, frames), channels), dtype=np.float32)
+
+    for start in range(0, frames, block_frames):
+        end = min(start + block_frames, frames)
+        block = scratch[: end - start]
+        # Transposed view of the source; the copy happens inside clip
+        np.clip(audio[:, start:end].T, -1.0, 1.0, out=block)
+        if sample_format == "int16":
+            block *= _INT16_SCALE
+        data[start:end] = block
+
+    data.flush()
+    del data
+
+    logger.debug(f"Wrote {sample_format} stem: {path} ({channels}ch, {frames} frames)")
+    return path
+
+
+def to_mono(audio: np.ndarray) -> np.ndarray:
+    """Mix a stem down to a mono float32 buffer.
+
+    Args:
+        audio: Float samples shaped (channels, frames), or (frames,) for mono
+
+    Returns:
+        Contiguous float32 array of shape (frames,). A mono float32 input
+        that is already contiguous is returned without copying.
+    """
+    if audio.ndim == 1:
+        return np.ascontiguousarray(audio, dtype=np.float32)
+
+    channels = audio.shape[0]
+    if channels == 1:
+        return np.ascontiguousarray(audio[0], dtype=np.float32)
+
+    mono = np.empty(audio.shape[1], dtype=np.float32)
+    np.add(audio[0], audio[1], out=mono, casting="same_kind")
+    for channel in range(2, channels):
+        np.add(mono, audio[channel], out=mono, casting="same_kind")
+    mono *= 1.0 / channels
+    return mono
+
+
+def _wav_header(
+    channels: int, frames: int, sample_rate: int, sample_width: int, format_tag: int
+) -> bytes:
+    """Build RIFF/WAVE headers up to the start of the data chunk."""
+    data_size = frames * channels * sample_width
+    block_align = channels * sample_width
+    fmt = struct.pack(
+        "<HHIIHH",
+        format_tag,
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        sample_width * 8,
+    )
+
+    chunks = []
+    if format_tag == 1:
+        chunks.append(b"fmt " + struct.pack("<I", len(fmt)) + fmt)
+    else:
+        # Non-PCM formats carry a cbSize field and a fact chunk
+        fmt += struct.pack("<H", 0)
+        chunks.append(b"fmt " + struct.pack("<I", len(fmt)) + fmt)
+        chunks.append(b"fact" + struct.pack("<II", 4, frames))
+    chunks.append(b"data" + struct.pack("<I", data_size))
+
+    body = b"WAVE" + b"".join(chunks)
+    return b"RIFF" + struct.pack("<I", len(body) + data_size) + body
@@ -11,6 +11,7 @@ from typing import Dict, List, Optional
 from lxml import etree
 from loguru import logger
 
+from guitarprotool.core import xml_queries as queries
 from guitarprotool.core.gp_file import GPFile
 from guitarprotool.core.xml_modifier import SyncPoint
 from guitarprotool.utils.exceptions import (
@@ -36,7 +37,7 @@ class BackingTrackInfo:
     asset_id: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class SyncPointDiff:
     """Difference between two sync points at the same bar.
 
@@ -305,11 +306,7 @@ class SyncComparator:
                     return sync_points
 
                 # Extract each SyncPoint
-                for automation in automations.findall("Automation"):
-                    type_elem = automation.find("Type")
-                    if type_elem is None or type_elem.text != "SyncPoint":
-                        continue
-
+                for automation in queries.AUTOMATIONS_OF_TYPE(automations, type="SyncPoint"):
                     value_elem = automation.find("Value")
                     if value_elem is None:
                         continue
@@ -0,0 +1,142 @@
+"""Tempo map of a score: tempo automations and bar lengths.
+
+Guitar Pro stores tempo changes as MasterTrack Tempo automations, each
+applying from a bar on, and bar lengths as MasterBar time signatures.
+Together they give the time of every bar at the tab tempo, and the tempo
+expected in each section of the song.
+
+Automations are applied from the start of their bar; positions within a
+bar and linear ramps are not modelled.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import List, Optional, Tuple
+
+from loguru import logger
+from lxml import etree
+
+from guitarprotool.core import xml_queries as queries
+
+# Tempo assumed when a score has no Tempo automation (Guitar Pro's default)
+DEFAULT_TEMPO = 120.0
+
+
+@dataclass
+class TempoMap:
+    """Tempo changes and bar lengths of a score.
+
+    Attributes:
+        changes: (bar, BPM) of each tempo automation, sorted by bar. The
+            first tempo also applies to any bars before it.
+        bar_quarters: Length of each bar in quarter notes
+    """
+
+    changes: List[Tuple[int, float]]
+    bar_quarters: List[float]
+
+    @classmethod
+    def from_root(cls, root: etree._Element) -> "TempoMap":
+        """Read the tempo map of a parsed GPIF document.
+
+        Args:
+            root: GPIF root element
+
+        Returns:
+            TempoMap; changes holds DEFAULT_TEMPO at bar 0 if the score has
+            no readable Tempo automation
+        """
+        changes = []
+        for automation in queries.TEMPO_AUTOMATIONS(root):
+            try:
+                bar = int(automation.findtext("Bar") or 0)
+                # Value may be "BPM BEAT_TYPE" (e.g. "78 2")
+                changes.append((bar, float((automation.findtext("Value") or "").split()[0])))
+            except (ValueError, IndexError):
+                logger.debug("Skipping unreadable tempo automation")
+                continue
+
+        master_bars = root.find("MasterBars")
+        bar_quarters = [
+            _bar_quarters(master_bar.findtext("Time"))
+            for master_bar in (master_bars if master_bars is not None else [])
+            if master_bar.tag == "MasterBar"
+        ]
+        return cls(changes=sorted(changes) or [(0, DEFAULT_TEMPO)], bar_quarters=bar_quarters)
+
+    @property
+    def bar_count(self) -> int:
+        """Number of bars."""
+        return len(self.bar_quarters)
+
+    @property
+    def beats_per_bar(self) -> int:
+        """Quarter-note beats in the most common bar length (4 with no bars).
+
+        Used as the meter for downbeat labelling, e.g. 3 for 3/4 and 6/8.
+        """
+        if not self.bar_quarters:
+            return 4
+        quarters = Counter(self.bar_quarters).most_common(1)[0][0]
+        return max(1, round(quarters))
+
+    @property
+    def tempos(self) -> List[float]:
+        """Distinct tempos in the score, ascending."""
+        return sorted({tempo for _, tempo in self.changes})
+
+    def tempo_at_bar(self, bar: int) -> float:
+        """Tempo in effect at a bar.
+
+        Args:
+            bar: Bar index (0-indexed)
+
+        Returns:
+            Tempo in BPM
+        """
+        tempo = self.changes[0][1]
+        for change_bar, change_tempo in self.changes:
+            if change_bar > bar:
+                break
+            tempo = change_tempo
+        return tempo
+
+    def bar_starts(self) -> List[float]:
+        """Start time of each bar at the tab tempo.
+
+        Returns:
+            bar_count + 1 times in seconds, ending with the end of the last bar
+        """
+        lengths = (
+            quarters * 60.0 / self.tempo_at_bar(bar)
+            for bar, quarters in enumerate(self.bar_quarters)
+        )
+        return list(accumulate(lengths, initial=0.0))
+
+    def sections(self) -> List[Tuple[float, float, float]]:
+        """Spans of constant tempo at the tab tempo.
+
+        Returns:
+            List of (start seconds, end seconds, BPM), in order. Adjacent
+            automations with the same tempo are merged.
+        """
+        starts = self.bar_starts()
+        sections: List[Tuple[float, float, float]] = []
+        for bar in range(self.bar_count):
+            tempo = self.tempo_at_bar(bar)
+            if sections and sections[-1][2] == tempo:
+                sections[-1] = (sections[-1][0], starts[bar + 1], tempo)
+            else:
+                sections.append((starts[bar], starts[bar + 1], tempo))
+        return sections
+
+
+def _bar_quarters(time_signature: Optional[str]) -> float:
+    """Length in quarter notes of a bar with time signature "n/d"."""
+    try:
+        numerator, denominator = (time_signature or "4/4").split("/")
+        return int(numerator) * 4.0 / int(denominator)
+    except ValueError:
+        logger.warning(f"Unreadable time signature {time_signature!r}, assuming 4/4")
+        return 4.0
@@ -0,0 +1,643 @@
+"""Watch-folder ingestion: sync tabs dropped into shared folders.
+
+This module handles:
+- Noticing new or changed files in watched directories, through Linux
+  inotify (called via ctypes, no extra dependency) or, where inotify is
+  unavailable, by polling file sizes and modification times
+- Debouncing: a file is picked up once it has been quiet for
+  DEBOUNCE_SECONDS, so files still being copied are not processed
+- Pairing each tab with its audio by file stem: song.gp with song.mp3 (any
+  of AUDIO_EXTENSIONS), or with song.url / song.txt holding a YouTube link
+- A ledger of content hashes per output directory, so pairs already synced
+  are skipped; inputs whose size and mtime are unchanged are not re-read
+- Running jobs on a bounded thread pool, each as a separate guitarprotool
+  process writing to a temporary file that is renamed into place on success
+
+Only the top level of each watched directory is watched. Outputs go to a
+"synced" subdirectory by default, so they are never picked up as inputs.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from guitarprotool.core.format_handler import get_supported_extensions
+from guitarprotool.utils.exceptions import WatchJobError
+
+# Seconds a file must go without events before it is picked up
+DEBOUNCE_SECONDS = 2.0
+
+# Seconds between directory scans when polling
+POLL_INTERVAL = 5.0
+
+# Longest wait for events before checking whether to stop
+IDLE_WAKEUP = 1.0
+
+# Audio files paired with a tab of the same stem
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".flac", ".ogg", ".m4a", ".aac", ".opus")
+
+# Files holding a YouTube link, paired with a tab of the same stem
+LINK_EXTENSIONS = (".url", ".txt")
+
+# Output subdirectory of a watched directory, when no output directory is given
+DEFAULT_OUTPUT_DIRNAME = "synced"
+
+# Ledger of synced pairs, kept in each output directory
+LEDGER_NAME = ".guitarprotool-watch.json"
+
+# Bytes read at a time when hashing inputs
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# inotify flags (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+
+# struct inotify_event header: wd, mask, cookie, len (name follows)
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+# Runner signature: (job, temporary output path, pipeline arguments) -> None
+Runner = Callable[["WatchJob", Path, Sequence[str]], None]
+
+
+def list_files(directories: Iterable[Path]) -> Iterator[Path]:
+    """Visible regular files at the top level of each directory."""
+    for directory in directories:
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.name.startswith(".") and entry.is_file():
+                        yield Path(entry.path)
+        except OSError as e:
+            logger.warning(f"Cannot list {directory}: {e}")
+
+
+def read_link(path: Path) -> str:
+    """Read the URL from a link file.
+
+    Accepts a bare URL on any line, or an Internet Shortcut (.url) file's
+    "URL=" line.
+
+    Raises:
+        WatchJobError: If the file holds no http(s) URL
+    """
+    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        line = line.strip()
+        if line.upper().startswith("URL="):
+            line = line[4:].strip()
+        if line.startswith(("http://", "https://")):
+            return line
+    raise WatchJobError(f"No http(s) link in {path}")
+
+
+@dataclass(frozen=True)
+class WatchJob:
+    """A tab and its audio, to be synced into output_path.
+
+    Attributes:
+        tab_path: Guitar Pro file
+        audio_path: Local audio file, or link file holding a YouTube URL
+        output_path: File to write the synced tab to
+    """
+
+    tab_path: Path
+    audio_path: Path
+    output_path: Path
+
+    @property
+    def is_link(self) -> bool:
+        """Whether the audio comes from a link file."""
+        return self.audio_path.suffix.lower() in LINK_EXTENSIONS
+
+    def audio_args(self) -> List[str]:
+        """guitarprotool arguments selecting the audio source."""
+        if self.is_link:
+            return ["--youtube-url", read_link(self.audio_path)]
+        return ["--local-audio", str(self.audio_path)]
+
+    def fingerprint(self) -> List[List[int]]:
+        """[size, mtime_ns] of the tab and the audio."""
+        stats = (self.tab_path.stat(), self.audio_path.stat())
+        return [[stat.st_size, stat.st_mtime_ns] for stat in stats]
+
+    def digest(self, pipeline_args: Sequence[str] = ()) -> str:
+        """SHA-256 of the tab, the audio (or link) and the pipeline arguments."""
+        sha = hashlib.sha256()
+        for path in (self.tab_path, self.audio_path):
+            with open(path, "rb") as f:
+                while block := f.read(HASH_BLOCK_SIZE):
+                    sha.update(block)
+            sha.update(b"\0")
+        sha.update("\0".join(pipeline_args).encode("utf-8"))
+        return sha.hexdigest()
+
+
+def _sibling(base: Path, extensions: Sequence[str]) -> Optional[Path]:
+    """First existing file named base + one of extensions (either case)."""
+    for extension in extensions:
+        for suffix in (extension, extension.upper()):
+            candidate = base.with_name(base.name + suffix)
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+def find_job(path: Path, output_dir: Optional[Path] = None) -> Optional[WatchJob]:
+    """Find the tab/audio pair a changed file belongs to.
+
+    Args:
+        path: Tab, audio or link file
+        output_dir: Output directory; None uses DEFAULT_OUTPUT_DIRNAME next
+            to the tab
+
+    Returns:
+        WatchJob, or None if path is not a tab, audio or link file, or its
+        counterpart is missing
+    """
+    tab_extensions = get_supported_extensions()
+    if path.suffix.lower() not in (*tab_extensions, *AUDIO_EXTENSIONS, *LINK_EXTENSIONS):
+        return None
+
+    base = path.parent / path.stem
+    tab_path = _sibling(base, tab_extensions)
+    audio_path = _sibling(base, AUDIO_EXTENSIONS) or _sibling(base, LINK_EXTENSIONS)
+    if tab_path is None or audio_path is None:
+        return None
+
+    output_dir = output_dir or path.parent / DEFAULT_OUTPUT_DIRNAME
+    return WatchJob(tab_path, audio_path, output_dir / f"{path.stem}_with_audio.gp")
+
+
+def run_pipeline_process(job: WatchJob, output_path: Path, pipeline_args: Sequence[str]) -> None:
+    """Sync one pair by running guitarprotool non-interactively in a new process.
+
+    A separate process per job keeps the pipeline's global state apart and
+    lets jobs run on separate cores; a running analysis worker is used as
+    usual.
+
+    Raises:
+        WatchJobError: If the process fails
+    """
+    command = [
+        sys.executable,
+        "-m",
+        "guitarprotool.cli.main",
+        "--input",
+        str(job.tab_path),
+        *job.audio_args(),
+        "--output",
+        str(output_path),
+        "--quiet",
+        *pipeline_args,
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        detail = (result.stderr or result.stdout).strip().splitlines()
+        raise WatchJobError(
+            f"guitarprotool exited with code {result.returncode} for {job.tab_path.name}"
+            + (f": {detail[-1]}" if detail else "")
+        )
+
+
+class InotifyEvents:
+    """Changed files in a set of directories, from Linux inotify.
+
+    Reports files closed after writing or moved in, so a file shows up once
+    it has been written rather than on every write.
+    """
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_TO
+
+    def __init__(self, directories: Sequence[Path]):
+        """Start watching directories.
+
+        Raises:
+            OSError: If inotify is unavailable or a directory cannot be watched
+        """
+        libc = _inotify_libc()
+        if libc is None:
+            raise OSError("inotify is not available on this system")
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+
+        self._fd = fd
+        self._directories: Dict[int, Path] = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                os.close(fd)
+                raise OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+            self._directories[wd] = Path(directory)
+
+    def read(self, timeout: float) -> List[Path]:
+        """Wait up to timeout seconds for changes.
+
+        Returns:
+            Changed files; every file in the directories if the kernel's
+            event queue overflowed
+        """
+        ready, _, _ = select.select([self._fd], [], [], max(timeout, 0.0))
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths: List[Path] = []
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            wd, mask, _cookie, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflowed, rescanning watched directories")
+                paths.extend(list_files(self._directories.values()))
+            elif name and not mask & IN_ISDIR and wd in self._directories:
+                paths.append(self._directories[wd] / os.fsdecode(name))
+        return paths
+
+    def close(self) -> None:
+        """Stop watching."""
+        os.close(self._fd)
+
+
+def _inotify_libc() -> Optional[ctypes.CDLL]:
+    """The C library, if it provides inotify."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class PollingEvents:
+    """Changed files in a set of directories, by comparing periodic scans.
+
+    Used where inotify is unavailable, and for network shares, where
+    inotify does not see changes made by other machines.
+    """
+
+    def __init__(self, directories: Sequence[Path], interval: float = POLL_INTERVAL):
+        """Take the first scan of directories.
+
+        Args:
+            directories: Directories to watch
+            interval: Seconds between scans
+        """
+        self._directories = list(directories)
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        """(size, mtime_ns) of every file."""
+        snapshot = {}
+        for path in list_files(self._directories):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def read(self, timeout: float) -> List[Path]:
+        """Wait up to timeout seconds for the next scan.
+
+        Returns:
+            Files new or changed since the previous scan
+        """
+        wait = self._next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(max(timeout, 0.0))
+            return []
+        time.sleep(max(wait, 0.0))
+        self._next_scan = time.monotonic() + self.interval
+
+        snapshot = self._scan()
+        changed = [path for path, stat in snapshot.items() if self._snapshot.get(path) != stat]
+        self._snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        """Stop watching."""
+
+
+class WatchLedger:
+    """Pairs already synced into one output directory.
+
+    Stored as JSON (LEDGER_NAME) next to the outputs. Each entry, keyed by
+    output file name, holds the content digest of the pair, and the
+    fingerprint of its inputs and the pipeline arguments when synced, so
+    an untouched pair is recognised from two stat calls without reading it.
+    """
+
+    def __init__(self, path: Path):
+        """Load the ledger at path (empty if missing or unreadable)."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        try:
+            self._entries = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable watch ledger {path}: {e}")
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Entry for an output file name, or None."""
+        with self._lock:
+            return self._entries.get(name)
+
+    def record(
+        self, name: str, fingerprint: List[List[int]], pipeline_args: List[str], digest: str
+    ) -> None:
+        """Record a synced pair and save the ledger."""
+        with self._lock:
+            self._entries[name] = {
+                "fingerprint": fingerprint,
+                "args": pipeline_args,
+                "digest": digest,
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=1)
+            os.replace(temp_name, self.path)
+
+
+@dataclass
+class WatchStats:
+    """Counts of jobs handled by a FolderWatcher.
+
+    Attributes:
+        synced: Pairs synced
+        skipped: Pairs already synced from the same content
+        failed: Pairs whose sync failed
+    """
+
+    synced: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+class FolderWatcher:
+    """Syncs tab/audio pairs dropped into watched directories.
+
+    Changed files are debounced, paired, and queued by output file, so a
+    pair changed again while queued is synced once; at most `workers` jobs
+    run at once. A job whose inputs and pipeline arguments match the
+    ledger is skipped without running the pipeline.
+
+    Example:
+        >>> watcher = FolderWatcher([Path("/shared/tabs")], workers=4)
+        >>> watcher.run()  # until interrupted or watcher.stop()
+    """
+
+    def __init__(
+        self,
+        directories: Sequence[Path],
+        output_dir: Optional[Path] = None,
+        workers: int = 2,
+        pipeline_args: Sequence[str] = (),
+        debounce: float = DEBOUNCE_SECONDS,
+        poll_interval: float = POLL_INTERVAL,
+        use_inotify: bool = True,
+        runner: Optional[Runner] = None,
+    ):
+        """Initialize FolderWatcher.
+
+        Args:
+            directories: Directories to watch
+            output_dir: Directory for synced files. If None, each watched
+                directory's DEFAULT_OUTPUT_DIRNAME subdirectory.
+            workers: Maximum number of concurrent jobs
+            pipeline_args: Extra guitarprotool arguments for every job
+            debounce: Seconds a file must be quiet before it is picked up
+            poll_interval: Seconds between scans when polling
+            use_inotify: Use inotify when available; False always polls
+            runner: Function syncing one job. Defaults to
+                run_pipeline_process; tests can pass a local stand-in.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.directories = [Path(directory).resolve() for directory in directories]
+        self.output_dir = Path(output_dir).resolve() if output_dir else None
+        self.workers = workers
+        self.pipeline_args = list(pipeline_args)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.stats = WatchStats()
+        self.backend: Optional[str] = None
+
+        self._runner = runner or run_pipeline_process
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="watch")
+        self._events: Optional[InotifyEvents | PollingEvents] = None
+        self._pending: Dict[Path, float] = {}  # changed file -> time of its last event
+        self._queued: Dict[Path, WatchJob] = {}  # output file -> job, in arrival order
+        self._running: Dict[Path, Future] = {}
+        self._ledgers: Dict[Path, WatchLedger] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._closed = False
+
+    def __enter__(self) -> "FolderWatcher":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Start receiving change events (inotify, else polling)."""
+        if self._events is not None:
+            return
+        if self.use_inotify:
+            try:
+                self._events = InotifyEvents(self.directories)
+                self.backend = "inotify"
+            except OSError as e:
+                logger.info(f"Falling back to polling: {e}")
+        if self._events is None:
+            self._events = PollingEvents(self.directories, self.poll_interval)
+            self.backend = "polling"
+        logger.debug(f"Watching {len(self.directories)} directories with {self.backend}")
+
+    def scan(self) -> None:
+        """Queue every pair currently in the watched directories."""
+        jobs = {}
+        for path in list_files(self.directories):
+            job = find_job(path, self.output_dir)
+            if job is not None:
+                jobs[job.output_path] = job
+        for job in jobs.values():
+            self._enqueue_job(job)
+
+    def step(self, timeout: float) -> None:
+        """Wait up to timeout seconds for changes, then queue settled files."""
+        for path in self._events.read(timeout):
+            self._pending[path] = time.monotonic()
+
+        now = time.monotonic()
+        settled = [path for path, seen in self._pending.items() if now - seen >= self.debounce]
+        for path in settled:
+            del self._pending[path]
+            self._enqueue(path)
+
+    def run(self) -> None:
+        """Sync the existing library, then watch until stop() is called."""
+        self.start()
+        self.scan()
+        try:
+            while not self._stop.is_set():
+                self.step(self._next_timeout())
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        """Make run() return once its current wait ends."""
+        self._stop.set()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no jobs are queued or running.
+
+        Returns:
+            True if idle, False if timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._queued and not self._running:
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+
+    def close(self) -> None:
+        """Stop events, drop queued jobs and wait for running ones."""
+        with self._lock:
+            self._closed = True
+            self._queued.clear()
+        if self._events is not None:
+            self._events.close()
+            self._events = None
+        self._executor.shutdown(wait=True)
+
+    def _next_timeout(self) -> float:
+        """Seconds until the next pending file settles, at most IDLE_WAKEUP."""
+        if not self._pending:
+            return IDLE_WAKEUP
+        settles = min(self._pending.values()) + self.debounce - time.monotonic()
+        return min(max(settles, 0.0), IDLE_WAKEUP)
+
+    def _enqueue(self, path: Path) -> None:
+        """Queue the pair a file belongs to, if any."""
+        job = find_job(path, self.output_dir)
+        if job is not None:
+            self._enqueue_job(job)
+
+    def _enqueue_job(self, job: WatchJob) -> None:
+        """Queue a job, replacing any queued job for the same output."""
+        with self._lock:
+            self._queued[job.output_path] = job
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start queued jobs while workers are free (one job per output at a time)."""
+        with self._lock:
+            for output_path in list(self._queued):
+                if self._closed or len(self._running) >= self.workers:
+                    return
+                if output_path in self._running:
+                    continue
+                job = self._queued.pop(output_path, None)
+                if job is None:
+                    continue
+                future = self._executor.submit(self._process, job)
+                self._running[output_path] = future
+                future.add_done_callback(partial(self._finished, output_path))
+
+    def _finished(self, output_path: Path, future: Future) -> None:
+        """Count a finished job and start the next."""
+        with self._lock:
+            del self._running[output_path]
+            error = future.exception()
+            if error is not None:
+                self.stats.failed += 1
+                logger.error(f"Failed to sync {output_path.name}: {error}")
+            elif future.result():
+                self.stats.synced += 1
+            else:
+                self.stats.skipped += 1
+        self._dispatch()
+
+    def _ledger(self, output_dir: Path) -> WatchLedger:
+        """Ledger of an output directory."""
+        with self._lock:
+            if output_dir not in self._ledgers:
+                self._ledgers[output_dir] = WatchLedger(output_dir / LEDGER_NAME)
+            return self._ledgers[output_dir]
+
+    def _process(self, job: WatchJob) -> bool:
+        """Sync a job unless the ledger shows it is current.
+
+        Returns:
+            True if synced, False if skipped
+        """
+        ledger = self._ledger(job.output_path.parent)
+        name = job.output_path.name
+        entry = ledger.get(name)
+        fingerprint = job.fingerprint()
+
+        digest = None
+        if entry is not None and job.output_path.exists():
+            if entry["fingerprint"] == fingerprint and entry.get("args") == self.pipeline_args:
+                return False
+            digest = job.digest(self.pipeline_args)
+            if entry["digest"] == digest:
+                ledger.record(name, fingerprint, self.pipeline_args, digest)
+                return False
+        digest = digest or job.digest(self.pipeline_args)
+
+        logger.info(f"Syncing {job.tab_path.name} with {job.audio_path.name}")
+        job.output_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(
+            dir=job.output_path.parent, prefix=f".{job.output_path.stem}.", suffix=".gp"
+        )
+        os.close(fd)
+        temp_path = Path(temp_name)
+        try:
+            self._runner(job, temp_path, self.pipeline_args)
+            os.replace(temp_path, job.output_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        ledger.record(name, fingerprint, self.pipeline_args, digest)
+        logger.success(f"Synced {job.output_path}")
+        return True
@@ -0,0 +1,562 @@
+"""Long-running analysis worker that keeps models loaded between songs.
+
+This module handles:
+- A daemon (AnalysisWorker + serve()) that loads the Demucs model and
+  warms up librosa's JIT-compiled beat tracking once, then runs bass
+  isolation and beat analysis jobs sent over a Unix socket
+- A client (WorkerClient) the CLI uses when a worker is running; when none
+  is, the CLI runs the same work in-process
+
+Protocol: each message is one line of JSON, optionally followed by a
+binary payload whose length is given in the "payload_bytes" field. Audio
+buffers travel as raw little-endian float32. While a job runs the worker
+sends {"progress": p, "message": m} lines; the job ends with a line
+containing "ok" (and "result" or "error").
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from guitarprotool.core.beat_detector import BeatInfo
+from guitarprotool.core.tempo_map import TempoMap
+from guitarprotool.utils import exceptions
+from guitarprotool.utils.exceptions import GuitarProToolError, WorkerUnavailableError
+
+
+def _default_socket_path() -> Path:
+    """Socket path in the user's runtime directory, or a per-user temp directory.
+
+    $XDG_RUNTIME_DIR is private to the user. The fallback directory is named
+    after the uid, created with mode 0700, and its owner is checked before
+    use, since another user could create it first in a shared /tmp.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "guitarprotool" / "worker.sock"
+    user = os.getuid() if hasattr(os, "getuid") else os.getlogin()
+    return Path(tempfile.gettempdir()) / f"guitarprotool-{user}" / "worker.sock"
+
+
+DEFAULT_SOCKET_PATH = _default_socket_path()
+
+# Seconds to wait for a connection before treating the worker as not running
+CONNECT_TIMEOUT = 0.5
+
+# Upper bound on a JSON header line
+MAX_HEADER_BYTES = 1024 * 1024
+
+# Synthetic click track used to trigger numba compilation at start-up
+_WARMUP_SECONDS = 4.0
+_WARMUP_BPM = 120.0
+
+ProgressCallback = Callable[[float, str], None]
+
+
+def _send_message(wfile, header: Dict[str, Any], payload: bytes = b"") -> None:
+    """Write one message (JSON line plus optional payload)."""
+    if payload:
+        header = {**header, "payload_bytes": len(payload)}
+    wfile.write(json.dumps(header).encode("utf-8") + b"\n")
+    if payload:
+        wfile.write(payload)
+    wfile.flush()
+
+
+def _recv_message(rfile) -> Tuple[Dict[str, Any], bytearray]:
+    """Read one message written by _send_message.
+
+    Raises:
+        WorkerUnavailableError: If the connection closes or the message is
+            malformed
+    """
+    line = rfile.readline(MAX_HEADER_BYTES)
+    if not line:
+        raise WorkerUnavailableError("Worker connection closed")
+    try:
+        header = json.loads(line)
+    except ValueError as e:
+        raise WorkerUnavailableError(f"Invalid worker message: {e}") from e
+
+    payload = bytearray(header.get("payload_bytes", 0))
+    view = memoryview(payload)
+    received = 0
+    while received < len(payload):
+        count = rfile.readinto(view[received:])
+        if not count:
+            raise WorkerUnavailableError("Worker connection closed mid-message")
+        received += count
+    return header, payload
+
+
+def _audio_payload(y: np.ndarray) -> bytes:
+    """Serialize a mono buffer as little-endian float32."""
+    return np.ascontiguousarray(y, dtype="<f4").tobytes()
+
+
+def _audio_from_payload(payload: bytearray) -> np.ndarray:
+    """Deserialize a float32 buffer without copying."""
+    return np.frombuffer(payload, dtype="<f4")
+
+
+def _beat_info_result(beat_info: BeatInfo) -> Dict[str, Any]:
+    """Serialize analysis results for a response (arrays as lists)."""
+    return {
+        key: value.tolist() if isinstance(value, np.ndarray) else value
+        for key, value in asdict(beat_info).items()
+    }
+
+
+def _beat_info_from_result(result: Dict[str, Any]) -> BeatInfo:
+    """Deserialize analysis results, restoring the per-beat arrays."""
+    for key in ("beat_strengths", "beat_regularity"):
+        if result.get(key) is not None:
+            result[key] = np.asarray(result[key], dtype=np.float64)
+    return BeatInfo(**result)
+
+
+def _tempo_map_header(tempo_map: Optional[TempoMap]) -> Optional[Dict[str, Any]]:
+    """Serialize a tempo map for a request header."""
+    return asdict(tempo_map) if tempo_map is not None else None
+
+
+def _tempo_map_from_header(header: Dict[str, Any]) -> Optional[TempoMap]:
+    """Deserialize the tempo map of a request header, if any."""
+    data = header.get("tempo_map")
+    if data is None:
+        return None
+    return TempoMap(
+        changes=[(int(bar), float(bpm)) for bar, bpm in data["changes"]],
+        bar_quarters=[float(q) for q in data["bar_quarters"]],
+    )
+
+
+def _check_owned(path: Path, directory: bool) -> None:
+    """Check a socket or its directory belongs to the current user.
+
+    Raises:
+        WorkerUnavailableError: If path is owned by another user, is a
+            symlink, or (for the directory) is accessible by other users
+    """
+    if not hasattr(os, "getuid"):
+        return
+    info = os.lstat(path)
+    expected = stat.S_ISDIR(info.st_mode) if directory else stat.S_ISSOCK(info.st_mode)
+    if not expected:
+        raise WorkerUnavailableError(f"Not a {'directory' if directory else 'socket'}: {path}")
+    if info.st_uid != os.getuid():
+        raise WorkerUnavailableError(f"{path} is owned by another user (uid {info.st_uid})")
+    if directory and info.st_mode & 0o077:
+        raise WorkerUnavailableError(
+            f"{path} is accessible by other users (mode {stat.S_IMODE(info.st_mode):o})"
+        )
+
+
+class AnalysisWorker:
+    """Holds warm models and runs isolation and beat analysis jobs.
+
+    Jobs are run one at a time; the loaded models are not shared between
+    concurrent jobs.
+    """
+
+    def __init__(
+        self,
+        isolator: Optional[Any] = None,
+        detector: Optional[Any] = None,
+        model: Optional[str] = None,
+        device: Optional[str] = None,
+        backend: Optional[str] = None,
+    ):
+        """Initialize AnalysisWorker.
+
+        Args:
+            isolator: BassIsolator to use. If None, one is created when bass
+                isolation dependencies are installed.
+            detector: BeatDetector to use. If None, a default one is created.
+            model: Demucs model for the created isolator (default model if None)
+            device: Processing device for the created isolator
+            backend: Separation backend for the created isolator, "torch" or
+                "onnx" (DEFAULT_BACKEND if None)
+        """
+        from guitarprotool.core.bass_isolator import (
+            DEFAULT_BACKEND,
+            BassIsolator,
+            create_isolator,
+            isolation_available,
+        )
+        from guitarprotool.core.beat_detector import BeatDetector
+
+        backend = backend or DEFAULT_BACKEND
+        if isolator is None and isolation_available(backend):
+            isolator = create_isolator(
+                backend, model=model or BassIsolator.DEFAULT_MODEL, device=device
+            )
+
+        self.isolator = isolator
+        self.detector = detector or BeatDetector()
+        self.jobs_completed = 0
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Load the separation model and compile beat tracking code."""
+        if self.isolator is not None:
+            logger.info("Loading separation model...")
+            self.isolator._load_model()
+
+        logger.info("Warming up beat tracking...")
+        sample_rate = self.detector.sample_rate
+        clicks = np.zeros(int(_WARMUP_SECONDS * sample_rate), dtype=np.float32)
+        step = int(60.0 / _WARMUP_BPM * sample_rate)
+        clicks[::step] = 1.0
+        try:
+            self.detector.analyze_audio(clicks, sample_rate)
+        except GuitarProToolError as e:
+            logger.warning(f"Beat tracking warm-up failed: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the worker for ping requests."""
+        return {
+            "pid": os.getpid(),
+            "isolation": self.isolator is not None,
+            "model": getattr(self.isolator, "model_name", None),
+            "jobs_completed": self.jobs_completed,
+        }
+
+    def run_job(
+        self,
+        header: Dict[str, Any],
+        payload: bytearray,
+        progress: ProgressCallback,
+    ) -> Tuple[Dict[str, Any], bytes]:
+        """Run one job.
+
+        Args:
+            header: Request header; "job" selects the operation
+            payload: Request payload (audio for analyze_audio)
+            progress: Callback forwarding progress to the client
+
+        Returns:
+            Tuple of (result dict, result payload)
+
+        Raises:
+            GuitarProToolError: If the job fails
+            ValueError: If the job is unknown or malformed
+        """
+        job = header.get("job")
+        if job == "ping":
+            return self.status(), b""
+
+        with self._lock:
+            if job == "isolate":
+                result = self._isolate(header, progress)
+            elif job == "analyze":
+                beat_info = self.detector.analyze(
+                    header["audio_path"],
+                    progress_callback=progress,
+                    tempo_map=_tempo_map_from_header(header),
+                    beats_per_bar=header.get("beats_per_bar"),
+                )
+                result = (_beat_info_result(beat_info), b"")
+            elif job == "analyze_audio":
+                beat_info = self.detector.analyze_audio(
+                    _audio_from_payload(payload),
+                    header["sample_rate"],
+                    progress_callback=progress,
+                    tempo_map=_tempo_map_from_header(header),
+                    beats_per_bar=header.get("beats_per_bar"),
+                )
+                result = (_beat_info_result(beat_info), b"")
+            else:
+                raise ValueError(f"Unknown job: {job!r}")
+            self.jobs_completed += 1
+            return result
+
+    def _isolate(
+        self, header: Dict[str, Any], progress: ProgressCallback
+    ) -> Tuple[Dict[str, Any], bytes]:
+        """Run an isolation job with the warm isolator."""
+        if self.isolator is None:
+            raise exceptions.IsolationDependencyError(
+                "Worker was started without bass isolation dependencies"
+            )
+
+        if header.get("output_dir"):
+            self.isolator.output_dir = Path(header["output_dir"])
+            self.isolator.output_dir.mkdir(parents=True, exist_ok=True)
+        self.isolator.progress_callback = progress
+        try:
+            isolation = self.isolator.isolate(
+                header["audio_path"],
+                output_filename=header.get("output_filename"),
+                write_file=header.get("write_file", True),
+                profile=header.get("profile"),
+            )
+        finally:
+            self.isolator.progress_callback = None
+
+        result = asdict(isolation)
+        bass_audio = result.pop("bass_audio")
+        result["bass_path"] = str(isolation.bass_path) if isolation.bass_path else None
+        result["original_path"] = str(isolation.original_path)
+        return result, _audio_payload(bass_audio) if bass_audio is not None else b""
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads one request per connection and streams back progress and result."""
+
+    def handle(self) -> None:
+        worker: AnalysisWorker = self.server.worker  # type: ignore[attr-defined]
+        try:
+            header, payload = _recv_message(self.rfile)
+        except WorkerUnavailableError:
+            return
+
+        def progress(percent: float, message: str) -> None:
+            _send_message(self.wfile, {"progress": percent, "message": message})
+
+        try:
+            result, result_payload = worker.run_job(header, payload, progress)
+        except Exception as e:
+            logger.error(f"Job {header.get('job')!r} failed: {e}")
+            _send_message(
+                self.wfile, {"ok": False, "error": str(e), "error_type": type(e).__name__}
+            )
+            return
+
+        _send_message(self.wfile, {"ok": True, "result": result}, result_payload)
+
+
+class _WorkerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(
+    socket_path: Optional[Path] = None,
+    worker: Optional[AnalysisWorker] = None,
+    on_ready: Optional[Callable[[socketserver.BaseServer], None]] = None,
+    backend: Optional[str] = None,
+) -> None:
+    """Run the worker until interrupted.
+
+    Args:
+        socket_path: Unix socket to listen on. If None, uses DEFAULT_SOCKET_PATH.
+        worker: Worker to serve. If None, a default AnalysisWorker is created
+            and warmed up.
+        on_ready: Optional callback given the server once the socket accepts
+            connections; callers running serve() on a thread use it to keep
+            a handle for server.shutdown()
+        backend: Separation backend of the created worker ("torch" or "onnx")
+
+    Raises:
+        WorkerUnavailableError: If another worker is already listening, or the
+            socket directory is not private to the current user
+    """
+    socket_path = Path(socket_path) if socket_path else DEFAULT_SOCKET_PATH
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # Checked before binding, so nobody else can swap the socket afterwards
+    _check_owned(socket_path.parent, directory=True)
+
+    if WorkerClient(socket_path).is_running():
+        raise WorkerUnavailableError(f"A worker is already listening on {socket_path}")
+    socket_path.unlink(missing_ok=True)  # Stale socket from a killed worker
+
+    if worker is None:
+        worker = AnalysisWorker(backend=backend)
+        worker.warm_up()
+
+    with _WorkerServer(str(socket_path), _RequestHandler) as server:
+        server.worker = worker  # type: ignore[attr-defined]
+        os.chmod(socket_path, 0o600)
+        logger.success(f"Analysis worker listening on {socket_path}")
+        if on_ready is not None:
+            on_ready(server)
+        try:
+            server.serve_forever()
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+class WorkerClient:
+    """Sends jobs to a running AnalysisWorker.
+
+    Each job uses its own connection, so a client can be shared freely.
+
+    Example:
+        >>> client = WorkerClient()
+        >>> if client.is_running():
+        ...     beat_info = client.analyze("/path/to/audio.mp3")
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None):
+        """Initialize WorkerClient.
+
+        Args:
+            socket_path: Worker socket. If None, uses DEFAULT_SOCKET_PATH.
+        """
+        self.socket_path = Path(socket_path) if socket_path else DEFAULT_SOCKET_PATH
+
+    def ping(self) -> Dict[str, Any]:
+        """Get the worker status.
+
+        Returns:
+            Status dict (pid, isolation, model, jobs_completed)
+
+        Raises:
+            WorkerUnavailableError: If no worker is listening
+        """
+        result, _ = self._request({"job": "ping"})
+        return result
+
+    def is_running(self) -> bool:
+        """Check whether a worker is listening on the socket."""
+        try:
+            self.ping()
+            return True
+        except WorkerUnavailableError:
+            return False
+
+    def isolate(
+        self,
+        audio_path: Path | str,
+        output_dir: Optional[Path] = None,
+        output_filename: Optional[str] = None,
+        write_file: bool = True,
+        profile: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ):
+        """Isolate bass in the worker (see BassIsolator.isolate).
+
+        Returns:
+            IsolationResult; bass_audio is set when write_file is False
+
+        Raises:
+            WorkerUnavailableError: If the worker cannot be reached
+            IsolationError: If the worker has no isolation support
+        """
+        from guitarprotool.core.bass_isolator import IsolationResult
+
+        header = {
+            "job": "isolate",
+            "audio_path": str(Path(audio_path).resolve()),
+            "output_dir": str(Path(output_dir).resolve()) if output_dir else None,
+            "output_filename": output_filename,
+            "write_file": write_file,
+            "profile": profile,
+        }
+        result, payload = self._request(header, progress_callback=progress_callback)
+
+        result["bass_path"] = Path(result["bass_path"]) if result["bass_path"] else None
+        result["original_path"] = Path(result["original_path"])
+        result["bass_audio"] = _audio_from_payload(payload) if payload else None
+        return IsolationResult(**result)
+
+    def analyze(
+        self,
+        audio_path: Path | str,
+        progress_callback: Optional[ProgressCallback] = None,
+        tempo_map: Optional[TempoMap] = None,
+        beats_per_bar: Optional[int] = None,
+    ) -> BeatInfo:
+        """Analyze an audio file in the worker (see BeatDetector.analyze).
+
+        Raises:
+            WorkerUnavailableError: If the worker cannot be reached
+            BeatDetectionError: If analysis fails
+        """
+        header = {
+            "job": "analyze",
+            "audio_path": str(Path(audio_path).resolve()),
+            "tempo_map": _tempo_map_header(tempo_map),
+            "beats_per_bar": beats_per_bar,
+        }
+        result, _ = self._request(header, progress_callback=progress_callback)
+        return _beat_info_from_result(result)
+
+    def analyze_audio(
+        self,
+        y: np.ndarray,
+        sample_rate: int,
+        progress_callback: Optional[ProgressCallback] = None,
+        tempo_map: Optional[TempoMap] = None,
+        beats_per_bar: Optional[int] = None,
+    ) -> BeatInfo:
+        """Analyze a mono buffer in the worker (see BeatDetector.analyze_audio).
+
+        Raises:
+            WorkerUnavailableError: If the worker cannot be reached
+            BeatDetectionError: If analysis fails
+        """
+        header = {
+            "job": "analyze_audio",
+            "sample_rate": sample_rate,
+            "tempo_map": _tempo_map_header(tempo_map),
+            "beats_per_bar": beats_per_bar,
+        }
+        result, _ = self._request(header, _audio_payload(y), progress_callback)
+        return _beat_info_from_result(result)
+
+    def _request(
+        self,
+        header: Dict[str, Any],
+        payload: bytes = b"",
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> Tuple[Dict[str, Any], bytearray]:
+        """Send a job and wait for its result.
+
+        Raises:
+            WorkerUnavailableError: If the worker cannot be reached
+            GuitarProToolError: The error raised by the job in the worker
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise WorkerUnavailableError("Unix sockets are not supported on this platform")
+
+        try:
+            # Never send audio paths to a socket planted by another user
+            _check_owned(self.socket_path, directory=False)
+        except FileNotFoundError as e:
+            raise WorkerUnavailableError(f"No worker at {self.socket_path}") from e
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(CONNECT_TIMEOUT)
+            try:
+                sock.connect(str(self.socket_path))
+            except OSError as e:
+                raise WorkerUnavailableError(f"No worker at {self.socket_path}: {e}") from e
+            sock.settimeout(None)
+
+            with sock.makefile("rb") as rfile, sock.makefile("wb") as wfile:
+                try:
+                    _send_message(wfile, header, payload)
+                    while True:
+                        response, response_payload = _recv_message(rfile)
+                        if "ok" in response:
+                            break
+                        if progress_callback:
+                            progress_callback(response["progress"], response["message"])
+                except OSError as e:
+                    raise WorkerUnavailableError(f"Worker connection failed: {e}") from e
+        finally:
+            sock.close()
+
+        if not response["ok"]:
+            raise self._job_error(response)
+        return response["result"], response_payload
+
+    @staticmethod
+    def _job_error(response: Dict[str, Any]) -> GuitarProToolError:
+        """Rebuild the exception a job raised in the worker."""
+        error_class = getattr(exceptions, response.get("error_type", ""), None)
+        if not (isinstance(error_class, type) and issubclass(error_class, GuitarProToolError)):
+            error_class = GuitarProToolError
+        return error_class(response.get("error", "Worker job failed"))
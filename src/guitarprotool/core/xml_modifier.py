@@ -9,19 +9,92 @@ This module handles:
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 from lxml import etree
 from loguru import logger
 
+from guitarprotool.core import xml_queries as queries
+from guitarprotool.core.tempo_map import TempoMap
+from guitarprotool.core.xml_writer import indent_subtree, splice_modified_elements
 from guitarprotool.utils.exceptions import (
     XMLParseError,
     XMLStructureError,
     XMLInjectionError,
 )
 
+# SyncPoint Automation markup, filled in by _create_sync_point_elements
+SYNC_POINT_TEMPLATE = (
+    "<Automation><Type>SyncPoint</Type><Linear>false</Linear><Bar>{bar}</Bar>"
+    "<Position>{position}</Position><Visible>true</Visible><Value>"
+    "<BarIndex>{bar}</BarIndex><BarOccurrence>{occurrence}</BarOccurrence>"
+    "<ModifiedTempo>{tempo:.3f}</ModifiedTempo><OriginalTempo>{original}</OriginalTempo>"
+    "<FrameOffset>{frame}</FrameOffset></Value></Automation>"
+)
 
-@dataclass
+
+def _leading_whitespace(element: etree._Element) -> Optional[str]:
+    """Text between an element and whatever precedes it in its parent."""
+    previous = element.getprevious()
+    if previous is not None:
+        return previous.tail
+    parent = element.getparent()
+    return parent.text if parent is not None else None
+
+
+def _indent_unit(parent: etree._Element, lead: str) -> str:
+    """Indentation added per level below an element whose children start with lead."""
+    parent_lead = _leading_whitespace(parent) or ""
+    if "\n" in parent_lead and lead.startswith(parent_lead):
+        return lead[len(parent_lead) :]
+    return ""
+
+
+def _insert_keeping_layout(
+    parent: etree._Element,
+    element: etree._Element,
+    before: Optional[etree._Element] = None,
+    after: Optional[etree._Element] = None,
+) -> None:
+    """Insert an element before or after a sibling (or append it), copying the
+    whitespace around its neighbours so it lands on its own line.
+
+    Only the new element and, when it becomes the last child, the tail of
+    the previous last child are touched. Documents without line breaks
+    between elements are left compact.
+    """
+    if before is not None:
+        lead = _leading_whitespace(before)
+        element.tail = lead
+        before.addprevious(element)
+    elif after is not None:
+        lead = _leading_whitespace(after)
+        element.tail = after.tail
+        if lead is not None and "\n" in lead:
+            after.tail = lead
+        after.addnext(element)
+    else:
+        lead = None
+        element.tail = parent.text
+        parent.append(element)
+
+    if lead is not None and "\n" in lead:
+        indent_subtree(element, lead, _indent_unit(parent, lead))
+
+
+def _remove_keeping_layout(element: etree._Element) -> None:
+    """Remove an element, keeping the whitespace before its parent's closing tag."""
+    parent = element.getparent()
+    if element.getnext() is None:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = element.tail
+        else:
+            parent.text = element.tail
+    parent.remove(element)
+
+
+@dataclass(slots=True)
 class SyncPoint:
     """Represents a sync point for audio-tab synchronization.
 
@@ -42,6 +115,38 @@ class SyncPoint:
     bar_occurrence: int = 0
 
 
+@dataclass
+class SyncPointDelta:
+    """Summary of the changes made to SyncPoint automations by an injection.
+
+    Sync points are keyed by (bar, bar_occurrence), which is how Guitar Pro
+    identifies a sync point within repeated sections.
+
+    Attributes:
+        added: Keys of sync points that were newly inserted
+        updated: Keys of existing sync points whose values were rewritten in place
+        removed: Keys of existing sync points that were deleted
+        unchanged: Keys of existing sync points that were left untouched
+    """
+
+    added: List[Tuple[int, int]] = field(default_factory=list)
+    updated: List[Tuple[int, int]] = field(default_factory=list)
+    removed: List[Tuple[int, int]] = field(default_factory=list)
+    unchanged: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether any sync point was added, updated, or removed."""
+        return bool(self.added or self.updated or self.removed)
+
+    def summary(self) -> str:
+        """Return a one-line summary of the delta for logging."""
+        return (
+            f"{len(self.added)} added, {len(self.updated)} updated, "
+            f"{len(self.removed)} removed, {len(self.unchanged)} unchanged"
+        )
+
+
 @dataclass
 class AssetInfo:
     """Information about an audio asset to embed.
@@ -126,6 +231,11 @@ class XMLModifier:
         self._root: Optional[etree._Element] = None
         self._is_loaded = False
 
+        # Original file bytes and paths of elements changed since load/save,
+        # used to splice edits into the source instead of re-serializing it
+        self._source: Optional[bytes] = None
+        self._modified_paths: Set[str] = set()
+
         logger.debug(f"XMLModifier initialized for: {self.gpif_path}")
 
     def load(self) -> None:
@@ -146,8 +256,10 @@ class XMLModifier:
                 remove_blank_text=False,
                 strip_cdata=False,
             )
-            self._tree = etree.parse(str(self.gpif_path), parser)
-            self._root = self._tree.getroot()
+            self._source = self.gpif_path.read_bytes()
+            self._root = etree.fromstring(self._source, parser)
+            self._tree = self._root.getroottree()
+            self._modified_paths.clear()
             self._is_loaded = True
 
             logger.success("XML loaded successfully")
@@ -157,11 +269,22 @@ class XMLModifier:
         except Exception as e:
             raise XMLParseError(f"Unexpected error loading XML: {e}") from e
 
-    def save(self, output_path: Optional[Path] = None) -> Path:
+    def save(
+        self,
+        output_path: Optional[Path] = None,
+        preserve_formatting: bool = True,
+    ) -> Path:
         """Save the modified XML to file.
 
+        By default only the elements changed through this class (BackingTrack,
+        Assets, MasterTrack/Automations) are re-serialized and spliced into the
+        original bytes, so untouched regions of the score stay byte-for-byte
+        identical. If the edit cannot be expressed as a splice, or
+        preserve_formatting is False, the whole tree is pretty-printed instead.
+
         Args:
             output_path: Optional output path. If None, overwrites original file.
+            preserve_formatting: Splice modified elements into the original bytes
 
         Returns:
             Path to the saved file
@@ -176,13 +299,30 @@ class XMLModifier:
         try:
             logger.info(f"Saving XML to: {save_path}")
 
-            # Write with XML declaration and proper encoding
-            self._tree.write(
-                str(save_path),
-                encoding="UTF-8",
-                xml_declaration=True,
-                pretty_print=True,
-            )
+            content = None
+            if preserve_formatting and self._can_splice():
+                if self._modified_paths:
+                    content = splice_modified_elements(
+                        self._source, self._root, self._modified_paths
+                    )
+                else:
+                    content = self._source
+
+            if content is not None:
+                Path(save_path).write_bytes(content)
+            else:
+                # Write with XML declaration and proper encoding
+                self._tree.write(
+                    str(save_path),
+                    encoding="UTF-8",
+                    xml_declaration=True,
+                    pretty_print=True,
+                )
+                content = Path(save_path).read_bytes()
+
+            # The saved bytes are the new baseline for later splices
+            self._source = content
+            self._modified_paths.clear()
 
             logger.success(f"XML saved to: {save_path}")
             return save_path
@@ -230,6 +370,7 @@ class XMLModifier:
             # Insert after MasterTrack (before Tracks)
             master_track_index = list(self._root).index(master_track)
             self._root.insert(master_track_index + 1, backing_track)
+            self._modified_paths.add("BackingTrack")
 
             logger.success("BackingTrack injected successfully")
 
@@ -261,7 +402,7 @@ class XMLModifier:
                 assets = self._create_assets_section()
 
             # Check if asset with this ID already exists
-            existing = assets.find(f"Asset[@id='{asset_info.asset_id}']")
+            existing = queries.first(queries.ASSET_BY_ID, assets, id=str(asset_info.asset_id))
             if existing is not None:
                 logger.warning(f"Asset with id={asset_info.asset_id} already exists, replacing")
                 assets.remove(existing)
@@ -278,17 +419,33 @@ class XMLModifier:
 
             embedded_path = etree.SubElement(asset, "EmbeddedFilePath")
             embedded_path.text = etree.CDATA(asset_info.embedded_file_path)
+            self._modified_paths.add("Assets")
 
             logger.success(f"Asset injected: {asset_info.embedded_file_path}")
 
         except Exception as e:
             raise XMLInjectionError(f"Failed to inject Asset: {e}") from e
 
-    def inject_sync_points(self, sync_points: List[SyncPoint]) -> None:
+    def inject_sync_points(
+        self,
+        sync_points: List[SyncPoint],
+        incremental: bool = False,
+    ) -> SyncPointDelta:
         """Inject SyncPoint automations into MasterTrack/Automations.
 
+        By default all existing SyncPoint automations are removed and the new
+        set is appended. With incremental=True the new set is diffed against the
+        existing automations by (bar, bar_occurrence): changed values are updated
+        in place, and only missing or obsolete sync points are inserted or deleted.
+        Re-running the pipeline with small parameter changes then touches as
+        little of the XML as possible.
+
         Args:
             sync_points: List of sync points to inject
+            incremental: If True, apply only the differences to existing sync points
+
+        Returns:
+            SyncPointDelta describing what was added, updated, and removed
 
         Raises:
             XMLStructureError: If MasterTrack is missing
@@ -298,9 +455,12 @@ class XMLModifier:
 
         if not sync_points:
             logger.warning("No sync points provided, skipping injection")
-            return
+            return SyncPointDelta()
 
-        logger.info(f"Injecting {len(sync_points)} sync points")
+        logger.info(
+            f"Injecting {len(sync_points)} sync points"
+            f"{' (incremental)' if incremental else ''}"
+        )
 
         try:
             # Find MasterTrack
@@ -314,16 +474,28 @@ class XMLModifier:
                 logger.debug("Automations element not found, creating")
                 automations = etree.SubElement(master_track, "Automations")
 
-            # Remove existing SyncPoint automations
-            for existing in automations.findall("Automation[Type='SyncPoint']"):
-                automations.remove(existing)
+            if incremental:
+                delta = self._apply_sync_point_diff(automations, sync_points)
+            else:
+                delta = SyncPointDelta()
+
+                # Remove existing SyncPoint automations
+                for existing in queries.AUTOMATIONS_OF_TYPE(automations, type="SyncPoint"):
+                    delta.removed.append(self._sync_point_key(existing))
+                    _remove_keeping_layout(existing)
+
+                # Add new sync points
+                previous = automations[-1] if len(automations) else None
+                for element in self._create_sync_point_elements(sync_points):
+                    _insert_keeping_layout(automations, element, after=previous)
+                    previous = element
+                delta.added.extend((sp.bar, sp.bar_occurrence) for sp in sync_points)
 
-            # Add new sync points
-            for sync_point in sync_points:
-                automation = self._create_sync_point_element(sync_point)
-                automations.append(automation)
+            if delta.has_changes:
+                self._modified_paths.add("MasterTrack/Automations")
 
-            logger.success(f"Injected {len(sync_points)} sync points")
+            logger.success(f"Injected {len(sync_points)} sync points ({delta.summary()})")
+            return delta
 
         except XMLStructureError:
             raise
@@ -340,7 +512,7 @@ class XMLModifier:
 
         try:
             # Look for Tempo automation in MasterTrack/Automations
-            tempo_automation = self._root.find("MasterTrack/Automations/Automation[Type='Tempo']")
+            tempo_automation = self._root.find(queries.TEMPO_AUTOMATION_PATH)
             if tempo_automation is not None:
                 value = tempo_automation.find("Value")
                 if value is not None and value.text:
@@ -356,6 +528,19 @@ class XMLModifier:
             logger.warning(f"Error extracting tempo: {e}")
             return None
 
+    def get_tempo_map(self) -> Optional[TempoMap]:
+        """Extract every tempo change and the bar lengths from the XML.
+
+        Returns:
+            TempoMap, or None if the score has no Tempo automation
+        """
+        self._ensure_loaded()
+
+        if self._root.find(queries.TEMPO_AUTOMATION_PATH) is None:
+            logger.debug("Tempo automation not found in XML")
+            return None
+        return TempoMap.from_root(self._root)
+
     def get_bar_count(self) -> int:
         """Get the total number of bars/measures in the score.
 
@@ -365,10 +550,7 @@ class XMLModifier:
         self._ensure_loaded()
 
         try:
-            master_bars = self._root.find("MasterBars")
-            if master_bars is not None:
-                return len(master_bars.findall("MasterBar"))
-            return 0
+            return int(queries.MASTER_BAR_COUNT(self._root))
         except Exception as e:
             logger.warning(f"Error counting bars: {e}")
             return 0
@@ -382,6 +564,20 @@ class XMLModifier:
         if not self._is_loaded or self._root is None:
             raise XMLParseError("XML not loaded. Call load() first.")
 
+    def _can_splice(self) -> bool:
+        """Check whether edits can be spliced into the original bytes.
+
+        Splicing writes serialized elements as UTF-8, so it is only used when
+        the source document is UTF-8 encoded.
+
+        Returns:
+            True if the original bytes are available and UTF-8 encoded
+        """
+        if self._source is None:
+            return False
+        encoding = (self._tree.docinfo.encoding or "UTF-8").upper()
+        return encoding in ("UTF-8", "UTF8")
+
     def _create_backing_track_element(self, config: BackingTrackConfig) -> etree._Element:
         """Create a BackingTrack XML element.
 
@@ -425,23 +621,194 @@ class XMLModifier:
         Returns:
             Automation element for sync point
         """
-        automation = etree.Element("Automation")
-
-        self._add_element(automation, "Type", "SyncPoint")
-        self._add_element(automation, "Linear", "false")
-        self._add_element(automation, "Bar", str(sync_point.bar))
-        self._add_element(automation, "Position", str(sync_point.position))
-        self._add_element(automation, "Visible", "true")
-
-        # Value sub-element
-        value = etree.SubElement(automation, "Value")
-        self._add_element(value, "BarIndex", str(sync_point.bar))
-        self._add_element(value, "BarOccurrence", str(sync_point.bar_occurrence))
-        self._add_element(value, "ModifiedTempo", f"{sync_point.modified_tempo:.3f}")
-        self._add_element(value, "OriginalTempo", str(int(sync_point.original_tempo)))
-        self._add_element(value, "FrameOffset", str(sync_point.frame_offset))
-
-        return automation
+        return self._create_sync_point_elements([sync_point])[0]
+
+    @staticmethod
+    def _create_sync_point_elements(sync_points: List[SyncPoint]) -> List[etree._Element]:
+        """Create SyncPoint Automation XML elements in one parse.
+
+        Formatting every automation into one string and parsing it once is
+        about twice as fast as building each element child by child.
+
+        Args:
+            sync_points: Sync point data
+
+        Returns:
+            Automation elements, in the order of sync_points
+        """
+        markup = "".join(
+            SYNC_POINT_TEMPLATE.format(
+                bar=sync_point.bar,
+                position=sync_point.position,
+                occurrence=sync_point.bar_occurrence,
+                tempo=sync_point.modified_tempo,
+                original=int(sync_point.original_tempo),
+                frame=sync_point.frame_offset,
+            )
+            for sync_point in sync_points
+        )
+        return list(etree.fromstring(f"<Automations>{markup}</Automations>"))
+
+    def _apply_sync_point_diff(
+        self,
+        automations: etree._Element,
+        sync_points: List[SyncPoint],
+    ) -> SyncPointDelta:
+        """Bring existing SyncPoint automations in line with sync_points.
+
+        Existing automations are matched to new sync points by
+        (bar, bar_occurrence). Matched automations have their changed text
+        values rewritten in place, unmatched new sync points are inserted in
+        bar order among the existing ones, and leftover automations are removed.
+
+        Args:
+            automations: MasterTrack/Automations element
+            sync_points: Desired sync points
+
+        Returns:
+            SyncPointDelta describing the applied changes
+        """
+        delta = SyncPointDelta()
+
+        existing: Dict[Tuple[int, int], etree._Element] = {}
+        for automation in queries.AUTOMATIONS_OF_TYPE(automations, type="SyncPoint"):
+            key = self._sync_point_key(automation)
+            if key in existing:
+                # Duplicate key: only the first one can be kept
+                _remove_keeping_layout(automation)
+                delta.removed.append(key)
+            else:
+                existing[key] = automation
+
+        desired: Dict[Tuple[int, int], SyncPoint] = {}
+        for sync_point in sync_points:
+            desired[(sync_point.bar, sync_point.bar_occurrence)] = sync_point
+
+        for key, automation in existing.items():
+            if key not in desired:
+                _remove_keeping_layout(automation)
+                delta.removed.append(key)
+
+        new_keys = []
+        for key in sorted(desired):
+            automation = existing.get(key)
+            if automation is None:
+                new_keys.append(key)
+            elif self._update_sync_point_element(automation, desired[key]):
+                delta.updated.append(key)
+            else:
+                delta.unchanged.append(key)
+
+        new_elements = self._create_sync_point_elements([desired[key] for key in new_keys])
+        self._merge_sync_point_elements(automations, list(zip(new_keys, new_elements)))
+        delta.added.extend(new_keys)
+
+        return delta
+
+    def _update_sync_point_element(
+        self,
+        automation: etree._Element,
+        sync_point: SyncPoint,
+    ) -> bool:
+        """Rewrite the values of a SyncPoint automation in place.
+
+        Only text that actually differs is assigned. If the element is missing
+        any of the expected children, it is replaced by a freshly built one,
+        laid out like the element it replaces.
+
+        Args:
+            automation: Existing SyncPoint Automation element
+            sync_point: Desired sync point values
+
+        Returns:
+            True if the element was modified
+        """
+        expected = {
+            "Bar": str(sync_point.bar),
+            "Position": str(sync_point.position),
+            "Value/BarIndex": str(sync_point.bar),
+            "Value/BarOccurrence": str(sync_point.bar_occurrence),
+            "Value/ModifiedTempo": f"{sync_point.modified_tempo:.3f}",
+            "Value/OriginalTempo": str(int(sync_point.original_tempo)),
+            "Value/FrameOffset": str(sync_point.frame_offset),
+        }
+
+        elements = {path: automation.find(path) for path in expected}
+        if any(element is None for element in elements.values()):
+            logger.debug(f"Rebuilding malformed SyncPoint at bar {sync_point.bar}")
+            replacement = self._create_sync_point_element(sync_point)
+            replacement.tail = automation.tail
+            parent = automation.getparent()
+            lead = _leading_whitespace(automation)
+            parent.replace(automation, replacement)
+            if lead is not None and "\n" in lead:
+                indent_subtree(replacement, lead, _indent_unit(parent, lead))
+            return True
+
+        changed = False
+        for path, text in expected.items():
+            element = elements[path]
+            if (element.text or "").strip() != text:
+                element.text = text
+                changed = True
+
+        return changed
+
+    @staticmethod
+    def _merge_sync_point_elements(
+        automations: etree._Element,
+        new_elements: List[Tuple[Tuple[int, int], etree._Element]],
+    ) -> None:
+        """Insert SyncPoint automations in (bar, bar_occurrence) order.
+
+        One merge pass over the existing SyncPoints (in document order) and
+        the new elements (sorted by key): each new element is placed before the
+        first existing SyncPoint with a larger key, or after the last SyncPoint
+        (or the last inserted element) if none is larger. Without any existing
+        SyncPoints the elements are appended to the end of Automations. New
+        elements copy the indentation of their neighbours.
+
+        Args:
+            automations: MasterTrack/Automations element
+            new_elements: (bar, bar_occurrence) and element of each new
+                SyncPoint, sorted by key
+        """
+        existing = list(queries.AUTOMATIONS_OF_TYPE(automations, type="SyncPoint"))
+        keys = [XMLModifier._sync_point_key(automation) for automation in existing]
+        index = 0
+        previous = existing[-1] if existing else (automations[-1] if len(automations) else None)
+        for key, element in new_elements:
+            while index < len(existing) and keys[index] <= key:
+                index += 1
+            if index < len(existing):
+                _insert_keeping_layout(automations, element, before=existing[index])
+            else:
+                _insert_keeping_layout(automations, element, after=previous)
+                previous = element
+
+    @staticmethod
+    def _sync_point_key(automation: etree._Element) -> Tuple[int, int]:
+        """Get the (bar, bar_occurrence) key of a SyncPoint automation.
+
+        Args:
+            automation: SyncPoint Automation element
+
+        Returns:
+            Tuple of (bar, bar_occurrence), defaulting missing values to 0
+        """
+
+        def _int(query: etree.XPath) -> int:
+            element = queries.first(query, automation)
+            try:
+                return int(element.text.strip())
+            except (AttributeError, ValueError):
+                return 0
+
+        if queries.first(queries.SYNC_POINT_BAR_INDEX, automation) is not None:
+            bar = _int(queries.SYNC_POINT_BAR_INDEX)
+        else:
+            bar = _int(queries.AUTOMATION_BAR)
+        return bar, _int(queries.SYNC_POINT_BAR_OCCURRENCE)
 
     def _create_assets_section(self) -> etree._Element:
         """Create and insert Assets section in the correct location.
@@ -0,0 +1,51 @@
+"""Precompiled XPath queries for score.gpif documents.
+
+Path strings passed to find()/findall() are parsed on every call, and building
+them with f-strings (e.g. an asset id) mixes data into the query text. This
+module compiles the predicate and multi-step queries used by the XML readers
+and writers once at import time; values are passed as XPath variables, which
+lxml quotes itself. One-off first-match lookups with constant paths stay on
+find(), which is cheaper than an XPath evaluation for that case; their paths
+are kept here as strings.
+
+Usage:
+    tempo = root.find(TEMPO_AUTOMATION_PATH)
+    asset = first(ASSET_BY_ID, assets, id=str(asset_id))
+"""
+
+from typing import Optional
+
+from lxml import etree
+
+# find() path of the first Tempo automation, relative to the GPIF root element
+TEMPO_AUTOMATION_PATH = "MasterTrack/Automations/Automation[Type='Tempo']"
+
+# Queries relative to the GPIF root element
+TEMPO_AUTOMATIONS = etree.XPath("MasterTrack/Automations/Automation[Type='Tempo']")
+MASTER_BAR_COUNT = etree.XPath("count(MasterBars/MasterBar)")
+
+# Queries relative to a MasterTrack/Automations element
+AUTOMATIONS_OF_TYPE = etree.XPath("Automation[Type=$type]")
+
+# Queries relative to an Assets element
+ASSET_BY_ID = etree.XPath("Asset[@id=$id]")
+
+# Queries relative to a SyncPoint Automation element
+SYNC_POINT_BAR_INDEX = etree.XPath("Value/BarIndex")
+SYNC_POINT_BAR_OCCURRENCE = etree.XPath("Value/BarOccurrence")
+AUTOMATION_BAR = etree.XPath("Bar")
+
+
+def first(query: etree.XPath, element: etree._Element, **variables) -> Optional[etree._Element]:
+    """Evaluate a node-set query and return its first result.
+
+    Args:
+        query: Compiled XPath query returning elements
+        element: Context element to evaluate against
+        **variables: Values for XPath variables referenced by the query
+
+    Returns:
+        First matching element, or None if nothing matched
+    """
+    results = query(element, **variables)
+    return results[0] if results else None
@@ -0,0 +1,380 @@
+"""Formatting-preserving writer for score.gpif files.
+
+Guitar Pro scores can be several megabytes of XML. Re-serializing the whole
+tree on every save reformats regions we never touched and makes diffs of
+version-controlled tabs unreadable. This module splices only the modified
+subtrees back into the original byte stream:
+
+- A lightweight tag scanner locates the byte span of each top-level element
+  (and of selected second-level elements such as MasterTrack/Automations)
+- Modified elements are diffed child by child against their original
+  span, and only the children that changed are rewritten, inserted after
+  their previous sibling, or removed; new elements are inserted after
+  their previous sibling
+- Everything outside those spans is copied byte-for-byte
+"""
+
+import re
+from copy import deepcopy
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lxml import etree
+from loguru import logger
+
+# Matches markup tokens in an XML byte stream. Group 1 is "/" for closing tags,
+# group 2 the tag name and group 3 "/" for self-closing tags. Comments, CDATA,
+# processing instructions and DOCTYPE are matched so their content is skipped.
+_TOKEN_RE = re.compile(
+    rb"<!--.*?-->"
+    rb"|<!\[CDATA\[.*?\]\]>"
+    rb"|<\?.*?\?>"
+    rb"|<!DOCTYPE[^>]*>"
+    rb"|<(/?)([A-Za-z_][\w.\-:]*)(?:\"[^\"]*\"|'[^']*'|[^'\">])*?(/?)>",
+    re.DOTALL,
+)
+
+_WHITESPACE = b" \t\r\n"
+
+# Byte span (start of opening tag, end of closing tag) of an element
+Span = Tuple[int, int]
+
+# (start, end, replacement) applied to the source bytes
+Edit = Tuple[int, int, bytes]
+
+# Parser matching XMLModifier's, so re-parsed spans compare equal to the tree
+_PARSER = etree.XMLParser(remove_blank_text=False, strip_cdata=False)
+
+
+def find_element_spans(source: bytes, parents: Iterable[str] = ()) -> Dict[str, List[Span]]:
+    """Locate byte spans of top-level elements in an XML document.
+
+    Spans are recorded for every child of the root element, keyed by tag name,
+    and for the children of the top-level elements named in parents, keyed by
+    "Parent/Child". Top-level elements that are not in parents are skipped with
+    a plain substring search for their closing tag, so large sections such as
+    Beats or Notes cost little more than a memory scan.
+
+    Args:
+        source: Raw XML document bytes
+        parents: Tag names of top-level elements whose children should be recorded
+
+    Returns:
+        Mapping of element path to list of spans (one per occurrence)
+    """
+    parents = set(parents)
+    spans: Dict[str, List[Span]] = {}
+    stack: List[Tuple[bytes, int]] = []
+    pos = 0
+
+    while True:
+        match = _TOKEN_RE.search(source, pos)
+        if match is None:
+            break
+        pos = match.end()
+
+        name = match.group(2)
+        if name is None:
+            continue  # Comment, CDATA, PI or DOCTYPE
+
+        if match.group(1):
+            # Closing tag
+            if not stack:
+                break
+            tag, start = stack.pop()
+            if len(stack) == 1:
+                _record(spans, tag.decode(), start, pos)
+            elif len(stack) == 2 and stack[1][0].decode() in parents:
+                _record(spans, f"{stack[1][0].decode()}/{tag.decode()}", start, pos)
+            if not stack:
+                break  # End of root element
+            continue
+
+        depth = len(stack)
+        if match.group(3):
+            # Self-closing tag
+            if depth == 1:
+                _record(spans, name.decode(), match.start(), pos)
+            elif depth == 2 and stack[1][0].decode() in parents:
+                _record(spans, f"{stack[1][0].decode()}/{name.decode()}", match.start(), pos)
+            continue
+
+        if depth == 1 and name.decode() not in parents:
+            end = _skip_element(source, name, pos)
+            if end is not None:
+                _record(spans, name.decode(), match.start(), end)
+                pos = end
+                continue
+
+        stack.append((name, match.start()))
+
+    return spans
+
+
+def splice_modified_elements(
+    source: bytes,
+    root: etree._Element,
+    modified_paths: Iterable[str],
+) -> Optional[bytes]:
+    """Rebuild an XML document by splicing modified elements into the source.
+
+    Each path in modified_paths is either a top-level tag ("BackingTrack") or a
+    second-level path ("MasterTrack/Automations"). The element currently at that
+    path in root replaces its original span; elements that did not exist in the
+    source are inserted after their previous sibling, and elements that no
+    longer exist in root are removed.
+
+    Args:
+        source: Original XML document bytes (UTF-8)
+        root: Root element of the modified tree
+        modified_paths: Paths of elements that were changed
+
+    Returns:
+        The spliced document, or None if the change cannot be expressed as a
+        splice (the caller should then serialize the full tree)
+    """
+    modified_paths = set(modified_paths)
+    parents = {path.split("/")[0] for path in modified_paths if "/" in path}
+    spans = find_element_spans(source, parents)
+
+    edits: List[Edit] = []
+    for path in sorted(modified_paths):
+        path_edits = _edits_for_path(source, root, path, spans)
+        if path_edits is None:
+            logger.debug(f"Cannot splice {path}, falling back to full serialization")
+            return None
+        edits.extend(edit for edit in path_edits if edit[2] or edit[0] != edit[1])
+
+    edits.sort(key=lambda e: (e[0], e[1]))
+    for previous, current in zip(edits, edits[1:]):
+        if current[0] < previous[1]:
+            logger.debug("Overlapping XML edits, falling back to full serialization")
+            return None
+
+    chunks: List[bytes] = []
+    pos = 0
+    for start, end, replacement in edits:
+        chunks.append(source[pos:start])
+        chunks.append(replacement)
+        pos = end
+    chunks.append(source[pos:])
+
+    logger.debug(f"Spliced {len(edits)} element(s) into original XML")
+    return b"".join(chunks)
+
+
+def indent_subtree(element: etree._Element, lead: str, unit: str) -> None:
+    """Put each descendant of an element on its own line, one unit deeper per level.
+
+    Args:
+        element: Element whose descendants are laid out (its own tail is kept)
+        lead: Whitespace in front of the element, starting with a newline
+        unit: Indentation added per level (may be empty)
+    """
+    children = list(element)
+    if not children:
+        return
+    child_lead = lead + unit
+    element.text = child_lead
+    for child in children:
+        indent_subtree(child, child_lead, unit)
+        child.tail = child_lead
+    children[-1].tail = lead
+
+
+def _edits_for_path(
+    source: bytes,
+    root: etree._Element,
+    path: str,
+    spans: Dict[str, List[Span]],
+) -> Optional[List[Edit]]:
+    """Compute the edits for one modified path."""
+    original = spans.get(path, [])
+    if len(original) > 1:
+        return None
+
+    current = root.findall(path)
+    if len(current) > 1:
+        return None
+    element = current[0] if current else None
+    depth = path.count("/") + 1
+
+    if original:
+        start, end = original[0]
+        if element is None:
+            # Removed: also drop the indentation in front of it
+            return [(_whitespace_start(source, start), end, b"")]
+        child_edits = _child_edits(source, start, end, element, depth)
+        if child_edits is not None:
+            return child_edits
+        return [(start, end, _serialize(element, source, start, end, depth))]
+
+    if element is None:
+        return []
+
+    # Inserted: place after the previous sibling's original span
+    previous = element.getprevious()
+    if previous is None or not isinstance(previous.tag, str):
+        return None
+    parent_path = path.rsplit("/", 1)[0] + "/" if "/" in path else ""
+    previous_path = parent_path + previous.tag
+    previous_spans = spans.get(previous_path, [])
+    if len(previous_spans) != 1 or len(root.findall(previous_path)) != 1:
+        return None
+
+    previous_start, previous_end = previous_spans[0]
+    lead = _lead_before(source, previous_start)
+    text = _serialize(element, source, previous_start, previous_end, depth)
+    return [(previous_end, previous_end, lead + text)]
+
+
+def _child_edits(
+    source: bytes, start: int, end: int, element: etree._Element, depth: int
+) -> Optional[List[Edit]]:
+    """Edits rewriting only the children of an element that changed.
+
+    The original children (re-parsed from the span) and the current ones are
+    matched by their serialized form; unchanged runs are left untouched.
+
+    Returns:
+        Edits, or None if the element itself changed (tag, attributes,
+        comments among its children) or it has no children before or after
+    """
+    child_spans = _child_spans(source, start, end)
+    try:
+        original = etree.fromstring(source[start:end], _PARSER)
+    except etree.XMLSyntaxError:
+        return None
+    if (
+        original.tag != element.tag
+        or dict(original.attrib) != dict(element.attrib)
+        or not child_spans
+        or not len(element)
+        or len(child_spans) != len(original)
+        or not all(isinstance(child.tag, str) for child in (*original, *element))
+    ):
+        return None
+
+    before = [etree.tostring(child, with_tail=False) for child in original]
+    after = [etree.tostring(child, with_tail=False) for child in element]
+    matcher = SequenceMatcher(None, before, after, autojunk=False)
+
+    edits: List[Edit] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        if tag == "delete":
+            first, last = child_spans[i1][0], child_spans[i2 - 1][1]
+            edits.append((_whitespace_start(source, first), last, b""))
+            continue
+
+        children = element[j1:j2]
+        if tag == "replace":
+            first, last = child_spans[i1][0], child_spans[i2 - 1][1]
+            lead = _lead_before(source, first)
+            text = lead.join(
+                _serialize(child, source, first, last, depth + 1) for child in children
+            )
+            edits.append((first, last, text))
+        elif i1 > 0:
+            anchor_start, anchor_end = child_spans[i1 - 1]
+            lead = _lead_before(source, anchor_start)
+            text = b"".join(
+                lead + _serialize(child, source, anchor_start, anchor_end, depth + 1)
+                for child in children
+            )
+            edits.append((anchor_end, anchor_end, text))
+        else:
+            first, last = child_spans[0]
+            lead = _lead_before(source, first)
+            text = b"".join(
+                _serialize(child, source, first, last, depth + 1) + lead for child in children
+            )
+            edits.append((first, first, text))
+    return edits
+
+
+def _child_spans(source: bytes, start: int, end: int) -> List[Span]:
+    """Spans of the direct children of the element spanning start:end."""
+    spans: List[Span] = []
+    depth = 0
+    child_start = 0
+    for match in _TOKEN_RE.finditer(source, start, end):
+        if match.group(2) is None:
+            continue
+        if match.group(1):
+            depth -= 1
+            if depth == 1:
+                spans.append((child_start, match.end()))
+        elif match.group(3):
+            if depth == 1:
+                spans.append((match.start(), match.end()))
+        else:
+            depth += 1
+            if depth == 2:
+                child_start = match.start()
+    return spans
+
+
+def _serialize(
+    element: etree._Element, source: bytes, start: int, end: int, depth: int
+) -> bytes:
+    """Serialize an element without its tail, laid out like a neighbouring span.
+
+    Elements carrying their own whitespace (laid out by XMLModifier) are
+    written as they are. Otherwise, if the neighbour at source[start:end]
+    spans several lines, the element is laid out one child per line, indented
+    like the neighbour; compact neighbours get compact output.
+    """
+    lead = _lead_before(source, start)
+    text_is_layout = element.text is not None and element.text.isspace()
+    multiline = b"\n" in lead and b"\n" in source[start:end]
+    if len(element) and not text_is_layout and multiline:
+        indent = lead[lead.rfind(b"\n") + 1 :].decode()
+        element = deepcopy(element)
+        indent_subtree(element, "\n" + indent, indent[: len(indent) // depth])
+    return etree.tostring(element, encoding="UTF-8", with_tail=False)
+
+
+def _lead_before(source: bytes, start: int) -> bytes:
+    """Get the whitespace run that ends at start."""
+    return source[_whitespace_start(source, start) : start]
+
+
+def _whitespace_start(source: bytes, start: int) -> int:
+    """Find the start of the whitespace run that ends at start."""
+    while start > 0 and source[start - 1] in _WHITESPACE:
+        start -= 1
+    return start
+
+
+def _skip_element(source: bytes, name: bytes, pos: int) -> Optional[int]:
+    """Find the end of an element by searching for its closing tag.
+
+    Only valid when no element with the same name is nested inside it and the
+    closing tag found is not inside a CDATA section or comment. The last
+    CDATA section and comment opened before the closing tag must end before
+    it; CDATA that is closed earlier (the usual case in GP files) does not
+    prevent the shortcut.
+
+    Returns:
+        Offset just past the closing tag, or None if the shortcut is not safe
+    """
+    closing = source.find(b"</" + name + b">", pos)
+    if closing < 0:
+        return None
+    for opener, terminator in ((b"<![CDATA[", b"]]>"), (b"<!--", b"-->")):
+        section = source.rfind(opener, pos, closing)
+        if section >= 0:
+            section_end = source.find(terminator, section + len(opener))
+            if section_end < 0 or section_end + len(terminator) > closing:
+                return None
+    for terminator in (b">", b" ", b"/", b"\t", b"\n", b"\r"):
+        if source.find(b"<" + name + terminator, pos, closing) >= 0:
+            return None
+    return closing + len(name) + 3
+
+
+def _record(spans: Dict[str, List[Span]], path: str, start: int, end: int) -> None:
+    """Append a span to the mapping."""
+    spans.setdefault(path, []).append((start, end))
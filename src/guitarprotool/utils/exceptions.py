@@ -131,6 +131,12 @@ class InsufficientBeatsError(DriftAnalysisError):
     pass
 
 
+class AlignmentError(BeatDetectionError):
+    """Raised when the score cannot be aligned to the audio."""
+
+    pass
+
+
 class XMLModificationError(GuitarProToolError):
     """Base class for errors during XML parsing/modification."""
 
@@ -165,3 +171,15 @@ class ConfigurationError(GuitarProToolError):
     """Raised for configuration-related errors."""
 
     pass
+
+
+class WorkerUnavailableError(GuitarProToolError):
+    """Raised when the analysis worker cannot be reached or drops a connection."""
+
+    pass
+
+
+class WatchJobError(GuitarProToolError):
+    """Raised when a watch-folder job fails to produce its output."""
+
+    pass
@@ -0,0 +1,64 @@
+"""Helpers for deferring imports of heavy dependencies.
+
+Importing numpy, yt_dlp, questionary or torch costs tens to hundreds of
+milliseconds (seconds for torch). These helpers let modules check whether
+a dependency is installed without importing it, and bind a module name
+that is only imported on first attribute access.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def is_installed(*names: str) -> bool:
+    """Check whether modules can be imported, without importing them.
+
+    Only the module's spec is located (via importlib.util.find_spec); its
+    code is not executed. Parent packages of dotted names are imported.
+
+    Args:
+        *names: Top-level or dotted module names
+
+    Returns:
+        True if every module is installed
+    """
+    for name in names:
+        if name in sys.modules:
+            if sys.modules[name] is None:  # Blocked, e.g. by a test
+                return False
+            continue
+        try:
+            if importlib.util.find_spec(name) is None:
+                return False
+        except (ImportError, ValueError):
+            return False
+    return True
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Get a module that is imported on first attribute access.
+
+    Args:
+        name: Module name
+
+    Returns:
+        The module if it is already imported, otherwise a lazily loading
+        module registered in sys.modules
+
+    Raises:
+        ModuleNotFoundError: If the module is not installed
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,296 @@
+"""Per-stage timing and memory instrumentation.
+
+Pipeline stages are wrapped in spans:
+
+    >>> from guitarprotool.utils.instrumentation import span
+    >>> with span("isolation", backend="torch"):
+    ...     isolate()
+
+Each finished span records wall time, CPU time (process-wide, so it
+includes worker threads such as ffmpeg readers and BLAS pools), the
+process's peak RSS so far and, when tracemalloc is tracing, the peak of
+Python/numpy allocations during the span. Spans nest and may be opened
+from any thread.
+
+Recorded spans can be exported as JSON, Chrome trace format (load it in
+chrome://tracing or https://ui.perfetto.dev) and Prometheus text
+exposition format. Hooks (see SpanHook) are notified as spans start and
+finish, e.g. to profile each stage.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Protocol
+
+# Prometheus metric name prefix
+METRIC_PREFIX = "guitarprotool_stage"
+
+
+def _max_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far, or None if unknown."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+@dataclass
+class Span:
+    """One timed pipeline stage.
+
+    Attributes:
+        name: Stage name (e.g. "download", "isolation")
+        start: Start time in seconds since the recorder was created
+        wall_time: Elapsed wall-clock time in seconds
+        cpu_time: Process CPU time (user + system) spent in seconds
+        max_rss_bytes: Process peak RSS at the end of the span (a
+            high-water mark, so it never decreases between spans)
+        traced_peak_bytes: Peak traced allocations during the span, or None
+            if tracemalloc was not tracing
+        thread_id: Thread the span ran on
+        parent: Name of the enclosing span on the same thread
+        attributes: Extra labels, e.g. the model or backend used
+        error: Exception type name if the stage raised
+    """
+
+    name: str
+    start: float
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    max_rss_bytes: Optional[int] = None
+    traced_peak_bytes: Optional[int] = None
+    thread_id: int = 0
+    parent: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class SpanHook(Protocol):
+    """Receives span start and finish events, on the span's thread."""
+
+    def span_started(self, record: Span, depth: int) -> None:
+        """Called before the span's timing starts (depth 0 = outermost)."""
+
+    def span_finished(self, record: Span, depth: int) -> None:
+        """Called after the span's timing stops."""
+
+
+class SpanRecorder:
+    """Collects spans and exports them.
+
+    Thread-safe: each thread has its own stack of open spans, and finished
+    spans are appended under a lock.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """Initialize SpanRecorder.
+
+        Args:
+            trace_memory: Start tracemalloc so spans record allocation peaks.
+                Tracing slows allocation-heavy code down noticeably, so it
+                is off by default.
+        """
+        self.spans: List[Span] = []
+        self.hooks: List[SpanHook] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _stack(self) -> List[list]:
+        """Open spans on this thread, as [span, running traced peak] pairs."""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _fold_traced_peak(self, stack: List[list]) -> Optional[int]:
+        """Fold the traced peak since the last reset into all open spans.
+
+        tracemalloc has a single global peak, so it is reset at every span
+        boundary and each span keeps the running max of the pieces.
+        """
+        if not tracemalloc.is_tracing():
+            return None
+        peak = tracemalloc.get_traced_memory()[1]
+        for entry in stack:
+            entry[1] = max(entry[1] or 0, peak)
+        tracemalloc.reset_peak()
+        return peak
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time a block as a named span.
+
+        Args:
+            name: Stage name
+            **attributes: Extra labels stored on the span
+
+        Yields:
+            The span; attributes may be added while it is open
+        """
+        stack = self._stack()
+        self._fold_traced_peak(stack)
+
+        record = Span(
+            name=name,
+            start=time.perf_counter() - self._origin,
+            thread_id=threading.get_ident(),
+            parent=stack[-1][0].name if stack else None,
+            attributes=dict(attributes),
+        )
+        entry = [record, None]
+        stack.append(entry)
+        depth = len(stack) - 1
+        for hook in self.hooks:
+            hook.span_started(record, depth)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        except BaseException as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            record.wall_time = time.perf_counter() - wall_start
+            record.cpu_time = time.process_time() - cpu_start
+            for hook in reversed(self.hooks):
+                hook.span_finished(record, depth)
+            self._fold_traced_peak(stack)
+            stack.pop()
+            record.traced_peak_bytes = entry[1]
+            record.max_rss_bytes = _max_rss_bytes()
+            with self._lock:
+                self.spans.append(record)
+
+    def clear(self) -> None:
+        """Drop all recorded spans."""
+        with self._lock:
+            self.spans.clear()
+
+    def to_json(self) -> List[Dict[str, Any]]:
+        """Get spans as JSON-serializable dicts, in start order."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        return [asdict(s) for s in spans]
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Get spans in Chrome trace event format (complete "X" events)."""
+        pid = os.getpid()
+        events = []
+        for s in self.to_json():
+            args = {k: s[k] for k in ("cpu_time", "max_rss_bytes", "traced_peak_bytes", "error")}
+            args.update(s["attributes"])
+            events.append(
+                {
+                    "name": s["name"],
+                    "cat": "pipeline",
+                    "ph": "X",
+                    "ts": s["start"] * 1e6,
+                    "dur": s["wall_time"] * 1e6,
+                    "pid": pid,
+                    "tid": s["thread_id"],
+                    "args": {k: v for k, v in args.items() if v is not None},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_prometheus(self) -> str:
+        """Get per-stage totals in Prometheus text exposition format.
+
+        Wall and CPU time are summaries (sum and count per stage); memory
+        peaks are gauges holding the largest value seen for the stage.
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+        for s in self.to_json():
+            stage = stages.setdefault(
+                s["name"], {"count": 0, "wall": 0.0, "cpu": 0.0, "rss": None, "traced": None}
+            )
+            stage["count"] += 1
+            stage["wall"] += s["wall_time"]
+            stage["cpu"] += s["cpu_time"]
+            for key, value in (("rss", s["max_rss_bytes"]), ("traced", s["traced_peak_bytes"])):
+                if value is not None:
+                    stage[key] = max(stage[key] or 0, value)
+
+        lines = []
+        for metric, kind, help_text in (
+            ("wall_seconds", "summary", "Wall-clock time spent in pipeline stages"),
+            ("cpu_seconds", "summary", "Process CPU time spent in pipeline stages"),
+            ("max_rss_bytes", "gauge", "Process peak RSS at the end of the stage"),
+            ("traced_peak_bytes", "gauge", "Peak traced allocations during the stage"),
+        ):
+            name = f"{METRIC_PREFIX}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for stage_name, stage in stages.items():
+                label = f'{{stage="{stage_name}"}}'
+                if kind == "summary":
+                    total = stage["wall" if metric == "wall_seconds" else "cpu"]
+                    lines.append(f"{name}_sum{label} {total:.6f}")
+                    lines.append(f"{name}_count{label} {stage['count']}")
+                else:
+                    value = stage["rss" if metric == "max_rss_bytes" else "traced"]
+                    if value is not None:
+                        lines.append(f"{name}{label} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_dir: Path) -> Dict[str, Path]:
+        """Write all three exports to a directory.
+
+        Args:
+            output_dir: Directory to write spans.json, trace.json and
+                metrics.prom to
+
+        Returns:
+            Dict mapping format ("json", "chrome", "prometheus") to path
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = {
+            "json": output_dir / "spans.json",
+            "chrome": output_dir / "trace.json",
+            "prometheus": output_dir / "metrics.prom",
+        }
+        paths["json"].write_text(json.dumps(self.to_json(), indent=2))
+        paths["chrome"].write_text(json.dumps(self.to_chrome_trace()))
+        paths["prometheus"].write_text(self.to_prometheus())
+        return paths
+
+
+# Process-wide recorder used by span()
+_recorder = SpanRecorder()
+
+
+def get_recorder() -> SpanRecorder:
+    """Get the process-wide span recorder."""
+    return _recorder
+
+
+def set_recorder(recorder: SpanRecorder) -> SpanRecorder:
+    """Replace the process-wide span recorder.
+
+    Returns:
+        The previous recorder
+    """
+    global _recorder
+    previous, _recorder = _recorder, recorder
+    return previous
+
+
+def span(name: str, **attributes: Any):
+    """Time a block as a named span on the process-wide recorder.
+
+    See SpanRecorder.span.
+    """
+    return _recorder.span(name, **attributes)
@@ -0,0 +1,207 @@
+"""Per-stage cProfile profiling of the pipeline.
+
+StageProfiler hooks into the span recorder (see instrumentation) and runs
+cProfile for the duration of each outermost span on the main thread, so
+download, decode, isolation, beat tracking and so on are profiled
+separately. Spans of the same stage (e.g. beat tracking on the bass stem
+and on the full mix) are merged.
+
+For each stage it writes:
+- <stage>.prof: pstats data (snakeviz, `python -m pstats`)
+- <stage>.collapsed: collapsed stacks ("a;b;c <microseconds>" per line)
+  for flamegraph.pl, speedscope or inferno. cProfile records caller and
+  callee edges rather than full stacks, so stacks are rebuilt from the
+  call graph, splitting a function's time across its callers in
+  proportion to the time each caller spent in it.
+"""
+
+import cProfile
+import pstats
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from guitarprotool.utils.instrumentation import Span
+
+# pstats function key: (filename, line number, function name)
+FunctionKey = Tuple[str, int, str]
+
+# Collapsed stacks deeper than this are truncated at the limit
+MAX_STACK_DEPTH = 128
+
+# Paths lighter than this share of the stage's time are dropped from
+# collapsed stacks, which bounds the number of paths walked
+MIN_STACK_FRACTION = 1e-4
+
+
+@dataclass
+class FunctionStats:
+    """Time spent in one function during a stage.
+
+    Attributes:
+        name: Function label, "function (file:line)"
+        calls: Total number of calls
+        self_time: Time in the function itself, in seconds
+        cumulative_time: Time including callees, in seconds
+    """
+
+    name: str
+    calls: int
+    self_time: float
+    cumulative_time: float
+
+
+def function_label(func: FunctionKey) -> str:
+    """Format a pstats function key for display and collapsed stacks."""
+    filename, line, name = func
+    if filename == "~":  # Built-in
+        return name.replace(";", ",")
+    return f"{name} ({Path(filename).name}:{line})".replace(";", ",")
+
+
+def collapse_stats(stats: pstats.Stats) -> List[str]:
+    """Rebuild collapsed stacks from cProfile's caller/callee graph.
+
+    Args:
+        stats: Profile statistics
+
+    Returns:
+        Lines of "frame;frame;frame <self time in microseconds>"
+    """
+    raw = stats.stats  # type: ignore[attr-defined]
+    callees: Dict[FunctionKey, Dict[FunctionKey, float]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, (_, _, _, edge_cumulative) in callers.items():
+            callees.setdefault(caller, {})[func] = edge_cumulative
+
+    # Calls made from frames entered before profiling started have no
+    # recorded caller; their time starts stacks of its own
+    roots = {}
+    for func, (_, _, _, cumulative, callers) in raw.items():
+        attributed = sum(edge[3] for caller, edge in callers.items() if caller != func)
+        if cumulative - attributed > 0:
+            roots[func] = cumulative - attributed
+    min_weight = max(1e-6, MIN_STACK_FRACTION * sum(roots.values()))
+    totals: Dict[str, float] = {}
+
+    def walk(func: FunctionKey, weight: float, path: List[FunctionKey]) -> None:
+        _, _, self_time, cumulative, _ = raw[func]
+        share = weight / cumulative if cumulative > 0 else 0.0
+        stack = ";".join(function_label(f) for f in path)
+        node_self = self_time * share
+
+        if len(path) < MAX_STACK_DEPTH:
+            for callee, edge_time in callees.get(func, {}).items():
+                child_weight = edge_time * share
+                if child_weight < min_weight:
+                    continue
+                if callee in path:  # Recursion: keep the time at this frame
+                    node_self += child_weight
+                    continue
+                walk(callee, child_weight, path + [callee])
+        else:
+            node_self = weight
+
+        totals[stack] = totals.get(stack, 0.0) + node_self
+
+    for root, weight in roots.items():
+        if weight >= min_weight:
+            walk(root, weight, [root])
+
+    return [
+        f"{stack} {round(seconds * 1e6)}"
+        for stack, seconds in sorted(totals.items())
+        if round(seconds * 1e6) > 0
+    ]
+
+
+class StageProfiler:
+    """Profiles each outermost pipeline span with cProfile.
+
+    Register it with SpanRecorder.hooks. Only main-thread spans are
+    profiled: cProfile profiles the thread that enables it, and background
+    work (prefetch downloads, the worker's request threads) would
+    otherwise interleave with the stage being measured.
+    """
+
+    def __init__(self):
+        """Initialize StageProfiler."""
+        self.stages: Dict[str, pstats.Stats] = {}
+        self._active: Optional[cProfile.Profile] = None
+
+    def span_started(self, record: Span, depth: int) -> None:
+        """Start profiling an outermost main-thread span."""
+        if depth != 0 or threading.current_thread() is not threading.main_thread():
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:  # Another profiler is active
+            logger.debug(f"Not profiling stage {record.name}: {e}")
+            return
+        self._active = profile
+
+    def span_finished(self, record: Span, depth: int) -> None:
+        """Stop profiling and merge the span's stats into its stage."""
+        if depth != 0 or self._active is None:
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+        profile, self._active = self._active, None
+        profile.disable()
+
+        if record.name in self.stages:
+            self.stages[record.name].add(profile)
+        else:
+            self.stages[record.name] = pstats.Stats(profile)
+
+    def clear(self) -> None:
+        """Drop collected profiles."""
+        self.stages.clear()
+
+    def top_functions(self, stage: str, limit: int = 10) -> List[FunctionStats]:
+        """Get the functions with the most self time in a stage.
+
+        Args:
+            stage: Stage (span) name
+            limit: Number of functions to return
+
+        Returns:
+            FunctionStats sorted by self time, largest first
+        """
+        raw = self.stages[stage].stats  # type: ignore[attr-defined]
+        functions = [
+            FunctionStats(
+                name=function_label(func),
+                calls=calls,
+                self_time=self_time,
+                cumulative_time=cumulative,
+            )
+            for func, (_, calls, self_time, cumulative, _) in raw.items()
+        ]
+        functions.sort(key=lambda f: f.self_time, reverse=True)
+        return functions[:limit]
+
+    def write(self, output_dir: Path) -> List[Path]:
+        """Write .prof and .collapsed files for every profiled stage.
+
+        Args:
+            output_dir: Directory to write to (created if missing)
+
+        Returns:
+            Paths of the files written
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        written = []
+        for stage, stats in self.stages.items():
+            prof_path = output_dir / f"{stage}.prof"
+            stats.dump_stats(prof_path)
+            collapsed_path = output_dir / f"{stage}.collapsed"
+            collapsed_path.write_text("\n".join(collapse_stats(stats)) + "\n")
+            written.extend([prof_path, collapsed_path])
+        logger.debug(f"Wrote profiles for {len(self.stages)} stages to {output_dir}")
+        return written
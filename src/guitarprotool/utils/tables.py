@@ -0,0 +1,204 @@
+"""Columnar export of per-bar and per-beat data.
+
+A table is a dict of equal-length 1-D numpy arrays (column name ->
+values). Tables are written CHUNK_ROWS rows at a time, so a long
+recording's rows are never all formatted in memory at once:
+
+- CSV / TSV: each chunk formatted column by column with numpy
+- JSON Lines: one object per row
+- Parquet / Arrow IPC: via pyarrow, when installed
+
+format_rows gives the same chunks as fixed-width text, for the
+human-readable reports.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from guitarprotool.utils.exceptions import ConfigurationError
+from guitarprotool.utils.imports import is_installed, lazy_import
+
+PYARROW_AVAILABLE = is_installed("pyarrow")
+pa = lazy_import("pyarrow") if PYARROW_AVAILABLE else None
+
+Table = Dict[str, np.ndarray]
+
+# Rows formatted and written per chunk
+CHUNK_ROWS = 4096
+
+# File suffix -> export format
+FORMATS = {
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".jsonl": "jsonl",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+}
+
+
+def table_chunks(table: Table, chunk_rows: int = CHUNK_ROWS) -> Iterator[Table]:
+    """Split a table into consecutive chunks of rows.
+
+    Args:
+        table: Column name -> values
+        chunk_rows: Rows per chunk
+
+    Yields:
+        Tables of at most chunk_rows rows, as views into the columns
+    """
+    rows = table_rows(table)
+    for start in range(0, rows, chunk_rows):
+        yield {name: column[start : start + chunk_rows] for name, column in table.items()}
+
+
+def table_rows(table: Table) -> int:
+    """Number of rows in a table.
+
+    Raises:
+        ValueError: If the columns differ in length
+    """
+    lengths = {len(column) for column in table.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Table columns differ in length: {sorted(lengths)}")
+    return lengths.pop() if lengths else 0
+
+
+def format_column(column: np.ndarray, fmt: str, missing: str = "") -> np.ndarray:
+    """Format every value of a column with a printf-style format.
+
+    Args:
+        column: Values
+        fmt: printf-style format for one value, e.g. "%10.3f"
+        missing: Text for NaN values, right-aligned to the field width of fmt
+
+    Returns:
+        Array of strings
+    """
+    strings = np.char.mod(fmt, column)
+    if column.dtype.kind == "f":
+        nan = np.isnan(column)
+        if nan.any():
+            width = re.match(r"%[-+ #0]*(\d*)", fmt).group(1)
+            strings = np.where(nan, missing.rjust(int(width or 0)), strings)
+    return strings
+
+
+def format_rows(
+    chunk: Table, formats: Dict[str, str], separator: str, missing: str = ""
+) -> List[str]:
+    """Format a chunk of rows as text lines, column by column.
+
+    Args:
+        chunk: Column name -> values
+        formats: Column name -> printf-style format; columns are written in
+            this order, and columns not listed are left out
+        separator: Text between columns
+        missing: Text for NaN values
+
+    Returns:
+        One line per row, without line endings
+    """
+    lines: Optional[np.ndarray] = None
+    for name, fmt in formats.items():
+        strings = format_column(chunk[name], fmt, missing)
+        lines = strings if lines is None else np.char.add(np.char.add(lines, separator), strings)
+    return [] if lines is None else lines.tolist()
+
+
+def write_table(
+    table: Table,
+    file_path: Path | str,
+    table_format: Optional[str] = None,
+    formats: Optional[Dict[str, str]] = None,
+) -> Path:
+    """Write a table to a file, streaming it in chunks.
+
+    Args:
+        table: Column name -> values
+        file_path: Output file
+        table_format: "csv", "tsv", "jsonl", "parquet" or "arrow"; None
+            picks it from the file suffix
+        formats: Column name -> printf-style format for CSV/TSV (default
+            "%d" for integers, "%.6f" for floats, "%s" otherwise)
+
+    Returns:
+        Path written
+
+    Raises:
+        ConfigurationError: If the format is unknown, or needs pyarrow and
+            pyarrow is not installed
+    """
+    path = Path(file_path)
+    table_format = table_format or FORMATS.get(path.suffix.lower())
+    if table_format in ("csv", "tsv"):
+        _write_delimited(table, path, "," if table_format == "csv" else "\t", formats)
+    elif table_format == "jsonl":
+        _write_jsonl(table, path)
+    elif table_format in ("parquet", "arrow"):
+        _write_arrow(table, path, table_format)
+    else:
+        raise ConfigurationError(
+            f"Unknown table format for {path.name}; use one of: {', '.join(FORMATS)}"
+        )
+    logger.debug(f"Wrote {table_rows(table)} rows to {path}")
+    return path
+
+
+def _default_format(column: np.ndarray) -> str:
+    """printf-style format for a column's dtype."""
+    if column.dtype.kind in "iub":
+        return "%d"
+    if column.dtype.kind == "f":
+        return "%.6f"
+    return "%s"
+
+
+def _write_delimited(
+    table: Table, path: Path, delimiter: str, formats: Optional[Dict[str, str]]
+) -> None:
+    """Write CSV/TSV: a header line, then chunks formatted by format_rows."""
+    formats = {
+        name: (formats or {}).get(name) or _default_format(column)
+        for name, column in table.items()
+    }
+    with open(path, "w", encoding="utf-8", newline="") as out:
+        out.write(delimiter.join(table) + "\n")
+        for chunk in table_chunks(table):
+            out.write("\n".join(format_rows(chunk, formats, delimiter)) + "\n")
+
+
+def _write_jsonl(table: Table, path: Path) -> None:
+    """Write JSON Lines, one object per row; NaN becomes null."""
+    names = list(table)
+    with open(path, "w", encoding="utf-8") as out:
+        for chunk in table_chunks(table):
+            columns = []
+            for column in chunk.values():
+                values = column.tolist()
+                if column.dtype.kind == "f" and np.isnan(column).any():
+                    values = [None if value != value else value for value in values]
+                columns.append(values)
+            out.writelines(json.dumps(dict(zip(names, row))) + "\n" for row in zip(*columns))
+
+
+def _write_arrow(table: Table, path: Path, table_format: str) -> None:
+    """Write Parquet or Arrow IPC, one row group / record batch per chunk."""
+    if not PYARROW_AVAILABLE:
+        raise ConfigurationError(
+            f"{table_format} export needs pyarrow. Install with: pip install pyarrow"
+        )
+    schema = pa.Table.from_pydict({name: column[:0] for name, column in table.items()}).schema
+    if table_format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(str(path), schema)
+    else:
+        writer = pa.ipc.new_file(str(path), schema)
+    with writer:
+        for chunk in table_chunks(table):
+            writer.write_table(pa.Table.from_pydict(chunk, schema=schema))
@@ -0,0 +1,83 @@
+"""Tests for audio_probe module."""
+
+import subprocess
+
+import pytest
+from pydub.generators import Sine
+
+from guitarprotool.core.audio_probe import probe_mp3
+
+
+def _export(temp_dir, name, duration_ms=2000, frame_rate=44100, channels=2, **kwargs):
+    """Export a sine wave with the given encoder settings."""
+    path = temp_dir / name
+    audio = Sine(440).to_audio_segment(duration=duration_ms)
+    audio = audio.set_frame_rate(frame_rate).set_channels(channels)
+    audio.export(str(path), **kwargs)
+    return path
+
+
+class TestProbeMp3:
+    """Tests for probe_mp3()."""
+
+    def test_cbr_stereo(self, temp_dir):
+        """Test parameters of a CBR stereo MP3."""
+        path = _export(temp_dir, "cbr.mp3", format="mp3", bitrate="192k")
+
+        info = probe_mp3(path)
+
+        assert info.mpeg_version == "1"
+        assert info.sample_rate == 44100
+        assert info.channels == 2
+        assert info.bitrate == 192
+        assert info.is_cbr
+        assert info.duration_ms == pytest.approx(2000, abs=60)
+
+    def test_mono_and_sample_rate(self, temp_dir):
+        """Test mono channel mode and non-default sample rate."""
+        path = _export(
+            temp_dir, "mono.mp3", frame_rate=48000, channels=1, format="mp3", bitrate="128k"
+        )
+
+        info = probe_mp3(path)
+
+        assert info.sample_rate == 48000
+        assert info.channels == 1
+        assert info.bitrate == 128
+
+    def test_vbr_detected(self, temp_dir):
+        """Test VBR files are not reported as constant bitrate."""
+        wav_path = _export(temp_dir, "source.wav", format="wav")
+        path = temp_dir / "vbr.mp3"
+        subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-y", "-i", str(wav_path), "-q:a", "2", str(path)],
+            check=True,
+        )
+
+        info = probe_mp3(path)
+
+        assert not info.is_cbr
+        assert info.duration_ms == pytest.approx(2000, abs=150)
+
+    def test_id3v2_tag_skipped(self, temp_dir):
+        """Test a leading ID3v2 tag is skipped."""
+        path = _export(temp_dir, "plain.mp3", format="mp3", bitrate="192k")
+        tagged = temp_dir / "tagged.mp3"
+        # 10-byte header with a syncsafe size of 1000, followed by padding
+        tag = b"ID3\x04\x00\x00" + bytes([0, 0, 7, 104]) + b"\x00" * 1000
+        tagged.write_bytes(tag + path.read_bytes())
+
+        info = probe_mp3(tagged)
+
+        assert info.audio_offset >= 1010
+        assert info.bitrate == 192
+
+    def test_wav_is_not_mp3(self, temp_dir):
+        """Test non-MP3 files return None."""
+        path = _export(temp_dir, "audio.wav", format="wav")
+
+        assert probe_mp3(path) is None
+
+    def test_missing_file(self, temp_dir):
+        """Test missing files return None."""
+        assert probe_mp3(temp_dir / "missing.mp3") is None
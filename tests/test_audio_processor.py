@@ -10,6 +10,8 @@ from pydub import AudioSegment
 from pydub.generators import Sine
 
 from guitarprotool.core.audio_processor import AudioProcessor, AudioInfo
+from guitarprotool.core.audio_probe import probe_mp3
+from guitarprotool.core.prefetcher import DownloadedAudio
 from guitarprotool.utils.exceptions import (
     DownloadError,
     ConversionError,
@@ -167,6 +169,79 @@ class TestProcessLocalFile:
             assert isinstance(args[1], str)  # status
 
 
+class TestPassthrough:
+    """Test probe-first passthrough and streaming transcode."""
+
+    def test_compliant_mp3_copied_unchanged(self, audio_processor, sample_mp3_file):
+        """Test a 192kbps 44.1kHz stereo CBR MP3 is embedded without re-encoding."""
+        with patch('guitarprotool.core.audio_processor.subprocess.Popen') as mock_popen:
+            audio_info = audio_processor.process_local_file(sample_mp3_file)
+
+        mock_popen.assert_not_called()
+        assert audio_info.file_path.read_bytes() == sample_mp3_file.read_bytes()
+        assert audio_info.duration_ms == pytest.approx(1000, abs=60)
+
+    def test_non_compliant_mp3_transcoded(self, audio_processor, temp_dir):
+        """Test an MP3 at the wrong bitrate is transcoded to target specs."""
+        mp3_path = temp_dir / "low.mp3"
+        audio = Sine(440).to_audio_segment(duration=1000).set_frame_rate(22050)
+        audio.export(str(mp3_path), format="mp3", bitrate="64k")
+
+        audio_info = audio_processor.process_local_file(mp3_path)
+
+        result = probe_mp3(audio_info.file_path)
+        assert result.sample_rate == 44100
+        assert result.channels == 2
+        assert result.bitrate == 192
+        assert audio_info.duration_ms == pytest.approx(1000, abs=60)
+        assert audio_info.file_path.read_bytes() != mp3_path.read_bytes()
+
+    def test_transcoded_mp3_has_info_header(self, audio_processor, sample_audio_file):
+        """Test the encoder's Xing/LAME Info frame is written to the output."""
+        audio_info = audio_processor.process_local_file(sample_audio_file)
+
+        head = audio_info.file_path.read_bytes()[:4096]
+        assert b"Info" in head or b"Xing" in head
+        assert b"LAME" in head or b"Lavc" in head
+
+    def test_ffmpeg_failure_raises_conversion_error(self, audio_processor, temp_dir):
+        """Test an unreadable input raises ConversionError and leaves no output."""
+        bad_file = temp_dir / "broken.wav"
+        bad_file.write_bytes(b"not audio at all")
+
+        with pytest.raises(ConversionError, match="ffmpeg exited"):
+            audio_processor.process_local_file(bad_file)
+
+        assert not list(audio_processor.output_dir.glob("*.mp3"))
+
+    def test_uuid_is_input_sha1(self, audio_processor, sample_audio_file, sample_mp3_file):
+        """Test the UUID hashed during copy/transcode matches the input's SHA1."""
+        for input_path in (sample_audio_file, sample_mp3_file):
+            expected = hashlib.sha1(input_path.read_bytes()).hexdigest()
+
+            audio_info = audio_processor.process_local_file(input_path)
+
+            assert audio_info.uuid.replace('-', '') == expected[:32]
+            assert audio_info.uuid == audio_processor._generate_uuid(input_path)
+            assert audio_info.file_path.name == f"{audio_info.uuid}.mp3"
+
+    def test_no_temp_files_left(self, audio_processor, sample_audio_file, temp_dir):
+        """Test temporary output files are renamed or removed."""
+        audio_processor.process_local_file(sample_audio_file)
+        bad_file = temp_dir / "broken.wav"
+        bad_file.write_bytes(b"not audio at all")
+        with pytest.raises(ConversionError):
+            audio_processor.process_local_file(bad_file)
+
+        assert not list(audio_processor.output_dir.glob("*.tmp"))
+
+    def test_missing_ffmpeg_raises_conversion_error(self, audio_processor, sample_audio_file):
+        """Test a missing ffmpeg binary raises ConversionError."""
+        with patch('guitarprotool.core.audio_processor.shutil.which', return_value=None):
+            with pytest.raises(ConversionError, match="ffmpeg not found"):
+                audio_processor.process_local_file(sample_audio_file)
+
+
 class TestProcessYouTube:
     """Test YouTube download and processing."""
 
@@ -239,6 +314,28 @@ class TestProcessYouTube:
             audio_processor.process_youtube(url)
 
 
+class TestProcessDownload:
+    """Test processing prefetched downloads."""
+
+    def test_process_download(self, audio_processor, sample_audio_file):
+        """Test a prefetched file is converted and keeps its source metadata."""
+        download = DownloadedAudio(
+            url="https://youtube.com/watch?v=abc123abc12",
+            video_id="abc123abc12",
+            file_path=sample_audio_file,
+            title="Prefetched Song",
+        )
+
+        audio_info = audio_processor.process_download(download)
+
+        assert audio_info.file_path.exists()
+        assert audio_info.file_path.suffix == ".mp3"
+        assert audio_info.title == "Prefetched Song"
+        assert audio_info.original_url == download.url
+        # The cached download is left in place for later runs
+        assert sample_audio_file.exists()
+
+
 class TestUUIDGeneration:
     """Test UUID generation."""
 
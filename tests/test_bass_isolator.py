@@ -63,6 +63,41 @@ class TestIsolationResult:
         assert result.error_message == "CUDA out of memory"
 
 
+class TestInferenceProfiles:
+    """Test CPU inference profiles."""
+
+    def test_profiles_defined(self):
+        """Test the named profiles trade passes for speed in order."""
+        from guitarprotool.core.bass_isolator import DEFAULT_PROFILE, INFERENCE_PROFILES
+
+        fast, balanced, quality = (INFERENCE_PROFILES[n] for n in ("fast", "balanced", "quality"))
+
+        assert DEFAULT_PROFILE == "balanced"
+        assert fast.shifts < balanced.shifts < quality.shifts
+        assert fast.overlap < balanced.overlap < quality.overlap
+        assert fast.quantize and not balanced.quantize
+        assert all(name == profile.name for name, profile in INFERENCE_PROFILES.items())
+
+    def test_get_profile(self):
+        """Test profiles are looked up by name and passed through as objects."""
+        from guitarprotool.core.bass_isolator import BassIsolator, InferenceProfile
+
+        custom = InferenceProfile("custom", shifts=0, bfloat16=True, num_threads=2)
+
+        assert BassIsolator._get_profile("fast").name == "fast"
+        assert BassIsolator._get_profile(custom) is custom
+        with pytest.raises(ValueError, match="not supported"):
+            BassIsolator._get_profile("ultra")
+
+    def test_available_cpus(self):
+        """Test the CPU count is positive and within the machine's CPUs."""
+        import os
+
+        from guitarprotool.core.bass_isolator import _available_cpus
+
+        assert 1 <= _available_cpus() <= (os.cpu_count() or 1)
+
+
 class TestCheckDependencies:
     """Test dependency checking."""
 
@@ -156,6 +191,20 @@ class TestBassIsolatorInit:
         with pytest.raises(ModelNotAvailableError):
             BassIsolator(output_dir=temp_dir, model="invalid_model")
 
+    @pytest.mark.skipif(
+        not _isolation_available(),
+        reason="Bass isolation dependencies not installed",
+    )
+    def test_init_stem_format(self, temp_dir, mock_dependencies):
+        """Test stem format is validated and stored."""
+        from guitarprotool.core.bass_isolator import BassIsolator
+
+        isolator = BassIsolator(output_dir=temp_dir, stem_format="float32")
+        assert isolator.stem_format == "float32"
+
+        with pytest.raises(ValueError):
+            BassIsolator(output_dir=temp_dir, stem_format="int24")
+
     @pytest.mark.skipif(
         not _isolation_available(),
         reason="Bass isolation dependencies not installed",
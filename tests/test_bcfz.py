@@ -5,7 +5,14 @@ Tests the BitStream class, BCFZ decompression, and BCFS container extraction.
 
 import pytest
 
-from guitarprotool.core.bcfz import BitStream, decompress_bcfz, extract_gpx_files
+from guitarprotool.core.bcfz import (
+    BitStream,
+    BitWriter,
+    build_bcfs_container,
+    compress_bcfz,
+    decompress_bcfz,
+    extract_gpx_files,
+)
 from guitarprotool.utils.exceptions import BCFZDecompressionError
 
 
@@ -202,6 +209,91 @@ class TestExtractGPXFiles:
         assert True  # Documentation test
 
 
+class TestBitWriter:
+    """Tests for the BitWriter class."""
+
+    def test_round_trip_with_bit_stream(self):
+        """Test written fields read back with BitStream."""
+        writer = BitWriter()
+        writer.write_bits(1, 1)
+        writer.write_bits(13, 4)
+        writer.write_bits_reversed(11, 4)
+        writer.write_bits(0x41, 8)
+
+        stream = BitStream(writer.getvalue())
+
+        assert stream.read_bit() == 1
+        assert stream.read_bits(4) == 13
+        assert stream.read_bits_reversed(4) == 11
+        assert stream.read_bits(8) == 0x41
+
+    def test_final_byte_zero_padded(self):
+        """Test a partial final byte is padded with zero bits."""
+        writer = BitWriter()
+        writer.write_bits(0b101, 3)
+
+        assert writer.getvalue() == bytes([0b10100000])
+
+
+class TestCompressBCFZ:
+    """Tests for the compress_bcfz function."""
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"",
+            b"A",
+            b"AB",
+            b"ABCABCABCABCABCABCABCABC",
+            bytes(range(256)) * 4,
+            b"<Bar id='1'><Voices>1 -1 -1 -1</Voices></Bar>\n" * 2000,
+        ],
+    )
+    def test_round_trip(self, data):
+        """Test decompress_bcfz restores compressed data exactly."""
+        compressed = compress_bcfz(data)
+
+        assert compressed.startswith(b"BCFZ")
+        assert int.from_bytes(compressed[4:8], "little") == len(data)
+        assert decompress_bcfz(compressed) == data
+
+    def test_repetitive_data_shrinks(self):
+        """Test back-references are used for repeated content."""
+        data = b"<Beat><Rhythm ref='0'/></Beat>" * 1000
+
+        assert len(compress_bcfz(data)) < len(data) // 20
+
+
+class TestBuildBCFSContainer:
+    """Tests for the build_bcfs_container function."""
+
+    def test_round_trip(self):
+        """Test extract_gpx_files recovers every file, including multi-sector ones."""
+        files = {
+            "score.gpif": b"<GPIF>" + b"x" * 10000 + b"</GPIF>",
+            "misc.xml": b"<Misc/>",
+        }
+
+        container = build_bcfs_container(files)
+
+        assert container.startswith(b"BCFS")
+        assert len(container) % 4096 == 0
+        assert extract_gpx_files(container) == files
+
+    def test_compressed_round_trip(self):
+        """Test a compressed container decompresses and extracts."""
+        files = {"score.gpif": b"<GPIF><Score/></GPIF>"}
+
+        data = compress_bcfz(build_bcfs_container(files))
+
+        assert extract_gpx_files(decompress_bcfz(data)) == files
+
+    def test_file_too_large(self):
+        """Test files beyond one file table entry are rejected."""
+        with pytest.raises(ValueError, match="too large"):
+            build_bcfs_container({"score.gpif": bytes(5 * 1024 * 1024)})
+
+
 class TestBCFZIntegration:
     """Integration tests with realistic BCFZ data."""
 
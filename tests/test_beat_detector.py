@@ -1,16 +1,23 @@
 """Tests for beat_detector module."""
 
+from fractions import Fraction
 from unittest.mock import patch, MagicMock
 
 import pytest
 import numpy as np
 
 from guitarprotool.core.beat_detector import (
+    LIBROSA_AVAILABLE,
     BeatDetector,
     BeatInfo,
+    SyncPointArray,
     SyncPointData,
     SyncResult,
+    bar_positions,
+    beat_regularity,
+    filter_beat_outliers,
 )
+from guitarprotool.core.tempo_map import TempoMap
 from guitarprotool.utils.exceptions import BeatDetectionError, BPMDetectionError
 
 
@@ -124,6 +131,322 @@ class TestAnalyze:
         assert progress_values[-1][0] == 1.0
 
 
+class TestAnalyzeAudio:
+    """Test BeatDetector.analyze_audio() method."""
+
+    @pytest.fixture
+    def mock_librosa(self):
+        with patch("guitarprotool.core.beat_detector.LIBROSA_AVAILABLE", True), patch(
+            "guitarprotool.core.beat_detector.librosa"
+        ) as mock_librosa:
+            mock_librosa.beat.beat_track.return_value = (
+                np.array([120.0]),
+                np.array([0, 21, 42, 63, 84]),
+            )
+            mock_librosa.onset.onset_detect.return_value = np.array([0, 21, 42, 63, 84])
+            mock_librosa.frames_to_time.return_value = np.array([0.0, 0.5, 1.0, 1.5, 2.0])
+            yield mock_librosa
+
+    def test_buffer_analyzed_without_loading(self, mock_librosa):
+        """Test an in-memory buffer is analyzed without touching the filesystem."""
+        y = np.zeros(44100, dtype=np.float32)
+
+        result = BeatDetector().analyze_audio(y, 44100)
+
+        assert isinstance(result, BeatInfo)
+        mock_librosa.load.assert_not_called()
+        mock_librosa.resample.assert_not_called()
+        assert mock_librosa.beat.beat_track.call_args.kwargs["y"] is y
+
+    def test_other_sample_rate_resampled(self, mock_librosa):
+        """Test buffers at another sample rate are resampled first."""
+        mock_librosa.resample.return_value = np.zeros(44100, dtype=np.float32)
+
+        BeatDetector().analyze_audio(np.zeros(48000, dtype=np.float32), 48000)
+
+        assert mock_librosa.resample.call_args.kwargs == {"orig_sr": 48000, "target_sr": 44100}
+
+    def test_stereo_rejected(self, mock_librosa):
+        """Test multi-channel buffers raise BeatDetectionError."""
+        with pytest.raises(BeatDetectionError, match="mono"):
+            BeatDetector().analyze_audio(np.zeros((2, 100), dtype=np.float32), 44100)
+
+
+class TestGuidedAnalysis:
+    """Test tempo-map guided beat tracking."""
+
+    @staticmethod
+    def clicks(frame_rate, segments):
+        """Onset envelope with an impulse on every beat of (seconds, BPM) segments."""
+        frames = []
+        time = 0.0
+        for seconds, bpm in segments:
+            end = time + seconds
+            while time < end:
+                frames.append(int(round(time * frame_rate)))
+                time += 60.0 / bpm
+        envelope = np.zeros(frames[-1] + int(frame_rate))
+        envelope[frames] = 1.0
+        return envelope
+
+    @pytest.fixture
+    def frame_rate(self, beat_detector):
+        return beat_detector.sample_rate / beat_detector.hop_length
+
+    def test_finds_audio_tempo_near_tab_tempo(self, beat_detector, frame_rate):
+        """Test the local tempo is measured, not copied from the tab."""
+        envelope = self.clicks(frame_rate, [(40.0, 126.0)])
+        tempo_map = TempoMap(changes=[(0, 120.0)], bar_quarters=[4.0] * 20)
+
+        bpm = beat_detector.guided_tempo(envelope, tempo_map)
+
+        assert len(bpm) == len(envelope)
+        assert np.median(bpm) == pytest.approx(126.0, rel=0.01)
+
+    def test_double_time_ruled_out(self, beat_detector, frame_rate):
+        """Test eighth-note onsets do not double the tempo."""
+        envelope = self.clicks(frame_rate, [(30.0, 240.0)])
+        tempo_map = TempoMap(changes=[(0, 120.0)], bar_quarters=[4.0] * 15)
+
+        bpm = beat_detector.guided_tempo(envelope, tempo_map)
+
+        assert np.median(bpm) == pytest.approx(120.0, rel=0.02)
+
+    def test_follows_tempo_sections(self, beat_detector, frame_rate):
+        """Test each tempo section is tracked near its own tab tempo."""
+        envelope = self.clicks(frame_rate, [(48.0, 100.0), (48.0, 140.0)])
+        # 20 bars at 100 BPM (48s), then 28 bars at 140 BPM (48s)
+        tempo_map = TempoMap(changes=[(0, 100.0), (20, 140.0)], bar_quarters=[4.0] * 48)
+
+        bpm = beat_detector.guided_tempo(envelope, tempo_map)
+
+        assert bpm[int(20 * frame_rate)] == pytest.approx(100.0, rel=0.02)
+        assert bpm[int(75 * frame_rate)] == pytest.approx(140.0, rel=0.02)
+
+    def test_short_audio_uses_tab_tempo(self, beat_detector):
+        """Test envelopes too short to measure fall back to the tab tempo."""
+        tempo_map = TempoMap(changes=[(0, 90.0)], bar_quarters=[4.0])
+
+        bpm = beat_detector.guided_tempo(np.zeros(10), tempo_map)
+
+        np.testing.assert_array_equal(bpm, np.full(10, 90.0))
+
+    def test_beat_track_given_tempo_curve(self):
+        """Test analyze_audio tracks beats at the guided tempo."""
+        with patch("guitarprotool.core.beat_detector.LIBROSA_AVAILABLE", True), patch(
+            "guitarprotool.core.beat_detector.librosa"
+        ) as mock_librosa:
+            mock_librosa.onset.onset_strength.return_value = np.zeros(1000)
+            mock_librosa.beat.beat_track.return_value = (np.array([0.0]), np.array([0, 43]))
+            mock_librosa.onset.onset_detect.return_value = np.array([0])
+            mock_librosa.frames_to_time.return_value = np.array([0.0, 0.5])
+            tempo_map = TempoMap(changes=[(0, 120.0)], bar_quarters=[4.0] * 4)
+
+            result = BeatDetector().analyze_audio(
+                np.zeros(44100, dtype=np.float32), 44100, tempo_map=tempo_map
+            )
+
+        bpm = mock_librosa.beat.beat_track.call_args.kwargs["bpm"]
+        assert bpm.shape == (1000,)
+        assert result.bpm == pytest.approx(120.0)
+
+
+class TestDownbeats:
+    """Test downbeat detection."""
+
+    @staticmethod
+    def accents(positions):
+        """Accents that are high on downbeats."""
+        return np.where(np.array(positions) == 0, 1.5, -0.5)
+
+    def test_regular_bars(self):
+        """Test accented beats are labelled as downbeats."""
+        positions = [i % 4 for i in range(16)]
+
+        assert bar_positions(self.accents(positions), 4).tolist() == positions
+
+    def test_pickup_beats(self):
+        """Test beats before the first accented beat are labelled as a pickup."""
+        positions = [(i + 3) % 4 for i in range(17)]
+
+        labelled = bar_positions(self.accents(positions), 4)
+
+        assert labelled.tolist() == positions
+        assert labelled[0] == 3
+
+    def test_recovers_after_extra_beat(self):
+        """Test a spurious beat shifts the bar phase only locally."""
+        true_positions = [i % 4 for i in range(40)]
+        # Extra beat after beat 17: positions stay on the true grid around it
+        positions = true_positions[:18] + [-1] + true_positions[18:]
+        accents = self.accents(positions)
+
+        labelled = bar_positions(accents, 4)
+
+        downbeats = np.flatnonzero(labelled == 0)
+        np.testing.assert_array_equal(downbeats, np.flatnonzero(np.array(positions) == 0))
+
+    def test_recovers_after_missed_beat(self):
+        """Test a missed beat does not shift later bars."""
+        positions = [i % 4 for i in range(40)]
+        del positions[21]
+
+        labelled = bar_positions(self.accents(positions), 4)
+
+        np.testing.assert_array_equal(
+            np.flatnonzero(labelled == 0), np.flatnonzero(np.array(positions) == 0)
+        )
+
+    def test_single_beat_bars(self):
+        """Test every beat is a downbeat with one beat per bar."""
+        assert bar_positions(np.zeros(5), 1).tolist() == [0] * 5
+
+    def test_analyze_labels_beats(self):
+        """Test analyze_audio returns positions only when a meter is given."""
+        with patch("guitarprotool.core.beat_detector.LIBROSA_AVAILABLE", True), patch(
+            "guitarprotool.core.beat_detector.librosa"
+        ) as mock_librosa, patch.object(
+            BeatDetector, "beat_accents", return_value=np.array([1.0, -1.0, 1.0, -1.0, 1.0])
+        ):
+            mock_librosa.beat.beat_track.return_value = (np.array([120.0]), np.arange(5))
+            mock_librosa.onset.onset_detect.return_value = np.arange(5)
+            mock_librosa.frames_to_time.return_value = np.array([0.0, 0.5, 1.0, 1.5, 2.0])
+            y = np.zeros(44100, dtype=np.float32)
+
+            plain = BeatDetector().analyze_audio(y, 44100)
+            labelled = BeatDetector().analyze_audio(y, 44100, beats_per_bar=2)
+
+        assert plain.beat_positions is None
+        assert labelled.beat_positions == [0, 1, 0, 1, 0]
+
+    @pytest.mark.skipif(not LIBROSA_AVAILABLE, reason="librosa not installed")
+    def test_chord_changes_accent_downbeats(self):
+        """Test beats where the harmony changes get higher accents."""
+        detector = BeatDetector(sample_rate=22050)
+        seconds_per_beat = 0.5
+        t = np.arange(int(4 * seconds_per_beat * 22050)) / 22050
+        bars = [
+            sum(np.sin(2 * np.pi * f * m * t) for m in (1, 1.26, 1.5)) * np.exp(-t)
+            for f in (110.0, 146.8, 164.8, 130.8) * 2
+        ]
+        y = np.concatenate(bars).astype(np.float32)
+        beat_times = list(np.arange(len(bars) * 4) * seconds_per_beat)
+
+        accents = detector.beat_accents(y, beat_times)
+
+        assert accents.shape == (len(beat_times),)
+        assert np.all(accents[4::4] > np.delete(accents, np.arange(0, len(accents), 4)).max())
+
+
+class TestBeatOutliers:
+    """Test per-beat strengths, regularity and outlier filtering."""
+
+    @pytest.fixture
+    def beats(self):
+        """40 beats at 120 BPM with 5 ms jitter."""
+        rng = np.random.default_rng(0)
+        return np.arange(40) * 0.5 + rng.normal(0, 0.005, 40)
+
+    def test_regular_beats_unchanged(self, beats):
+        """Test steady beats pass through the filter untouched."""
+        filtered, filled = filter_beat_outliers(beats)
+
+        np.testing.assert_array_equal(filtered, beats)
+        assert not filled.any()
+
+    def test_spurious_beat_dropped(self, beats):
+        """Test a beat splitting an interval in two is removed."""
+        with_extra = np.insert(beats, 11, beats[10] + 0.2)
+
+        filtered, filled = filter_beat_outliers(with_extra)
+
+        np.testing.assert_array_equal(filtered, beats)
+        assert not filled.any()
+
+    def test_missed_beats_filled_in(self, beats):
+        """Test gaps of whole beats are filled with evenly spaced beats."""
+        with_gaps = np.delete(beats, [5, 20, 21])
+
+        filtered, filled = filter_beat_outliers(with_gaps)
+
+        assert len(filtered) == len(beats)
+        np.testing.assert_allclose(filtered, beats, atol=0.02)
+        assert np.flatnonzero(filled).tolist() == [5, 20, 21]
+
+    def test_first_beat_kept(self, beats):
+        """Test the first beat is never dropped."""
+        filtered, _ = filter_beat_outliers(beats)
+
+        assert filtered[0] == beats[0]
+
+    def test_regularity_flags_displaced_beat(self, beats):
+        """Test a displaced beat and its neighbours' intervals score low."""
+        displaced = beats.copy()
+        displaced[15] += 0.15
+
+        regularity = beat_regularity(displaced)
+
+        assert regularity[15] < 0.8
+        assert np.delete(regularity, [14, 15, 16]).min() > 0.9
+
+    def test_beat_strengths(self, beat_detector):
+        """Test strengths sample the envelope near each beat, relative to its peaks."""
+        envelope = np.zeros(400)
+        envelope[[20, 40, 60, 86, 110, 130]] = 2.0  # Frame 86: 1.0 s at hop 512
+        envelope[173] = 1.0  # 2.0 s
+
+        strengths = beat_detector.beat_strengths(envelope, [1.0, 2.0, 3.0])
+
+        assert strengths[0] == pytest.approx(1.0)
+        assert strengths[1] == pytest.approx(0.5)
+        assert strengths[2] == 0.0
+
+    def test_reliable_mask(self):
+        """Test reliability follows the regularity, and is None if unmeasured."""
+        beat_info = BeatInfo(
+            bpm=120.0,
+            beat_times=[0.0, 0.5, 1.0],
+            confidence=0.9,
+            beat_regularity=np.array([1.0, 0.9, 0.3]),
+        )
+
+        assert beat_info.reliable.tolist() == [True, True, False]
+        assert BeatInfo(bpm=120.0, beat_times=[0.0], confidence=0.9).reliable is None
+
+    def test_from_beat_keeps_arrays(self):
+        """Test trimming and shifting beats carries the per-beat arrays along."""
+        beat_info = BeatInfo(
+            bpm=120.0,
+            beat_times=[0.0, 0.5, 1.0, 1.5],
+            confidence=0.9,
+            beat_positions=[0, 1, 0, 1],
+            beat_strengths=np.array([0.1, 0.2, 0.3, 0.4]),
+            beat_regularity=np.array([1.0, 1.0, 0.5, 1.0]),
+        )
+
+        trimmed = beat_info.from_beat(2, 3.0)
+
+        np.testing.assert_array_equal(trimmed.beat_times, [3.0, 3.5])
+        assert trimmed.beat_positions is None
+        np.testing.assert_array_equal(trimmed.beat_strengths, [0.3, 0.4])
+        np.testing.assert_array_equal(trimmed.beat_regularity, [0.5, 1.0])
+
+    @pytest.mark.skipif(not LIBROSA_AVAILABLE, reason="librosa not installed")
+    def test_analyze_audio_measures_beats(self):
+        """Test analysis returns a strength and regularity for every beat."""
+        sr = 22050
+        y = np.zeros(sr * 8, dtype=np.float32)
+        click = np.exp(-np.arange(400) / 60.0) * np.sin(np.arange(400) * 0.9)
+        for start in np.arange(0.5, 7.5, 0.5):
+            y[int(start * sr):int(start * sr) + 400] += click
+
+        beat_info = BeatDetector(sample_rate=sr).analyze_audio(y, sr)
+
+        assert beat_info.beat_strengths.shape == (len(beat_info.beat_times),)
+        assert beat_info.beat_regularity.shape == (len(beat_info.beat_times),)
+        assert beat_info.reliable[1:-1].all()
+
+
 class TestDetectBPM:
     """Test BeatDetector.detect_bpm() method."""
 
@@ -166,6 +489,75 @@ class TestDetectBPM:
         assert bpm > 0
 
 
+class TestSyncPointArray:
+    """Tests for column-wise sync point storage."""
+
+    @pytest.fixture
+    def points(self):
+        return SyncPointArray(
+            bars=[0, 4, 8],
+            frame_offsets=[0, 352800, 705600],
+            modified_tempos=[120.0, 121.5, 119.25],
+            original_tempos=[120.0, 120.0, 120.0],
+        )
+
+    def test_column_dtypes(self, points):
+        """Test columns are stored as int64 frames/bars and float32 tempos."""
+        assert points.bars.dtype == np.int64
+        assert points.frame_offsets.dtype == np.int64
+        assert points.modified_tempos.dtype == np.float32
+        assert points.original_tempos.dtype == np.float32
+
+    def test_arrays_not_copied(self):
+        """Test columns that already have their dtype are used as given."""
+        frames = np.arange(3, dtype=np.int64)
+        points = SyncPointArray(
+            bars=frames,
+            frame_offsets=frames,
+            modified_tempos=np.ones(3, np.float32),
+            original_tempos=np.ones(3, np.float32),
+        )
+        assert points.frame_offsets is frames
+
+    def test_index_gives_record(self, points):
+        """Test an int index gives a SyncPointData with Python scalars."""
+        record = points[1]
+        assert record == SyncPointData(
+            bar=4, frame_offset=352800, modified_tempo=121.5, original_tempo=120.0
+        )
+        assert type(record.frame_offset) is int
+
+    def test_slice_is_view(self, points):
+        """Test slicing shares the underlying arrays."""
+        tail = points[1:]
+        assert len(tail) == 2
+        assert np.shares_memory(tail.frame_offsets, points.frame_offsets)
+
+    def test_records_round_trip(self, points):
+        """Test records convert back to the same columns."""
+        again = SyncPointArray.from_records(points.records())
+        np.testing.assert_array_equal(again.frame_offsets, points.frame_offsets)
+        assert [sp.bar for sp in points] == [0, 4, 8]
+
+    def test_to_sync_points(self, points):
+        """Test conversion to XMLModifier SyncPoints."""
+        sync_points = points.to_sync_points()
+        assert [sp.frame_offset for sp in sync_points] == [0, 352800, 705600]
+        assert sync_points[2].modified_tempo == pytest.approx(119.25)
+        assert sync_points[0].position == 0
+
+    def test_mismatched_columns_rejected(self):
+        """Test columns of different lengths are refused."""
+        with pytest.raises(ValueError):
+            SyncPointArray(
+                bars=[0, 1], frame_offsets=[0], modified_tempos=[1.0], original_tempos=[1.0]
+            )
+
+    def test_records_have_slots(self, points):
+        """Test SyncPointData records carry no per-instance __dict__."""
+        assert not hasattr(points[0], "__dict__")
+
+
 class TestGenerateSyncPoints:
     """Test BeatDetector.generate_sync_points() method."""
 
@@ -185,6 +577,7 @@ class TestGenerateSyncPoints:
         assert isinstance(result.sync_points, list)
         assert len(result.sync_points) > 0
         assert all(isinstance(sp, SyncPointData) for sp in result.sync_points)
+        assert result.sync_points is result.sync_points  # Records built once
         assert isinstance(result.frame_padding, int)
         assert isinstance(result.first_beat_time, float)
 
@@ -203,6 +596,19 @@ class TestGenerateSyncPoints:
         # Bar 0 should have frame_offset 0 (relative to first beat)
         assert result.sync_points[0].frame_offset == 0
 
+    def test_pickup_beats_precede_bar_zero(self, beat_detector, sample_beat_info):
+        """Test bar 0 starts at the first downbeat, not at pickup beats."""
+        sample_beat_info.beat_positions = [(i + 3) % 4 for i in range(60)]
+
+        result = beat_detector.generate_sync_points(sample_beat_info, original_tempo=120.0)
+
+        assert result.first_beat_time == 0.5
+        assert result.frame_padding == -int(0.5 * beat_detector.sample_rate)
+        assert result.sync_points[0].frame_offset == 0
+        # Bar 1 starts four beats after the first downbeat, a full bar later
+        bar_one = [sp for sp in result.sync_points if sp.bar == 1]
+        assert not bar_one or bar_one[0].frame_offset == 2 * beat_detector.sample_rate
+
     def test_generate_sync_points_interval(self, beat_detector, sample_beat_info):
         """Test sync points are created at correct intervals."""
         result = beat_detector.generate_sync_points(
@@ -235,6 +641,16 @@ class TestGenerateSyncPoints:
             assert sp.original_tempo == 120.0
             assert sp.modified_tempo > 0
 
+    def test_generate_sync_points_error_bound(self, beat_detector, sample_beat_info):
+        """Test an error bound places the fewest sync points needed."""
+        result = beat_detector.generate_sync_points(
+            sample_beat_info, original_tempo=120.0, max_error_ms=10
+        )
+
+        # Steady beats: one sync point covers the whole song
+        assert [sp.bar for sp in result.sync_points] == [0]
+        assert result.sync_points[0].modified_tempo == pytest.approx(120.0)
+
     def test_generate_sync_points_empty_beats_raises(self, beat_detector):
         """Test that empty beat list raises error."""
         empty_beat_info = BeatInfo(bpm=120.0, beat_times=[], confidence=0.5)
@@ -344,9 +760,18 @@ class TestBeatInfo:
         )
 
         assert info.bpm == 120.0
-        assert info.beat_times == [0.0, 0.5, 1.0]
+        assert info.beat_times.dtype == np.float64
+        assert info.beat_times.tolist() == [0.0, 0.5, 1.0]
         assert info.confidence == 0.85
 
+    def test_first_downbeat(self):
+        """Test bar 0 starts at the first labelled downbeat."""
+        info = BeatInfo(bpm=120.0, beat_times=[0.0, 0.5, 1.0], confidence=0.9)
+        assert info.first_downbeat == 0
+
+        info.beat_positions = [2, 3, 0]
+        assert info.first_downbeat == 2
+
     def test_beat_info_required_fields(self):
         """Test BeatInfo requires all fields."""
         with pytest.raises(TypeError):
@@ -532,6 +957,121 @@ class TestTempoCorrection:
         # Should have roughly double the beats (interpolated)
         assert len(corrected.beat_times) >= len(beat_times) * 2 - 1
 
+    def test_correction_keeps_beat_arrays(self):
+        """Test corrected beats keep one strength and regularity per beat."""
+        beat_times = [i * 1.0 for i in range(10)]
+        beat_info = BeatInfo(
+            bpm=60.0,
+            beat_times=beat_times,
+            confidence=0.9,
+            beat_strengths=np.ones(10),
+            beat_regularity=np.ones(10),
+        )
+
+        corrected = BeatDetector.correct_tempo_multiple(beat_info, reference_tempo=120.0)
+
+        assert len(corrected.beat_strengths) == len(corrected.beat_times)
+        assert corrected.beat_strengths[1] == 0.0  # Interpolated beat
+        assert corrected.reliable.all()
+
+    @pytest.mark.parametrize(
+        "offset, expected",
+        [(0, [0, 1, 2, 3, 0, 1]), (2, [3, 0, 1, 2, 3, 0])],
+    )
+    def test_correction_keeps_bar_positions(self, offset, expected):
+        """Test bar positions survive a 2:1 correction, pickup included."""
+        beat_info = BeatInfo(
+            bpm=240.0,
+            beat_times=np.arange(40) * 0.25,
+            confidence=0.9,
+            beat_positions=[(i - offset) % 4 for i in range(40)],
+        )
+
+        corrected, ratio = BeatDetector.correct_tempo_ratio(beat_info, reference_tempo=120.0)
+
+        assert ratio == 2
+        assert corrected.beat_positions[:6] == expected
+        assert len(corrected.beat_positions) == len(corrected.beat_times)
+        assert corrected.beat_times[corrected.first_downbeat] == offset * 0.25
+
+    @pytest.mark.parametrize(
+        "detected_bpm, ratio",
+        [(180.0, Fraction(3, 2)), (80.0, Fraction(2, 3)), (160.0, Fraction(4, 3))],
+    )
+    def test_correct_rational_lock(self, detected_bpm, ratio):
+        """Test 3:2, 2:3 and 4:3 grids are resampled onto the true beats."""
+        beat_times = list(np.arange(48) * 60.0 / detected_bpm)
+        # The detected beats on the true beats are the accented ones
+        beat_info = BeatInfo(
+            bpm=detected_bpm,
+            beat_times=beat_times,
+            confidence=0.9,
+            beat_strengths=np.where(np.arange(48) % ratio.numerator == 0, 1.0, 0.2),
+        )
+
+        corrected, chosen = BeatDetector.correct_tempo_ratio(beat_info, reference_tempo=120.0)
+
+        assert chosen == ratio
+        assert corrected.bpm == pytest.approx(120.0)
+        np.testing.assert_allclose(
+            corrected.beat_times, np.arange(len(corrected.beat_times)) * 0.5, atol=1e-9
+        )
+        assert corrected.beat_times[-1] <= beat_times[-1]
+
+    def test_onsets_pick_between_ratios(self):
+        """Test onset strengths decide between ratios that fit the tempo equally."""
+        # 170 BPM is 6% from 120 BPM at both 3:2 and 4:3; every 4th beat is accented
+        beat_info = BeatInfo(
+            bpm=170.0,
+            beat_times=list(np.arange(48) * 60.0 / 170.0),
+            confidence=0.9,
+            beat_strengths=np.where(np.arange(48) % 4 == 0, 1.0, 0.2),
+        )
+
+        corrected, ratio = BeatDetector.correct_tempo_ratio(
+            beat_info, reference_tempo=120.0, tolerance=0.3
+        )
+
+        assert ratio == Fraction(4, 3)
+        # Every 3rd corrected beat is an accented detected beat; the rest fall between
+        assert corrected.beat_strengths[:7].tolist() == [1.0, 0.0, 0.0, 1.0, 0.0, 0.0, 1.0]
+
+    @pytest.mark.parametrize("strengths", [None, np.ones(48)])
+    def test_steady_grid_off_tempo_kept(self, strengths):
+        """Test a steady grid beyond tolerance is not forced onto another ratio."""
+        # 118 BPM is 18% off a 100 BPM tab, but 4:3 (88.5 BPM) is within 15%
+        beat_info = BeatInfo(
+            bpm=118.0,
+            beat_times=list(np.arange(48) * 60.0 / 118.0),
+            confidence=0.9,
+            beat_strengths=strengths,
+        )
+
+        corrected, ratio = BeatDetector.correct_tempo_ratio(beat_info, reference_tempo=100.0)
+
+        assert ratio == 1
+        assert corrected is beat_info
+
+    def test_tempo_map_tempos_used(self):
+        """Test the tab's tempos replace the reference tempo when given."""
+        beat_info = BeatInfo(bpm=180.0, beat_times=list(np.arange(24) / 3.0), confidence=0.9)
+        tempo_map = TempoMap(changes=[(0, 120.0)], bar_quarters=[4.0])
+
+        _, ratio = BeatDetector.correct_tempo_ratio(
+            beat_info, reference_tempo=100.0, tempo_map=tempo_map
+        )
+
+        assert ratio == Fraction(3, 2)
+
+    def test_no_correction_reports_unit_ratio(self):
+        """Test an uncorrected grid is returned as is with ratio 1."""
+        beat_info = BeatInfo(bpm=118.0, beat_times=[0.0, 0.5, 1.0], confidence=0.9)
+
+        corrected, ratio = BeatDetector.correct_tempo_ratio(beat_info, reference_tempo=120.0)
+
+        assert corrected is beat_info
+        assert ratio == 1
+
     def test_no_correction_needed(self):
         """Test that no correction is applied when tempo is close to reference."""
         beat_times = [i * 0.5 for i in range(20)]  # 120 BPM beats
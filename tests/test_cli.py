@@ -16,6 +16,7 @@ sys.modules["aubio"] = mock_aubio
 
 # ruff: noqa: E402
 from guitarprotool.cli.main import (
+    align_beats_to_start,
     print_banner,
     get_track_name,
     confirm_overwrite,
@@ -26,6 +27,8 @@ from guitarprotool.cli.main import (
 )
 from guitarprotool.core.beat_detector import BeatInfo
 
+FIXTURE_GP = Path(__file__).parent / "fixtures" / "simple_song" / "input.gp"
+
 
 class TestPrintBanner:
     """Test banner display."""
@@ -123,6 +126,31 @@ class TestDisplayBeatInfo:
         display_beat_info(beat_info)
 
 
+class TestAlignBeatsToStart:
+    """Tests for aligning detected beats to the music start."""
+
+    def beat_info(self):
+        return BeatInfo(
+            bpm=120.0,
+            beat_times=[0.2, 0.7, 1.2, 1.7, 2.2],
+            confidence=0.9,
+            beat_positions=[2, 3, 0, 1, 2],
+        )
+
+    def test_nearest_beat_moved_to_start(self):
+        """Test beats before the start are dropped and the rest shifted."""
+        aligned = align_beats_to_start(self.beat_info(), 1.25)
+        assert aligned.beat_times == pytest.approx([1.25, 1.75, 2.25])
+
+    def test_positions_kept_on_downbeat(self):
+        """Test bar positions survive when the first beat is a detected downbeat."""
+        assert align_beats_to_start(self.beat_info(), 1.25).beat_positions == [0, 1, 2]
+
+    def test_positions_dropped_off_downbeat(self):
+        """Test bar positions are dropped when the first beat is not a downbeat."""
+        assert align_beats_to_start(self.beat_info(), 0.7).beat_positions is None
+
+
 class TestMain:
     """Test main entry point."""
 
@@ -216,6 +244,16 @@ class TestTroubleshootingCopies:
         assert result.parent.name == "files"
         assert result.name.startswith("run_")
 
+    def test_get_troubleshooting_dir_unique(self, temp_dir, monkeypatch):
+        """Test runs started in the same second get separate directories."""
+        monkeypatch.chdir(temp_dir)
+
+        first = get_troubleshooting_dir()
+        second = get_troubleshooting_dir()
+
+        assert first != second
+        assert second.exists()
+
     def test_save_troubleshooting_copies(self, temp_dir):
         """Test that save_troubleshooting_copies copies all files."""
         # Create source files
@@ -275,3 +313,235 @@ class TestOriginalTempoFallback:
         # Verify the fallback worked
         assert original_tempo == detected_bpm
         assert original_tempo is not None
+
+
+class TestWorkerFallback:
+    """Test use of the analysis worker with in-process fallback."""
+
+    @patch("guitarprotool.core.beat_detector.BeatDetector")
+    @patch("guitarprotool.cli.main.get_worker_client")
+    def test_detect_beats_uses_worker(self, mock_get_worker, mock_detector_class, temp_dir):
+        """Test beat detection runs in the worker when one is running."""
+        from guitarprotool.cli.main import detect_beats
+
+        beat_info = BeatInfo(bpm=120.0, beat_times=[0.5, 1.0], confidence=0.9)
+        mock_get_worker.return_value.analyze.return_value = beat_info
+
+        result = detect_beats(temp_dir / "song.mp3", MagicMock())
+
+        assert result is beat_info
+        mock_detector_class.assert_not_called()
+
+    @patch("guitarprotool.core.beat_detector.BeatDetector")
+    @patch("guitarprotool.cli.main.get_worker_client")
+    def test_detect_beats_falls_back(self, mock_get_worker, mock_detector_class, temp_dir):
+        """Test beat detection runs in-process if the worker goes away."""
+        from guitarprotool.cli.main import detect_beats
+        from guitarprotool.utils.exceptions import WorkerUnavailableError
+
+        beat_info = BeatInfo(bpm=120.0, beat_times=[0.5, 1.0], confidence=0.9)
+        mock_get_worker.return_value.analyze.side_effect = WorkerUnavailableError("gone")
+        mock_detector_class.return_value.analyze.return_value = beat_info
+
+        result = detect_beats(temp_dir / "song.mp3", MagicMock())
+
+        assert result is beat_info
+
+
+class TestProcessAudio:
+    """Test process_audio() dispatch and availability check."""
+
+    @patch("guitarprotool.core.audio_processor.AudioProcessor", autospec=True)
+    def test_local_file(self, mock_processor_class, temp_dir):
+        """Test a local source is converted with process_local_file."""
+        from guitarprotool.cli.main import process_audio
+
+        processor = mock_processor_class.return_value
+        audio_path = temp_dir / "song.wav"
+
+        result = process_audio("local", str(audio_path), temp_dir, MagicMock())
+
+        processor.process_local_file.assert_called_once_with(audio_path)
+        assert result is processor.process_local_file.return_value
+
+    @patch("guitarprotool.cli.main.console")
+    @patch("guitarprotool.cli.main.AUDIO_PROCESSOR_AVAILABLE", False)
+    def test_missing_yt_dlp(self, mock_console, temp_dir):
+        """Test the error names yt-dlp and how to install it."""
+        from guitarprotool.cli.main import process_audio
+
+        assert process_audio("local", "song.wav", temp_dir, MagicMock()) is None
+        message = mock_console.print.call_args.args[0]
+        assert "yt-dlp is not installed" in message
+        assert "pip install yt-dlp" in message
+
+
+class TestScoreSyncMethod:
+    """Test --sync-method score."""
+
+    def test_interactive_mode_rejects_score(self, monkeypatch):
+        """Test score mode is refused instead of silently ignored without --input."""
+        from guitarprotool.cli.main import parse_args
+
+        monkeypatch.setattr(sys, "argv", ["guitarprotool", "--sync-method", "score"])
+
+        with pytest.raises(SystemExit):
+            parse_args()
+
+    @pytest.mark.skipif(not FIXTURE_GP.exists(), reason="fixture missing")
+    @patch("guitarprotool.cli.main.isolate_bass")
+    @patch("guitarprotool.cli.main.estimate_music_start")
+    @patch("guitarprotool.cli.main.detect_beats")
+    @patch("guitarprotool.cli.main.align_to_score")
+    def test_alignment_skips_beat_tracking(
+        self, mock_align, mock_detect, mock_start, mock_isolate, temp_dir, monkeypatch
+    ):
+        """Test a successful alignment is used without running beat detection."""
+        import argparse
+
+        from guitarprotool.cli.main import run_pipeline_noninteractive
+        from guitarprotool.core.score_aligner import ScoreAlignment
+
+        monkeypatch.chdir(temp_dir)
+        audio_path = temp_dir / "song.mp3"
+        audio_path.write_bytes(b"audio")
+        audio_info = MagicMock(file_path=audio_path, uuid="0" * 32)
+        mock_align.return_value = ScoreAlignment(
+            bar_times=[0.5 + 2.0 * bar for bar in range(9)], cost=0.2
+        )
+        args = argparse.Namespace(
+            input=FIXTURE_GP,
+            output=temp_dir / "out.gp",
+            local_audio=audio_path,
+            youtube_url=None,
+            track_name="Audio Track",
+            quiet=True,
+            compare=False,
+            sync_method="score",
+        )
+
+        with patch("guitarprotool.cli.main.process_audio", return_value=audio_info):
+            assert run_pipeline_noninteractive(args) == 0
+
+        mock_align.assert_called_once()
+        mock_detect.assert_not_called()
+        mock_start.assert_not_called()
+        mock_isolate.assert_not_called()
+        assert (temp_dir / "out.gp").exists()
+
+
+class TestTempoCorrection:
+    """Test tempo ratio correction in the pipeline."""
+
+    @pytest.mark.skipif(not FIXTURE_GP.exists(), reason="fixture missing")
+    @patch("guitarprotool.cli.main.bass_isolation_available", return_value=False)
+    @patch("guitarprotool.cli.main.estimate_music_start", return_value=None)
+    @patch("guitarprotool.cli.main.detect_beats")
+    def test_tempo_correction_uses_tempo_map(
+        self, mock_detect, mock_start, mock_available, temp_dir, monkeypatch
+    ):
+        """Test beat tracking runs the tempo ratio correction against the tab's tempo map."""
+        import argparse
+
+        import numpy as np
+
+        from guitarprotool.cli.main import run_pipeline_noninteractive
+        from guitarprotool.core.beat_detector import BeatDetector, BeatInfo
+
+        monkeypatch.chdir(temp_dir)
+        audio_path = temp_dir / "song.mp3"
+        audio_path.write_bytes(b"audio")
+        audio_info = MagicMock(file_path=audio_path, uuid="0" * 32)
+        mock_detect.return_value = BeatInfo(
+            bpm=120.0, beat_times=list(np.arange(64) * 0.5), confidence=0.9
+        )
+        args = argparse.Namespace(
+            input=FIXTURE_GP,
+            output=temp_dir / "out.gp",
+            local_audio=audio_path,
+            youtube_url=None,
+            track_name="Audio Track",
+            quiet=True,
+            compare=False,
+            sync_method="beats",
+        )
+
+        with patch("guitarprotool.cli.main.process_audio", return_value=audio_info), patch.object(
+            BeatDetector, "correct_tempo_ratio", wraps=BeatDetector.correct_tempo_ratio
+        ) as mock_correct:
+            assert run_pipeline_noninteractive(args) == 0
+
+        mock_correct.assert_called_once()
+        assert mock_correct.call_args.kwargs["tempo_map"] is not None
+
+
+class TestWatchMode:
+    """Test --watch argument handling."""
+
+    def test_parse_watch_args(self, temp_dir, monkeypatch):
+        """Test --watch needs no input file and forwards pipeline options."""
+        from guitarprotool.cli.main import parse_args, watch_pipeline_args
+
+        argv = ["guitarprotool", "--watch", str(temp_dir), "--watch-workers", "4"]
+        monkeypatch.setattr(sys, "argv", argv + ["--sync-error-ms", "20"])
+
+        args = parse_args()
+
+        assert args.watch == [temp_dir]
+        assert args.watch_workers == 4
+        pipeline_args = watch_pipeline_args(args)
+        assert pipeline_args[pipeline_args.index("--sync-error-ms") + 1] == "20.0"
+        assert "--max-sync-points" not in pipeline_args
+
+    def test_parse_watch_missing_folder(self, temp_dir, monkeypatch):
+        """Test a missing watch folder is rejected."""
+        from guitarprotool.cli.main import parse_args
+
+        monkeypatch.setattr(sys, "argv", ["guitarprotool", "--watch", str(temp_dir / "nope")])
+
+        with pytest.raises(SystemExit):
+            parse_args()
+
+
+class TestImportTime:
+    """Test the CLI module imports quickly (heavy dependencies load on use)."""
+
+    # Cumulative `python -X importtime` budget for guitarprotool.cli.main, in
+    # microseconds. Eagerly importing numpy, yt_dlp and questionary puts it
+    # at roughly 0.45-0.5 s; the lazy layout is around 0.18 s.
+    IMPORT_BUDGET_US = 350_000
+
+    HEAVY_MODULES = ("numpy", "librosa", "yt_dlp", "prompt_toolkit", "torch", "demucs")
+
+    def _run(self, code):
+        import subprocess
+
+        return subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    def test_heavy_modules_not_imported(self):
+        """Test importing the CLI does not execute heavy dependencies."""
+        result = self._run(
+            "import sys, guitarprotool.cli.main\n"
+            f"print(','.join(m for m in {self.HEAVY_MODULES!r} if m in sys.modules))"
+        )
+
+        assert result.stdout.strip() == ""
+
+    def test_import_time_budget(self):
+        """Test the CLI import stays within the time budget."""
+        result = self._run("import guitarprotool.cli.main")
+
+        cumulative = [
+            int(line.split("|")[1])
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:")
+            and line.split("|")[2].strip() == "guitarprotool.cli.main"
+        ]
+
+        assert cumulative, "guitarprotool.cli.main missing from -X importtime output"
+        assert max(cumulative) < self.IMPORT_BUDGET_US
@@ -1,11 +1,18 @@
 """Tests for the DriftAnalyzer module."""
 
+import json
+
+import numpy as np
 import pytest
 from guitarprotool.core.drift_analyzer import (
     DriftAnalyzer,
     DriftReport,
     DriftSeverity,
     BarDriftInfo,
+    budget_sync_anchors,
+    min_sync_anchors,
+    segment_slopes,
+    _scan_segment,
 )
 from guitarprotool.core.beat_detector import SyncPointData
 from guitarprotool.utils.exceptions import InsufficientBeatsError
@@ -270,6 +277,32 @@ class TestDriftAnalyzerDebug:
         # Should show interval variance
         assert "Interval variance:" in content
 
+    def test_beat_table(self):
+        """Test per-beat columns, with no interval before the first beat."""
+        beat_times = [1.0, 1.5, 2.0, 2.5, 3.0]
+        analyzer = DriftAnalyzer(
+            beat_times, original_tempo=120.0, beat_positions=[0, 1, 0, 1, 2]
+        )
+
+        table = analyzer.beat_table()
+
+        assert np.isnan(table["interval"][0]) and np.isnan(table["instant_bpm"][0])
+        assert table["instant_bpm"][1:].tolist() == [120.0] * 4
+        assert table["relative_time"].tolist() == [0.0, 0.5, 1.0, 1.5, 2.0]
+        assert table["bar"].tolist() == [0, 0, 1, 1, 1]
+        assert table["beat_in_bar"].tolist() == [0, 1, 0, 1, 2]
+        assert "reliable" not in table
+
+    def test_export_beats(self, tmp_path):
+        """Test beat export as CSV."""
+        analyzer = DriftAnalyzer([i * 0.5 for i in range(8)], original_tempo=120.0)
+
+        path = analyzer.export_beats(tmp_path / "beats.csv")
+
+        lines = path.read_text().splitlines()
+        assert lines[0] == "beat,time,relative_time,interval,instant_bpm,bar,beat_in_bar"
+        assert lines[5].startswith("4,2.000000,2.000000,0.500000,120.000000,1,0")
+
 
 class TestDriftReport:
     """Tests for DriftReport dataclass."""
@@ -324,3 +357,316 @@ class TestDriftReport:
         assert "BAR-BY-BAR DRIFT ANALYSIS" in content
         assert "120.00" in content  # Tab BPM
         assert "LEGEND" in content
+
+    def test_tempo_ratio_reported(self, tmp_path):
+        """Test the corrected tempo ratio appears in the summary and the file."""
+        report = DriftReport(
+            bar_drifts=[],
+            avg_drift_percent=0.0,
+            max_drift_percent=0.0,
+            max_drift_bar=0,
+            total_bars_analyzed=0,
+            bars_with_significant_drift=[],
+            tempo_stability_score=1.0,
+            recommended_sync_interval=8,
+            tempo_corrected=True,
+            original_detected_bpm=180.0,
+            corrected_bpm=120.0,
+            tempo_ratio="3:2",
+        )
+        output_file = tmp_path / "drift_report.txt"
+
+        report.write_to_file(str(output_file))
+
+        assert "Tempo correction: 180.0 -> 120.0 BPM (3:2 grid)" in report.get_summary_lines()
+        assert "3:2 grid (detected:true beats)" in output_file.read_text()
+
+    def test_bar_table(self):
+        """Test per-bar columns match the per-bar records."""
+        drifts = [
+            BarDriftInfo(bar=bar, expected_time=bar * 2.0, actual_time=bar * 2.0,
+                         local_tempo=tempo, original_tempo=120.0)
+            for bar, tempo in enumerate([120.0, 122.0, 126.0, 131.0, 140.0])
+        ]
+        report = DriftReport(
+            bar_drifts=drifts,
+            avg_drift_percent=0.0,
+            max_drift_percent=0.0,
+            max_drift_bar=0,
+            total_bars_analyzed=5,
+            bars_with_significant_drift=[],
+            tempo_stability_score=1.0,
+            recommended_sync_interval=8,
+            bars_with_sync_points=[0, 3],
+        )
+
+        table = report.bar_table()
+
+        assert table["severity"].tolist() == [d.severity.value for d in drifts]
+        assert np.allclose(table["drift_percent"], [d.drift_percent for d in drifts])
+        assert table["sync_point"].tolist() == [True, False, False, True, False]
+
+    def test_export(self, tmp_path):
+        """Test bar export as JSON Lines."""
+        report = DriftReport(
+            bar_drifts=[BarDriftInfo(0, 0.0, 0.1, 123.0, 120.0)],
+            avg_drift_percent=2.5,
+            max_drift_percent=2.5,
+            max_drift_bar=0,
+            total_bars_analyzed=1,
+            bars_with_significant_drift=[],
+            tempo_stability_score=0.9,
+            recommended_sync_interval=8,
+        )
+
+        path = report.export(tmp_path / "bars.jsonl")
+
+        row = json.loads(path.read_text())
+        assert row["severity"] == "minor" and row["sync_point"] is False
+        assert row["drift_percent"] == pytest.approx(2.5)
+
+
+class TestDownbeatMapping:
+    """Tests for mapping bars through detected downbeats."""
+
+    @pytest.fixture
+    def beats_with_extra(self):
+        """Beats at 120 BPM with one spurious beat in bar 1, labelled by bar position."""
+        beat_times = [i * 0.5 for i in range(16)]
+        beat_times.insert(6, 2.75)
+        positions = [0, 1, 2, 3, 0, 1, 1, 2, 3, 0, 1, 2, 3, 0, 1, 2, 3]
+        return beat_times, positions
+
+    def test_bars_follow_downbeats(self, beats_with_extra):
+        """Test bars after a spurious beat stay on their downbeats."""
+        beat_times, positions = beats_with_extra
+        analyzer = DriftAnalyzer(beat_times, original_tempo=120.0, beat_positions=positions)
+
+        for bar in range(4):
+            drift = analyzer.get_drift_at_bar(bar)
+            assert drift.actual_time == pytest.approx(bar * 2.0)
+            assert drift.drift_seconds == pytest.approx(0.0)
+
+    def test_without_positions_beats_are_counted(self, beats_with_extra):
+        """Test the spurious beat shifts later bars when downbeats are unknown."""
+        beat_times, _ = beats_with_extra
+        analyzer = DriftAnalyzer(beat_times, original_tempo=120.0)
+
+        assert analyzer.get_drift_at_bar(2).actual_time == pytest.approx(3.5)
+
+    def test_frame_offsets_use_downbeats(self, beats_with_extra):
+        """Test sync point frame offsets land on the downbeats."""
+        beat_times, positions = beats_with_extra
+        analyzer = DriftAnalyzer(beat_times, original_tempo=120.0, beat_positions=positions)
+
+        assert analyzer._calculate_frame_offset_for_bar(3) == 6 * 44100
+
+    def test_bars_beyond_downbeats(self, beats_with_extra):
+        """Test bars past the last downbeat have no drift info."""
+        beat_times, positions = beats_with_extra
+        analyzer = DriftAnalyzer(beat_times, original_tempo=120.0, beat_positions=positions)
+
+        assert analyzer.get_drift_at_bar(4) is None
+
+    def test_pickup_beats_before_first_bar(self):
+        """Test pickup beats do not form a short first bar."""
+        beat_times = [i * 0.5 for i in range(18)]
+        positions = [(i + 2) % 4 for i in range(18)]
+        analyzer = DriftAnalyzer(beat_times, original_tempo=120.0, beat_positions=positions)
+
+        assert analyzer.downbeat_indices[0] == 2
+        assert analyzer.first_beat_time == 1.0
+        for bar in range(4):
+            drift = analyzer.get_drift_at_bar(bar)
+            assert drift.actual_time == pytest.approx(bar * 2.0)
+            assert drift.drift_seconds == pytest.approx(0.0)
+        table = analyzer.beat_table()
+        assert table["bar"][:3].tolist() == [-1, -1, 0]
+        assert table["beat_in_bar"][:3].tolist() == [2, 3, 0]
+
+    def test_mismatched_positions_ignored(self):
+        """Test positions not matching the beats fall back to counting beats."""
+        analyzer = DriftAnalyzer(
+            [i * 0.5 for i in range(8)], original_tempo=120.0, beat_positions=[0, 1]
+        )
+
+        assert analyzer.downbeat_indices is None
+        assert analyzer.get_drift_at_bar(1).actual_time == pytest.approx(2.0)
+
+    def test_debug_beats_number_bars_by_downbeat(self, beats_with_extra, tmp_path):
+        """Test the debug dump numbers bars from the downbeats."""
+        beat_times, positions = beats_with_extra
+        analyzer = DriftAnalyzer(beat_times, original_tempo=120.0, beat_positions=positions)
+        path = tmp_path / "beats.txt"
+
+        analyzer.write_debug_beats(str(path))
+
+        rows = [line.split("|") for line in path.read_text().splitlines() if "|" in line]
+        # Header row first; beat 9 (index 9) starts bar 2
+        assert rows[10][5].strip() == "2"
+        assert rows[10][6].strip() == "0"
+
+
+def played_bar_error(analyzer, sync_points, bars):
+    """Largest difference (seconds) between where playback puts each bar and its downbeat."""
+    errors = []
+    for bar in range(bars):
+        sync_point = [sp for sp in sync_points if sp.bar <= bar][-1]
+        bar_seconds = analyzer.expected_bar_duration * analyzer.original_tempo
+        played = sync_point.frame_offset / 44100 + (
+            (bar - sync_point.bar) * bar_seconds / sync_point.modified_tempo
+        )
+        actual = analyzer.beat_times[bar * 4] - analyzer.beat_times[0]
+        errors.append(abs(played - actual))
+    return max(errors)
+
+
+class TestOptimalSyncPlacement:
+    """Tests for error-bounded sync point placement."""
+
+    @pytest.fixture
+    def drifting_beats(self):
+        """100 bars slowly speeding up and slowing down around 120 BPM, with 5 ms jitter."""
+        rng = np.random.default_rng(0)
+        intervals = 0.5 * (1 + 0.03 * np.sin(np.linspace(0, 6, 400)))
+        beats = np.concatenate([[0.0], np.cumsum(intervals)])[:400]
+        return (beats + rng.normal(0, 0.005, len(beats))).tolist()
+
+    def test_steady_tempo_needs_one_sync_point(self):
+        """Test bars at a constant tempo are fitted by a single sync point."""
+        bar_times = np.arange(20) * 2.1
+
+        assert min_sync_anchors(bar_times, 0.01) == [0]
+
+    def test_tempo_change_gets_sync_point(self):
+        """Test a tempo change is marked by a sync point where it happens."""
+        bar_times = np.concatenate([np.arange(10) * 2.0, 18.0 + np.arange(1, 11) * 1.5])
+
+        anchors = min_sync_anchors(bar_times, 0.01)
+
+        assert anchors == [0, 9]
+        assert segment_slopes(bar_times, anchors, 0.01) == pytest.approx([2.0, 1.5])
+
+    @pytest.mark.parametrize("chunk", [1, 3, 32, 1000])
+    def test_scan_independent_of_chunk_size(self, drifting_beats, chunk):
+        """Test chunked scanning finds the same segments as scanning everything at once."""
+        bar_times = np.asarray(drifting_beats[::4])
+        bars = np.arange(len(bar_times))
+
+        for anchor in (0, 37, len(bar_times) - 2):
+            ends, tail = _scan_segment(bar_times, bars, anchor, 0.02, chunk)
+            all_ends, all_tail = _scan_segment(bar_times, bars, anchor, 0.02, len(bar_times))
+            np.testing.assert_array_equal(ends, all_ends)
+            assert tail == all_tail
+
+    def test_error_bound_respected(self, drifting_beats):
+        """Test playback of the placed sync points stays within the bound."""
+        analyzer = DriftAnalyzer(drifting_beats, original_tempo=120.0)
+
+        sync_points = analyzer.generate_adaptive_sync_points(max_bars=100, max_error_ms=20)
+
+        assert sync_points[0].bar == 0
+        assert played_bar_error(analyzer, sync_points, 100) <= 0.020 + 1e-4
+
+    def test_fewer_sync_points_than_rules(self, drifting_beats):
+        """Test the optimizer needs far fewer sync points than the fixed rules."""
+        analyzer = DriftAnalyzer(drifting_beats, original_tempo=120.0)
+
+        rules = analyzer.generate_adaptive_sync_points(max_bars=100)
+        optimal = analyzer.generate_adaptive_sync_points(max_bars=100, max_error_ms=20)
+
+        assert len(optimal) < len(rules) / 2
+
+    def test_looser_bound_fewer_sync_points(self, drifting_beats):
+        """Test raising the bound never adds sync points."""
+        analyzer = DriftAnalyzer(drifting_beats, original_tempo=120.0)
+
+        counts = [
+            len(analyzer.generate_adaptive_sync_points(max_bars=100, max_error_ms=ms))
+            for ms in (10, 20, 40)
+        ]
+
+        assert counts == sorted(counts, reverse=True)
+
+    def test_budget(self, drifting_beats):
+        """Test a budget caps the sync points and more budget lowers the error."""
+        bar_times = np.asarray(drifting_beats[::4])
+
+        small, small_error = budget_sync_anchors(bar_times, 3)
+        large, large_error = budget_sync_anchors(bar_times, 12)
+
+        assert len(small) <= 3 and len(large) <= 12
+        assert large_error < small_error
+
+    def test_budget_limits_error_bound(self, drifting_beats):
+        """Test the budget wins when the bound would need more sync points."""
+        analyzer = DriftAnalyzer(drifting_beats, original_tempo=120.0)
+
+        sync_points = analyzer.generate_adaptive_sync_points(
+            max_bars=100, max_error_ms=1, max_sync_points=5
+        )
+
+        assert len(sync_points) <= 5
+        assert played_bar_error(analyzer, sync_points, 100) < 0.1
+
+    def test_intro_sync_point_kept(self):
+        """Test tabs with intro bars keep the intro sync point."""
+        beat_times = [2.0 + i * 0.5 for i in range(40)]
+        analyzer = DriftAnalyzer(beat_times, original_tempo=120.0, tab_start_bar=1)
+
+        sync_points = analyzer.generate_adaptive_sync_points(max_bars=11, max_error_ms=10)
+
+        assert [sp.bar for sp in sync_points] == [0, 1]
+        assert sync_points[1].frame_offset == 2 * 44100
+        assert sync_points[1].modified_tempo == pytest.approx(120.0)
+
+
+class TestUnreliableBeats:
+    """Tests for ignoring beats flagged as unreliable."""
+
+    @pytest.fixture
+    def beats_with_bad_region(self):
+        """120 BPM beats with bar 3's downbeat (beat 12) displaced by 0.2 s and flagged."""
+        beat_times = [i * 0.5 for i in range(48)]
+        beat_times[12] += 0.2
+        reliable = [True] * 48
+        reliable[11:14] = [False] * 3
+        return beat_times, reliable
+
+    def test_unreliable_bars_left_out_of_report(self, beats_with_bad_region):
+        """Test drift statistics skip bars starting on unreliable beats."""
+        beat_times, reliable = beats_with_bad_region
+        analyzer = DriftAnalyzer(beat_times, original_tempo=120.0, reliable_beats=reliable)
+
+        report = analyzer.analyze(max_bars=12)
+
+        assert 3 not in [drift.bar for drift in report.bar_drifts]
+        assert report.total_bars_analyzed == 11
+
+    def test_local_tempo_ignores_unreliable_intervals(self):
+        """Test the local tempo uses only intervals between reliable beats."""
+        # Spurious beat at 5.8 s becomes beat 12, bar 3's downbeat
+        beat_times = sorted([i * 0.5 for i in range(48)] + [5.8])
+        reliable = [index != 12 for index in range(len(beat_times))]
+        flagged = DriftAnalyzer(beat_times, original_tempo=120.0, reliable_beats=reliable)
+        unflagged = DriftAnalyzer(beat_times, original_tempo=120.0)
+
+        assert flagged.calculate_local_tempo_at_bar(3, window_beats=4) == pytest.approx(120.0)
+        assert unflagged.calculate_local_tempo_at_bar(3, window_beats=4) == pytest.approx(150.0)
+
+    def test_no_sync_points_for_bad_beats(self, beats_with_bad_region):
+        """Test sync placement does not chase a displaced, unreliable beat."""
+        beat_times, reliable = beats_with_bad_region
+        flagged = DriftAnalyzer(beat_times, original_tempo=120.0, reliable_beats=reliable)
+        unflagged = DriftAnalyzer(beat_times, original_tempo=120.0)
+
+        assert len(flagged.generate_adaptive_sync_points(12, max_error_ms=20)) == 1
+        assert len(unflagged.generate_adaptive_sync_points(12, max_error_ms=20)) > 1
+
+    def test_mismatched_flags_ignored(self):
+        """Test reliability flags not matching the beats are ignored."""
+        analyzer = DriftAnalyzer(
+            [i * 0.5 for i in range(8)], original_tempo=120.0, reliable_beats=[True]
+        )
+
+        assert analyzer.reliable_beats is None
@@ -14,7 +14,10 @@ from guitarprotool.core.format_handler import (
     GPFormat,
     detect_format,
     get_supported_extensions,
+    inspect_file,
     is_supported_format,
+    scan_library,
+    sniff_format,
 )
 from guitarprotool.utils.exceptions import (
     FormatConversionError,
@@ -89,6 +92,144 @@ class TestDetectFormat:
             detect_format(temp_dir / "nonexistent.gp")
 
 
+class TestSniffFormat:
+    """Tests for content-based format sniffing."""
+
+    def test_sniff_zip(self, sample_gp_file):
+        """Test ZIP archives are identified as GP8."""
+        assert sniff_format(sample_gp_file) == GPFormat.GP8
+
+    @pytest.mark.parametrize("magic", [b"BCFZ", b"BCFS"])
+    def test_sniff_gpx(self, temp_dir, magic):
+        """Test BCFZ/BCFS containers are identified as GPX."""
+        path = temp_dir / "song.bin"
+        path.write_bytes(magic + b"\x00" * 12)
+
+        assert sniff_format(path) == GPFormat.GPX
+
+    @pytest.mark.parametrize(
+        "version,expected",
+        [(b"3.00", GPFormat.GP3), (b"4.06", GPFormat.GP4), (b"5.10", GPFormat.GP5)],
+    )
+    def test_sniff_legacy(self, temp_dir, version, expected):
+        """Test length-prefixed legacy version strings."""
+        header = b"FICHIER GUITAR PRO v" + version
+        path = temp_dir / "song.bin"
+        path.write_bytes(bytes([len(header)]) + header + b"\x00" * 8)
+
+        assert sniff_format(path) == expected
+
+    def test_sniff_unknown(self, temp_dir):
+        """Test unrecognized content returns None."""
+        path = temp_dir / "song.gp"
+        path.write_bytes(b"dummy content")
+
+        assert sniff_format(path) is None
+
+    def test_detect_mislabeled_zip(self, sample_gp_file, temp_dir):
+        """Test detect_format trusts content over a wrong extension."""
+        mislabeled = temp_dir / "actually_gp8.gpx"
+        mislabeled.write_bytes(sample_gp_file.read_bytes())
+
+        assert detect_format(mislabeled) == GPFormat.GP8
+
+
+class TestInspectFile:
+    """Tests for header-only file validation."""
+
+    def test_valid_gp8(self, sample_gp_file):
+        """Test a GP8 archive with score.gpif is valid."""
+        result = inspect_file(sample_gp_file)
+
+        assert result.valid
+        assert result.format == GPFormat.GP8
+        assert result.gpif_member == "score.gpif"
+        assert not result.mislabeled
+
+    def test_gp8_content_dir(self, temp_dir):
+        """Test score.gpif is found under Content/."""
+        path = temp_dir / "song.gp"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("Content/score.gpif", "<GPIF/>")
+
+        assert inspect_file(path).gpif_member == "Content/score.gpif"
+
+    def test_gp8_without_gpif(self, temp_dir):
+        """Test an archive without score.gpif is invalid."""
+        path = temp_dir / "song.gp"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("VERSION", "7.0")
+
+        result = inspect_file(path)
+
+        assert not result.valid
+        assert "score.gpif" in result.error
+
+    def test_truncated_zip(self, sample_gp_file, temp_dir):
+        """Test a truncated archive is reported, not raised."""
+        path = temp_dir / "broken.gp"
+        path.write_bytes(sample_gp_file.read_bytes()[:40])
+
+        result = inspect_file(path)
+
+        assert not result.valid
+        assert "ZIP" in result.error
+
+    def test_invalid_bcfz_size(self, temp_dir):
+        """Test a BCFZ header with a non-positive size is invalid."""
+        path = temp_dir / "song.gpx"
+        path.write_bytes(b"BCFZ\x00\x00\x00\x00")
+
+        assert not inspect_file(path).valid
+
+    def test_unrecognized_header(self, temp_dir):
+        """Test files with unknown content are invalid."""
+        path = temp_dir / "song.gp5"
+        path.write_bytes(b"dummy content")
+
+        result = inspect_file(path)
+
+        assert not result.valid
+        assert result.suffix_format == GPFormat.GP5
+        assert result.format is None
+
+
+class TestScanLibrary:
+    """Tests for bulk library scanning."""
+
+    def test_scan_library(self, sample_gp_file, temp_dir):
+        """Test every supported file is inspected, including subdirectories."""
+        subdir = temp_dir / "albums" / "one"
+        subdir.mkdir(parents=True)
+        (subdir / "mislabeled.gpx").write_bytes(sample_gp_file.read_bytes())
+        (subdir / "broken.gp5").write_bytes(b"garbage")
+        (temp_dir / "notes.txt").write_text("not a tab")
+
+        results = scan_library(temp_dir, max_workers=2)
+
+        by_name = {r.path.name: r for r in results}
+        assert set(by_name) == {"test.gp", "mislabeled.gpx", "broken.gp5"}
+        assert by_name["test.gp"].valid
+        assert by_name["mislabeled.gpx"].valid
+        assert by_name["mislabeled.gpx"].mislabeled
+        assert not by_name["broken.gp5"].valid
+
+    def test_scan_non_recursive(self, sample_gp_file, temp_dir):
+        """Test recursive=False ignores subdirectories."""
+        subdir = temp_dir / "sub"
+        subdir.mkdir()
+        (subdir / "other.gp").write_bytes(sample_gp_file.read_bytes())
+
+        results = scan_library(temp_dir, recursive=False)
+
+        assert [r.path.name for r in results] == ["test.gp"]
+
+    def test_scan_missing_directory(self, temp_dir):
+        """Test scanning a missing directory raises an error."""
+        with pytest.raises(InvalidGPFileError, match="Directory not found"):
+            scan_library(temp_dir / "missing")
+
+
 class TestIsSupportedFormat:
     """Tests for the is_supported_format function."""
 
@@ -0,0 +1,64 @@
+"""Tests for imports utility module."""
+
+import sys
+
+import pytest
+
+from guitarprotool.utils.imports import is_installed, lazy_import
+
+
+class TestIsInstalled:
+    """Tests for is_installed()."""
+
+    def test_installed_module(self):
+        """Test installed modules (including dotted names) are found."""
+        assert is_installed("json", "xml.etree")
+
+    def test_missing_module(self):
+        """Test missing modules and missing parents are reported."""
+        assert not is_installed("json", "no_such_module_xyz")
+        assert not is_installed("no_such_package_xyz.sub")
+
+    def test_blocked_module(self, monkeypatch):
+        """Test modules blocked in sys.modules count as missing."""
+        monkeypatch.setitem(sys.modules, "blocked_module_xyz", None)
+
+        assert not is_installed("blocked_module_xyz")
+
+    def test_does_not_import(self, monkeypatch):
+        """Test the check leaves the module unimported."""
+        monkeypatch.delitem(sys.modules, "wave", raising=False)
+
+        assert is_installed("wave")
+        assert "wave" not in sys.modules
+
+
+class TestLazyImport:
+    """Tests for lazy_import()."""
+
+    def test_loads_on_attribute_access(self, temp_dir, monkeypatch):
+        """Test the module body runs only when an attribute is used."""
+        (temp_dir / "lazy_probe_xyz.py").write_text(
+            "import builtins\nbuiltins.lazy_probe_loads += 1\nVALUE = 42\n"
+        )
+        monkeypatch.syspath_prepend(str(temp_dir))
+        monkeypatch.setattr("builtins.lazy_probe_loads", 0, raising=False)
+        monkeypatch.delitem(sys.modules, "lazy_probe_xyz", raising=False)
+        import builtins
+
+        module = lazy_import("lazy_probe_xyz")
+        assert builtins.lazy_probe_loads == 0
+
+        assert module.VALUE == 42
+        assert builtins.lazy_probe_loads == 1
+
+    def test_existing_module_returned(self):
+        """Test already imported modules are returned unchanged."""
+        import json
+
+        assert lazy_import("json") is json
+
+    def test_missing_module(self):
+        """Test missing modules raise ModuleNotFoundError immediately."""
+        with pytest.raises(ModuleNotFoundError):
+            lazy_import("no_such_module_xyz")
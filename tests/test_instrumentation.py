@@ -0,0 +1,170 @@
+"""Tests for instrumentation module."""
+
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from guitarprotool.utils import instrumentation
+from guitarprotool.utils.instrumentation import SpanRecorder, get_recorder, set_recorder, span
+
+
+@pytest.fixture
+def traced_recorder():
+    """A recorder tracing allocations; tracemalloc is stopped afterwards."""
+    import tracemalloc
+
+    was_tracing = tracemalloc.is_tracing()
+    yield SpanRecorder(trace_memory=True)
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+class TestSpanRecorder:
+    """Tests for SpanRecorder."""
+
+    def test_records_times_and_attributes(self):
+        """Test a span records wall/CPU time, RSS and its attributes."""
+        recorder = SpanRecorder()
+
+        with recorder.span("isolation", backend="torch") as record:
+            time.sleep(0.02)
+            record.attributes["model"] = "htdemucs"
+
+        (record,) = recorder.spans
+        assert record.name == "isolation"
+        assert record.wall_time >= 0.02
+        assert record.cpu_time >= 0.0
+        assert record.attributes == {"backend": "torch", "model": "htdemucs"}
+        assert record.traced_peak_bytes is None
+        assert record.error is None
+
+    def test_nesting_and_errors(self):
+        """Test nested spans record their parent and failures their error."""
+        recorder = SpanRecorder()
+
+        with pytest.raises(ValueError):
+            with recorder.span("pipeline"):
+                with recorder.span("decode"):
+                    raise ValueError("bad audio")
+
+        spans = {s.name: s for s in recorder.spans}
+        assert spans["decode"].parent == "pipeline"
+        assert spans["pipeline"].parent is None
+        assert spans["decode"].error == spans["pipeline"].error == "ValueError"
+
+    def test_threads_have_separate_stacks(self):
+        """Test a span on another thread is not nested under this thread's."""
+        recorder = SpanRecorder()
+
+        def download():
+            with recorder.span("download"):
+                pass
+
+        with recorder.span("pipeline"):
+            thread = threading.Thread(target=download)
+            thread.start()
+            thread.join()
+            with recorder.span("decode"):
+                pass
+
+        spans = {s.name: s for s in recorder.spans}
+        assert spans["download"].parent is None
+        assert spans["download"].thread_id != spans["pipeline"].thread_id
+        assert spans["decode"].parent == "pipeline"
+
+    def test_traced_peak_includes_children(self, traced_recorder):
+        """Test allocation peaks are measured per span and roll up to parents."""
+        with traced_recorder.span("pipeline"):
+            with traced_recorder.span("isolation"):
+                buffer = np.ones(4_000_000, dtype=np.float64)  # 32 MB
+                del buffer
+            with traced_recorder.span("beat_tracking"):
+                small = np.ones(1000)
+                del small
+
+        spans = {s.name: s for s in traced_recorder.spans}
+        assert spans["isolation"].traced_peak_bytes >= 32_000_000
+        assert spans["beat_tracking"].traced_peak_bytes < 32_000_000
+        assert spans["pipeline"].traced_peak_bytes >= spans["isolation"].traced_peak_bytes
+
+    def test_clear(self):
+        """Test clear drops recorded spans."""
+        recorder = SpanRecorder()
+        with recorder.span("decode"):
+            pass
+
+        recorder.clear()
+
+        assert recorder.spans == []
+
+
+class TestExport:
+    """Tests for span exports."""
+
+    @pytest.fixture
+    def recorder(self):
+        recorder = SpanRecorder()
+        for _ in range(2):
+            with recorder.span("decode"):
+                pass
+        with recorder.span("isolation", backend="onnx"):
+            pass
+        return recorder
+
+    def test_json(self, recorder):
+        """Test spans export as dicts in start order."""
+        records = recorder.to_json()
+
+        assert [r["name"] for r in records] == ["decode", "decode", "isolation"]
+        assert records[2]["attributes"] == {"backend": "onnx"}
+        json.dumps(records)
+
+    def test_chrome_trace(self, recorder):
+        """Test spans become complete events in microseconds."""
+        trace = recorder.to_chrome_trace()
+
+        events = trace["traceEvents"]
+        assert len(events) == 3
+        assert all(e["ph"] == "X" for e in events)
+        assert events[2]["args"]["backend"] == "onnx"
+        assert events[1]["ts"] >= events[0]["ts"] + events[0]["dur"]
+        assert "traced_peak_bytes" not in events[0]["args"]
+
+    def test_prometheus(self, recorder):
+        """Test stages are aggregated into summaries and gauges."""
+        text = recorder.to_prometheus()
+
+        assert "# TYPE guitarprotool_stage_wall_seconds summary" in text
+        assert 'guitarprotool_stage_wall_seconds_count{stage="decode"} 2' in text
+        assert 'guitarprotool_stage_cpu_seconds_count{stage="isolation"} 1' in text
+        assert 'guitarprotool_stage_max_rss_bytes{stage="decode"}' in text
+        assert 'guitarprotool_stage_traced_peak_bytes{stage="decode"}' not in text
+
+    def test_write(self, recorder, temp_dir):
+        """Test all three formats are written."""
+        paths = recorder.write(temp_dir)
+
+        assert json.loads(paths["json"].read_text())[0]["name"] == "decode"
+        assert "traceEvents" in json.loads(paths["chrome"].read_text())
+        assert paths["prometheus"].read_text().startswith("# HELP")
+
+
+class TestDefaultRecorder:
+    """Tests for the process-wide recorder."""
+
+    def test_span_uses_current_recorder(self):
+        """Test span() records on the recorder installed by set_recorder()."""
+        recorder = SpanRecorder()
+        previous = set_recorder(recorder)
+        try:
+            with span("repackage"):
+                pass
+            assert get_recorder() is recorder
+        finally:
+            set_recorder(previous)
+
+        assert [s.name for s in recorder.spans] == ["repackage"]
+        assert instrumentation.get_recorder() is previous
@@ -0,0 +1,355 @@
+"""Tests for onnx_separator module."""
+
+import json
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from guitarprotool.core.bass_isolator import (
+    SEPARATION_BACKENDS,
+    create_isolator,
+    isolation_available,
+)
+from guitarprotool.core import onnx_separator
+from guitarprotool.core.onnx_separator import (
+    ONNX_GRAPH_VERSION,
+    OnnxBassIsolator,
+    _segment_weight,
+    decode_audio,
+    export_model,
+    export_onnx,
+    ispectrogram,
+    separate_segments,
+    spectrogram,
+)
+from guitarprotool.utils.exceptions import IsolationDependencyError, IsolationError
+from guitarprotool.utils.imports import is_installed
+
+
+class TestSeparateSegments:
+    """Test segmented separation with overlap-add."""
+
+    @staticmethod
+    def fake_model(chunk):
+        """Two sources: the input and its negation."""
+        return np.stack([chunk, -chunk], axis=1)
+
+    @pytest.mark.parametrize("overlap", [0.0, 0.25, 0.5])
+    def test_identity_model_reconstructs_mix(self, overlap):
+        """Test overlap-add of an identity model returns the mix unchanged."""
+        mix = np.random.default_rng(0).standard_normal((2, 1000)).astype(np.float32)
+
+        sources = separate_segments(self.fake_model, mix, 128, 2, overlap)
+
+        assert sources.shape == (2, 2, 1000)
+        np.testing.assert_allclose(sources[0], mix, rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(sources[1], -mix, rtol=1e-5, atol=1e-6)
+
+    def test_short_input_padded(self):
+        """Test input shorter than one segment is zero-padded and trimmed."""
+        mix = np.ones((1, 10), dtype=np.float32)
+        chunks = []
+
+        def model(chunk):
+            chunks.append(chunk.copy())
+            return chunk[:, None]
+
+        sources = separate_segments(model, mix, 64, 1, 0.25)
+
+        assert len(chunks) == 1
+        assert chunks[0].shape == (1, 1, 64)
+        assert chunks[0][0, 0, 10:].sum() == 0
+        np.testing.assert_allclose(sources, np.ones((1, 1, 10)))
+
+    def test_segment_weight(self):
+        """Test the window is triangular, positive and peaks at 1."""
+        weight = _segment_weight(9)
+
+        assert weight.max() == 1.0
+        assert (weight > 0).all()
+        np.testing.assert_allclose(weight, weight[::-1])
+
+
+class TestSpectrogram:
+    """Test the numpy STFT and iSTFT around the exported graph."""
+
+    def test_shape(self):
+        """Test complex channels become channel pairs and frames follow the hop."""
+        mix = np.zeros((1, 2, 1000), dtype=np.float32)
+
+        spec = spectrogram(mix, nfft=256, hop_length=64)
+
+        assert spec.shape == (1, 4, 128, 16)
+        assert spec.dtype == np.float32
+
+    def test_frame_matches_stft(self):
+        """Test a frame equals the normalized Hann STFT of the padded segment."""
+        nfft, hop = 256, 64
+        mix = np.random.default_rng(0).standard_normal((1, 1, 1024)).astype(np.float32)
+
+        spec = spectrogram(mix, nfft, hop)
+
+        # Demucs' padding, then the STFT's centring; kept frame 3 is STFT frame 5
+        padded = np.pad(mix[0, 0], (hop // 2 * 3, hop // 2 * 3), mode="reflect")
+        padded = np.pad(padded, nfft // 2, mode="reflect")
+        window = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(nfft) / nfft)
+        expected = np.fft.rfft(padded[5 * hop : 5 * hop + nfft] * window)[:-1] / np.sqrt(nfft)
+        np.testing.assert_allclose(spec[0, 0, :, 3], expected.real, atol=1e-6)
+        np.testing.assert_allclose(spec[0, 1, :, 3], expected.imag, atol=1e-6)
+
+    def test_roundtrip(self):
+        """Test the iSTFT of an unchanged spectrogram restores the segment away from its ends."""
+        nfft, hop = 256, 64
+        t = np.arange(2048) / 44100
+        mix = np.stack([np.sin(2 * np.pi * 440 * t), np.cos(2 * np.pi * 110 * t)])[None]
+
+        spec = spectrogram(mix.astype(np.float32), nfft, hop)
+        sources = ispectrogram(np.stack([spec, 2 * spec], axis=1), hop, mix.shape[-1])
+
+        assert sources.shape == (1, 2, 2, 2048)
+        np.testing.assert_allclose(sources[0, 0, :, nfft:-nfft], mix[0, :, nfft:-nfft], atol=1e-5)
+        np.testing.assert_allclose(
+            sources[0, 1, :, nfft:-nfft], 2 * mix[0, :, nfft:-nfft], atol=1e-5
+        )
+
+
+class TestDecodeAudio:
+    """Test ffmpeg decoding."""
+
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    def test_decode_channels_and_rate(self, temp_dir):
+        """Test audio is decoded to (channels, samples) float32."""
+        path = temp_dir / "tone.wav"
+        subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=110:duration=1",
+             "-ar", "22050", str(path)],
+            check=True,
+        )
+
+        audio = decode_audio(path, 44100, 2)
+
+        assert audio.dtype == np.float32
+        assert audio.shape[0] == 2
+        assert abs(audio.shape[1] - 44100) < 2000
+        np.testing.assert_array_equal(audio[0], audio[1])
+
+    @pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+    def test_decode_invalid_file(self, temp_dir):
+        """Test undecodable input raises IsolationError."""
+        path = temp_dir / "broken.mp3"
+        path.write_bytes(b"not audio")
+
+        with pytest.raises(IsolationError, match="ffmpeg exited"):
+            decode_audio(path, 44100, 2)
+
+
+class TestBackendSelection:
+    """Test runtime backend selection."""
+
+    def test_backends(self):
+        """Test both backends report availability as a bool."""
+        assert SEPARATION_BACKENDS == ("torch", "onnx")
+        for backend in SEPARATION_BACKENDS:
+            assert isinstance(isolation_available(backend), bool)
+
+    def test_unknown_backend(self):
+        """Test unknown backends are rejected."""
+        with pytest.raises(ValueError, match="not supported"):
+            isolation_available("tflite")
+        with pytest.raises(ValueError, match="not supported"):
+            create_isolator("tflite")
+
+    @pytest.mark.skipif(OnnxBassIsolator.is_available(), reason="onnxruntime installed")
+    def test_missing_onnxruntime(self, temp_dir):
+        """Test creating the ONNX backend without onnxruntime raises."""
+        with pytest.raises(IsolationDependencyError, match="onnxruntime"):
+            create_isolator("onnx", output_dir=temp_dir)
+
+    @pytest.mark.skipif(not OnnxBassIsolator.is_available(), reason="onnxruntime not installed")
+    def test_onnx_isolator_cpu_only(self, temp_dir):
+        """Test the ONNX backend refuses GPU devices."""
+        isolator = create_isolator("onnx", output_dir=temp_dir)
+        assert isinstance(isolator, OnnxBassIsolator)
+
+        with pytest.raises(ValueError, match="CPU only"):
+            create_isolator("onnx", output_dir=temp_dir, device="cuda")
+
+    @pytest.mark.skipif(is_installed("torch", "demucs"), reason="torch and demucs installed")
+    def test_export_needs_torch(self, temp_dir):
+        """Test exporting without torch/demucs explains what is missing."""
+        with pytest.raises(IsolationDependencyError, match="requires torch"):
+            export_onnx("htdemucs", temp_dir / "htdemucs.onnx")
+
+
+@pytest.mark.skipif(
+    not is_installed("torch", "demucs", "onnxruntime"),
+    reason="torch, demucs and onnxruntime not installed",
+)
+class TestExport:
+    """Test exporting a hybrid Demucs model and running it with onnxruntime."""
+
+    def test_export_matches_torch(self, temp_dir):
+        """Test graph plus numpy STFT/iSTFT reproduce the PyTorch model's output."""
+        import torch
+        from demucs.htdemucs import HTDemucs
+
+        torch.manual_seed(0)
+        model = HTDemucs(["drums", "bass"], channels=8, depth=2, t_layers=1, segment=1)
+        onnx_path = temp_dir / "tiny.onnx"
+
+        metadata = export_model(model, onnx_path, name="tiny")
+
+        assert metadata["version"] == ONNX_GRAPH_VERSION
+        assert json.loads(onnx_path.with_suffix(".json").read_text()) == metadata
+        mix = np.random.default_rng(0).standard_normal(
+            (1, metadata["audio_channels"], metadata["segment_samples"])
+        ).astype(np.float32)
+        with torch.no_grad():
+            expected = model(torch.from_numpy(mix)).numpy()
+        isolator = OnnxBassIsolator(output_dir=temp_dir, onnx_path=onnx_path, num_threads=1)
+        isolator._load_metadata()
+
+        sources = isolator._run_segment(isolator._session(1), mix)
+
+        np.testing.assert_allclose(sources, expected, atol=1e-3)
+
+
+class FakeSession:
+    """Stand-in for onnxruntime.InferenceSession returning (silence, input) as (drums, bass)."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def run(self, output_names, inputs):
+        assert output_names == ["spec_sources", "wave_sources"]
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        spec, chunk = inputs["spec"], inputs["mix"]
+        assert spec.shape == (1, 2 * chunk.shape[1], 256, chunk.shape[-1] // 128)
+        # The whole input comes back through the waveform output
+        return [
+            np.zeros((1, 2, *spec.shape[1:]), dtype=np.float32),
+            np.stack([np.zeros_like(chunk), chunk], axis=1),
+        ]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+class TestOnnxIsolate:
+    """Test OnnxBassIsolator.isolate() with a stubbed inference session."""
+
+    @pytest.fixture
+    def tone(self, temp_dir):
+        """One second of a stereo 110 Hz tone."""
+        path = temp_dir / "tone.wav"
+        subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-f", "lavfi", "-i", "sine=frequency=110:duration=1",
+             "-ar", "44100", "-ac", "2", str(path)],
+            check=True,
+        )
+        return path
+
+    @pytest.fixture
+    def make_isolator(self, temp_dir, monkeypatch):
+        """Build an isolator whose graph metadata exists and whose session is a FakeSession."""
+        monkeypatch.setattr(OnnxBassIsolator, "is_available", staticmethod(lambda: True))
+        onnx_path = temp_dir / "model.onnx"
+        onnx_path.write_bytes(b"")
+        onnx_path.with_suffix(".json").write_text(json.dumps({
+            "version": ONNX_GRAPH_VERSION,
+            "samplerate": 44100,
+            "audio_channels": 2,
+            "sources": ["drums", "bass"],
+            "segment_samples": 8192,
+            "nfft": 512,
+            "hop_length": 128,
+        }))
+
+        def make(session, **kwargs):
+            isolator = OnnxBassIsolator(
+                output_dir=temp_dir / "stems", onnx_path=onnx_path, num_threads=1, **kwargs
+            )
+            isolator._sessions[1] = session
+            return isolator
+
+        return make
+
+    def test_writes_bass_stem(self, make_isolator, tone):
+        """Test the bass source is denormalized and written as a WAV stem."""
+        session = FakeSession()
+        progress = []
+        isolator = make_isolator(session, progress_callback=lambda p, m: progress.append(p))
+
+        result = isolator.isolate(tone, profile="fast")
+
+        assert result.success, result.error_message
+        assert result.bass_path == isolator.output_dir / "tone_bass.wav"
+        assert result.sample_rate == 44100
+        assert session.calls > 1
+        expected = decode_audio(tone, 44100, 2)
+        written = decode_audio(result.bass_path, 44100, 2)
+        np.testing.assert_allclose(written, expected, atol=1e-3)
+        assert progress[-1] == 1.0
+
+    def test_in_memory_result(self, make_isolator, tone):
+        """Test write_file=False returns the mono bass buffer without writing."""
+        isolator = make_isolator(FakeSession())
+
+        result = isolator.isolate(tone, output_filename="custom", write_file=False)
+
+        assert result.success, result.error_message
+        assert result.bass_path is None
+        np.testing.assert_allclose(
+            result.bass_audio, decode_audio(tone, 44100, 2).mean(axis=0), atol=1e-5
+        )
+        assert not list(isolator.output_dir.glob("*.wav"))
+
+    def test_missing_file(self, make_isolator, temp_dir):
+        """Test a missing input fails without running the session."""
+        session = FakeSession()
+
+        result = make_isolator(session).isolate(temp_dir / "missing.mp3")
+
+        assert not result.success
+        assert "not found" in result.error_message
+        assert session.calls == 0
+
+    def test_session_error(self, make_isolator, tone):
+        """Test an inference failure is reported in the result and writes nothing."""
+        isolator = make_isolator(FakeSession(error=RuntimeError("bad input shape")))
+
+        result = isolator.isolate(tone)
+
+        assert not result.success
+        assert "bad input shape" in result.error_message
+        assert result.bass_path is None
+        assert not list(isolator.output_dir.glob("*.wav"))
+
+    def test_stale_graph_exported_again(self, make_isolator, monkeypatch):
+        """Test a graph of an older layout version is exported again."""
+        exported = []
+        monkeypatch.setattr(
+            onnx_separator, "export_onnx", lambda name, path: exported.append(name) or {}
+        )
+        isolator = make_isolator(FakeSession())
+        metadata_path = isolator.onnx_path.with_suffix(".json")
+        metadata = json.loads(metadata_path.read_text())
+        del metadata["version"]
+        metadata_path.write_text(json.dumps(metadata))
+
+        isolator._load_metadata()
+
+        assert exported == [isolator.model_name]
+
+    def test_undecodable_input(self, make_isolator, temp_dir):
+        """Test an undecodable input is reported in the result."""
+        path = temp_dir / "broken.mp3"
+        path.write_bytes(b"not audio")
+
+        result = make_isolator(FakeSession()).isolate(path)
+
+        assert not result.success
+        assert "ffmpeg exited" in result.error_message
@@ -0,0 +1,217 @@
+"""Tests for prefetcher module."""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from guitarprotool.core.prefetcher import (
+    DownloadedAudio,
+    YouTubePrefetcher,
+    extract_video_id,
+    yt_dlp_download,
+)
+from guitarprotool.utils.exceptions import DownloadError
+
+
+URL_A = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+URL_B = "https://youtu.be/9bZkp7q19f0"
+URL_C = "https://www.youtube.com/shorts/abcdefghijk"
+
+
+class FakeDownloader:
+    """Stand-in for yt-dlp that writes a small file after a delay."""
+
+    def __init__(self, delay: float = 0.0, fail_ids=()):
+        self.delay = delay
+        self.fail_ids = set(fail_ids)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str, cache_dir: Path, video_id: str):
+        with self._lock:
+            self.calls.append(video_id)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if video_id in self.fail_ids:
+                raise DownloadError(f"Failed to download {url}")
+            file_path = cache_dir / f"{video_id}.webm"
+            file_path.write_bytes(b"audio")
+            return file_path, f"Title {video_id}"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestExtractVideoId:
+    """Tests for extract_video_id()."""
+
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            (URL_A, "dQw4w9WgXcQ"),
+            ("https://www.youtube.com/watch?list=PL1&v=dQw4w9WgXcQ&t=42", "dQw4w9WgXcQ"),
+            (URL_B, "9bZkp7q19f0"),
+            (URL_C, "abcdefghijk"),
+            ("https://www.youtube.com/embed/dQw4w9WgXcQ?start=3", "dQw4w9WgXcQ"),
+        ],
+    )
+    def test_youtube_urls(self, url, expected):
+        """Test video ids are extracted from common URL forms."""
+        assert extract_video_id(url) == expected
+
+    def test_other_urls_hashed(self):
+        """Test URLs without a video id get a stable hash key."""
+        key = extract_video_id("https://example.com/song.mp3")
+
+        assert key.startswith("url-")
+        assert key == extract_video_id("https://example.com/song.mp3")
+        assert key != extract_video_id("https://example.com/other.mp3")
+
+
+class TestYouTubePrefetcher:
+    """Tests for YouTubePrefetcher."""
+
+    def test_get_downloads_and_caches(self, temp_dir):
+        """Test a download is recorded in the cache for later runs."""
+        downloader = FakeDownloader()
+        with YouTubePrefetcher(cache_dir=temp_dir, downloader=downloader) as prefetcher:
+            download = prefetcher.get(URL_A)
+
+        assert isinstance(download, DownloadedAudio)
+        assert download.video_id == "dQw4w9WgXcQ"
+        assert download.title == "Title dQw4w9WgXcQ"
+        assert download.file_path.exists()
+        assert not download.from_cache
+
+        # A new prefetcher (new run) hits the cache without downloading
+        with YouTubePrefetcher(cache_dir=temp_dir, downloader=downloader) as prefetcher:
+            cached = prefetcher.get(URL_A)
+
+        assert cached.from_cache
+        assert cached.file_path == download.file_path
+        assert downloader.calls == ["dQw4w9WgXcQ"]
+
+    def test_same_video_downloaded_once(self, temp_dir):
+        """Test concurrent requests for one video share a download."""
+        downloader = FakeDownloader(delay=0.05)
+        with YouTubePrefetcher(cache_dir=temp_dir, downloader=downloader) as prefetcher:
+            prefetcher.prefetch(URL_A)
+            prefetcher.prefetch("https://youtube.com/watch?v=dQw4w9WgXcQ&t=10")
+            prefetcher.get(URL_A)
+
+        assert downloader.calls == ["dQw4w9WgXcQ"]
+
+    def test_concurrency_is_bounded(self, temp_dir):
+        """Test no more than max_workers downloads run at once."""
+        downloader = FakeDownloader(delay=0.05)
+        urls = [f"https://www.youtube.com/watch?v=video{i:06d}" for i in range(6)]
+
+        with YouTubePrefetcher(cache_dir=temp_dir, max_workers=2, downloader=downloader) as prefetcher:
+            prefetcher.prefetch_all(urls)
+            results = [prefetcher.get(url) for url in urls]
+
+        assert len(results) == 6
+        assert downloader.max_active == 2
+
+    def test_download_overlaps_with_caller_work(self, temp_dir):
+        """Test prefetched downloads progress while the caller is busy."""
+        downloader = FakeDownloader(delay=0.1)
+
+        with YouTubePrefetcher(cache_dir=temp_dir, downloader=downloader) as prefetcher:
+            prefetcher.prefetch(URL_B)
+            time.sleep(0.15)  # Simulated analysis of an earlier job
+            start = time.monotonic()
+            prefetcher.get(URL_B)
+            waited = time.monotonic() - start
+
+        assert waited < 0.05
+
+    def test_failed_download_raises_and_retries(self, temp_dir):
+        """Test failures surface as DownloadError and are not cached."""
+        downloader = FakeDownloader(fail_ids={"9bZkp7q19f0"})
+
+        with YouTubePrefetcher(cache_dir=temp_dir, downloader=downloader) as prefetcher:
+            with pytest.raises(DownloadError):
+                prefetcher.get(URL_B)
+
+            downloader.fail_ids.clear()
+            download = prefetcher.get(URL_B)
+
+        assert download.file_path.exists()
+        assert downloader.calls == ["9bZkp7q19f0", "9bZkp7q19f0"]
+
+    def test_unexpected_error_wrapped(self, temp_dir):
+        """Test non-DownloadError failures are wrapped in DownloadError."""
+
+        def broken(url, cache_dir, video_id):
+            raise OSError("disk full")
+
+        with YouTubePrefetcher(cache_dir=temp_dir, downloader=broken) as prefetcher:
+            with pytest.raises(DownloadError, match="disk full"):
+                prefetcher.get(URL_A)
+
+    def test_timeout_raises_and_keeps_download(self, temp_dir):
+        """Test a timed-out wait raises DownloadError without abandoning the download."""
+        downloader = FakeDownloader(delay=0.2)
+
+        with YouTubePrefetcher(cache_dir=temp_dir, downloader=downloader) as prefetcher:
+            with pytest.raises(DownloadError, match="Timed out"):
+                prefetcher.get(URL_A, timeout=0.01)
+            download = prefetcher.get(URL_A)
+
+        assert download.file_path.exists()
+        assert downloader.calls == ["dQw4w9WgXcQ"]
+
+    def test_incomplete_cache_entry_ignored(self, temp_dir):
+        """Test a partial file without metadata is not treated as cached."""
+        (temp_dir / "dQw4w9WgXcQ.webm.part").write_bytes(b"partial")
+
+        with YouTubePrefetcher(cache_dir=temp_dir, downloader=FakeDownloader()) as prefetcher:
+            assert prefetcher.lookup(URL_A) is None
+
+    def test_invalid_max_workers(self, temp_dir):
+        """Test max_workers must be positive."""
+        with pytest.raises(ValueError):
+            YouTubePrefetcher(cache_dir=temp_dir, max_workers=0)
+
+
+class TestYtDlpDownload:
+    """Tests for the default yt-dlp downloader."""
+
+    @patch("guitarprotool.core.prefetcher.yt_dlp.YoutubeDL")
+    def test_resumable_options(self, mock_yt_dlp_class, temp_dir):
+        """Test downloads use a stable per-video name and continue partial files."""
+        mock_ydl = MagicMock()
+        mock_yt_dlp_class.return_value.__enter__.return_value = mock_ydl
+        mock_ydl.extract_info.return_value = {"title": "Song", "ext": "webm"}
+        output = temp_dir / "dQw4w9WgXcQ.webm"
+        output.write_bytes(b"audio")
+        mock_ydl.prepare_filename.return_value = str(output)
+
+        file_path, title = yt_dlp_download(URL_A, temp_dir, "dQw4w9WgXcQ")
+
+        opts = mock_yt_dlp_class.call_args[0][0]
+        assert opts["continuedl"] is True
+        assert opts["nopart"] is False
+        assert opts["outtmpl"] == str(temp_dir / "dQw4w9WgXcQ.%(ext)s")
+        assert file_path == output
+        assert title == "Song"
+
+    @patch("guitarprotool.core.prefetcher.yt_dlp.YoutubeDL")
+    def test_yt_dlp_error(self, mock_yt_dlp_class, temp_dir):
+        """Test yt-dlp errors are converted to DownloadError."""
+        import yt_dlp
+
+        mock_ydl = MagicMock()
+        mock_yt_dlp_class.return_value.__enter__.return_value = mock_ydl
+        mock_ydl.extract_info.side_effect = yt_dlp.utils.DownloadError("Network error")
+
+        with pytest.raises(DownloadError, match="Network error"):
+            yt_dlp_download(URL_A, temp_dir, "dQw4w9WgXcQ")
@@ -0,0 +1,124 @@
+"""Tests for profiling module."""
+
+import pstats
+import threading
+
+import pytest
+
+from guitarprotool.utils.instrumentation import SpanRecorder
+from guitarprotool.utils.profiling import StageProfiler, collapse_stats, function_label
+
+
+def _work(n):
+    return sum(i * i for i in range(n))
+
+
+def _outer():
+    _inner()
+    return _work(20_000)
+
+
+def _inner():
+    return _work(50_000)
+
+
+@pytest.fixture
+def profiled():
+    """A recorder with a StageProfiler hooked in."""
+    recorder = SpanRecorder()
+    profiler = StageProfiler()
+    recorder.hooks.append(profiler)
+    return recorder, profiler
+
+
+class TestStageProfiler:
+    """Tests for StageProfiler."""
+
+    def test_profiles_outermost_spans(self, profiled):
+        """Test each stage gets its own profile; nested spans are included."""
+        recorder, profiler = profiled
+
+        with recorder.span("decode"):
+            _work(10_000)
+        with recorder.span("isolation"):
+            with recorder.span("model_load"):
+                _outer()
+
+        assert set(profiler.stages) == {"decode", "isolation"}
+        names = [f.name for f in profiler.top_functions("isolation", limit=50)]
+        assert any(name.startswith("_inner ") for name in names)
+
+    def test_repeated_stage_merged(self, profiled):
+        """Test spans with the same name accumulate into one profile."""
+        recorder, profiler = profiled
+
+        for _ in range(2):
+            with recorder.span("beat_tracking"):
+                _inner()
+
+        (inner,) = [
+            f for f in profiler.top_functions("beat_tracking", 50) if f.name.startswith("_inner ")
+        ]
+        assert inner.calls == 2
+
+    def test_other_threads_not_profiled(self, profiled):
+        """Test spans on background threads are skipped."""
+        recorder, profiler = profiled
+
+        def download():
+            with recorder.span("download"):
+                _work(1000)
+
+        thread = threading.Thread(target=download)
+        thread.start()
+        thread.join()
+
+        assert profiler.stages == {}
+        assert [s.name for s in recorder.spans] == ["download"]
+
+    def test_write(self, profiled, temp_dir):
+        """Test .prof files load in pstats and collapsed stacks are written."""
+        recorder, profiler = profiled
+        with recorder.span("drift_analysis"):
+            _outer()
+
+        written = profiler.write(temp_dir / "profile")
+
+        assert sorted(p.name for p in written) == [
+            "drift_analysis.collapsed",
+            "drift_analysis.prof",
+        ]
+        pstats.Stats(str(temp_dir / "profile" / "drift_analysis.prof"))
+        lines = (temp_dir / "profile" / "drift_analysis.collapsed").read_text().splitlines()
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+        profiler.clear()
+        assert profiler.stages == {}
+
+
+class TestCollapseStats:
+    """Tests for collapsed stack reconstruction."""
+
+    def test_stacks_follow_call_graph(self, profiled):
+        """Test stacks nest callees under callers and total the stage time."""
+        recorder, profiler = profiled
+        with recorder.span("stage"):
+            _outer()
+
+        stats = profiler.stages["stage"]
+        lines = collapse_stats(stats)
+        stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+
+        inner_stacks = [s for s in stacks if "_inner (" in s]
+        assert inner_stacks
+        assert all(s.index("_outer (") < s.index("_inner (") for s in inner_stacks)
+
+        outer = next(f for f in stats.stats if f[2] == "_outer")
+        outer_total_us = stats.stats[outer][3] * 1e6
+        outer_stacks_us = sum(v for s, v in stacks.items() if s.startswith("_outer ("))
+        assert outer_stacks_us == pytest.approx(outer_total_us, rel=0.05)
+
+    def test_function_label(self):
+        """Test labels are readable and free of the stack separator."""
+        assert function_label(("/src/pkg/mod.py", 12, "run")) == "run (mod.py:12)"
+        assert function_label(("~", 0, "<built-in method a;b>")) == "<built-in method a,b>"
@@ -0,0 +1,372 @@
+"""Tests for the score_aligner module."""
+
+import numpy as np
+import pytest
+from lxml import etree
+
+from guitarprotool.core.score_aligner import (
+    LIBROSA_AVAILABLE,
+    ScoreAligner,
+    ScoreAlignment,
+    ScoreOnsets,
+    StartEstimate,
+    _warp,
+    banded_dtw,
+    normalized_cross_correlation,
+    onset_patterns,
+)
+from guitarprotool.utils.exceptions import AlignmentError, BeatDetectionError
+
+
+def make_gpif(bars, tempo=120.0, time="4/4", rhythm="Quarter", extra_rhythm=""):
+    """Build a one-track GPIF root from per-bar lists of beats.
+
+    Each beat is (rhythm id, number of notes); rhythm "0" is `rhythm`.
+    """
+    rhythms = f'<Rhythm id="0"><NoteValue>{rhythm}</NoteValue></Rhythm>{extra_rhythm}'
+    master_bars, bar_elems, voices, beats, notes = [], [], [], [], []
+    beat_id = note_id = 0
+    for index, bar_beats in enumerate(bars):
+        master_bars.append(f"<MasterBar><Time>{time}</Time><Bars>{index}</Bars></MasterBar>")
+        bar_elems.append(f'<Bar id="{index}"><Voices>{index} -1 -1 -1</Voices></Bar>')
+        beat_ids = []
+        for rhythm_id, note_count in bar_beats:
+            ids = " ".join(str(note_id + n) for n in range(note_count))
+            notes.extend(f'<Note id="{note_id + n}"/>' for n in range(note_count))
+            note_id += note_count
+            notes_elem = f"<Notes>{ids}</Notes>" if note_count else ""
+            beats.append(f'<Beat id="{beat_id}"><Rhythm ref="{rhythm_id}"/>{notes_elem}</Beat>')
+            beat_ids.append(str(beat_id))
+            beat_id += 1
+        voices.append(f'<Voice id="{index}"><Beats>{" ".join(beat_ids)}</Beats></Voice>')
+    xml = (
+        "<GPIF><MasterTrack><Automations><Automation><Type>Tempo</Type><Bar>0</Bar>"
+        f"<Value>{tempo:g} 2</Value></Automation></Automations></MasterTrack>"
+        f"<MasterBars>{''.join(master_bars)}</MasterBars><Bars>{''.join(bar_elems)}</Bars>"
+        f"<Voices>{''.join(voices)}</Voices><Beats>{''.join(beats)}</Beats>"
+        f"<Notes>{''.join(notes)}</Notes><Rhythms>{rhythms}</Rhythms></GPIF>"
+    )
+    return etree.fromstring(xml)
+
+
+def quarter_bars(count, notes=1):
+    """Bars of four quarter notes."""
+    return [[("0", notes)] * 4 for _ in range(count)]
+
+
+class TestScoreOnsets:
+    """Tests for reading onsets from GPIF."""
+
+    def test_quarter_notes(self):
+        """Test quarter notes at 120 BPM fall every half second."""
+        score = ScoreOnsets.from_root(make_gpif(quarter_bars(2)))
+        assert score.bar_count == 2
+        assert score.duration == pytest.approx(4.0)
+        np.testing.assert_allclose(score.bar_starts, [0.0, 2.0, 4.0])
+        np.testing.assert_allclose(score.onset_times, np.arange(8) * 0.5)
+
+    def test_onset_weights_count_notes(self):
+        """Test chords weigh more than single notes."""
+        score = ScoreOnsets.from_root(make_gpif([[("0", 3), ("0", 1), ("0", 1), ("0", 1)]]))
+        assert score.onset_weights[0] == 3
+        assert score.onset_weights[1] == 1
+
+    def test_rests_take_time_without_onsets(self):
+        """Test rests advance time but add no onsets."""
+        score = ScoreOnsets.from_root(make_gpif([[("0", 0), ("0", 1), ("0", 0), ("0", 1)]]))
+        np.testing.assert_allclose(score.onset_times, [0.5, 1.5])
+
+    def test_dotted_and_tuplet_rhythms(self):
+        """Test dots and tuplets change beat durations."""
+        extra = (
+            '<Rhythm id="1"><NoteValue>Quarter</NoteValue><AugmentationDot count="1"/></Rhythm>'
+            '<Rhythm id="2"><NoteValue>Eighth</NoteValue>'
+            '<PrimaryTuplet num="3" den="2"/></Rhythm>'
+        )
+        root = make_gpif([[("1", 1), ("2", 1), ("2", 1), ("2", 1)]], extra_rhythm=extra)
+        score = ScoreOnsets.from_root(root)
+        # Dotted quarter = 0.75s, triplet eighth = 1/6 s at 120 BPM
+        np.testing.assert_allclose(score.onset_times, [0.0, 0.75, 0.75 + 1 / 6, 0.75 + 2 / 6])
+
+    def test_time_signature(self):
+        """Test bar length follows the time signature."""
+        score = ScoreOnsets.from_root(make_gpif([[("0", 1)] * 3] * 2, time="3/4"))
+        np.testing.assert_allclose(score.bar_starts, [0.0, 1.5, 3.0])
+
+    def test_tempo(self):
+        """Test the tempo automation sets seconds per quarter."""
+        score = ScoreOnsets.from_root(make_gpif(quarter_bars(1), tempo=60.0))
+        np.testing.assert_allclose(score.onset_times, [0.0, 1.0, 2.0, 3.0])
+
+    def test_tied_notes_do_not_start_onsets(self):
+        """Test notes continuing a tie add no onset."""
+        root = make_gpif([[("0", 1), ("0", 1), ("0", 1), ("0", 1)]])
+        tie = etree.SubElement(root.find("Notes/Note[@id='1']"), "Tie")
+        tie.set("destination", "true")
+        score = ScoreOnsets.from_root(root)
+        np.testing.assert_allclose(score.onset_times, [0.0, 1.0, 1.5])
+
+    def test_track_filter(self):
+        """Test only the selected track positions are read."""
+        root = make_gpif(quarter_bars(1))
+        assert len(ScoreOnsets.from_root(root, tracks=[0]).onset_times) == 4
+        assert len(ScoreOnsets.from_root(root, tracks=[1]).onset_times) == 0
+
+    def test_no_bars_raises(self):
+        """Test a score without bars raises AlignmentError."""
+        with pytest.raises(AlignmentError):
+            ScoreOnsets.from_root(etree.fromstring("<GPIF><MasterBars/></GPIF>"))
+
+    def test_from_gpif_invalid_file(self, tmp_path):
+        """Test unparseable files raise AlignmentError."""
+        path = tmp_path / "score.gpif"
+        path.write_text("not xml")
+        with pytest.raises(AlignmentError):
+            ScoreOnsets.from_gpif(path)
+
+    def test_click_track_length(self):
+        """Test the click track covers the whole score."""
+        score = ScoreOnsets.from_root(make_gpif(quarter_bars(1)))
+        assert len(score.click_track(1000)) >= 2000
+
+    def test_first_note_bar(self):
+        """Test the first bar with an onset is found past empty bars."""
+        score = ScoreOnsets.from_root(make_gpif(quarter_bars(2, notes=0) + quarter_bars(2)))
+        assert score.first_note_bar == 2
+
+    def test_impulse_train(self):
+        """Test onsets in the span become weighted impulses at their frames."""
+        score = ScoreOnsets.from_root(make_gpif([[("0", 1), ("0", 3), ("0", 0), ("0", 1)]] * 2))
+        train = score.impulse_train(10.0, start=0.5, end=2.0)
+        assert len(train) == 16
+        assert train.nonzero()[0].tolist() == [0, 10]
+        np.testing.assert_allclose(train[[0, 10]], [np.log1p(3), np.log1p(1)])
+
+        stretched = score.impulse_train(10.0, start=0.5, end=2.0, stretch=1.2)
+        assert stretched.nonzero()[0].tolist() == [0, 12]
+
+    def test_alignment_error_is_beat_detection_error(self):
+        """Test callers handling BeatDetectionError also catch AlignmentError."""
+        assert issubclass(AlignmentError, BeatDetectionError)
+
+
+class TestScoreAlignment:
+    """Tests for the ScoreAlignment result."""
+
+    def test_beat_times(self):
+        """Test the beat grid splits each bar evenly and ends at the last bar end."""
+        alignment = ScoreAlignment(bar_times=[1.0, 3.0, 4.0], cost=0.2)
+        assert alignment.bar_count == 2
+        assert alignment.beat_times(beats_per_bar=2) == pytest.approx(
+            [1.0, 2.0, 3.0, 3.5, 4.0]
+        )
+
+    def test_beat_info(self):
+        """Test BeatInfo carries the grid tempo and confidence."""
+        alignment = ScoreAlignment(bar_times=[0.5, 2.5, 4.5], cost=0.25)
+        beat_info = alignment.beat_info()
+        assert beat_info.bpm == pytest.approx(120.0)
+        assert beat_info.confidence == pytest.approx(0.75)
+        assert beat_info.beat_times[0] == pytest.approx(0.5)
+        assert beat_info.beat_times[4] == pytest.approx(2.5)
+        assert beat_info.beat_positions == [0, 1, 2, 3, 0, 1, 2, 3, 0]
+
+    def test_confidence_clipped(self):
+        """Test confidence stays within 0 and 1."""
+        assert ScoreAlignment(bar_times=[0.0, 1.0], cost=1.5).confidence == 0.0
+        assert ScoreAlignment(bar_times=[0.0, 1.0], cost=-0.1).confidence == 1.0
+
+
+class TestOnsetPatterns:
+    """Tests for onset pattern features."""
+
+    def test_rows_are_unit_length(self):
+        """Test non-flat windows are normalized to unit length."""
+        envelope = np.random.default_rng(0).random(50)
+        patterns = onset_patterns(envelope, context=4)
+        assert patterns.shape == (50, 9)
+        np.testing.assert_allclose(np.linalg.norm(patterns, axis=1), 1.0, rtol=1e-5)
+
+    def test_flat_windows_are_zero(self):
+        """Test silence gives zero rows."""
+        patterns = onset_patterns(np.zeros(20), context=4)
+        assert not patterns.any()
+
+
+class TestNormalizedCrossCorrelation:
+    """Tests for FFT normalized cross-correlation."""
+
+    def test_finds_embedded_template(self):
+        """Test a scaled, offset copy of the template correlates fully at its lag."""
+        rng = np.random.default_rng(0)
+        template = rng.random(40)
+        signal = rng.random(300) * 0.2
+        signal[123:163] = 3.0 * template + 1.0
+
+        correlation = normalized_cross_correlation(template, signal)
+
+        assert len(correlation) == 261
+        assert int(np.argmax(correlation)) == 123
+        assert correlation[123] == pytest.approx(1.0)
+        assert np.all(np.abs(correlation) <= 1.0 + 1e-9)
+
+    def test_matches_direct_computation(self):
+        """Test the FFT result equals the correlation coefficient of each window."""
+        rng = np.random.default_rng(1)
+        template, signal = rng.random(16), rng.random(64)
+        direct = [np.corrcoef(template, signal[k : k + 16])[0, 1] for k in range(49)]
+        np.testing.assert_allclose(normalized_cross_correlation(template, signal), direct)
+
+    def test_silent_windows_are_zero(self):
+        """Test windows of silence give zero rather than rounding noise."""
+        signal = np.concatenate([np.zeros(100), np.random.default_rng(2).random(50)])
+        correlation = normalized_cross_correlation(np.random.default_rng(3).random(20), signal)
+        assert not correlation[:80].any()
+
+    def test_short_signal_padded(self):
+        """Test a signal shorter than the template gives a single lag."""
+        assert len(normalized_cross_correlation(np.arange(10.0), np.arange(4.0))) == 1
+
+
+class TestBandedDTW:
+    """Tests for banded subsequence DTW."""
+
+    @staticmethod
+    def envelope(length, seed=0):
+        rng = np.random.default_rng(seed)
+        envelope = np.zeros(length)
+        envelope[rng.choice(length, length // 6, replace=False)] = rng.random(length // 6) + 0.5
+        return envelope
+
+    def test_finds_offset_subsequence(self):
+        """Test a score embedded in longer audio is found at its offset."""
+        score = self.envelope(120)
+        audio = np.concatenate([np.zeros(30), score, np.zeros(20)])
+        score_patterns = onset_patterns(score)
+        audio_patterns = onset_patterns(audio)
+        path, cost = banded_dtw(
+            score_patterns, audio_patterns, np.zeros(len(score), dtype=int), len(audio)
+        )
+        assert path[0, 0] == 0 and path[-1, 0] == len(score) - 1
+        middle = path[(path[:, 0] > 10) & (path[:, 0] < 110)]
+        np.testing.assert_array_equal(middle[:, 1] - middle[:, 0], 30)
+        assert cost < 0.1
+
+    def test_band_outside_audio_raises(self):
+        """Test a band with no reachable audio frames raises AlignmentError."""
+        score_patterns = onset_patterns(self.envelope(40))
+        audio_patterns = onset_patterns(self.envelope(40, seed=1))
+        with pytest.raises(AlignmentError):
+            banded_dtw(score_patterns, audio_patterns, np.full(40, 100), 8)
+
+
+class TestWarp:
+    """Tests for mapping score frames through the onset anchors."""
+
+    def test_interpolates_between_onsets(self):
+        """Test frames between onsets are interpolated, not read off the path."""
+        path = np.array([[0, 10], [5, 11], [10, 30]])
+        warped = _warp(np.array([5.0]), np.array([0.0, 10.0]), path)
+        assert warped[0] == pytest.approx(20.0)
+
+    def test_extrapolates_outside_onsets(self):
+        """Test frames before the first and after the last onset follow the tempo."""
+        path = np.array([[10, 20], [20, 40]])
+        warped = _warp(np.array([0.0, 30.0]), np.array([10.0, 20.0]), path)
+        np.testing.assert_allclose(warped, [0.0, 60.0])
+
+
+@pytest.mark.skipif(not LIBROSA_AVAILABLE, reason="librosa not installed")
+class TestScoreAligner:
+    """End-to-end alignment of synthetic performances."""
+
+    def test_align_intro_and_tempo(self):
+        """Test bars are found in audio with an intro and a slower tempo."""
+        # Evenly spaced identical notes are ambiguous by a beat; vary the rhythm
+        rng = np.random.default_rng(0)
+        bars = [
+            [("0", int(n)) for n in rng.choice([0, 1, 1, 2, 3], size=8)] for _ in range(24)
+        ]
+        bars[0][0] = ("0", 2)
+        score = ScoreOnsets.from_root(make_gpif(bars, rhythm="Eighth"))
+        aligner = ScoreAligner()
+        intro, stretch = 2.0, 1.1
+        performance = ScoreOnsets(
+            bar_starts=intro + score.bar_starts * stretch,
+            onset_times=intro + score.onset_times * stretch,
+            onset_weights=score.onset_weights,
+        )
+        audio = performance.click_track(aligner.sample_rate)
+
+        alignment = aligner.align(score, audio, aligner.sample_rate)
+
+        assert alignment.bar_count == 24
+        errors = np.abs(np.array(alignment.bar_times) - performance.bar_starts)
+        assert np.max(errors[:-1]) < 0.03
+        assert alignment.confidence > 0.5
+
+    def test_no_notes_raises(self):
+        """Test a score without notes cannot be aligned."""
+        score = ScoreOnsets.from_root(make_gpif(quarter_bars(2, notes=0)))
+        with pytest.raises(AlignmentError):
+            ScoreAligner().align(score, np.zeros(22050 * 4), 22050)
+
+    def test_audio_too_short_raises(self):
+        """Test audio much shorter than the score is rejected."""
+        score = ScoreOnsets.from_root(make_gpif(quarter_bars(8)))
+        with pytest.raises(AlignmentError):
+            ScoreAligner().align(score, np.zeros(22050), 22050)
+
+    def test_estimate_start_skips_intro(self):
+        """Test the first note bar is found after noise and a count-in, off tempo."""
+        rng = np.random.default_rng(0)
+        bars = quarter_bars(2, notes=0) + [
+            [("0", int(n)) for n in rng.choice([0, 1, 1, 2, 3], size=8)] for _ in range(12)
+        ]
+        bars[2][0] = ("0", 2)
+        score = ScoreOnsets.from_root(make_gpif(bars, rhythm="Eighth"))
+        aligner = ScoreAligner()
+        start, stretch = 9.0, 1.03
+        shift = start - score.bar_starts[2] * stretch
+        # Stray noise onsets and a four-click count-in before the music
+        intro = np.concatenate([rng.uniform(0.5, 6.5, 6), start - 2.0 + 0.5 * np.arange(4)])
+        onsets = np.concatenate([intro, shift + score.onset_times * stretch])
+        weights = np.concatenate([np.ones(len(intro)), score.onset_weights])
+        order = np.argsort(onsets)
+        performance = ScoreOnsets(
+            bar_starts=np.array([0.0, onsets[-1] + 1.0]),
+            onset_times=onsets[order],
+            onset_weights=weights[order],
+        )
+        audio = performance.click_track(aligner.sample_rate)
+        audio += 0.05 * rng.standard_normal(len(audio)).astype(np.float32)
+
+        estimate = aligner.estimate_start(score, audio, aligner.sample_rate)
+
+        assert estimate.bar == 2
+        assert abs(estimate.time - start) < 0.03
+        assert estimate.reliable
+
+    def test_estimate_start_in_noise_unreliable(self):
+        """Test audio without the tab's rhythm gives an unreliable estimate."""
+        score = ScoreOnsets.from_root(make_gpif(quarter_bars(4)))
+        noise = np.random.default_rng(0).standard_normal(22050 * 20).astype(np.float32)
+
+        estimate = ScoreAligner().estimate_start(score, noise, 22050)
+
+        assert not estimate.reliable
+
+    def test_estimate_start_no_notes_raises(self):
+        """Test a score without notes has no start to find."""
+        score = ScoreOnsets.from_root(make_gpif(quarter_bars(2, notes=0)))
+        with pytest.raises(AlignmentError):
+            ScoreAligner().estimate_start(score, np.zeros(22050 * 4), 22050)
+
+
+class TestStartEstimate:
+    """Tests for the start estimate result."""
+
+    def test_reliable_threshold(self):
+        """Test only confident estimates are reliable."""
+        assert StartEstimate(bar=0, time=1.0, confidence=0.8).reliable
+        assert not StartEstimate(bar=0, time=1.0, confidence=0.1).reliable
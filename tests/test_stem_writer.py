@@ -0,0 +1,101 @@
+"""Tests for stem_writer module."""
+
+import wave
+
+import numpy as np
+import pytest
+
+from guitarprotool.core.stem_writer import to_mono, write_stem
+
+# scipy is installed with librosa; used here as an independent WAV reader
+wavfile = pytest.importorskip("scipy.io.wavfile")
+
+
+@pytest.fixture
+def stereo_stem():
+    """Two seconds of stereo float audio with some overshoot."""
+    t = np.arange(88200, dtype=np.float32) / 44100
+    left = 1.2 * np.sin(2 * np.pi * 55 * t)
+    right = 0.5 * np.sin(2 * np.pi * 110 * t)
+    return np.stack([left, right]).astype(np.float32)
+
+
+class TestWriteStem:
+    """Tests for write_stem()."""
+
+    def test_int16_matches_reference_conversion(self, temp_dir, stereo_stem):
+        """Test int16 output equals a clip-and-scale of the whole array."""
+        path = write_stem(temp_dir / "bass.wav", stereo_stem, 44100, block_frames=10000)
+
+        rate, data = wavfile.read(path)
+        expected = (np.clip(stereo_stem.T, -1, 1) * 32767).astype(np.int16)
+
+        assert rate == 44100
+        assert data.dtype == np.int16
+        np.testing.assert_array_equal(data, expected)
+
+    def test_float32_output(self, temp_dir, stereo_stem):
+        """Test float32 output is clipped but otherwise exact."""
+        path = write_stem(temp_dir / "bass.wav", stereo_stem, 44100, sample_format="float32")
+
+        rate, data = wavfile.read(path)
+
+        assert data.dtype == np.float32
+        assert data.shape == (88200, 2)
+        assert data.max() <= 1.0
+        np.testing.assert_array_equal(data[:, 1], stereo_stem[1])
+
+    def test_standard_pcm_header(self, temp_dir, stereo_stem):
+        """Test int16 files are readable by the stdlib wave module."""
+        path = write_stem(temp_dir / "bass.wav", stereo_stem, 48000)
+
+        with wave.open(str(path)) as wav:
+            assert wav.getnchannels() == 2
+            assert wav.getsampwidth() == 2
+            assert wav.getframerate() == 48000
+            assert wav.getnframes() == 88200
+
+    def test_mono_and_float64_input(self, temp_dir):
+        """Test 1-D and float64 inputs are accepted."""
+        audio = np.linspace(-0.5, 0.5, 1000)
+
+        _, data = wavfile.read(write_stem(temp_dir / "mono.wav", audio, 44100))
+
+        assert data.shape == (1000,)
+
+    def test_empty_audio(self, temp_dir):
+        """Test a zero-length stem produces a valid empty file."""
+        path = write_stem(temp_dir / "empty.wav", np.zeros((2, 0), np.float32), 44100)
+
+        with wave.open(str(path)) as wav:
+            assert wav.getnframes() == 0
+
+    def test_formats_match_isolator(self):
+        """Test BassIsolator validates against the formats written here."""
+        from guitarprotool.core.bass_isolator import STEM_FORMAT_NAMES
+        from guitarprotool.core.stem_writer import STEM_FORMATS
+
+        assert set(STEM_FORMAT_NAMES) == set(STEM_FORMATS)
+
+    def test_invalid_format(self, temp_dir, stereo_stem):
+        """Test unknown sample formats raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown stem format"):
+            write_stem(temp_dir / "bass.wav", stereo_stem, 44100, sample_format="int24")
+
+
+class TestToMono:
+    """Tests for to_mono()."""
+
+    def test_stereo_average(self, stereo_stem):
+        """Test channels are averaged into float32."""
+        mono = to_mono(stereo_stem)
+
+        assert mono.dtype == np.float32
+        np.testing.assert_allclose(mono, stereo_stem.mean(axis=0), rtol=1e-6)
+
+    def test_mono_input_not_copied(self):
+        """Test contiguous mono float32 input is returned as-is."""
+        audio = np.zeros(100, dtype=np.float32)
+
+        assert to_mono(audio) is audio
+        assert to_mono(audio[None, :]).base is audio
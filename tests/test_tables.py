@@ -0,0 +1,112 @@
+"""Tests for tables utility module."""
+
+import json
+
+import numpy as np
+import pytest
+
+from guitarprotool.utils import tables
+from guitarprotool.utils.exceptions import ConfigurationError
+from guitarprotool.utils.tables import (
+    PYARROW_AVAILABLE,
+    format_rows,
+    table_chunks,
+    table_rows,
+    write_table,
+)
+
+
+@pytest.fixture
+def table():
+    """Small table with int, float (one NaN), str and bool columns."""
+    return {
+        "bar": np.array([0, 1, 2]),
+        "tempo": np.array([120.0, np.nan, 121.5]),
+        "severity": np.array(["stable", "minor", "stable"]),
+        "sync": np.array([True, False, True]),
+    }
+
+
+class TestTableChunks:
+    """Tests for table_rows() and table_chunks()."""
+
+    def test_chunks_cover_all_rows(self, table):
+        """Test chunks are consecutive and cover every row."""
+        chunks = list(table_chunks(table, chunk_rows=2))
+
+        assert [table_rows(chunk) for chunk in chunks] == [2, 1]
+        assert chunks[1]["bar"].tolist() == [2]
+
+    def test_ragged_columns_rejected(self):
+        """Test columns of different lengths are rejected."""
+        with pytest.raises(ValueError, match="differ in length"):
+            table_rows({"a": np.zeros(2), "b": np.zeros(3)})
+
+
+class TestFormatRows:
+    """Tests for format_rows()."""
+
+    def test_fixed_width(self, table):
+        """Test columns are formatted in order, with missing values aligned."""
+        lines = format_rows(table, {"bar": "%3d", "tempo": "%8.2f"}, " | ", missing="-")
+
+        assert lines == ["  0 |   120.00", "  1 |        -", "  2 |   121.50"]
+
+    def test_no_columns(self, table):
+        """Test an empty format list gives no lines."""
+        assert format_rows(table, {}, ",") == []
+
+
+class TestWriteTable:
+    """Tests for write_table()."""
+
+    def test_csv(self, table, tmp_path):
+        """Test CSV export with a header and default formats."""
+        path = write_table(table, tmp_path / "bars.csv")
+
+        assert path.read_text().splitlines() == [
+            "bar,tempo,severity,sync",
+            "0,120.000000,stable,1",
+            "1,,minor,0",
+            "2,121.500000,stable,1",
+        ]
+
+    def test_tsv_with_formats(self, table, tmp_path):
+        """Test TSV export with per-column formats."""
+        path = write_table(table, tmp_path / "bars.tsv", formats={"tempo": "%.1f"})
+
+        assert path.read_text().splitlines()[1] == "0\t120.0\tstable\t1"
+
+    def test_jsonl(self, table, tmp_path):
+        """Test JSON Lines export writes NaN as null."""
+        path = write_table(table, tmp_path / "bars.jsonl")
+
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert rows[1] == {"bar": 1, "tempo": None, "severity": "minor", "sync": False}
+
+    def test_chunked_write(self, table, tmp_path, monkeypatch):
+        """Test output does not depend on the chunk size."""
+        whole = write_table(table, tmp_path / "whole.csv").read_text()
+        monkeypatch.setattr(tables, "CHUNK_ROWS", 1)
+
+        assert write_table(table, tmp_path / "chunked.csv").read_text() == whole
+
+    def test_unknown_format(self, table, tmp_path):
+        """Test an unknown suffix is rejected."""
+        with pytest.raises(ConfigurationError, match="Unknown table format"):
+            write_table(table, tmp_path / "bars.xlsx")
+
+    @pytest.mark.skipif(PYARROW_AVAILABLE, reason="pyarrow installed")
+    def test_parquet_without_pyarrow(self, table, tmp_path):
+        """Test Parquet export explains how to install pyarrow."""
+        with pytest.raises(ConfigurationError, match="pip install pyarrow"):
+            write_table(table, tmp_path / "bars.parquet")
+
+    @pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+    def test_parquet(self, table, tmp_path):
+        """Test Parquet export round-trips the columns."""
+        import pyarrow.parquet as pq
+
+        path = write_table(table, tmp_path / "bars.parquet")
+
+        assert pq.read_table(path).column("bar").to_pylist() == [0, 1, 2]
@@ -0,0 +1,88 @@
+"""Tests for the tempo_map module."""
+
+import numpy as np
+import pytest
+from lxml import etree
+
+from guitarprotool.core.tempo_map import DEFAULT_TEMPO, TempoMap
+
+
+def make_root(tempos, times):
+    """GPIF root with (bar, BPM) tempo automations and one MasterBar per time signature."""
+    automations = "".join(
+        f"<Automation><Type>Tempo</Type><Bar>{bar}</Bar><Value>{bpm:g} 2</Value></Automation>"
+        for bar, bpm in tempos
+    )
+    master_bars = "".join(f"<MasterBar><Time>{time}</Time></MasterBar>" for time in times)
+    return etree.fromstring(
+        f"<GPIF><MasterTrack><Automations>{automations}</Automations></MasterTrack>"
+        f"<MasterBars>{master_bars}</MasterBars></GPIF>"
+    )
+
+
+class TestFromRoot:
+    """Tests for reading tempo maps from GPIF."""
+
+    def test_changes_sorted(self):
+        """Test automations are read and sorted by bar."""
+        tempo_map = TempoMap.from_root(make_root([(4, 90.0), (0, 120.0)], ["4/4"] * 8))
+        assert tempo_map.changes == [(0, 120.0), (4, 90.0)]
+        assert tempo_map.bar_count == 8
+
+    def test_time_signatures(self):
+        """Test bar lengths follow the time signatures."""
+        tempo_map = TempoMap.from_root(make_root([(0, 120.0)], ["4/4", "3/4", "6/8", "7/8"]))
+        assert tempo_map.bar_quarters == [4.0, 3.0, 3.0, 3.5]
+
+    @pytest.mark.parametrize(
+        "times,expected",
+        [(["4/4"] * 3, 4), (["3/4", "3/4", "4/4"], 3), (["6/8"] * 2, 3), ([], 4)],
+    )
+    def test_beats_per_bar(self, times, expected):
+        """Test the meter is the most common bar length in quarter notes."""
+        assert TempoMap.from_root(make_root([(0, 120.0)], times)).beats_per_bar == expected
+
+    def test_no_automation_uses_default(self):
+        """Test scores without a tempo automation get the default tempo."""
+        tempo_map = TempoMap.from_root(make_root([], ["4/4"]))
+        assert tempo_map.changes == [(0, DEFAULT_TEMPO)]
+
+    def test_unreadable_automation_skipped(self):
+        """Test automations without a numeric value are ignored."""
+        root = make_root([(0, 100.0)], ["4/4"])
+        broken = etree.SubElement(root.find("MasterTrack/Automations"), "Automation")
+        etree.SubElement(broken, "Type").text = "Tempo"
+        etree.SubElement(broken, "Value").text = ""
+        assert TempoMap.from_root(root).changes == [(0, 100.0)]
+
+
+class TestTempoMap:
+    """Tests for tempo lookups and timing."""
+
+    @pytest.fixture
+    def tempo_map(self):
+        return TempoMap(changes=[(0, 120.0), (2, 60.0), (3, 60.0)], bar_quarters=[4.0] * 4)
+
+    def test_tempo_at_bar(self, tempo_map):
+        """Test the latest change at or before a bar applies."""
+        assert tempo_map.tempo_at_bar(0) == 120.0
+        assert tempo_map.tempo_at_bar(1) == 120.0
+        assert tempo_map.tempo_at_bar(2) == 60.0
+        assert tempo_map.tempo_at_bar(10) == 60.0
+
+    def test_first_tempo_applies_before_first_change(self):
+        """Test bars before the first automation use its tempo."""
+        tempo_map = TempoMap(changes=[(2, 90.0)], bar_quarters=[4.0] * 4)
+        assert tempo_map.tempo_at_bar(0) == 90.0
+
+    def test_tempos(self, tempo_map):
+        """Test distinct tempos are listed ascending."""
+        assert tempo_map.tempos == [60.0, 120.0]
+
+    def test_bar_starts(self, tempo_map):
+        """Test bar times accumulate bar lengths at each bar's tempo."""
+        np.testing.assert_allclose(tempo_map.bar_starts(), [0.0, 2.0, 4.0, 8.0, 12.0])
+
+    def test_sections_merge_equal_tempos(self, tempo_map):
+        """Test consecutive bars at one tempo form a single section."""
+        assert tempo_map.sections() == [(0.0, 4.0, 120.0), (4.0, 12.0, 60.0)]
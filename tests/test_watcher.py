@@ -0,0 +1,262 @@
+"""Tests for watcher module."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from guitarprotool.core.watcher import (
+    LEDGER_NAME,
+    FolderWatcher,
+    InotifyEvents,
+    PollingEvents,
+    WatchJob,
+    find_job,
+    read_link,
+)
+from guitarprotool.utils.exceptions import WatchJobError
+
+try:
+    InotifyEvents([]).close()
+    INOTIFY_AVAILABLE = True
+except OSError:
+    INOTIFY_AVAILABLE = False
+
+
+class FakeRunner:
+    """Stand-in for the pipeline process that writes a small output after a delay."""
+
+    def __init__(self, delay: float = 0.0, fail_names=()):
+        self.delay = delay
+        self.fail_names = set(fail_names)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, job: WatchJob, output_path: Path, pipeline_args):
+        with self._lock:
+            self.calls.append(job.tab_path.name)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if job.tab_path.name in self.fail_names:
+                raise WatchJobError(f"Failed to sync {job.tab_path.name}")
+            output_path.write_bytes(b"synced " + job.tab_path.read_bytes())
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def add_pair(directory: Path, stem: str, audio_suffix: str = ".mp3", content: bytes = b"tab"):
+    """Write a tab and an audio file with the same stem."""
+    (directory / f"{stem}.gp").write_bytes(content)
+    (directory / f"{stem}{audio_suffix}").write_bytes(b"audio")
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """Poll condition until it holds or timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestFindJob:
+    """Tests for find_job() and read_link()."""
+
+    def test_pairs_by_stem(self, temp_dir):
+        """Test a tab and audio of the same stem are paired from either file."""
+        add_pair(temp_dir, "song")
+
+        from_tab = find_job(temp_dir / "song.gp")
+        from_audio = find_job(temp_dir / "song.mp3")
+
+        assert from_tab == from_audio
+        assert from_tab.output_path == temp_dir / "synced" / "song_with_audio.gp"
+        assert from_tab.audio_args() == ["--local-audio", str(temp_dir / "song.mp3")]
+
+    def test_missing_counterpart(self, temp_dir):
+        """Test no job is found until both files exist."""
+        (temp_dir / "song.gp").write_bytes(b"tab")
+
+        assert find_job(temp_dir / "song.gp") is None
+        assert find_job(temp_dir / "notes.md") is None
+
+    def test_link_file(self, temp_dir):
+        """Test an Internet Shortcut file supplies a YouTube URL."""
+        (temp_dir / "song.gpx").write_bytes(b"tab")
+        (temp_dir / "song.url").write_text(
+            "[InternetShortcut]\nURL=https://youtu.be/9bZkp7q19f0\n"
+        )
+
+        job = find_job(temp_dir / "song.url", output_dir=temp_dir / "out")
+
+        assert job.is_link
+        assert job.audio_args() == ["--youtube-url", "https://youtu.be/9bZkp7q19f0"]
+        assert job.output_path == temp_dir / "out" / "song_with_audio.gp"
+
+    def test_link_without_url(self, temp_dir):
+        """Test a link file without a URL is rejected."""
+        (temp_dir / "song.txt").write_text("see chat\n")
+
+        with pytest.raises(WatchJobError, match="No http"):
+            read_link(temp_dir / "song.txt")
+
+
+class TestFolderWatcher:
+    """Tests for FolderWatcher syncing and skipping."""
+
+    def test_scan_syncs_library(self, temp_dir):
+        """Test existing pairs are synced and written atomically."""
+        add_pair(temp_dir, "a")
+        add_pair(temp_dir, "b", ".wav")
+        (temp_dir / "lonely.gp").write_bytes(b"tab")
+        runner = FakeRunner()
+
+        with FolderWatcher([temp_dir], runner=runner) as watcher:
+            watcher.scan()
+            assert watcher.wait_idle(timeout=5)
+
+        output_dir = temp_dir / "synced"
+        assert sorted(runner.calls) == ["a.gp", "b.gp"]
+        assert watcher.stats.synced == 2
+        assert (output_dir / "a_with_audio.gp").read_bytes() == b"synced tab"
+        assert sorted(p.name for p in output_dir.iterdir()) == [
+            LEDGER_NAME,
+            "a_with_audio.gp",
+            "b_with_audio.gp",
+        ]
+
+    def test_unchanged_library_skipped(self, temp_dir):
+        """Test a second run over an unchanged library runs nothing."""
+        add_pair(temp_dir, "a")
+        with FolderWatcher([temp_dir], runner=FakeRunner()) as watcher:
+            watcher.scan()
+            watcher.wait_idle(timeout=5)
+
+        runner = FakeRunner()
+        with FolderWatcher([temp_dir], runner=runner) as watcher:
+            watcher.scan()
+            watcher.wait_idle(timeout=5)
+
+        assert runner.calls == []
+        assert watcher.stats.skipped == 1
+
+    def test_touched_file_skipped_by_hash(self, temp_dir):
+        """Test a file rewritten with the same content is not synced again."""
+        add_pair(temp_dir, "a")
+        with FolderWatcher([temp_dir], runner=FakeRunner()) as watcher:
+            watcher.scan()
+            watcher.wait_idle(timeout=5)
+        time.sleep(0.01)
+        (temp_dir / "a.gp").write_bytes(b"tab")
+
+        runner = FakeRunner()
+        with FolderWatcher([temp_dir], runner=runner) as watcher:
+            watcher.scan()
+            watcher.wait_idle(timeout=5)
+
+        assert runner.calls == []
+
+    def test_changed_content_or_args_resynced(self, temp_dir):
+        """Test new content or new pipeline arguments sync the pair again."""
+        add_pair(temp_dir, "a")
+        with FolderWatcher([temp_dir], runner=FakeRunner()) as watcher:
+            watcher.scan()
+            watcher.wait_idle(timeout=5)
+        (temp_dir / "a.gp").write_bytes(b"tab v2")
+
+        runner = FakeRunner()
+        with FolderWatcher([temp_dir], runner=runner) as watcher:
+            watcher.scan()
+            watcher.wait_idle(timeout=5)
+        with FolderWatcher([temp_dir], runner=runner, pipeline_args=["-n", "Bass"]) as watcher:
+            watcher.scan()
+            watcher.wait_idle(timeout=5)
+
+        assert runner.calls == ["a.gp", "a.gp"]
+        assert (temp_dir / "synced" / "a_with_audio.gp").read_bytes() == b"synced tab v2"
+
+    def test_failed_job_leaves_no_output(self, temp_dir):
+        """Test a failed job leaves neither output nor temporary file, and is retried."""
+        add_pair(temp_dir, "a")
+
+        with FolderWatcher([temp_dir], runner=FakeRunner(fail_names={"a.gp"})) as watcher:
+            watcher.scan()
+            watcher.wait_idle(timeout=5)
+
+        assert watcher.stats.failed == 1
+        assert list((temp_dir / "synced").iterdir()) == []
+
+        runner = FakeRunner()
+        with FolderWatcher([temp_dir], runner=runner) as watcher:
+            watcher.scan()
+            watcher.wait_idle(timeout=5)
+        assert runner.calls == ["a.gp"]
+
+    def test_worker_pool_bounded(self, temp_dir):
+        """Test at most `workers` jobs run at once, and they run in parallel."""
+        for index in range(6):
+            add_pair(temp_dir, f"song{index}")
+        runner = FakeRunner(delay=0.1)
+
+        with FolderWatcher([temp_dir], workers=3, runner=runner) as watcher:
+            watcher.scan()
+            assert watcher.wait_idle(timeout=5)
+
+        assert len(runner.calls) == 6
+        assert runner.max_active == 3
+
+    def test_invalid_workers(self, temp_dir):
+        """Test workers must be at least 1."""
+        with pytest.raises(ValueError):
+            FolderWatcher([temp_dir], workers=0)
+
+
+class TestWatchEvents:
+    """Tests for change events, debouncing and the run loop."""
+
+    def test_polling_reports_changes(self, temp_dir):
+        """Test polling reports new and modified files only."""
+        (temp_dir / "old.gp").write_bytes(b"tab")
+        events = PollingEvents([temp_dir], interval=0.0)
+
+        (temp_dir / "new.gp").write_bytes(b"tab")
+
+        assert events.read(timeout=0.1) == [temp_dir / "new.gp"]
+        assert events.read(timeout=0.1) == []
+
+    @pytest.mark.skipif(not INOTIFY_AVAILABLE, reason="inotify not available")
+    def test_inotify_reports_written_files(self, temp_dir):
+        """Test inotify reports files once they are written."""
+        events = InotifyEvents([temp_dir])
+        try:
+            (temp_dir / "new.gp").write_bytes(b"tab")
+            assert events.read(timeout=1.0) == [temp_dir / "new.gp"]
+        finally:
+            events.close()
+
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_run_picks_up_dropped_pair(self, temp_dir, use_inotify):
+        """Test a pair dropped while running is synced once after the debounce."""
+        runner = FakeRunner()
+        watcher = FolderWatcher(
+            [temp_dir], runner=runner, debounce=0.05, poll_interval=0.05, use_inotify=use_inotify
+        )
+        thread = threading.Thread(target=watcher.run)
+        thread.start()
+        try:
+            assert wait_for(lambda: watcher.backend is not None)
+            add_pair(temp_dir, "dropped")
+            assert wait_for(lambda: watcher.stats.synced == 1)
+        finally:
+            watcher.stop()
+            thread.join(timeout=5)
+
+        assert runner.calls == ["dropped.gp"]
+        assert (temp_dir / "synced" / "dropped_with_audio.gp").exists()
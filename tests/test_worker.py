@@ -0,0 +1,281 @@
+"""Tests for worker module."""
+
+import os
+import queue
+import stat
+import threading
+
+import numpy as np
+import pytest
+
+from guitarprotool.core.bass_isolator import IsolationResult
+from guitarprotool.core.beat_detector import BeatInfo
+from guitarprotool.core import worker as worker_module
+from guitarprotool.core.tempo_map import TempoMap
+from guitarprotool.core.worker import AnalysisWorker, WorkerClient, serve
+from guitarprotool.utils.exceptions import BPMDetectionError, WorkerUnavailableError
+
+
+class FakeDetector:
+    """Stand-in for BeatDetector that records its inputs."""
+
+    sample_rate = 44100
+
+    def __init__(self):
+        self.buffers = []
+        self.tempo_maps = []
+
+    def analyze(self, audio_path, progress_callback=None, tempo_map=None, beats_per_bar=None):
+        self.tempo_maps.append(tempo_map)
+        if progress_callback:
+            progress_callback(0.5, "Detecting tempo and beats...")
+        if "silent" in str(audio_path):
+            raise BPMDetectionError("No BPM detected")
+        positions = [0, 1, 2] if beats_per_bar else None
+        return BeatInfo(
+            bpm=120.0, beat_times=[0.5, 1.0, 1.5], confidence=0.9, beat_positions=positions
+        )
+
+    def analyze_audio(
+        self, y, sample_rate, progress_callback=None, tempo_map=None, beats_per_bar=None
+    ):
+        self.buffers.append((y, sample_rate))
+        self.tempo_maps.append(tempo_map)
+        return BeatInfo(
+            bpm=100.0,
+            beat_times=[0.0, 0.6],
+            confidence=0.8,
+            beat_strengths=np.array([1.0, 0.25]),
+            beat_regularity=np.array([1.0, 0.5]),
+        )
+
+
+class FakeIsolator:
+    """Stand-in for BassIsolator returning a fixed mono stem."""
+
+    model_name = "htdemucs"
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.progress_callback = None
+        self.loads = 0
+        self.profiles = []
+
+    def _load_model(self):
+        self.loads += 1
+
+    def isolate(self, audio_path, output_filename=None, write_file=True, profile=None):
+        self.profiles.append(profile)
+        self.progress_callback(0.25, "Separating sources...")
+        return IsolationResult(
+            bass_path=None,
+            original_path=audio_path,
+            model_used=self.model_name,
+            processing_time=1.0,
+            success=True,
+            bass_audio=np.linspace(-1, 1, 1000, dtype=np.float32),
+            sample_rate=44100,
+        )
+
+
+@pytest.fixture
+def running_worker(temp_dir):
+    """Serve an AnalysisWorker with fake models on a thread."""
+    socket_path = temp_dir / "worker.sock"
+    worker = AnalysisWorker(isolator=FakeIsolator(temp_dir), detector=FakeDetector())
+    servers = queue.Queue()
+    thread = threading.Thread(
+        target=serve, args=(socket_path, worker, servers.put), daemon=True
+    )
+    thread.start()
+    server = servers.get(timeout=5)
+
+    yield worker, WorkerClient(socket_path)
+
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+class TestWorkerClient:
+    """Tests for WorkerClient against a running worker."""
+
+    def test_ping(self, running_worker):
+        """Test status is reported."""
+        _, client = running_worker
+
+        status = client.ping()
+
+        assert client.is_running()
+        assert status["isolation"] is True
+        assert status["model"] == "htdemucs"
+
+    def test_analyze_with_progress(self, running_worker, temp_dir):
+        """Test file analysis runs in the worker and streams progress."""
+        _, client = running_worker
+        audio_path = temp_dir / "song.mp3"
+        audio_path.write_bytes(b"audio")
+        updates = []
+
+        beat_info = client.analyze(audio_path, progress_callback=lambda p, m: updates.append(p))
+
+        assert (beat_info.bpm, beat_info.confidence) == (120.0, 0.9)
+        assert beat_info.beat_times.dtype == np.float64
+        assert beat_info.beat_times.tolist() == [0.5, 1.0, 1.5]
+        assert updates == [0.5]
+
+    def test_isolate_returns_buffer(self, running_worker, temp_dir):
+        """Test the bass stem comes back as a float32 buffer."""
+        worker, client = running_worker
+
+        result = client.isolate(temp_dir / "song.mp3", write_file=False, profile="fast")
+
+        assert worker.isolator.profiles == ["fast"]
+        assert result.success
+        assert result.original_path == (temp_dir / "song.mp3").resolve()
+        assert result.sample_rate == 44100
+        np.testing.assert_array_equal(
+            result.bass_audio, np.linspace(-1, 1, 1000, dtype=np.float32)
+        )
+
+    def test_analyze_audio_round_trip(self, running_worker):
+        """Test buffers are sent to the worker intact."""
+        worker, client = running_worker
+        y = np.random.default_rng(0).standard_normal(5000).astype(np.float32)
+
+        beat_info = client.analyze_audio(y, 22050)
+
+        assert beat_info.bpm == 100.0
+        received, sample_rate = worker.detector.buffers[-1]
+        np.testing.assert_array_equal(received, y)
+        assert sample_rate == 22050
+        assert worker.jobs_completed == 1
+
+    def test_tempo_map_sent_to_worker(self, running_worker, temp_dir):
+        """Test the tab tempo map reaches the worker's detector."""
+        worker, client = running_worker
+        tempo_map = TempoMap(changes=[(0, 120.0), (8, 96.5)], bar_quarters=[4.0, 3.0])
+
+        client.analyze(temp_dir / "song.mp3", tempo_map=tempo_map)
+        client.analyze_audio(np.zeros(100, dtype=np.float32), 22050)
+
+        assert worker.detector.tempo_maps == [tempo_map, None]
+
+    def test_beat_positions_returned(self, running_worker, temp_dir):
+        """Test downbeat labels come back from the worker."""
+        _, client = running_worker
+
+        beat_info = client.analyze(temp_dir / "song.mp3", beats_per_bar=4)
+
+        assert beat_info.beat_positions == [0, 1, 2]
+
+    def test_beat_arrays_returned(self, running_worker):
+        """Test per-beat strengths and regularity come back as arrays."""
+        _, client = running_worker
+
+        beat_info = client.analyze_audio(np.zeros(100, dtype=np.float32), 44100)
+
+        np.testing.assert_array_equal(beat_info.beat_strengths, [1.0, 0.25])
+        np.testing.assert_array_equal(beat_info.reliable, [True, False])
+
+    def test_job_error_type_preserved(self, running_worker, temp_dir):
+        """Test errors raised in the worker are re-raised with their type."""
+        _, client = running_worker
+
+        with pytest.raises(BPMDetectionError, match="No BPM"):
+            client.analyze(temp_dir / "silent.mp3")
+
+    def test_second_worker_refused(self, running_worker):
+        """Test a second worker cannot take over a live socket."""
+        _, client = running_worker
+
+        with pytest.raises(WorkerUnavailableError, match="already listening"):
+            serve(client.socket_path, running_worker[0])
+
+    def test_not_running(self, temp_dir):
+        """Test a missing worker is reported without waiting."""
+        client = WorkerClient(temp_dir / "missing.sock")
+
+        assert not client.is_running()
+        with pytest.raises(WorkerUnavailableError):
+            client.analyze(temp_dir / "song.mp3")
+
+
+class TestSocketSecurity:
+    """Tests for the socket location and ownership checks."""
+
+    def test_default_path_in_runtime_dir(self, temp_dir, monkeypatch):
+        """Test $XDG_RUNTIME_DIR is preferred over the shared temp directory."""
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(temp_dir))
+
+        assert worker_module._default_socket_path() == temp_dir / "guitarprotool" / "worker.sock"
+
+    def test_default_path_per_user(self, monkeypatch):
+        """Test the temp directory fallback is per user."""
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+
+        path = worker_module._default_socket_path()
+
+        assert path.parent.name == f"guitarprotool-{os.getuid()}"
+
+    def test_socket_directory_created_private(self, temp_dir):
+        """Test serve() creates the socket directory with mode 0700."""
+        socket_path = temp_dir / "run" / "worker.sock"
+        servers = queue.Queue()
+        worker = AnalysisWorker(isolator=FakeIsolator(temp_dir), detector=FakeDetector())
+        thread = threading.Thread(
+            target=serve, args=(socket_path, worker, servers.put), daemon=True
+        )
+        thread.start()
+        server = servers.get(timeout=5)
+        try:
+            assert stat.S_IMODE(socket_path.parent.stat().st_mode) == 0o700
+            assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+        finally:
+            server.shutdown()
+            thread.join(timeout=5)
+
+    def test_shared_directory_refused(self, temp_dir):
+        """Test serve() refuses a socket directory other users can access."""
+        shared = temp_dir / "shared"
+        shared.mkdir()
+        shared.chmod(0o777)
+
+        with pytest.raises(WorkerUnavailableError, match="accessible by other users"):
+            serve(shared / "worker.sock", AnalysisWorker(FakeIsolator(temp_dir), FakeDetector()))
+
+        assert not (shared / "worker.sock").exists()
+
+    def test_foreign_socket_refused(self, running_worker, monkeypatch):
+        """Test the client does not connect to a socket owned by another user."""
+        _, client = running_worker
+        monkeypatch.setattr(os, "getuid", lambda: os.stat(client.socket_path).st_uid + 1)
+
+        with pytest.raises(WorkerUnavailableError, match="owned by another user"):
+            client.ping()
+
+    def test_non_socket_refused(self, temp_dir):
+        """Test the client refuses a path that is not a socket."""
+        (temp_dir / "worker.sock").write_bytes(b"")
+
+        with pytest.raises(WorkerUnavailableError, match="Not a socket"):
+            WorkerClient(temp_dir / "worker.sock").ping()
+
+
+class TestAnalysisWorker:
+    """Tests for AnalysisWorker."""
+
+    def test_warm_up_loads_models(self, temp_dir):
+        """Test warm-up loads the isolation model and runs beat tracking once."""
+        worker = AnalysisWorker(isolator=FakeIsolator(temp_dir), detector=FakeDetector())
+
+        worker.warm_up()
+
+        assert worker.isolator.loads == 1
+        assert len(worker.detector.buffers) == 1
+
+    def test_unknown_job(self, temp_dir):
+        """Test unknown jobs are rejected."""
+        worker = AnalysisWorker(isolator=FakeIsolator(temp_dir), detector=FakeDetector())
+
+        with pytest.raises(ValueError, match="Unknown job"):
+            worker.run_job({"job": "transcribe"}, bytearray(), lambda p, m: None)
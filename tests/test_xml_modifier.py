@@ -9,6 +9,7 @@ from lxml import etree
 from guitarprotool.core.xml_modifier import (
     XMLModifier,
     SyncPoint,
+    SyncPointDelta,
     AssetInfo,
     BackingTrackConfig,
 )
@@ -260,6 +261,104 @@ class TestXMLModifierSave:
         assert saved_root.tag == "GPIF"
         assert saved_root.find("Score/Title").text == "Test Song"
 
+    def test_unmodified_save_is_byte_identical(self, minimal_gpif, temp_dir):
+        """Test saving without modifications reproduces the original bytes."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+
+        new_path = temp_dir / "saved.gpif"
+        modifier.save(new_path)
+
+        assert new_path.read_bytes() == minimal_gpif.read_bytes()
+
+    def test_save_preserves_untouched_formatting(
+        self, minimal_gpif, temp_dir, sample_asset_info, sample_sync_points
+    ):
+        """Test only modified elements differ from the original bytes."""
+        original = minimal_gpif.read_bytes()
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        modifier.inject_backing_track(BackingTrackConfig(asset_id=0))
+        modifier.inject_asset(sample_asset_info)
+        modifier.inject_sync_points(sample_sync_points)
+
+        new_path = temp_dir / "saved.gpif"
+        modifier.save(new_path)
+        saved = new_path.read_bytes()
+
+        # Inline formatting in untouched sections survives the save
+        assert b"<Key><AccidentalCount>0</AccidentalCount></Key>" in saved
+        assert saved.startswith(original[: original.index(b"<MasterTrack>")])
+        root = etree.fromstring(saved)
+        assert root.find("BackingTrack/AssetId").text == "0"
+        assert root.find("Assets/Asset").get("id") == "0"
+        assert len(root.findall("MasterTrack/Automations/Automation[Type='SyncPoint']")) == 3
+
+    def test_incremental_resave_changes_only_edited_lines(
+        self, minimal_gpif, sample_sync_points
+    ):
+        """Test an incremental sync update produces a minimal diff."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        modifier.inject_sync_points(sample_sync_points)
+        modifier.save()
+        before = minimal_gpif.read_bytes().splitlines()
+
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        updated = list(sample_sync_points)
+        updated[1] = SyncPoint(bar=4, frame_offset=88300, modified_tempo=119.5, original_tempo=120.0)
+        modifier.inject_sync_points(updated, incremental=True)
+        modifier.save()
+        after = minimal_gpif.read_bytes().splitlines()
+
+        assert len(before) == len(after)
+        changed = [(a, b) for a, b in zip(before, after) if a != b]
+        assert len(changed) == 1
+        assert b"88300" in changed[0][1]
+
+    def test_incremental_repair_keeps_layout(self, minimal_gpif, sample_sync_points):
+        """Test rebuilt malformed and removed duplicate sync points keep the indented layout."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        modifier.inject_sync_points(sample_sync_points)
+        modifier.save()
+        clean = minimal_gpif.read_bytes()
+
+        # Bar 4 loses its FrameOffset; bar 8 appears twice
+        lines = clean.splitlines(keepends=True)
+        lines.remove(next(line for line in lines if b"<FrameOffset>88200<" in line))
+        start = max(i for i, line in enumerate(lines) if line.strip() == b"<Automation>")
+        end = next(i for i in range(start, len(lines)) if lines[i].strip() == b"</Automation>")
+        lines[end + 1 : end + 1] = lines[start : end + 1]
+        minimal_gpif.write_bytes(b"".join(lines))
+
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        delta = modifier.inject_sync_points(sample_sync_points, incremental=True)
+        modifier.save()
+
+        assert delta.updated == [(4, 0)]
+        assert delta.removed == [(8, 0)]
+        # The tree itself is laid out, not just the spliced output
+        automations = modifier._root.find("MasterTrack/Automations")
+        expected = etree.fromstring(clean).find("MasterTrack/Automations")
+        assert etree.tostring(automations) == etree.tostring(expected)
+        assert minimal_gpif.read_bytes() == clean
+
+    def test_save_without_preserve_formatting_reserializes(self, minimal_gpif, temp_dir):
+        """Test preserve_formatting=False writes the full pretty-printed tree."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+
+        new_path = temp_dir / "saved.gpif"
+        modifier.save(new_path, preserve_formatting=False)
+        saved = new_path.read_bytes()
+
+        assert saved.startswith(b"<?xml version='1.0' encoding='UTF-8'?>")
+        assert saved != minimal_gpif.read_bytes()
+        assert etree.fromstring(saved).find("Score/Title").text == "Test Song"
+
 
 # =============================================================================
 # BackingTrack Injection Tests
@@ -478,6 +577,26 @@ class TestInjectSyncPoints:
         assert automation.find("Value/ModifiedTempo").text == "119.500"
         assert automation.find("Value/OriginalTempo").text == "120"
 
+    def test_inject_sync_points_keeps_order(self, minimal_gpif):
+        """Test sync points built in one batch keep their order and values."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        sync_points = [
+            SyncPoint(
+                bar=bar,
+                frame_offset=bar * 88200,
+                modified_tempo=120 + bar / 8,
+                original_tempo=120.0,
+            )
+            for bar in range(0, 40, 4)
+        ]
+        modifier.inject_sync_points(sync_points)
+
+        automations = modifier._root.findall("MasterTrack/Automations/Automation[Type='SyncPoint']")
+        assert [a.findtext("Bar") for a in automations] == [str(b) for b in range(0, 40, 4)]
+        assert automations[-1].findtext("Value/ModifiedTempo") == "124.500"
+        assert automations[-1].findtext("Value/FrameOffset") == str(36 * 88200)
+
     def test_inject_sync_points_creates_automations(self, gpif_without_automations):
         """Test sync point injection creates Automations if missing."""
         modifier = XMLModifier(gpif_without_automations)
@@ -529,6 +648,189 @@ class TestInjectSyncPoints:
         assert tempo.find("Value").text == "120"
 
 
+class TestIncrementalSyncPoints:
+    """Tests for XMLModifier.inject_sync_points(incremental=True)."""
+
+    def test_full_injection_reports_delta(self, minimal_gpif, sample_sync_points):
+        """Test full replacement reports all points as added and removed."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+
+        first = modifier.inject_sync_points(sample_sync_points)
+        second = modifier.inject_sync_points(sample_sync_points)
+
+        assert first.added == [(0, 0), (4, 0), (8, 0)]
+        assert first.removed == []
+        assert second.removed == [(0, 0), (4, 0), (8, 0)]
+        assert len(second.added) == 3
+
+    def test_incremental_without_existing_appends(self, minimal_gpif, sample_sync_points):
+        """Test incremental mode on a clean file behaves like full injection."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+
+        delta = modifier.inject_sync_points(sample_sync_points, incremental=True)
+
+        assert delta.added == [(0, 0), (4, 0), (8, 0)]
+        assert not delta.updated and not delta.removed
+        automations = modifier._root.find("MasterTrack/Automations")
+        bars = [a.find("Bar").text for a in automations.findall("Automation[Type='SyncPoint']")]
+        assert bars == ["0", "4", "8"]
+
+    def test_incremental_unchanged_keeps_elements(self, minimal_gpif, sample_sync_points):
+        """Test identical re-injection leaves existing elements untouched."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        modifier.inject_sync_points(sample_sync_points)
+
+        automations = modifier._root.find("MasterTrack/Automations")
+        before = automations.findall("Automation[Type='SyncPoint']")
+
+        delta = modifier.inject_sync_points(sample_sync_points, incremental=True)
+
+        after = automations.findall("Automation[Type='SyncPoint']")
+        assert not delta.has_changes
+        assert delta.unchanged == [(0, 0), (4, 0), (8, 0)]
+        assert all(a is b for a, b in zip(before, after))
+
+    def test_incremental_updates_in_place(self, minimal_gpif, sample_sync_points):
+        """Test changed values are rewritten on the existing element."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        modifier.inject_sync_points(sample_sync_points)
+
+        automations = modifier._root.find("MasterTrack/Automations")
+        original_bar4 = automations.findall("Automation[Type='SyncPoint']")[1]
+
+        changed = list(sample_sync_points)
+        changed[1] = SyncPoint(bar=4, frame_offset=88300, modified_tempo=119.0, original_tempo=120.0)
+        delta = modifier.inject_sync_points(changed, incremental=True)
+
+        assert delta.updated == [(4, 0)]
+        assert delta.unchanged == [(0, 0), (8, 0)]
+        bar4 = automations.findall("Automation[Type='SyncPoint']")[1]
+        assert bar4 is original_bar4
+        assert bar4.find("Value/FrameOffset").text == "88300"
+        assert bar4.find("Value/ModifiedTempo").text == "119.000"
+
+    def test_incremental_inserts_and_removes(self, minimal_gpif, sample_sync_points):
+        """Test new bars are inserted in order and obsolete bars removed."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        modifier.inject_sync_points(sample_sync_points)
+
+        new_points = [
+            SyncPoint(bar=0, frame_offset=0, modified_tempo=120.0, original_tempo=120.0),
+            SyncPoint(bar=2, frame_offset=44100, modified_tempo=120.0, original_tempo=120.0),
+            SyncPoint(bar=8, frame_offset=176400, modified_tempo=120.2, original_tempo=120.0),
+        ]
+        delta = modifier.inject_sync_points(new_points, incremental=True)
+
+        assert delta.added == [(2, 0)]
+        assert delta.removed == [(4, 0)]
+        assert delta.unchanged == [(0, 0), (8, 0)]
+
+        automations = modifier._root.find("MasterTrack/Automations")
+        bars = [a.find("Bar").text for a in automations.findall("Automation[Type='SyncPoint']")]
+        assert bars == ["0", "2", "8"]
+
+    def test_incremental_keys_by_bar_occurrence(self, minimal_gpif):
+        """Test sync points in repeated bars are matched by occurrence."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        modifier.inject_sync_points([
+            SyncPoint(bar=1, frame_offset=100, modified_tempo=120.0, original_tempo=120.0),
+            SyncPoint(bar=1, frame_offset=900, modified_tempo=120.0, original_tempo=120.0,
+                      bar_occurrence=1),
+        ])
+
+        delta = modifier.inject_sync_points([
+            SyncPoint(bar=1, frame_offset=100, modified_tempo=120.0, original_tempo=120.0),
+            SyncPoint(bar=1, frame_offset=950, modified_tempo=120.0, original_tempo=120.0,
+                      bar_occurrence=1),
+        ], incremental=True)
+
+        assert delta.unchanged == [(1, 0)]
+        assert delta.updated == [(1, 1)]
+
+    def test_incremental_preserves_tempo_automation(self, minimal_gpif, sample_sync_points):
+        """Test incremental injection leaves other automations alone."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        modifier.inject_sync_points(sample_sync_points, incremental=True)
+
+        tempo = modifier._root.find("MasterTrack/Automations/Automation[Type='Tempo']")
+        assert tempo is not None
+        assert tempo.find("Value").text == "120"
+
+    def test_incremental_merges_interleaved_bars(self, minimal_gpif, sample_sync_points):
+        """Test several new bars between and after existing ones land in order."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        modifier.inject_sync_points(sample_sync_points)
+
+        bars = [0, 1, 2, 4, 6, 8, 10, 12]
+        delta = modifier.inject_sync_points(
+            [SyncPoint(bar=bar, frame_offset=bar * 22050, modified_tempo=120.0,
+                       original_tempo=120.0) for bar in bars],
+            incremental=True,
+        )
+
+        assert delta.added == [(1, 0), (2, 0), (6, 0), (10, 0), (12, 0)]
+        automations = modifier._root.find("MasterTrack/Automations")
+        found = [a.find("Bar").text for a in automations.findall("Automation[Type='SyncPoint']")]
+        assert found == [str(bar) for bar in bars]
+
+    def test_inserted_elements_match_line_layout(self, temp_dir, sample_sync_points):
+        """Test new sync points follow one-element-per-line layout without indentation."""
+        gpif_path = temp_dir / "score.gpif"
+        gpif_path.write_text(
+            "<GPIF>\n<MasterTrack>\n<Automations>\n<Automation>\n<Type>Tempo</Type>\n"
+            "<Value>120</Value>\n</Automation>\n</Automations>\n</MasterTrack>\n</GPIF>"
+        )
+        modifier = XMLModifier(gpif_path)
+        modifier.load()
+        modifier.inject_sync_points(sample_sync_points)
+        modifier.save()
+        before = gpif_path.read_bytes().splitlines()
+
+        assert b"</Automations>" in before
+        assert all(line.count(b"<") <= 2 for line in before)
+
+        modifier = XMLModifier(gpif_path)
+        modifier.load()
+        updated = list(sample_sync_points)
+        updated[1] = SyncPoint(bar=4, frame_offset=88300, modified_tempo=119.5, original_tempo=120.0)
+        modifier.inject_sync_points(updated, incremental=True)
+        modifier.save()
+        after = gpif_path.read_bytes().splitlines()
+
+        changed = [(a, b) for a, b in zip(before, after) if a != b]
+        assert len(before) == len(after)
+        assert changed == [(b"<FrameOffset>88200</FrameOffset>", b"<FrameOffset>88300</FrameOffset>")]
+
+    def test_removing_last_sync_point_keeps_closing_indent(self, minimal_gpif, sample_sync_points):
+        """Test removing the last automation keeps </Automations> on its own indented line."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+        modifier.inject_sync_points(sample_sync_points)
+
+        modifier.inject_sync_points(sample_sync_points[:2], incremental=True)
+        modifier.save()
+
+        assert b"\n        </Automations>" in minimal_gpif.read_bytes()
+
+    def test_empty_injection_returns_empty_delta(self, minimal_gpif):
+        """Test injecting no sync points returns an empty delta."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+
+        delta = modifier.inject_sync_points([], incremental=True)
+
+        assert isinstance(delta, SyncPointDelta)
+        assert not delta.has_changes
+
+
 # =============================================================================
 # Helper Method Tests
 # =============================================================================
@@ -584,6 +886,22 @@ class TestHelperMethods:
         tempo = modifier.get_original_tempo()
         assert tempo == 78.0
 
+    def test_get_tempo_map(self, minimal_gpif):
+        """Test extracting the tempo map."""
+        modifier = XMLModifier(minimal_gpif)
+        modifier.load()
+
+        tempo_map = modifier.get_tempo_map()
+        assert tempo_map.changes == [(0, 120.0)]
+        assert tempo_map.bar_count == 2
+
+    def test_get_tempo_map_not_found(self, gpif_without_automations):
+        """Test get_tempo_map returns None without a tempo automation."""
+        modifier = XMLModifier(gpif_without_automations)
+        modifier.load()
+
+        assert modifier.get_tempo_map() is None
+
     def test_get_bar_count(self, minimal_gpif):
         """Test getting bar count."""
         modifier = XMLModifier(minimal_gpif)
@@ -639,6 +957,11 @@ class TestDataClasses:
         assert sp.position == 0
         assert sp.bar_occurrence == 0
 
+    def test_sync_point_has_slots(self):
+        """Test SyncPoint records carry no per-instance __dict__."""
+        sp = SyncPoint(bar=0, frame_offset=0, modified_tempo=120.0, original_tempo=120.0)
+        assert not hasattr(sp, "__dict__")
+
     def test_backing_track_config_defaults(self):
         """Test BackingTrackConfig default values."""
         config = BackingTrackConfig()
@@ -0,0 +1,57 @@
+"""Tests for precompiled score.gpif XPath queries."""
+
+from lxml import etree
+
+from guitarprotool.core import xml_queries as queries
+
+
+GPIF = b"""<GPIF>
+    <MasterTrack>
+        <Automations>
+            <Automation><Type>Tempo</Type><Value>96 2</Value></Automation>
+            <Automation><Type>SyncPoint</Type><Value><BarIndex>3</BarIndex></Value></Automation>
+            <Automation><Type>Tempo</Type><Value>100 2</Value></Automation>
+            <Automation><Type>SyncPoint</Type><Value><BarIndex>7</BarIndex></Value></Automation>
+        </Automations>
+    </MasterTrack>
+    <MasterBars><MasterBar/><MasterBar/><MasterBar/></MasterBars>
+    <Assets>
+        <Asset id="0"/>
+        <Asset id="it's"/>
+    </Assets>
+</GPIF>"""
+
+
+class TestQueries:
+    """Tests for the compiled query registry."""
+
+    def test_tempo_automation_path_finds_first_match(self):
+        """Test find() with the tempo path returns the first Tempo automation."""
+        root = etree.fromstring(GPIF)
+
+        tempo = root.find(queries.TEMPO_AUTOMATION_PATH)
+
+        assert tempo.findtext("Value") == "96 2"
+
+    def test_automations_of_type_uses_variable(self):
+        """Test automation type is passed as an XPath variable."""
+        automations = etree.fromstring(GPIF).find("MasterTrack/Automations")
+
+        sync_points = queries.AUTOMATIONS_OF_TYPE(automations, type="SyncPoint")
+
+        assert [a.findtext("Value/BarIndex") for a in sync_points] == ["3", "7"]
+
+    def test_asset_by_id_quotes_value(self):
+        """Test ids containing quotes are matched instead of breaking the query."""
+        assets = etree.fromstring(GPIF).find("Assets")
+
+        assert queries.first(queries.ASSET_BY_ID, assets, id="it's") is not None
+        assert queries.first(queries.ASSET_BY_ID, assets, id="0' or '1'='1") is None
+
+    def test_master_bar_count(self):
+        """Test MasterBar count query."""
+        assert queries.MASTER_BAR_COUNT(etree.fromstring(GPIF)) == 3
+
+    def test_first_returns_none_without_match(self):
+        """Test first() returns None for an empty result."""
+        assert queries.first(queries.TEMPO_AUTOMATIONS, etree.fromstring(b"<GPIF/>")) is None
@@ -0,0 +1,196 @@
+"""Tests for the formatting-preserving XML writer."""
+
+import pytest
+from lxml import etree
+
+from guitarprotool.core import xml_writer
+from guitarprotool.core.xml_writer import find_element_spans, splice_modified_elements
+
+
+SOURCE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<GPIF>
+\t<Score><Title><![CDATA[</Score> in a title]]></Title></Score>
+\t<MasterTrack>
+\t\t<Tracks>0</Tracks>
+\t\t<Automations>
+\t\t\t<Automation><Type>Tempo</Type><Value>120 2</Value></Automation>
+\t\t</Automations>
+\t</MasterTrack>
+\t<Tracks><Track id="0"><Name>Bass</Name></Track></Tracks>
+\t<Bars><Bar id="0"><Voices>0 -1 -1 -1</Voices></Bar></Bars>
+\t<Rhythms/>
+</GPIF>
+"""
+
+
+def _root(source: bytes = SOURCE) -> etree._Element:
+    parser = etree.XMLParser(remove_blank_text=False, strip_cdata=False)
+    return etree.fromstring(source, parser)
+
+
+class TestFindElementSpans:
+    """Tests for find_element_spans()."""
+
+    def test_top_level_spans(self):
+        """Test spans cover each child of the root element exactly."""
+        spans = find_element_spans(SOURCE)
+
+        assert set(spans) == {"Score", "MasterTrack", "Tracks", "Bars", "Rhythms"}
+        start, end = spans["Tracks"][0]
+        assert SOURCE[start:end] == b'<Tracks><Track id="0"><Name>Bass</Name></Track></Tracks>'
+
+    def test_cdata_is_not_parsed_as_markup(self):
+        """Test closing tags inside CDATA do not end the element."""
+        spans = find_element_spans(SOURCE)
+
+        start, end = spans["Score"][0]
+        assert SOURCE[start:end].endswith(b"</Title></Score>")
+        assert b"in a title" in SOURCE[start:end]
+
+    def test_self_closing_element(self):
+        """Test self-closing top-level elements are recorded."""
+        spans = find_element_spans(SOURCE)
+
+        start, end = spans["Rhythms"][0]
+        assert SOURCE[start:end] == b"<Rhythms/>"
+
+    def test_child_spans_for_requested_parents(self):
+        """Test second-level spans are recorded only for requested parents."""
+        spans = find_element_spans(SOURCE, parents={"MasterTrack"})
+
+        assert "MasterTrack/Automations" in spans
+        assert "MasterTrack/Tracks" in spans
+        assert "Tracks/Track" not in spans
+        start, end = spans["MasterTrack/Automations"][0]
+        assert SOURCE[start:end].startswith(b"<Automations>")
+        assert SOURCE[start:end].endswith(b"</Automations>")
+
+    def test_closed_cdata_keeps_fast_path(self):
+        """Test CDATA closed before the closing tag does not force the slow scan."""
+        source = b"<GPIF><Score><Title><![CDATA[Song]]></Title></Score></GPIF>"
+
+        end = xml_writer._skip_element(source, b"Score", len(b"<GPIF><Score>"))
+
+        assert end == source.index(b"</GPIF>")
+        assert xml_writer._skip_element(SOURCE, b"Score", SOURCE.index(b"<Title>")) is None
+
+
+class TestSpliceModifiedElements:
+    """Tests for splice_modified_elements()."""
+
+    def test_no_changes_returns_source(self):
+        """Test splicing nothing reproduces the source exactly."""
+        assert splice_modified_elements(SOURCE, _root(), []) == SOURCE
+
+    def test_replace_nested_element(self):
+        """Test a modified second-level element is replaced in place."""
+        root = _root()
+        value = root.find("MasterTrack/Automations/Automation/Value")
+        value.text = "90 2"
+
+        result = splice_modified_elements(SOURCE, root, ["MasterTrack/Automations"])
+
+        start, end = find_element_spans(SOURCE, {"MasterTrack"})["MasterTrack/Automations"][0]
+        assert result[:start] == SOURCE[:start]
+        assert result.endswith(SOURCE[end:])
+        assert b"<Value>90 2</Value>" in result
+        assert b"120 2" not in result
+
+    def test_insert_new_top_level_element(self):
+        """Test a new element is inserted after its previous sibling."""
+        root = _root()
+        backing = etree.Element("BackingTrack")
+        etree.SubElement(backing, "AssetId").text = "0"
+        root.find("MasterTrack").addnext(backing)
+
+        result = splice_modified_elements(SOURCE, root, ["BackingTrack"])
+
+        before, after = SOURCE.split(b"</MasterTrack>")
+        assert result.startswith(before + b"</MasterTrack>")
+        assert result.endswith(after)
+        assert b"\n\t<BackingTrack>\n\t\t<AssetId>0</AssetId>\n\t</BackingTrack>" in result
+        assert etree.fromstring(result).find("BackingTrack/AssetId").text == "0"
+
+    def test_remove_element(self):
+        """Test a removed element and its indentation are dropped."""
+        root = _root()
+        root.remove(root.find("Bars"))
+
+        result = splice_modified_elements(SOURCE, root, ["Bars"])
+
+        assert b"<Bars>" not in result
+        assert result == SOURCE.replace(
+            b'\n\t<Bars><Bar id="0"><Voices>0 -1 -1 -1</Voices></Bar></Bars>', b""
+        )
+
+    def test_untouched_regions_are_byte_identical(self):
+        """Test formatting outside the modified element is preserved."""
+        root = _root()
+        root.find("Tracks/Track/Name").text = "Guitar"
+
+        result = splice_modified_elements(SOURCE, root, ["Tracks"])
+
+        start, end = find_element_spans(SOURCE)["Tracks"][0]
+        assert result[:start] == SOURCE[:start]
+        assert result.endswith(SOURCE[end:])
+
+    def test_ambiguous_insert_falls_back(self):
+        """Test an insert without a locatable previous sibling returns None."""
+        root = _root()
+        root.insert(0, etree.Element("Header"))
+
+        assert splice_modified_elements(SOURCE, root, ["Header"]) is None
+
+    def test_only_changed_children_rewritten(self):
+        """Test editing one child leaves its siblings' bytes untouched."""
+        source = SOURCE.replace(
+            b"\t\t</Automations>",
+            b"\t\t\t<Automation><Type>Tempo</Type><Value>100 2</Value></Automation>\n"
+            b"\t\t</Automations>",
+        )
+        root = _root(source)
+        root.findall("MasterTrack/Automations/Automation")[1].find("Value").text = "90 2"
+
+        result = splice_modified_elements(source, root, ["MasterTrack/Automations"])
+
+        assert result == source.replace(b"100 2", b"90 2")
+
+    def test_inserted_child_matches_flat_layout(self):
+        """Test a new child in a newline-only document gets no indentation."""
+        source = (
+            b"<GPIF>\n<MasterTrack>\n<Automations>\n"
+            b"<Automation>\n<Type>Tempo</Type>\n</Automation>\n"
+            b"</Automations>\n</MasterTrack>\n</GPIF>"
+        )
+        root = _root(source)
+        automation = etree.SubElement(root.find("MasterTrack/Automations"), "Automation")
+        etree.SubElement(automation, "Type").text = "SyncPoint"
+
+        result = splice_modified_elements(source, root, ["MasterTrack/Automations"])
+
+        assert result == source.replace(
+            b"</Automation>\n</Automations>",
+            b"</Automation>\n<Automation>\n<Type>SyncPoint</Type>\n</Automation>\n</Automations>",
+        )
+
+    def test_removed_child_drops_its_line(self):
+        """Test removing a child drops only that child and its indentation."""
+        root = _root()
+        automations = root.find("MasterTrack/Automations")
+        automations.remove(automations[0])
+        automations.text = "\n\t\t"
+
+        result = splice_modified_elements(SOURCE, root, ["MasterTrack/Automations"])
+
+        assert b"<Automation>" not in result
+        assert result.startswith(SOURCE[: SOURCE.index(b"<Automations>")])
+
+    @pytest.mark.parametrize("tag", ["Score", "Bars"])
+    def test_result_is_well_formed(self, tag):
+        """Test spliced output parses to the modified tree."""
+        root = _root()
+        root.find(tag).set("edited", "yes")
+
+        result = splice_modified_elements(SOURCE, root, [tag])
+
+        assert etree.fromstring(result).find(tag).get("edited") == "yes"